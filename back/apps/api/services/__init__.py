@@ -14,6 +14,9 @@ from .business import (
     get_video_service,
     EventService,
     get_event_service,
+    ProcessingTimeEstimate,
+    ProcessingTimeEstimator,
+    get_processing_time_estimator,
 )
 
 # Infrastructure services
@@ -40,6 +43,32 @@ from .ai import (
     TierManager,
     get_tier_manager,
     RAGSearchService,
+    EmbeddingCacheService,
+    get_embedding_cache,
+    vector_search_params,
+    vector_search,
+    QUANTIZATION_MODES,
+    LexicalSearchService,
+    get_lexical_search_service,
+    reciprocal_rank_fusion,
+    Text2SQLExecutor,
+    Text2SQLRejected,
+    Text2SQLResult,
+    get_text2sql_executor,
+    EmbeddingBackfillService,
+    TokenBucket,
+    get_embedding_backfill_service,
+    EmbeddingOutboxService,
+    get_embedding_outbox,
+    VideoEmbeddingJobService,
+    get_video_embedding_job,
+    make_embedding_version,
+    parse_embedding_version,
+    get_current_embedding_version,
+    ReembedPlannerService,
+    get_reembed_planner,
+    AnswerCacheService,
+    get_answer_cache,
 )
 
 __all__ = [
@@ -48,6 +77,9 @@ __all__ = [
     "get_video_service",
     "EventService",
     "get_event_service",
+    "ProcessingTimeEstimate",
+    "ProcessingTimeEstimator",
+    "get_processing_time_estimator",
     # Infrastructure
     "S3VideoUploadService",
     "s3_service",
@@ -68,4 +100,30 @@ __all__ = [
     "TierManager",
     "get_tier_manager",
     "RAGSearchService",
+    "EmbeddingCacheService",
+    "get_embedding_cache",
+    "vector_search_params",
+    "vector_search",
+    "QUANTIZATION_MODES",
+    "LexicalSearchService",
+    "get_lexical_search_service",
+    "reciprocal_rank_fusion",
+    "Text2SQLExecutor",
+    "Text2SQLRejected",
+    "Text2SQLResult",
+    "get_text2sql_executor",
+    "EmbeddingBackfillService",
+    "TokenBucket",
+    "get_embedding_backfill_service",
+    "EmbeddingOutboxService",
+    "get_embedding_outbox",
+    "VideoEmbeddingJobService",
+    "get_video_embedding_job",
+    "make_embedding_version",
+    "parse_embedding_version",
+    "get_current_embedding_version",
+    "ReembedPlannerService",
+    "get_reembed_planner",
+    "AnswerCacheService",
+    "get_answer_cache",
 ]
@@ -10,6 +10,33 @@ from .hybrid_search_service import HybridSearchService, get_hybrid_search_servic
 from .event_windowing_service import EventWindowingService, get_windowing_service
 from .tier_manager import TierManager, get_tier_manager
 from .search_service import RAGSearchService
+from .embedding_cache import EmbeddingCacheService, get_embedding_cache
+from .vector_index import QUANTIZATION_MODES, vector_search, vector_search_params
+from .embedding_backfill import (
+    EmbeddingBackfillService,
+    TokenBucket,
+    get_embedding_backfill_service,
+)
+from .embedding_outbox import EmbeddingOutboxService, get_embedding_outbox
+from .video_embedding_job import VideoEmbeddingJobService, get_video_embedding_job
+from .embedding_version import (
+    get_current_embedding_version,
+    make_embedding_version,
+    parse_embedding_version,
+)
+from .reembed_planner import ReembedPlannerService, get_reembed_planner
+from .answer_cache import AnswerCacheService, get_answer_cache
+from .text2sql_executor import (
+    Text2SQLExecutor,
+    Text2SQLRejected,
+    Text2SQLResult,
+    get_text2sql_executor,
+)
+from .lexical_search_service import (
+    LexicalSearchService,
+    get_lexical_search_service,
+    reciprocal_rank_fusion,
+)
 
 __all__ = [
     "BedrockService",
@@ -25,4 +52,30 @@ __all__ = [
     "TierManager",
     "get_tier_manager",
     "RAGSearchService",
+    "EmbeddingCacheService",
+    "get_embedding_cache",
+    "vector_search_params",
+    "vector_search",
+    "QUANTIZATION_MODES",
+    "LexicalSearchService",
+    "get_lexical_search_service",
+    "reciprocal_rank_fusion",
+    "Text2SQLExecutor",
+    "Text2SQLRejected",
+    "Text2SQLResult",
+    "get_text2sql_executor",
+    "EmbeddingBackfillService",
+    "TokenBucket",
+    "get_embedding_backfill_service",
+    "EmbeddingOutboxService",
+    "get_embedding_outbox",
+    "VideoEmbeddingJobService",
+    "get_video_embedding_job",
+    "make_embedding_version",
+    "parse_embedding_version",
+    "get_current_embedding_version",
+    "ReembedPlannerService",
+    "get_reembed_planner",
+    "AnswerCacheService",
+    "get_answer_cache",
 ]
@@ -0,0 +1,221 @@
+"""
+의미 기반 답변 캐시 (Semantic Answer Cache)
+- PromptInteraction.query_embedding 코사인 유사도로 이전 답변 재사용
+- 비디오 범위 + 비디오별 데이터 버전 + 질문 embedding 버전(모델)이 같을 때만 적중
+- 데이터 버전 = Video.data_version (ORM 변경 시 증가) + 이벤트 수 + 최대 이벤트 ID (직접 SQL INSERT 감지)
+"""
+
+import logging
+import re
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, F, Max
+from django.utils import timezone
+from pgvector.django import CosineDistance
+
+from apps.db.models import Event, PromptInteraction, Video
+
+from .embedding_version import get_current_embedding_version
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def get_video_data_signatures(video_ids: Iterable[int]) -> Dict[int, Tuple[int, int, int]]:
+    """
+    비디오별 이벤트 데이터 시그니처 (단일 쿼리)
+
+    (data_version, 이벤트 수, 최대 이벤트 ID) - data_version은 ORM 수정/삭제 커밋 시 증가,
+    이벤트 수/최대 ID는 직접 SQL INSERT 감지 → 다른 프로세스의 변경도 반영되는 캐시 키
+    (답변 캐시 / 윈도우 텍스트 캐시 / BM25 인덱스 공용)
+
+    Returns:
+        {video_id: (data_version, event_count, max_event_id)} (없는 비디오는 제외)
+    """
+    rows = (
+        Video.objects.filter(pk__in=list(video_ids))
+        .annotate(event_count=Count("events"), max_event_id=Max("events__id"))
+        .values_list("pk", "data_version", "event_count", "max_event_id")
+    )
+    return {
+        video_id: (data_version, event_count, max_event_id or 0)
+        for video_id, data_version, event_count, max_event_id in rows
+    }
+
+
+class AnswerCacheService:
+    """이전 질문-답변을 임베딩 유사도로 재사용하는 캐시"""
+
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Args:
+            similarity_threshold: 적중 최소 코사인 유사도 (0-1)
+            ttl_seconds: 재사용할 이전 답변의 최대 경과 시간 (초)
+        """
+        self.enabled = getattr(settings, "ANSWER_CACHE_ENABLED", True)
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else getattr(settings, "ANSWER_CACHE_SIMILARITY", 0.97)
+        )
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else getattr(settings, "ANSWER_CACHE_TTL", 86400)
+        )
+
+    @staticmethod
+    def extract_numbers(prompt: str) -> List[str]:
+        """
+        질문 속 숫자 (나이/시각/초)
+
+        "20세 남성"과 "30세 남성"은 임베딩이 매우 가깝지만 답이 다르므로
+        숫자가 모두 같을 때만 적중으로 처리한다.
+        """
+        return NUMBER_PATTERN.findall(prompt or "")
+
+    def get_data_version(self, video) -> Optional[str]:
+        """비디오 이벤트 데이터 버전 (단일 쿼리)"""
+        signature = get_video_data_signatures([video.pk]).get(video.pk)
+        if signature is None:
+            return None
+        return ":".join(map(str, signature))
+
+    def lookup(self, prompt: str, video) -> Optional[Dict]:
+        """
+        유사한 이전 질문의 답변 조회
+
+        Returns:
+            {
+                'response': 이전 AI 응답,
+                'events': 관련 Event 리스트 (저장 순서),
+                'interaction_id': 원본 PromptInteraction ID,
+                'similarity': 코사인 유사도,
+            } 또는 None (미적중)
+        """
+        if not self.enabled or video is None or not prompt:
+            return None
+
+        try:
+            query_embedding = self._embed(prompt)
+            if not query_embedding:
+                return None
+
+            data_version = self.get_data_version(video)
+            if data_version is None:
+                return None
+
+            max_distance = 1.0 - self.similarity_threshold
+            candidates = (
+                PromptInteraction.objects.filter(
+                    related_videos=video,
+                    query_embedding__isnull=False,
+                    embedding_version=get_current_embedding_version(),
+                    created_at__gte=timezone.now() - timedelta(seconds=self.ttl_seconds),
+                    analysis_results__answer_cache__data_version=data_version,
+                    analysis_results__answer_cache__numbers=self.extract_numbers(prompt),
+                )
+                .annotate(distance=CosineDistance("query_embedding", query_embedding))
+                .filter(distance__lte=max_distance)
+                .order_by("distance")
+                .values("id", "ai_response", "analysis_results", "distance")[:1]
+            )
+
+            candidate = next(iter(candidates), None)
+            if candidate is None:
+                logger.info(f"🔎 답변 캐시 미적중 (video={video.pk}, version={data_version})")
+                return None
+
+            event_ids = candidate["analysis_results"]["answer_cache"].get("event_ids", [])
+            events_by_id = Event.objects.select_related("video").in_bulk(event_ids)
+            events = [events_by_id[event_id] for event_id in event_ids if event_id in events_by_id]
+            similarity = 1.0 - candidate["distance"]
+
+            logger.info(
+                f"⚡ 답변 캐시 적중: interaction={candidate['id']}, "
+                f"유사도={similarity:.4f}, 이벤트 {len(events)}개"
+            )
+            return {
+                "response": candidate["ai_response"],
+                "events": events,
+                "interaction_id": candidate["id"],
+                "similarity": similarity,
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 답변 캐시 조회 오류: {str(e)}")
+            return None
+
+    def store(self, interaction, prompt: str, video, events: List) -> None:
+        """
+        PromptInteraction에 캐시 키 정보 저장 (query_embedding + 데이터 버전)
+
+        Args:
+            interaction: 저장된 PromptInteraction
+            prompt: 사용자 질문
+            video: 대상 비디오
+            events: 답변 근거 이벤트 (없으면 저장하지 않음 - 오류/빈 답변 캐싱 방지)
+        """
+        if not self.enabled or video is None or not events:
+            return
+
+        try:
+            query_embedding = self._embed(prompt)
+            data_version = self.get_data_version(video)
+            if not query_embedding or data_version is None:
+                return
+
+            analysis_results = dict(interaction.analysis_results or {})
+            analysis_results["answer_cache"] = {
+                "data_version": data_version,
+                "numbers": self.extract_numbers(prompt),
+                "event_ids": [event.id for event in events],
+            }
+
+            embedding_version = get_current_embedding_version()
+            PromptInteraction.objects.filter(pk=interaction.pk).update(
+                query_embedding=query_embedding,
+                embedding_version=embedding_version,
+                analysis_results=analysis_results,
+            )
+            interaction.query_embedding = query_embedding
+            interaction.embedding_version = embedding_version
+            interaction.analysis_results = analysis_results
+
+        except Exception as e:
+            logger.error(f"❌ 답변 캐시 저장 오류: {str(e)}")
+
+    def invalidate(self, video_id: int) -> None:
+        """비디오 데이터 버전 증가 → 해당 비디오의 기존 캐시 답변 모두 미적중"""
+        Video.objects.filter(pk=video_id).update(data_version=F("data_version") + 1)
+        logger.info(f"🗑️ 답변 캐시 무효화: video={video_id}")
+
+    @staticmethod
+    def _embed(prompt: str) -> Optional[List[float]]:
+        # 임베딩 캐시를 거치므로 같은 요청의 pgvector 검색과 Titan 호출을 공유
+        from .bedrock_service import get_bedrock_service
+
+        return get_bedrock_service().generate_embedding(
+            prompt, input_type="search_query"
+        )
+
+
+# 싱글톤 인스턴스
+_answer_cache = None
+
+
+def get_answer_cache() -> AnswerCacheService:
+    """답변 캐시 싱글톤 인스턴스 반환"""
+    global _answer_cache
+
+    if _answer_cache is None:
+        _answer_cache = AnswerCacheService()
+
+    return _answer_cache
@@ -4,15 +4,84 @@ AWS Bedrock Reranker 서비스
 - Cohere Rerank 또는 Claude를 활용한 재정렬
 """
 
+import hashlib
 import json
+import threading
+import time
 import boto3
-from typing import List, Dict, Tuple
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from django.conf import settings
 import logging
 
+from .embedding_cache import EmbeddingCacheService
+
 logger = logging.getLogger(__name__)
 
 
+class RerankScoreCache:
+    """(모델, 정규화 질의 해시, 문서 텍스트 해시) → relevance score LRU 캐시"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # key -> (score, expires_at)
+        self._scores: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "api_calls": 0, "api_documents": 0}
+
+    @staticmethod
+    def make_query_hash(query: str) -> str:
+        """정규화 질의 해시 (임베딩 캐시와 동일한 정규화 규칙)"""
+        normalized = EmbeddingCacheService.normalize_text(query)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_document_hash(text: str) -> str:
+        """문서 텍스트 해시 (윈도잉 텍스트 그대로)"""
+        return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+    def get(self, key: tuple) -> Optional[float]:
+        with self._lock:
+            item = self._scores.get(key)
+            if item is not None:
+                score, expires_at = item
+                if expires_at >= time.monotonic():
+                    self._scores.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return score
+                del self._scores[key]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: tuple, score: float) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._scores[key] = (score, time.monotonic() + self.ttl_seconds)
+            self._scores.move_to_end(key)
+
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def record_api_call(self, document_count: int) -> None:
+        with self._lock:
+            self._stats["api_calls"] += 1
+            self._stats["api_documents"] += document_count
+
+    def get_stats(self) -> Dict[str, float]:
+        """hit/miss 카운터 및 hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._scores)
+
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0.0
+        return stats
+
+
 class BedrockReranker:
     """Bedrock을 활용한 검색 결과 재정렬 서비스"""
 
@@ -37,6 +106,13 @@ class BedrockReranker:
         self.bedrock = boto3.client(**client_kwargs)
         self.rerank_model = settings.AWS_BEDROCK_RERANK_MODEL_ID
 
+        # 점수 캐시 (같은 세션의 후속 질문에서 동일 후보 재평가 방지)
+        self.cache_enabled = getattr(settings, "RERANK_CACHE_ENABLED", True)
+        self.score_cache = RerankScoreCache(
+            max_size=getattr(settings, "RERANK_CACHE_MAX_SIZE", 20000),
+            ttl_seconds=getattr(settings, "RERANK_CACHE_TTL", 1800),
+        )
+
         logger.info(f"✅ Bedrock Reranker 초기화 완료:")
         logger.info(f"   Model: {self.rerank_model}")
         logger.info(f"   Region: {self.region} (Tokyo - Cohere 지원)")
@@ -79,31 +155,17 @@ class BedrockReranker:
                 else:
                     doc_texts.append(str(doc))
 
-            body = {
-                "query": query,
-                "documents": doc_texts,
-                "top_n": top_k,
-                "api_version": 2,  # 원본 문서는 이미 가지고 있음
-            }
-            # AS-IS (현재 문제 있는 코드 예상)
-
-            response = self.bedrock.invoke_model(
-                modelId=self.rerank_model,
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json",
-            )
-
-            response_body = json.loads(response["body"].read())
-
-            # Rerank 결과 파싱
-            reranked_results = []
-            for result in response_body.get("results", []):
-                index = result["index"]
-                relevance_score = result["relevance_score"]
-
-                if index < len(documents):
-                    reranked_results.append((documents[index], relevance_score))
+            if not self.cache_enabled:
+                scored = self._invoke_rerank(query, doc_texts, top_n=top_k)
+                reranked_results = [
+                    (documents[index], score)
+                    for index, score in scored
+                    if index < len(documents)
+                ]
+            else:
+                reranked_results = self._rerank_cached(
+                    query, documents, doc_texts, top_k
+                )
 
             logger.info(
                 f"✅ Rerank 완료: {len(documents)}개 → {len(reranked_results)}개 (top_k={top_k})"
@@ -126,6 +188,90 @@ class BedrockReranker:
             # Fallback: 원본 순서 그대로 반환
             return [(doc, 1.0) for doc in documents[:top_k]]
 
+    def _rerank_cached(
+        self, query: str, documents: List, doc_texts: List[str], top_k: int
+    ) -> List[Tuple[Dict, float]]:
+        """
+        캐시 hit 점수는 재사용하고 miss 문서만 Reranker로 전송한 뒤 점수 순으로 병합
+
+        miss 문서는 top_n을 miss 개수로 요청해 모든 점수를 받아 캐시에 저장한다
+        (Cohere relevance_score는 질의-문서 쌍 단위 점수이므로 배치와 무관).
+        """
+        query_hash = self.score_cache.make_query_hash(query)
+        scores: Dict[int, float] = {}
+        miss_indexes = []
+
+        for index, text in enumerate(doc_texts):
+            key = (self.rerank_model, query_hash, self.score_cache.make_document_hash(text))
+            cached = self.score_cache.get(key)
+            if cached is not None:
+                scores[index] = cached
+            else:
+                miss_indexes.append(index)
+
+        if miss_indexes:
+            miss_texts = [doc_texts[index] for index in miss_indexes]
+            self.score_cache.record_api_call(len(miss_texts))
+
+            for miss_position, score in self._invoke_rerank(
+                query, miss_texts, top_n=len(miss_texts)
+            ):
+                if miss_position >= len(miss_indexes):
+                    continue
+                index = miss_indexes[miss_position]
+                scores[index] = score
+                self.score_cache.set(
+                    (
+                        self.rerank_model,
+                        query_hash,
+                        self.score_cache.make_document_hash(doc_texts[index]),
+                    ),
+                    score,
+                )
+
+        logger.info(
+            f"🗃️ Rerank 캐시: hit {len(doc_texts) - len(miss_indexes)}개 / miss {len(miss_indexes)}개"
+        )
+
+        # 점수 내림차순 (동점이면 원래 순서 유지)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(documents[index], score) for index, score in ranked[:top_k]]
+
+    def _invoke_rerank(
+        self, query: str, doc_texts: List[str], top_n: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Cohere Rerank API 호출
+
+        Returns:
+            [(문서 인덱스, relevance_score), ...] - 관련도 순
+        """
+        body = {
+            "query": query,
+            "documents": doc_texts,
+            "top_n": top_n,
+            "api_version": 2,  # 원본 문서는 이미 가지고 있음
+        }
+
+        response = self.bedrock.invoke_model(
+            modelId=self.rerank_model,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json",
+        )
+
+        response_body = json.loads(response["body"].read())
+
+        # Rerank 결과 파싱
+        return [
+            (result["index"], result["relevance_score"])
+            for result in response_body.get("results", [])
+        ]
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Rerank 점수 캐시 hit rate 등 통계"""
+        return self.score_cache.get_stats()
+
     def rerank_with_claude(
         self, query: str, documents: List[Dict], top_k: int = 5
     ) -> List[Tuple[Dict, float]]:
@@ -4,16 +4,57 @@ AWS Bedrock 서비스 모듈
 - RAG: 검색된 데이터를 자연어로 정리
 """
 
+import hashlib
 import json
 import boto3
 import logging
-from typing import Dict, Optional, List, Tuple
+import time
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from typing import Dict, Iterator, Optional, List, Tuple
 from datetime import datetime
 from django.conf import settings
 from apps.db.models import Event, Video
 
 logger = logging.getLogger(__name__)
 
+# Bedrock 처리량 초과 응답 코드 (일괄 처리 시 백오프 대상)
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+    "ModelNotReadyException",
+}
+
+
+class EmbeddingThrottled(Exception):
+    """Bedrock 임베딩 호출이 처리량 제한으로 거부됨"""
+
+
+TIMELINE_SYSTEM_PROMPT = "당신은 CCTV 영상 분석 결과를 설명하는 전문가입니다. 명확하고 정확한 정보를 제공하세요."
+
+
+def iter_claude_stream_text(response) -> Iterator[str]:
+    """
+    invoke_model_with_response_stream 응답에서 텍스트 delta만 순서대로 추출
+
+    Args:
+        response: bedrock-runtime invoke_model_with_response_stream 응답
+
+    Yields:
+        Claude가 생성한 텍스트 조각
+    """
+    for stream_event in response["body"]:
+        chunk = stream_event.get("chunk")
+        if not chunk:
+            continue
+
+        payload = json.loads(chunk["bytes"])
+        if payload.get("type") == "content_block_delta":
+            delta = payload.get("delta", {})
+            if delta.get("type") == "text_delta" and delta.get("text"):
+                yield delta["text"]
+
 
 def get_event_schema() -> str:
     """
@@ -73,6 +114,11 @@ def get_event_schema() -> str:
             "bbox_height": "INTEGER - 바운딩 박스 높이",
             "confidence": "FLOAT - 신뢰도 (0-1)",
             "interaction_target": "VARCHAR(100) - 상호작용 대상",
+            "attr_age": "FLOAT - 정확한 나이 (인덱스, attributes->>'age' 생성 컬럼)",
+            "attr_location": "INTEGER - 화면 위치 1=왼쪽, 2=가운데, 3=오른쪽 (인덱스)",
+            "attr_area_of_interest": "INTEGER - 관심 영역 1=왼쪽, 2=가운데, 3=오른쪽 (인덱스)",
+            "attr_obj_id": "INTEGER - 객체 추적 ID (인덱스)",
+            "attr_action_detected": "TEXT - 감지된 행동 (인덱스)",
         }
 
         if field_name in detailed_info:
@@ -97,6 +143,224 @@ def get_event_schema() -> str:
     return "\n".join(field_descriptions)
 
 
+def build_text2sql_static_prompt() -> str:
+    """
+    Text2SQL 정적 프롬프트(스키마 + 규칙 + 예시) 생성
+
+    사용자 질문, 비디오 필터, 현재 시각 같은 요청별 값은 포함하지 않는다
+    (Bedrock 프롬프트 캐싱의 고정 prefix로 사용).
+    """
+    # 동적으로 Event 모델에서 스키마 생성
+    event_fields = get_event_schema()
+
+    # 데이터베이스 스키마 정보
+    schema_info = f"""
+    데이터베이스 스키마:
+    
+    테이블: db_video (비디오 정보)
+    - video_id: INTEGER (Primary Key)
+    - name: VARCHAR(255) - 비디오 이름
+    - filename: VARCHAR(255) - 파일명
+    - duration: FLOAT - 비디오 길이(초)
+    - recorded_at: TIMESTAMP - 촬영 시각
+    - created_at: TIMESTAMP - 생성 시각
+    
+    테이블: db_event (이벤트 정보)
+{event_fields}
+    
+    **중요 - attributes 인덱스 컬럼 (JSONB에서 자동 생성, 반드시 이 컬럼 사용):**
+    - attr_age: FLOAT - 정확한 나이 (예: 6.88, 16.61, 45.8)
+    - attr_location: INTEGER - 화면상 위치 (1=왼쪽, 2=가운데, 3=오른쪽)
+    - attr_area_of_interest: INTEGER - 관심 영역 (1=왼쪽, 2=가운데, 3=오른쪽)
+    - attr_obj_id: INTEGER - 객체 추적 ID
+    - attr_action_detected: TEXT - 감지된 행동
+    - (attributes->>'age')::float 같은 JSON 캐스팅은 인덱스를 사용하지 못해 전체 스캔이 됩니다.
+    
+    **인덱스 컬럼이 없는 attributes 키 (JSON 쿼리):**
+    - 장면 분석: attributes->>'scene_analysis'
+    - 성별 신뢰도: (attributes->>'gender_score')::float
+    
+    중요사항:
+    1. timestamp는 FLOAT 타입이며 초(seconds) 단위입니다.
+    2. 테이블명은 반드시 db_video, db_event를 사용하세요.
+    3. JOIN 시 db_event.video_id = db_video.video_id를 사용하세요.
+    4. 시간 관련 질문은 timestamp 컬럼을 사용하세요.
+    5. 위치 정보 (bbox): bbox_x, bbox_y, bbox_width, bbox_height 사용
+    6. 성별 검색: gender 컬럼 사용 (male/female)
+    7. 행동 검색: action 컬럼 사용
+    8. **정확한 나이 검색**: attr_age 컬럼 사용
+       - "20세 이상" → WHERE attr_age >= 20
+       - "10대" → WHERE attr_age >= 10 AND attr_age < 20
+       - "30세 남성" → WHERE attr_age >= 30 AND attr_age < 31 AND gender = 'male'
+    9. **화면 위치 검색**: attr_location 컬럼 사용
+       - "왼쪽" → WHERE attr_location = 1
+       - "가운데" → WHERE attr_location = 2
+       - "오른쪽" → WHERE attr_location = 3
+    10. **관심 영역 검색**: attr_area_of_interest 컬럼 사용
+       - "관심 영역이 왼쪽" → WHERE attr_area_of_interest = 1
+       - "관심 영역이 오른쪽" → WHERE attr_area_of_interest = 3
+    11. 나이대 검색 (대략적): age_group 컬럼 사용 (young/middle/old)
+    12. **물건/객체 검색**: 전용 컬럼이 없으므로 searchable_text 또는 keywords 사용
+       - "칼을 든 사람" → WHERE searchable_text ILIKE '%knife%' OR 'knife' = ANY(keywords)
+    13. **attributes 관련 컬럼 정리**:
+       - attr_age: FLOAT - 정확한 나이
+       - attr_location: INTEGER - 화면 위치 (1=왼쪽, 2=가운데, 3=오른쪽)
+       - attr_area_of_interest: INTEGER - 관심 영역 (1=왼쪽, 2=가운데, 3=오른쪽)
+       - attr_action_detected: TEXT - 감지된 행동
+       - attr_obj_id: INTEGER - 객체 추적 ID
+       - gender_score: (attributes->>'gender_score')::float - 성별 신뢰도 (0-1)
+       - scene_analysis: attributes->>'scene_analysis' - 장면 분석 텍스트
+       - orientataion: attributes->>'orientataion' - 방향 정보
+    
+    **인덱스 컬럼 쿼리 예시**:
+    - 나이: WHERE attr_age BETWEEN 20 AND 30
+    - 위치: WHERE attr_location = 1
+    - 객체 ID: WHERE attr_obj_id = 5
+    
+    14. **실제 시각 기준 조회 (중요)**:
+        - 사용자 질문에 '오후 2시', '어제', '오늘 아침' 등 실제 시각이 포함되면:
+        - db_video.recorded_at (촬영 시작 시각) + (db_event.timestamp * INTERVAL '1 second')로 계산
+        - 예: "어제 오후 2시" → WHERE db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') 
+          BETWEEN '2026-01-07 14:00:00' AND '2026-01-07 15:00:00'
+        - 현재 시각: 사용자 질문 위의 '현재 시각' 값을 기준으로 하세요
+    
+    15. **집계 및 통계 쿼리**:
+        - "몇 번?" → COUNT(*) 사용
+        - "가장 많이?" → GROUP BY ... ORDER BY COUNT(*) DESC LIMIT 1
+        - "평균 나이" → AVG(attr_age)
+        - "시간대별 분포" → EXTRACT(HOUR FROM recorded_at + (timestamp * INTERVAL '1 second'))
+        - 예: "남성이 몇 번 나타났어?" → SELECT COUNT(*) FROM db_event WHERE gender='male'
+        - 예: "가장 많이 온 시간대는?" → SELECT EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second')) as hour, COUNT(*) FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id GROUP BY hour ORDER BY COUNT(*) DESC LIMIT 1
+    
+    **중요**: hour는 DB의 실제 칼럼이 아닙니다! 
+    - hour는 EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second'))로 계산된 값입니다
+    - SELECT 절에서 "as hour"로 별칭을 지정하면 사용 가능합니다
+    - WHERE 절에서 hour를 사용하려면 전체 EXTRACT 함수를 사용해야 합니다
+    - GROUP BY나 ORDER BY에서는 별칭 hour를 사용할 수 있습니다
+    
+    16. **중복 제거**:
+        - 동일 인물이 여러 프레임에 나올 수 있으므로 필요시 DISTINCT 사용
+        - 예: "몇 명의 남성?" → SELECT COUNT(DISTINCT attr_obj_id) WHERE gender='male'
+    
+    17. **event_type 전체 목록 (무인 점포 특화)**:
+        - theft: 도난 (물건을 몰래 가져가는 행위)
+        - collapse: 쓰러짐 (사람이 바닥에 쓰러진 상태)
+        - sitting: 점거 (오래 앉아있거나 공간 점거)
+        - loitering: 배회 (의심스럽게 배회하는 행동)
+        - intrusion: 침입 (허가되지 않은 영역 진입)
+        - fighting: 싸움/폭력/폭행 (신체적 충돌)
+        - vandalism: 기물 파손
+        - person_enter: 사람 진입
+        - person_exit: 사람 퇴장
+        - interaction: 상호작용 (물건 집기, 대화 등)
+        - anomaly: 일반적 이상 행동
+        - walking: 걷기
+        - standing: 서있기
+        - picking: 물건 집기
+        - **사용자 질문의 의도를 파악하여 가장 적합한 event_type으로 매핑하세요**
+        - 예: "싸움" → event_type='fighting', "물건 훔침" → event_type='theft'
+    
+    18. **검색 성능**:
+        - attr_* 컬럼은 (video_id, 컬럼) B-tree 인덱스가 있으므로 JSON 캐스팅 대신 항상 사용
+        - 범위 조건은 컬럼을 가공하지 말고 그대로 비교 (예: attr_age >= 20, FLOOR(attr_age) = 20 금지)
+    """
+
+    # Text2SQL 프롬프트
+    static_prompt = f"""당신은 PostgreSQL 전문가입니다. 아래 스키마와 규칙에 따라 마지막에 주어지는 사용자 질문을 SQL 쿼리로 변환하세요.
+
+{schema_info}
+
+요구사항:
+1. PostgreSQL 문법을 사용하세요.
+2. 반드시 실행 가능한 SQL만 생성하세요.
+3. SELECT 문만 생성하세요 (INSERT, UPDATE, DELETE 금지).
+4. 사용자 질문에 맞는 컬럼들을 선택하세요:
+   - 시간 정보: timestamp, duration
+   - 인물 정보: gender, age_group, emotion, attr_age
+   - 행동 정보: action, event_type, interaction_target, attr_action_detected
+   - 위치 정보: bbox_x, bbox_y, bbox_width, bbox_height
+   - 화면 위치: attr_location, attr_area_of_interest
+   - 신뢰도: confidence, (attributes->>'gender_score')::float
+   - 기타: attr_obj_id, attributes->>'scene_analysis', attributes->>'orientataion'
+5. 반드시 id와 timestamp는 포함하세요 (이벤트 조회용).
+6. 시간 범위 질문의 경우 timestamp 컬럼으로 필터링하세요.
+7. 이벤트 타입 관련 질문은 event_type 컬럼을 사용하세요.
+8. 결과는 timestamp 순으로 정렬하세요 (ORDER BY timestamp).
+9. **나이 관련 질문은 반드시 attr_age 사용** (age_group은 대략적)
+10. **화면 위치 질문은 attr_location 사용** (1=왼쪽, 2=가운데, 3=오른쪽)
+11. **관심 영역 질문은 attr_area_of_interest 사용**
+12. **attr_* 컬럼이 없는 attributes 키만 ->> 연산자로 접근**하고 필요시 ::타입으로 캐스팅하세요
+
+예시 (정확한 나이):
+- "20세 남성" → SELECT id, timestamp, gender, attr_age as age WHERE gender='male' AND attr_age >= 20 AND attr_age < 21
+- "30세 이상 남성" → SELECT id, timestamp, gender, attr_age as age WHERE gender='male' AND attr_age >= 30
+- "10대 여성" → SELECT id, timestamp, gender, attr_age as age WHERE gender='female' AND attr_age >= 10 AND attr_age < 20
+- "남성의 나이는?" → SELECT id, timestamp, gender, attr_age as age WHERE gender='male'
+
+예시 (위치):
+- "왼쪽에 있던 시간" → SELECT id, timestamp, attr_location as location WHERE attr_location = 1
+- "오른쪽 관심 영역" → SELECT id, timestamp, attr_area_of_interest as area WHERE attr_area_of_interest = 3
+- "가운데 남성" → SELECT id, timestamp, gender, attr_location as location WHERE gender='male' AND attr_location = 2
+
+예시 (행동 및 기타):
+- "감지된 행동은?" → SELECT id, timestamp, attr_action_detected as action_detected
+- "객체 ID가 5인 경우" → SELECT id, timestamp, attr_obj_id as obj_id WHERE attr_obj_id = 5
+- "성별 신뢰도 높은 이벤트" → SELECT id, timestamp, gender, (attributes->>'gender_score')::float as gender_score WHERE (attributes->>'gender_score')::float > 0.9
+
+예시 (일반):
+- "남성이 나타난 시점" → SELECT id, timestamp, gender WHERE gender='male'
+- "6초에 인물의 성별과 위치" → SELECT id, timestamp, gender, bbox_x, bbox_y WHERE timestamp=6
+- "도난 사건" → SELECT id, timestamp, event_type, action WHERE event_type='theft'
+
+예시 (실제 시각):
+- "어제 오후 2시에 무슨 일이?" → SELECT id, timestamp, event_type FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') BETWEEN '2026-01-07 14:00:00' AND '2026-01-07 15:00:00'
+- "오늘 아침 남성" → SELECT id, timestamp, gender FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE gender='male' AND EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second')) BETWEEN 6 AND 12
+
+예시 (집계):
+- "남성이 몇 번 나타났어?" → SELECT COUNT(*) as count FROM db_event WHERE gender='male'
+- "20대 여성이 물건을 집어간 기록" → SELECT id, timestamp, gender, attr_age as age, action FROM db_event WHERE gender='female' AND attr_age >= 20 AND attr_age < 30 AND (action ILIKE '%pick%' OR event_type='picking')
+- "최근 1시간 동안 이상 행동(신뢰도 0.8 이상)" → SELECT id, timestamp, event_type, confidence FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE event_type IN ('anomaly', 'theft', 'intrusion') AND confidence >= 0.8 AND db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') >= NOW() - INTERVAL '1 hour'
+- "가장 많이 감지된 나이대는?" → SELECT CASE WHEN attr_age < 20 THEN '10대' WHEN attr_age < 30 THEN '20대' WHEN attr_age < 40 THEN '30대' ELSE '40대 이상' END as age_range, COUNT(*) as count FROM db_event WHERE attr_age IS NOT NULL GROUP BY age_range ORDER BY count DESC LIMIT 1
+
+예시 (복합 조건):
+- "왼쪽에 있던 남성 중 30세 이상" → SELECT id, timestamp, gender, attr_age as age, attr_location as location WHERE gender='male' AND attr_age >= 30 AND attr_location = 1
+- "칼을 든 사람이 있었나?" → SELECT id, timestamp, event_type, searchable_text FROM db_event WHERE searchable_text ILIKE '%knife%' OR searchable_text ILIKE '%칼%' OR 'knife' = ANY(keywords)
+
+응답 형식 (JSON):
+{{
+    "sql": "실행 가능한 SQL 쿼리",
+    "explanation": "쿼리 설명",
+    "selected_fields": ["id", "timestamp", "gender", ...] // 선택한 컬럼 목록
+}}
+
+JSON 형식으로만 응답하세요."""
+
+    return static_prompt
+
+
+_text2sql_static_prompt = None
+
+
+def get_text2sql_static_prompt() -> Tuple[str, str]:
+    """
+    프로세스당 1회 생성한 Text2SQL 정적 프롬프트와 버전 해시 반환
+
+    Returns:
+        (정적 프롬프트, 버전 해시 12자리)
+    """
+    global _text2sql_static_prompt
+
+    if _text2sql_static_prompt is None:
+        static_prompt = build_text2sql_static_prompt()
+        version = hashlib.sha256(static_prompt.encode("utf-8")).hexdigest()[:12]
+        _text2sql_static_prompt = (static_prompt, version)
+        logger.info(
+            f"📐 Text2SQL 정적 프롬프트 생성: version={version}, {len(static_prompt)}자"
+        )
+
+    return _text2sql_static_prompt
+
+
 class BedrockService:
     """AWS Bedrock을 활용한 AI 서비스"""
 
@@ -112,7 +376,16 @@ class BedrockService:
         aws_secret_key = getattr(settings, "AWS_SECRET_ACCESS_KEY", None)
 
         # Bedrock Runtime 클라이언트 생성
-        client_kwargs = {"service_name": "bedrock-runtime", "region_name": self.region}
+        # (임베딩 일괄 처리 스레드 풀이 커넥션 풀을 공유하므로 풀 크기를 워커 수 이상으로)
+        client_kwargs = {
+            "service_name": "bedrock-runtime",
+            "region_name": self.region,
+            "config": Config(
+                max_pool_connections=max(
+                    10, getattr(settings, "EMBEDDING_BACKFILL_WORKERS", 8) * 2
+                )
+            ),
+        }
 
         # 로컬 개발 환경에서만 명시적 자격증명 사용
         if aws_access_key and aws_secret_key:
@@ -136,12 +409,28 @@ class BedrockService:
 
         self.bedrock_agent = boto3.client(**agent_kwargs)
 
+        # Bedrock 프롬프트 캐싱 (cache_control이 거부되면 일정 시간 끄고 다시 시도)
+        self.prompt_cache_enabled = getattr(
+            settings, "BEDROCK_PROMPT_CACHE_ENABLED", True
+        )
+        self.prompt_cache_retry_seconds = getattr(
+            settings, "BEDROCK_PROMPT_CACHE_RETRY_SECONDS", 3600
+        )
+        self._prompt_cache_disabled_until = 0.0
+
+        # Text2SQL 정적 프롬프트 미리 생성 (프로세스당 1회)
+        get_text2sql_static_prompt()
+
         logger.info(
             f"✅ Bedrock 서비스 초기화: region={self.region}, model={self.model_id}"
         )
 
     def _invoke_claude(
-        self, prompt: str, system_prompt: str = None, max_tokens: int = 2000
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        max_tokens: int = 2000,
+        cached_prefix: Optional[str] = None,
     ) -> str:
         """
         Claude 모델 호출
@@ -150,34 +439,60 @@ class BedrockService:
             prompt: 사용자 프롬프트
             system_prompt: 시스템 프롬프트 (선택사항)
             max_tokens: 최대 토큰 수
+            cached_prefix: 요청마다 동일한 프롬프트 앞부분 (프롬프트 캐싱 대상)
 
         Returns:
             Claude의 응답 텍스트
         """
         try:
-            # Claude 3 요청 바디 구성
-            messages = [{"role": "user", "content": prompt}]
-
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "messages": messages,
-                "temperature": 0.1,
-                "top_p": 0.9,
-            }
-
-            # 시스템 프롬프트가 있으면 추가
-            if system_prompt:
-                body["system"] = system_prompt
+            use_cache = bool(cached_prefix) and self._prompt_cache_available()
+            body = self._build_claude_body(
+                prompt, system_prompt, max_tokens, cached_prefix, use_cache
+            )
 
             # Bedrock API 호출
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id, body=json.dumps(body)
-            )
+            try:
+                response = self.bedrock_runtime.invoke_model(
+                    modelId=self.model_id, body=json.dumps(body)
+                )
+            except Exception as e:
+                error_code = (
+                    e.response.get("Error", {}).get("Code")
+                    if hasattr(e, "response")
+                    else None
+                )
+                if (
+                    not use_cache
+                    or error_code != "ValidationException"
+                    or "cache_control" not in str(e)
+                ):
+                    raise
+
+                # cache_control 거부 (미지원 모델 등) → 일정 시간 캐싱 끄고 1회 재시도
+                logger.warning(
+                    f"⚠️ 프롬프트 캐싱 {self.prompt_cache_retry_seconds}초간 비활성화: {str(e)}"
+                )
+                self._prompt_cache_disabled_until = (
+                    time.monotonic() + self.prompt_cache_retry_seconds
+                )
+                body = self._build_claude_body(
+                    prompt, system_prompt, max_tokens, cached_prefix, False
+                )
+                response = self.bedrock_runtime.invoke_model(
+                    modelId=self.model_id, body=json.dumps(body)
+                )
 
             # 응답 파싱
             response_body = json.loads(response["body"].read())
 
+            if use_cache:
+                usage = response_body.get("usage", {})
+                logger.info(
+                    f"🗃️ 프롬프트 캐시: read={usage.get('cache_read_input_tokens', 0)}, "
+                    f"write={usage.get('cache_creation_input_tokens', 0)}, "
+                    f"input={usage.get('input_tokens', 0)}"
+                )
+
             # Claude 3 응답 구조: content[0].text
             if "content" in response_body and len(response_body["content"]) > 0:
                 return response_body["content"][0]["text"]
@@ -188,6 +503,83 @@ class BedrockService:
             logger.error(f"❌ Claude 호출 오류: {str(e)}")
             raise
 
+    def _invoke_claude_stream(
+        self, prompt: str, system_prompt: str = None, max_tokens: int = 2000
+    ) -> Iterator[str]:
+        """
+        Claude 모델 스트리밍 호출 (invoke_model_with_response_stream)
+
+        Args:
+            prompt: 사용자 프롬프트
+            system_prompt: 시스템 프롬프트 (선택사항)
+            max_tokens: 최대 토큰 수
+
+        Yields:
+            Claude 응답 텍스트 조각 (생성되는 즉시)
+        """
+        body = self._build_claude_body(prompt, system_prompt, max_tokens)
+
+        try:
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                modelId=self.model_id, body=json.dumps(body)
+            )
+        except Exception as e:
+            logger.error(f"❌ Claude 스트리밍 호출 오류: {str(e)}")
+            raise
+
+        yield from iter_claude_stream_text(response)
+
+    def _prompt_cache_available(self) -> bool:
+        """프롬프트 캐싱 사용 가능 여부 (설정 on + cache_control 거부 후 대기 시간 경과)"""
+        return (
+            self.prompt_cache_enabled
+            and time.monotonic() >= self._prompt_cache_disabled_until
+        )
+
+    @staticmethod
+    def _build_claude_body(
+        prompt: str,
+        system_prompt: str = None,
+        max_tokens: int = 2000,
+        cached_prefix: Optional[str] = None,
+        use_cache: bool = False,
+    ) -> Dict:
+        """
+        Claude 3 요청 바디 구성
+
+        cached_prefix가 있으면 사용자 메시지 앞에 붙이고, use_cache면
+        cache_control 체크포인트를 달아 Bedrock이 prefix를 재사용하게 한다.
+        """
+        if cached_prefix and use_cache:
+            content = [
+                {
+                    "type": "text",
+                    "text": cached_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": prompt},
+            ]
+        elif cached_prefix:
+            content = f"{cached_prefix}\n\n{prompt}"
+        else:
+            content = prompt
+
+        messages = [{"role": "user", "content": content}]
+
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": messages,
+            "temperature": 0.1,
+            "top_p": 0.9,
+        }
+
+        # 시스템 프롬프트가 있으면 추가
+        if system_prompt:
+            body["system"] = system_prompt
+
+        return body
+
     def text_to_sql(
         self, prompt: str, video_id: Optional[int] = None
     ) -> Dict[str, any]:
@@ -205,212 +597,28 @@ class BedrockService:
                 "error": "에러 메시지 (있을 경우)"
             }
         """
-        # 동적으로 Event 모델에서 스키마 생성
-        event_fields = get_event_schema()
-
-        # 데이터베이스 스키마 정보
-        schema_info = f"""
-        데이터베이스 스키마:
-        
-        테이블: db_video (비디오 정보)
-        - video_id: INTEGER (Primary Key)
-        - name: VARCHAR(255) - 비디오 이름
-        - filename: VARCHAR(255) - 파일명
-        - duration: FLOAT - 비디오 길이(초)
-        - recorded_at: TIMESTAMP - 촬영 시각
-        - created_at: TIMESTAMP - 생성 시각
-        
-        테이블: db_event (이벤트 정보)
-{event_fields}
-        
-        **중요 - attributes JSON 필드 구조 (JSONB 타입):**
-        db_event.attributes에는 다음 정보가 저장되어 있습니다:
-        - age: FLOAT - 정확한 나이 (예: 6.88, 16.61, 45.8)
-        - obj_id: INTEGER - 객체 추적 ID
-        - scene_analysis: TEXT - AI 장면 분석 텍스트
-        - location: INTEGER - 화면상 위치 (1=왼쪽, 2=가운데, 3=오른쪽)
-        - area_of_interest: INTEGER - 관심 영역 (1=왼쪽, 2=가운데, 3=오른쪽)
-        
-        **PostgreSQL JSON 쿼리 방법:**
-        - 정확한 나이: (attributes->>'age')::float
-        - 위치: (attributes->>'location')::int
-        - 관심 영역: (attributes->>'area_of_interest')::int
-        - 장면 분석: attributes->>'scene_analysis'
-        
-        중요사항:
-        1. timestamp는 FLOAT 타입이며 초(seconds) 단위입니다.
-        2. 테이블명은 반드시 db_video, db_event를 사용하세요.
-        3. JOIN 시 db_event.video_id = db_video.video_id를 사용하세요.
-        4. 시간 관련 질문은 timestamp 컬럼을 사용하세요.
-        5. 위치 정보 (bbox): bbox_x, bbox_y, bbox_width, bbox_height 사용
-        6. 성별 검색: gender 컬럼 사용 (male/female)
-        7. 행동 검색: action 컬럼 사용
-        8. **정확한 나이 검색**: (attributes->>'age')::float 사용
-           - "20세 이상" → WHERE (attributes->>'age')::float >= 20
-           - "10대" → WHERE (attributes->>'age')::float BETWEEN 10 AND 19
-           - "30세 남성" → WHERE (attributes->>'age')::float >= 30 AND gender = 'male'
-        9. **화면 위치 검색**: (attributes->>'location')::int 사용
-           - "왼쪽" → WHERE (attributes->>'location')::int = 1
-           - "가운데" → WHERE (attributes->>'location')::int = 2
-           - "오른쪽" → WHERE (attributes->>'location')::int = 3
-        10. **관심 영역 검색**: (attributes->>'area_of_interest')::int 사용
-           - "관심 영역이 왼쪽" → WHERE (attributes->>'area_of_interest')::int = 1
-           - "관심 영역이 오른쪽" → WHERE (attributes->>'area_of_interest')::int = 3
-        11. 나이대 검색 (대략적): age_group 컬럼 사용 (young/middle/old)
-        12. **objects_detected JSONB 필드 검색**:
-           - "칼을 든 사람" → WHERE objects_detected::text LIKE '%칼%'
-           - "담배 피우는 사람" → WHERE objects_detected::text LIKE '%담배%'
-        13. **attributes JSON 필드의 하위 필드들**:
-           - age: (attributes->>'age')::float - 정확한 나이
-           - location: (attributes->>'location')::int - 화면 위치 (1=왼쪽, 2=가운데, 3=오른쪽)
-           - area_of_interest: (attributes->>'area_of_interest')::int - 관심 영역 (1=왼쪽, 2=가운데, 3=오른쪽)
-           - action_detected: attributes->>'action_detected' - 감지된 행동
-           - gender_score: (attributes->>'gender_score')::float - 성별 신뢰도 (0-1)
-           - obj_id: (attributes->>'obj_id')::int - 객체 추적 ID
-           - scene_analysis: attributes->>'scene_analysis' - 장면 분석 텍스트
-           - orientataion: attributes->>'orientataion' - 방향 정보
-        
-        **JSONB 쿼리 예시**:
-        - 나이: WHERE (attributes->>'age')::float BETWEEN 20 AND 30
-        - 객체 (정확 매칭): WHERE objects_detected::jsonb ? '칼'
-        - 객체 (부분 매칭): WHERE objects_detected::text ILIKE '%칼%'
-        - 위치: WHERE (attributes->>'location')::int = 1
-        
-        14. **실제 시각 기준 조회 (중요)**:
-            - 사용자 질문에 '오후 2시', '어제', '오늘 아침' 등 실제 시각이 포함되면:
-            - db_video.recorded_at (촬영 시작 시각) + (db_event.timestamp * INTERVAL '1 second')로 계산
-            - 예: "어제 오후 2시" → WHERE db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') 
-              BETWEEN '2026-01-07 14:00:00' AND '2026-01-07 15:00:00'
-            - 현재 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        
-        15. **집계 및 통계 쿼리**:
-            - "몇 번?" → COUNT(*) 사용
-            - "가장 많이?" → GROUP BY ... ORDER BY COUNT(*) DESC LIMIT 1
-            - "평균 나이" → AVG((attributes->>'age')::float)
-            - "시간대별 분포" → EXTRACT(HOUR FROM recorded_at + (timestamp * INTERVAL '1 second'))
-            - 예: "남성이 몇 번 나타났어?" → SELECT COUNT(*) FROM db_event WHERE gender='male'
-            - 예: "가장 많이 온 시간대는?" → SELECT EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second')) as hour, COUNT(*) FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id GROUP BY hour ORDER BY COUNT(*) DESC LIMIT 1
-        
-        **중요**: hour는 DB의 실제 칼럼이 아닙니다! 
-        - hour는 EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second'))로 계산된 값입니다
-        - SELECT 절에서 "as hour"로 별칭을 지정하면 사용 가능합니다
-        - WHERE 절에서 hour를 사용하려면 전체 EXTRACT 함수를 사용해야 합니다
-        - GROUP BY나 ORDER BY에서는 별칭 hour를 사용할 수 있습니다
-        
-        16. **중복 제거**:
-            - 동일 인물이 여러 프레임에 나올 수 있으므로 필요시 DISTINCT 사용
-            - 예: "몇 명의 남성?" → SELECT COUNT(DISTINCT (attributes->>'obj_id')::int) WHERE gender='male'
-        
-        17. **event_type 전체 목록 (무인 점포 특화)**:
-            - theft: 도난 (물건을 몰래 가져가는 행위)
-            - collapse: 쓰러짐 (사람이 바닥에 쓰러진 상태)
-            - sitting: 점거 (오래 앉아있거나 공간 점거)
-            - loitering: 배회 (의심스럽게 배회하는 행동)
-            - intrusion: 침입 (허가되지 않은 영역 진입)
-            - fighting: 싸움/폭력/폭행 (신체적 충돌)
-            - vandalism: 기물 파손
-            - person_enter: 사람 진입
-            - person_exit: 사람 퇴장
-            - interaction: 상호작용 (물건 집기, 대화 등)
-            - anomaly: 일반적 이상 행동
-            - walking: 걷기
-            - standing: 서있기
-            - picking: 물건 집기
-            - **사용자 질문의 의도를 파악하여 가장 적합한 event_type으로 매핑하세요**
-            - 예: "싸움" → event_type='fighting', "물건 훔침" → event_type='theft'
-        
-        18. **JSONB 검색 최적화**:
-            - 정확 매칭(성능 우선): objects_detected::jsonb ? '칼'
-            - 부분 매칭(유연성 우선): objects_detected::text ILIKE '%칼%' (대소문자 무시)
-            - 예: "칼 든 사람" → WHERE objects_detected::jsonb ? '칼' OR objects_detected::text ILIKE '%knife%'
-        """
+        static_prompt, prompt_version = get_text2sql_static_prompt()
+
+        # 요청별 동적 부분 (정적 prefix 뒤에 붙여 캐시 재사용)
+        question_prompt = f"현재 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
         # 비디오 필터 조건
-        video_filter = ""
         if video_id:
-            video_filter = (
+            question_prompt += (
                 f"\n\n특정 비디오 필터: video_id = {video_id} 조건을 반드시 포함하세요."
             )
 
-        # Text2SQL 프롬프트
-        text2sql_prompt = f"""당신은 PostgreSQL 전문가입니다. 다음 사용자 질문을 SQL 쿼리로 변환하세요.
-
-{schema_info}
-{video_filter}
-
-사용자 질문: "{prompt}"
-
-요구사항:
-1. PostgreSQL 문법을 사용하세요.
-2. 반드시 실행 가능한 SQL만 생성하세요.
-3. SELECT 문만 생성하세요 (INSERT, UPDATE, DELETE 금지).
-4. 사용자 질문에 맞는 컬럼들을 선택하세요:
-   - 시간 정보: timestamp, duration
-   - 인물 정보: gender, age_group, emotion, (attributes->>'age')::float
-   - 행동 정보: action, event_type, interaction_target, attributes->>'action_detected'
-   - 위치 정보: bbox_x, bbox_y, bbox_width, bbox_height
-   - 화면 위치: (attributes->>'location')::int, (attributes->>'area_of_interest')::int
-   - 신뢰도: confidence, (attributes->>'gender_score')::float
-   - 기타: (attributes->>'obj_id')::int, attributes->>'scene_analysis', attributes->>'orientataion'
-5. 반드시 id와 timestamp는 포함하세요 (이벤트 조회용).
-6. 시간 범위 질문의 경우 timestamp 컬럼으로 필터링하세요.
-7. 이벤트 타입 관련 질문은 event_type 컬럼을 사용하세요.
-8. 결과는 timestamp 순으로 정렬하세요 (ORDER BY timestamp).
-9. **나이 관련 질문은 반드시 (attributes->>'age')::float 사용** (age_group은 대략적)
-10. **화면 위치 질문은 (attributes->>'location')::int 사용** (1=왼쪽, 2=가운데, 3=오른쪽)
-11. **관심 영역 질문은 (attributes->>'area_of_interest')::int 사용**
-12. **attributes JSON 필드는 ->> 연산자로 접근**하고 필요시 ::타입으로 캐스팅하세요
-
-예시 (정확한 나이):
-- "20세 남성" → SELECT id, timestamp, gender, (attributes->>'age')::float as age WHERE gender='male' AND (attributes->>'age')::float >= 20 AND (attributes->>'age')::float < 21
-- "30세 이상 남성" → SELECT id, timestamp, gender, (attributes->>'age')::float as age WHERE gender='male' AND (attributes->>'age')::float >= 30
-- "10대 여성" → SELECT id, timestamp, gender, (attributes->>'age')::float as age WHERE gender='female' AND (attributes->>'age')::float BETWEEN 10 AND 19
-- "남성의 나이는?" → SELECT id, timestamp, gender, (attributes->>'age')::float as age WHERE gender='male'
-
-예시 (위치):
-- "왼쪽에 있던 시간" → SELECT id, timestamp, (attributes->>'location')::int as location WHERE (attributes->>'location')::int = 1
-- "오른쪽 관심 영역" → SELECT id, timestamp, (attributes->>'area_of_interest')::int as area WHERE (attributes->>'area_of_interest')::int = 3
-- "가운데 남성" → SELECT id, timestamp, gender, (attributes->>'location')::int as location WHERE gender='male' AND (attributes->>'location')::int = 2
-
-예시 (행동 및 기타):
-- "감지된 행동은?" → SELECT id, timestamp, attributes->>'action_detected' as action_detected
-- "객체 ID가 5인 경우" → SELECT id, timestamp, (attributes->>'obj_id')::int as obj_id WHERE (attributes->>'obj_id')::int = 5
-- "성별 신뢰도 높은 이벤트" → SELECT id, timestamp, gender, (attributes->>'gender_score')::float as gender_score WHERE (attributes->>'gender_score')::float > 0.9
-
-예시 (일반):
-- "남성이 나타난 시점" → SELECT id, timestamp, gender WHERE gender='male'
-- "6초에 인물의 성별과 위치" → SELECT id, timestamp, gender, bbox_x, bbox_y WHERE timestamp=6
-- "도난 사건" → SELECT id, timestamp, event_type, action WHERE event_type='theft'
-
-예시 (실제 시각):
-- "어제 오후 2시에 무슨 일이?" → SELECT id, timestamp, event_type FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') BETWEEN '2026-01-07 14:00:00' AND '2026-01-07 15:00:00'
-- "오늘 아침 남성" → SELECT id, timestamp, gender FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE gender='male' AND EXTRACT(HOUR FROM db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second')) BETWEEN 6 AND 12
-
-예시 (집계):
-- "남성이 몇 번 나타났어?" → SELECT COUNT(*) as count FROM db_event WHERE gender='male'
-- "20대 여성이 물건을 집어간 기록" → SELECT id, timestamp, gender, (attributes->>'age')::float as age, action FROM db_event WHERE gender='female' AND (attributes->>'age')::float BETWEEN 20 AND 29 AND (action ILIKE '%pick%' OR event_type='picking')
-- "최근 1시간 동안 이상 행동(신뢰도 0.8 이상)" → SELECT id, timestamp, event_type, confidence FROM db_event JOIN db_video ON db_event.video_id = db_video.video_id WHERE event_type IN ('anomaly', 'theft', 'intrusion') AND confidence >= 0.8 AND db_video.recorded_at + (db_event.timestamp * INTERVAL '1 second') >= NOW() - INTERVAL '1 hour'
-- "가장 많이 감지된 나이대는?" → SELECT CASE WHEN (attributes->>'age')::float < 20 THEN '10대' WHEN (attributes->>'age')::float < 30 THEN '20대' WHEN (attributes->>'age')::float < 40 THEN '30대' ELSE '40대 이상' END as age_range, COUNT(*) as count FROM db_event WHERE (attributes->>'age')::float IS NOT NULL GROUP BY age_range ORDER BY count DESC LIMIT 1
-
-예시 (복합 조건):
-- "왼쪽에 있던 남성 중 30세 이상" → SELECT id, timestamp, gender, (attributes->>'age')::float as age, (attributes->>'location')::int as location WHERE gender='male' AND (attributes->>'age')::float >= 30 AND (attributes->>'location')::int = 1
-- "칼을 든 사람이 있었나?" → SELECT id, timestamp, event_type, objects_detected FROM db_event WHERE objects_detected::jsonb ? '칼' OR objects_detected::text ILIKE '%knife%' OR objects_detected::text ILIKE '%칼%'
-
-응답 형식 (JSON):
-{{
-    "sql": "실행 가능한 SQL 쿼리",
-    "explanation": "쿼리 설명",
-    "selected_fields": ["id", "timestamp", "gender", ...] // 선택한 컬럼 목록
-}}
-
-JSON 형식으로만 응답하세요."""
+        question_prompt += (
+            f'\n\n사용자 질문: "{prompt}"\n\nJSON 형식으로만 응답하세요.'
+        )
 
         try:
             # Claude 호출
             response = self._invoke_claude(
-                prompt=text2sql_prompt,
+                prompt=question_prompt,
                 system_prompt="당신은 SQL 변환 전문가입니다. 항상 유효한 PostgreSQL 쿼리를 생성하세요.",
                 max_tokens=1500,
+                cached_prefix=static_prompt,
             )
 
             logger.info(f"🤖 Bedrock Text2SQL 응답: {response}")
@@ -438,6 +646,7 @@ JSON 형식으로만 응답하세요."""
                 "sql": sql,
                 "explanation": result.get("explanation", ""),
                 "error": None,
+                "prompt_version": prompt_version,
             }
 
         except json.JSONDecodeError as e:
@@ -469,6 +678,72 @@ JSON 형식으로만 응답하세요."""
         if not events:
             return "요청하신 조건에 해당하는 이벤트를 찾을 수 없습니다."
 
+        rag_prompt = self._build_timeline_prompt(prompt, events, video_name)
+
+        try:
+            response = self._invoke_claude(
+                prompt=rag_prompt,
+                system_prompt=TIMELINE_SYSTEM_PROMPT,
+                max_tokens=2000,
+            )
+
+            return response.strip()
+
+        except Exception as e:
+            logger.error(f"❌ RAG 응답 생성 오류: {str(e)}")
+            # 오류 시 기본 응답 생성
+            return self._generate_default_response(events)
+
+    def format_timeline_response_stream(
+        self, prompt: str, events: List[Dict], video_name: str = None
+    ) -> Iterator[str]:
+        """
+        format_timeline_response의 스트리밍 버전 (첫 토큰까지 대기 시간 단축)
+
+        Args:
+            prompt: 사용자의 원래 질문
+            events: 검색된 이벤트 리스트
+            video_name: 비디오 이름
+
+        Yields:
+            자연어 응답 텍스트 조각
+
+        Raises:
+            토큰을 일부 보낸 뒤 Bedrock 호출이 실패하면 예외를 그대로 전파
+            (잘린 응답이 완성된 답변으로 저장되지 않도록)
+        """
+        if not events:
+            yield "요청하신 조건에 해당하는 이벤트를 찾을 수 없습니다."
+            return
+
+        rag_prompt = self._build_timeline_prompt(prompt, events, video_name)
+        streamed_any = False
+
+        try:
+            for text in self._invoke_claude_stream(
+                prompt=rag_prompt,
+                system_prompt=TIMELINE_SYSTEM_PROMPT,
+                max_tokens=2000,
+            ):
+                # 선행 공백 제거 (비스트리밍 응답의 strip()과 동일한 결과)
+                if not streamed_any:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                streamed_any = True
+                yield text
+
+        except Exception as e:
+            logger.error(f"❌ RAG 스트리밍 응답 생성 오류: {str(e)}")
+            # 아직 아무것도 보내지 않았다면 기본 응답으로 대체, 이미 보냈다면 호출자에 전파
+            if streamed_any:
+                raise
+            yield self._generate_default_response(events)
+
+    def _build_timeline_prompt(
+        self, prompt: str, events: List[Dict], video_name: str = None
+    ) -> str:
+        """검색된 이벤트들로 RAG 프롬프트 구성"""
         # 이벤트 정보를 텍스트로 구성
         events_text = ""
         for i, event in enumerate(events, 1):
@@ -548,19 +823,7 @@ JSON 형식으로만 응답하세요."""
 
 답변:"""
 
-        try:
-            response = self._invoke_claude(
-                prompt=rag_prompt,
-                system_prompt="당신은 CCTV 영상 분석 결과를 설명하는 전문가입니다. 명확하고 정확한 정보를 제공하세요.",
-                max_tokens=2000,
-            )
-
-            return response.strip()
-
-        except Exception as e:
-            logger.error(f"❌ RAG 응답 생성 오류: {str(e)}")
-            # 오류 시 기본 응답 생성
-            return self._generate_default_response(events)
+        return rag_prompt
 
     def _generate_default_response(self, events: List[Dict]) -> str:
         """
@@ -633,12 +896,25 @@ JSON 형식으로만 응답하세요."""
             logger.error(f"❌ Knowledge Base 검색 오류: {str(e)}")
             return []
 
-    def generate_embedding(self, text: str) -> Optional[List[float]]:
+    def generate_embedding(
+        self,
+        text: str,
+        raise_on_throttle: bool = False,
+        use_cache: bool = True,
+        model_id: Optional[str] = None,
+        input_type: str = "search_document",
+    ) -> Optional[List[float]]:
         """
         Bedrock Titan Embeddings V2로 텍스트를 벡터로 변환
 
         Args:
             text: 임베딩할 텍스트
+            raise_on_throttle: 처리량 제한 시 None 대신 EmbeddingThrottled 발생
+                (일괄 처리기의 백오프용)
+            use_cache: 임베딩 캐시 사용 여부 (일괄 처리기는 캐시를 직접 관리)
+            model_id: 임베딩 모델 (기본: AWS_BEDROCK_EMBEDDING_MODEL_ID, 재임베딩 시 지정)
+            input_type: Cohere 입력 유형 - 저장 문서 "search_document", 검색 질의 "search_query"
+                (Titan은 구분 없음)
 
         Returns:
             1024차원 임베딩 벡터 (Titan v2 권장 차원)
@@ -648,10 +924,51 @@ JSON 형식으로만 응답하세요."""
             logger.warning("⚠️ 임베딩할 텍스트가 비어있습니다.")
             return None
 
+        model_id = model_id or settings.AWS_BEDROCK_EMBEDDING_MODEL_ID
+        if not use_cache:
+            return self._invoke_titan_embedding(
+                text, raise_on_throttle, model_id, input_type
+            )
+
+        from .embedding_cache import get_embedding_cache
+
+        # Cohere는 질의/문서 벡터가 다르므로 질의 벡터는 별도 캐시 키로 저장
+        cache_model_id = model_id
+        if model_id.startswith("cohere.") and input_type != "search_document":
+            cache_model_id = f"{model_id}#{input_type}"
+
+        return get_embedding_cache().get_or_create(
+            text,
+            cache_model_id,
+            1024,
+            lambda value: self._invoke_titan_embedding(
+                value, raise_on_throttle, model_id, input_type
+            ),
+        )
+
+    def _invoke_titan_embedding(
+        self,
+        text: str,
+        raise_on_throttle: bool = False,
+        model_id: Optional[str] = None,
+        input_type: str = "search_document",
+    ) -> Optional[List[float]]:
+        """
+        Bedrock Titan Embeddings V2 API 호출 (캐시 미적용)
+
+        Args:
+            text: 임베딩할 텍스트
+            raise_on_throttle: 처리량 제한 시 EmbeddingThrottled 발생
+            model_id: 임베딩 모델 (기본: AWS_BEDROCK_EMBEDDING_MODEL_ID)
+            input_type: Cohere 입력 유형 (search_document / search_query)
+
+        Returns:
+            1024차원 임베딩 벡터, 실패 시 None
+        """
         try:
             # Titan Embeddings V2 - 다중 차원(Matryoshka) 지원, 문맥 이해도 향상
             # 1024 dimensions (v2 권장 차원, 속도와 정확도 최적화)
-            embedding_model_id = settings.AWS_BEDROCK_EMBEDDING_MODEL_ID
+            embedding_model_id = model_id or settings.AWS_BEDROCK_EMBEDDING_MODEL_ID
 
             # 텍스트 길이 제한 (Titan v2: 8192 토큰)
             max_chars = 30000  # 안전 마진
@@ -659,14 +976,19 @@ JSON 형식으로만 응답하세요."""
                 text = text[:max_chars]
                 logger.warning(f"⚠️ 텍스트가 너무 길어 {max_chars}자로 자릅니다.")
 
-            # Bedrock Embeddings API 호출 (v2 형식)
-            body = json.dumps(
-                {
-                    "inputText": text,
-                    "dimensions": 1024,  # v2는 차원 지정 가능 (256, 512, 1024)
-                    "normalize": True,  # 정규화로 코사인 유사도 최적화
-                }
-            )
+            # Bedrock Embeddings API 호출 (v2 형식, Cohere 모델은 texts 배열)
+            if embedding_model_id.startswith("cohere."):
+                body = json.dumps(
+                    {"texts": [text], "input_type": input_type, "truncate": "END"}
+                )
+            else:
+                body = json.dumps(
+                    {
+                        "inputText": text,
+                        "dimensions": 1024,  # v2는 차원 지정 가능 (256, 512, 1024)
+                        "normalize": True,  # 정규화로 코사인 유사도 최적화
+                    }
+                )
 
             response = self.bedrock_runtime.invoke_model(
                 modelId=embedding_model_id,
@@ -680,6 +1002,8 @@ JSON 형식으로만 응답하세요."""
 
             # embedding 벡터 추출
             embedding = response_body.get("embedding")
+            if embedding is None and response_body.get("embeddings"):
+                embedding = response_body["embeddings"][0]
 
             if embedding and len(embedding) == 1024:
                 return embedding
@@ -689,6 +1013,14 @@ JSON 형식으로만 응답하세요."""
                 )
                 return None
 
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if raise_on_throttle and error_code in THROTTLING_ERROR_CODES:
+                raise EmbeddingThrottled(error_code) from e
+
+            logger.error(f"❌ Embedding 생성 오류: {str(e)}")
+            return None
+
         except Exception as e:
             logger.error(f"❌ Embedding 생성 오류: {str(e)}")
             import traceback
@@ -0,0 +1,484 @@
+"""
+Event embedding 일괄 생성(Backfill) 엔진
+- 제한된 크기의 스레드 풀로 Bedrock Titan 동시 호출
+- 토큰 버킷으로 초당 요청 수를 Bedrock 할당량 이하로 유지
+- Throttling 응답 시 속도 절반 감소 + 지수 백오프, 성공 시 점진적 복구 (AIMD)
+- 청크 단위 bulk_update (signal 미발동 → 이벤트마다 Bedrock 재호출 없음)
+- 콘텐츠 주소 저장소 (모델, 텍스트 해시): 같은 embedding 텍스트는 1회만 생성, 이벤트는 벡터 복사
+- 이벤트는 소속 비디오의 활성 embedding 버전(모델)으로 생성하고 버전을 함께 기록
+- ID 순 keyset 페이지네이션 → 마지막 처리 ID부터 재개 가능
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F
+
+from apps.db.models import Event, Video
+
+from .bedrock_service import EmbeddingThrottled
+from .embedding_version import (
+    EMBEDDING_DIMENSION,
+    event_embedding_text,
+    get_current_embedding_version,
+    get_video_embedding_versions,
+    parse_embedding_version,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷 + AIMD 속도 조절
+
+    - acquire(): 토큰이 생길 때까지 대기
+    - on_throttle(): 속도 절반 감소 (cooldown 내 중복 감소 방지)
+    - on_success(): max_rate까지 선형 증가
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: float = 1.0,
+        increase_step: Optional[float] = None,
+        decrease_cooldown: float = 1.0,
+    ):
+        """
+        Args:
+            rate: 초당 최대 요청 수 (할당량)
+            capacity: 버킷 크기 (순간 최대 요청 수, 기본: rate)
+            min_rate: 감소 시 하한
+            increase_step: 성공 1회당 증가량 (기본: max_rate / 100)
+            decrease_cooldown: 연속 감소 최소 간격 (초)
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1.0))
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.increase_step = increase_step or self.max_rate / 100
+        self.decrease_cooldown = decrease_cooldown
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰 획득 (부족하면 대기)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+
+            self._refill()
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate / 2)
+            # 버킷에 쌓인 토큰도 비워서 즉시 몰리는 요청 방지
+            self._tokens = min(self._tokens, 1.0)
+
+        logger.warning(f"🐢 Bedrock throttling → 요청 속도 {self.rate:.1f}/s로 감소")
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+
+@dataclass
+class BackfillProgress:
+    """일괄 생성 진행 상황 (last_id로 재개)"""
+
+    total: int = 0
+    processed: int = 0
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    unique_texts: int = 0  # 청크 내 중복 제거 후 텍스트 수 (저장소 적중 포함)
+    cache_hits: int = 0
+    api_calls: int = 0
+    throttled: int = 0
+    last_id: int = 0
+    rate: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> Dict:
+        data = asdict(self)
+        data["events_per_second"] = round(self.events_per_second, 2)
+        return data
+
+
+class EmbeddingBackfillService:
+    """동시성 + 속도 제한 Event embedding 일괄 생성기"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        chunk_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        """
+        Args:
+            workers: Bedrock 동시 호출 스레드 수
+            rate: 초당 최대 Bedrock 요청 수 (Titan 할당량에 맞춤)
+            chunk_size: 한 번에 조회/bulk_update할 이벤트 수
+            max_retries: throttling 시 텍스트당 최대 재시도 횟수
+        """
+        self.workers = (
+            workers
+            if workers is not None
+            else getattr(settings, "EMBEDDING_BACKFILL_WORKERS", 8)
+        )
+        self.rate = (
+            rate if rate is not None else getattr(settings, "EMBEDDING_BACKFILL_RATE", 50.0)
+        )
+        self.chunk_size = (
+            chunk_size
+            if chunk_size is not None
+            else getattr(settings, "EMBEDDING_BACKFILL_CHUNK_SIZE", 200)
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else getattr(settings, "EMBEDDING_BACKFILL_MAX_RETRIES", 5)
+        )
+        self.max_backoff = getattr(settings, "EMBEDDING_BACKFILL_MAX_BACKOFF", 30.0)
+        # 프로세스 내 backfill / 아웃박스 드레이너가 같은 Bedrock 할당량을 공유
+        self.limiter = TokenBucket(self.rate)
+
+    def backfill(
+        self,
+        video_id: Optional[int] = None,
+        force: bool = False,
+        limit: Optional[int] = None,
+        after_id: int = 0,
+        on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+    ) -> BackfillProgress:
+        """
+        Event embedding 일괄 생성
+
+        Args:
+            video_id: 특정 비디오만 처리 (선택)
+            force: 이미 embedding이 있는 이벤트도 재생성
+            limit: 처리할 최대 이벤트 수 (선택)
+            after_id: 이 ID 이후부터 처리 (이전 실행의 last_id로 재개)
+            on_progress: 청크 완료마다 호출 (체크포인트 저장/진행률 표시)
+
+        Returns:
+            BackfillProgress (last_id = 마지막으로 반영된 이벤트 ID)
+        """
+        from .bedrock_service import get_bedrock_service
+
+        queryset = Event.objects.all()
+        if video_id:
+            queryset = queryset.filter(video_id=video_id)
+        if not force:
+            queryset = queryset.filter(embedding__isnull=True)
+
+        progress = BackfillProgress(last_id=after_id or 0, rate=self.rate)
+        progress.total = queryset.filter(id__gt=progress.last_id).count()
+        if limit:
+            progress.total = min(progress.total, limit)
+        if progress.total == 0:
+            return progress
+
+        bedrock = get_bedrock_service()
+        limiter = self.limiter
+        started_at = time.monotonic()
+
+        logger.info(
+            f"🧠 Embedding backfill 시작: {progress.total}개 "
+            f"(workers={self.workers}, rate={self.rate}/s, after_id={progress.last_id})"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="embedding-backfill"
+        ) as pool:
+            while progress.processed < progress.total:
+                size = min(self.chunk_size, progress.total - progress.processed)
+                events = list(
+                    queryset.filter(id__gt=progress.last_id)
+                    .defer("embedding")
+                    .order_by("id")[:size]
+                )
+                if not events:
+                    break
+
+                self._process_chunk(events, bedrock, limiter, pool, progress)
+
+                progress.last_id = events[-1].id
+                progress.rate = limiter.rate
+                progress.elapsed_seconds = time.monotonic() - started_at
+                if on_progress:
+                    on_progress(progress)
+
+        progress.elapsed_seconds = time.monotonic() - started_at
+        logger.info(
+            f"✅ Embedding backfill 완료: 성공 {progress.success}, 실패 {progress.failed}, "
+            f"스킵 {progress.skipped}, API {progress.api_calls}회, "
+            f"{progress.events_per_second:.1f}개/s, last_id={progress.last_id}"
+        )
+        return progress
+
+    def embed_events(self, events: List[Event]) -> tuple:
+        """
+        주어진 이벤트들의 embedding 생성 + bulk_update (아웃박스 드레이너용)
+
+        Returns:
+            (embedding이 저장된 이벤트 ID 리스트, BackfillProgress)
+        """
+        from .bedrock_service import get_bedrock_service
+
+        progress = BackfillProgress(total=len(events), rate=self.limiter.rate)
+        if not events:
+            return [], progress
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="embedding-backfill"
+        ) as pool:
+            updated_ids = self._process_chunk(
+                events, get_bedrock_service(), self.limiter, pool, progress
+            )
+
+        progress.last_id = max(event.id for event in events)
+        progress.rate = self.limiter.rate
+        progress.elapsed_seconds = time.monotonic() - started_at
+        return updated_ids, progress
+
+    def embed_texts(
+        self, texts: List[str], model_id: str, dimension: int = EMBEDDING_DIMENSION
+    ) -> tuple:
+        """
+        텍스트 목록을 지정 모델로 embedding해 저장소에 고정(pinned) 저장 (재임베딩 준비용)
+
+        Returns:
+            ({텍스트: embedding}, BackfillProgress) - 실패한 텍스트는 제외
+        """
+        from .bedrock_service import get_bedrock_service
+
+        texts = list(dict.fromkeys(text for text in texts if text))
+        progress = BackfillProgress(total=len(texts), rate=self.limiter.rate)
+        if not texts:
+            return {}, progress
+
+        started_at = time.monotonic()
+        embeddings = {}
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="embedding-backfill"
+        ) as pool:
+            for offset in range(0, len(texts), self.chunk_size):
+                chunk = texts[offset : offset + self.chunk_size]
+                embeddings.update(
+                    self._embed_texts(
+                        chunk,
+                        model_id,
+                        dimension,
+                        get_bedrock_service(),
+                        self.limiter,
+                        pool,
+                        progress,
+                    )
+                )
+                progress.processed += len(chunk)
+
+        progress.success = len(embeddings)
+        progress.failed = len(texts) - len(embeddings)
+        progress.rate = self.limiter.rate
+        progress.elapsed_seconds = time.monotonic() - started_at
+        return embeddings, progress
+
+    def _process_chunk(
+        self,
+        events: List[Event],
+        bedrock,
+        limiter: TokenBucket,
+        pool: ThreadPoolExecutor,
+        progress: BackfillProgress,
+    ) -> List[int]:
+        # 1. searchable_text 보정 + (비디오 활성 버전, embedding 텍스트)별 중복 제거 (시각 제외)
+        versions = get_video_embedding_versions(event.video_id for event in events)
+        current = get_current_embedding_version()
+
+        regenerated = []
+        events_by_key: Dict[Tuple[str, str], List[Event]] = {}
+        for event in events:
+            if not event.searchable_text:
+                event.generate_searchable_text()
+                regenerated.append(event)
+
+            # 비디오 활성 버전의 텍스트 규칙을 따름 (재임베딩 전 비디오는 기존 규칙 유지)
+            version = versions.get(event.video_id, current)
+            text = event_embedding_text(event.searchable_text, version)
+            if not text:
+                progress.skipped += 1
+                continue
+            events_by_key.setdefault((version, text), []).append(event)
+
+        if regenerated:
+            Event.objects.bulk_update(regenerated, ["searchable_text", "keywords"])
+            # bulk_update는 signal 미발동 → 검색 텍스트 캐시(BM25/윈도우/답변) 무효화
+            Video.objects.filter(
+                pk__in={event.video_id for event in regenerated}
+            ).update(data_version=F("data_version") + 1)
+
+        # 2. 버전(모델)별로 저장소 조회 → 없는 텍스트만 Bedrock 호출
+        texts_by_version: Dict[str, List[str]] = {}
+        for version, text in events_by_key:
+            texts_by_version.setdefault(version, []).append(text)
+
+        embeddings: Dict[Tuple[str, str], List[float]] = {}
+        for version, texts in texts_by_version.items():
+            model_id, dimension = parse_embedding_version(version)
+            created = self._embed_texts(
+                texts, model_id, dimension, bedrock, limiter, pool, progress
+            )
+            for text, embedding in created.items():
+                embeddings[(version, text)] = embedding
+
+        # 3. 청크 단위 bulk_update (생성 버전 함께 기록)
+        updated = []
+        for key, key_events in events_by_key.items():
+            version, embedding = key[0], embeddings.get(key)
+            for event in key_events:
+                if embedding:
+                    event.embedding = embedding
+                    event.embedding_version = version
+                    updated.append(event)
+                else:
+                    progress.failed += 1
+
+        if updated:
+            Event.objects.bulk_update(updated, ["embedding", "embedding_version"])
+            # 버전 미기록 비디오는 이번에 사용한 버전으로 고정 (설정 모델이 바뀌어도 검색 일치)
+            Video.objects.filter(
+                pk__in={event.video_id for event in updated}, embedding_version=""
+            ).update(embedding_version=current)
+        progress.success += len(updated)
+        progress.processed += len(events)
+        return [event.id for event in updated]
+
+    def _embed_texts(
+        self,
+        texts: List[str],
+        model_id: str,
+        dimension: int,
+        bedrock,
+        limiter: TokenBucket,
+        pool: ThreadPoolExecutor,
+        progress: BackfillProgress,
+    ) -> Dict[str, List[float]]:
+        """
+        콘텐츠 주소 저장소 우선 조회 + 없는 텍스트만 동시 호출 → 저장소에 고정(pinned) 저장
+
+        Returns:
+            {텍스트: embedding} - 실패한 텍스트는 제외
+        """
+        from .embedding_cache import get_embedding_cache
+
+        cache = get_embedding_cache()
+
+        # 저장소 일괄 조회 (메인 스레드 - 워커 스레드는 DB 연결을 쓰지 않음)
+        progress.unique_texts += len(texts)
+        embeddings: Dict[str, List[float]] = dict(cache.get_many(texts, model_id, dimension))
+        progress.cache_hits += len(embeddings)
+        misses = [text for text in texts if text not in embeddings]
+
+        created = {}
+        for text, embedding, calls, throttled in pool.map(
+            lambda text: self._embed_with_backoff(text, bedrock, limiter, model_id),
+            misses,
+        ):
+            progress.api_calls += calls
+            progress.throttled += throttled
+            if embedding:
+                created[text] = embedding
+
+        if created:
+            cache.set_many(created, model_id, dimension, pinned=True)
+            embeddings.update(created)
+        return embeddings
+
+    def _embed_with_backoff(
+        self, text: str, bedrock, limiter: TokenBucket, model_id: Optional[str] = None
+    ) -> tuple:
+        """
+        Returns:
+            (text, embedding 또는 None, API 호출 수, throttling 횟수)
+        """
+        calls = 0
+        throttled = 0
+
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            calls += 1
+            try:
+                embedding = bedrock.generate_embedding(
+                    text, raise_on_throttle=True, use_cache=False, model_id=model_id
+                )
+                if embedding:
+                    limiter.on_success()
+                return text, embedding, calls, throttled
+
+            except EmbeddingThrottled:
+                throttled += 1
+                limiter.on_throttle()
+                if attempt < self.max_retries:
+                    # 지수 백오프 + 지터 (동시에 재시도가 몰리지 않도록)
+                    delay = min(self.max_backoff, 0.5 * (2**attempt))
+                    time.sleep(random.uniform(delay / 2, delay))
+
+        logger.error(f"❌ Embedding throttling 재시도 초과 ({self.max_retries}회)")
+        return text, None, calls, throttled
+
+
+# 싱글톤 인스턴스
+_embedding_backfill_service = None
+
+
+def get_embedding_backfill_service() -> EmbeddingBackfillService:
+    """Embedding backfill 서비스 싱글톤 인스턴스 반환"""
+    global _embedding_backfill_service
+
+    if _embedding_backfill_service is None:
+        _embedding_backfill_service = EmbeddingBackfillService()
+
+    return _embedding_backfill_service
@@ -0,0 +1,505 @@
+"""
+임베딩 캐시 서비스
+- L1: 프로세스 내 LRU (TTL + 최대 크기 제한)
+- L2: PostgreSQL 영구 캐시 (model_id, dimension, 정규화 텍스트 해시)
+- 동일 질문 반복 시 Bedrock Titan 호출 생략
+- pinned 엔트리: Event embedding 콘텐츠 주소 저장소 (같은 텍스트의 이벤트가 벡터 공유, 정리 제외)
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheService:
+    """2단계(LRU + PostgreSQL) 임베딩 캐시"""
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        use_db: Optional[bool] = None,
+        db_ttl_seconds: Optional[int] = None,
+        db_max_rows: Optional[int] = None,
+        pinned_ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_size: L1 LRU 최대 엔트리 수
+            ttl_seconds: L1 엔트리 유효 시간 (초)
+            use_db: L2(PostgreSQL) 캐시 사용 여부
+            db_ttl_seconds: L2 엔트리 유효 시간 (초)
+            db_max_rows: L2 최대 행 수 (초과 시 오래된 순으로 정리)
+            pinned_ttl_seconds: 고정 엔트리 유효 시간 (초, 이 기간 동안 재사용되지 않으면 정리)
+        """
+        self.enabled = getattr(settings, "EMBEDDING_CACHE_ENABLED", True)
+        self.max_size = (
+            max_size
+            if max_size is not None
+            else getattr(settings, "EMBEDDING_CACHE_MAX_SIZE", 2048)
+        )
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else getattr(settings, "EMBEDDING_CACHE_TTL", 3600)
+        )
+        self.use_db = (
+            use_db
+            if use_db is not None
+            else getattr(settings, "EMBEDDING_CACHE_DB_ENABLED", True)
+        )
+        self.db_ttl_seconds = (
+            db_ttl_seconds
+            if db_ttl_seconds is not None
+            else getattr(settings, "EMBEDDING_CACHE_DB_TTL", 30 * 24 * 3600)
+        )
+        self.db_max_rows = (
+            db_max_rows
+            if db_max_rows is not None
+            else getattr(settings, "EMBEDDING_CACHE_DB_MAX_ROWS", 100000)
+        )
+        self.pinned_ttl_seconds = (
+            pinned_ttl_seconds
+            if pinned_ttl_seconds is not None
+            else getattr(settings, "EMBEDDING_CACHE_PINNED_TTL", 180 * 24 * 3600)
+        )
+        self.db_prune_interval = getattr(
+            settings, "EMBEDDING_CACHE_DB_PRUNE_INTERVAL", 500
+        )
+
+        # key -> (embedding, expires_at)
+        self._lru: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0,
+            "db_errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------------
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """유니코드 정규화(NFKC) + 대소문자 통일 + 공백 정리"""
+        normalized = unicodedata.normalize("NFKC", text or "")
+        normalized = normalized.casefold()
+        return re.sub(r"\s+", " ", normalized).strip()
+
+    @classmethod
+    def make_text_hash(cls, text: str) -> str:
+        """정규화 텍스트의 SHA-256 해시"""
+        return hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, text: str, model_id: str, dimension: int) -> Optional[List[float]]:
+        """
+        캐시에서 임베딩 조회 (L1 → L2)
+
+        Returns:
+            임베딩 벡터 또는 None (miss)
+        """
+        if not self.enabled or not text:
+            return None
+
+        text_hash = self.make_text_hash(text)
+        key = (model_id, dimension, text_hash)
+
+        embedding = self._memory_get(key)
+        if embedding is not None:
+            self._incr("memory_hits")
+            return embedding
+
+        if self.use_db:
+            embedding = self._db_get(model_id, dimension, text_hash)
+            if embedding is not None:
+                self._incr("db_hits")
+                self._memory_set(key, embedding)
+                return embedding
+
+        self._incr("misses")
+        return None
+
+    def set(
+        self,
+        text: str,
+        model_id: str,
+        dimension: int,
+        embedding: List[float],
+        pinned: bool = False,
+    ) -> None:
+        """
+        임베딩을 L1/L2 캐시에 저장
+
+        Args:
+            pinned: 콘텐츠 주소 저장소 엔트리로 고정 (TTL/행 수 정리 제외)
+        """
+        if not self.enabled or not text or not embedding:
+            return
+
+        embedding = [float(v) for v in embedding]
+        text_hash = self.make_text_hash(text)
+        self._memory_set((model_id, dimension, text_hash), embedding)
+        self._incr("writes")
+
+        if self.use_db:
+            self._db_set(model_id, dimension, text_hash, embedding, pinned)
+
+    def get_many(
+        self, texts: List[str], model_id: str, dimension: int
+    ) -> Dict[str, List[float]]:
+        """
+        여러 텍스트를 한 번에 조회 (L1 → L2 단일 쿼리)
+
+        Returns:
+            {text: 임베딩} - 적중한 텍스트만 포함
+        """
+        if not self.enabled:
+            return {}
+
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, List[str]] = {}  # text_hash -> [text, ...]
+        for text in texts:
+            if not text:
+                continue
+            text_hash = self.make_text_hash(text)
+            embedding = self._memory_get((model_id, dimension, text_hash))
+            if embedding is not None:
+                found[text] = embedding
+                self._incr("memory_hits")
+            else:
+                missing.setdefault(text_hash, []).append(text)
+
+        if missing and self.use_db:
+            for text_hash, embedding in self._db_get_many(
+                model_id, dimension, list(missing)
+            ).items():
+                self._memory_set((model_id, dimension, text_hash), embedding)
+                for text in missing.pop(text_hash):
+                    found[text] = embedding
+                self._incr("db_hits")
+
+        self._incr("misses", sum(len(group) for group in missing.values()))
+        return found
+
+    def set_many(
+        self,
+        embeddings: Dict[str, List[float]],
+        model_id: str,
+        dimension: int,
+        pinned: bool = False,
+    ) -> None:
+        """여러 임베딩을 L1/L2에 저장 (L2는 단일 upsert)"""
+        if not self.enabled:
+            return
+
+        rows = {}
+        for text, embedding in embeddings.items():
+            if not text or not embedding:
+                continue
+            embedding = [float(v) for v in embedding]
+            text_hash = self.make_text_hash(text)
+            self._memory_set((model_id, dimension, text_hash), embedding)
+            rows[text_hash] = embedding
+
+        if not rows:
+            return
+        self._incr("writes", len(rows))
+
+        if self.use_db:
+            self._db_set_many(model_id, dimension, rows, pinned)
+
+    def get_or_create(
+        self,
+        text: str,
+        model_id: str,
+        dimension: int,
+        generator: Callable[[str], Optional[List[float]]],
+    ) -> Optional[List[float]]:
+        """
+        캐시 조회 후 miss면 generator로 생성하여 저장
+
+        Args:
+            text: 임베딩할 텍스트
+            model_id: 임베딩 모델 ID
+            dimension: 임베딩 차원
+            generator: 실제 임베딩 생성 함수 (text -> embedding)
+
+        Returns:
+            임베딩 벡터 (생성 실패 시 generator 반환값 그대로)
+        """
+        cached = self.get(text, model_id, dimension)
+        if cached is not None:
+            return cached
+
+        embedding = generator(text)
+        if embedding:
+            self.set(text, model_id, dimension, embedding)
+        return embedding
+
+    # ------------------------------------------------------------------
+    # 통계 / 관리
+    # ------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, float]:
+        """hit/miss 카운터 및 hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._lru)
+
+        hits = stats["memory_hits"] + stats["db_hits"]
+        total = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / total, 4) if total else 0.0
+        return stats
+
+    def clear_memory(self) -> None:
+        """L1 캐시 비우기 (L2는 유지)"""
+        with self._lock:
+            self._lru.clear()
+
+    def prune_db(self) -> int:
+        """
+        L2 캐시 정리: TTL 만료 행 삭제 후 최대 행 수 초과분을 오래된 순으로 삭제
+
+        고정 엔트리는 별도 TTL(pinned_ttl_seconds)로만 정리 - 벡터는 각 Event 행에
+        복사되어 있으므로, 오래 재사용되지 않은 엔트리(이전 모델/텍스트 개정 등)를 지워도
+        검색에는 영향이 없고 같은 텍스트가 다시 나오면 한 번 재생성된다.
+
+        Returns:
+            삭제된 행 수
+        """
+        from apps.db.models import EmbeddingCacheEntry
+
+        deleted = 0
+        try:
+            cutoff = timezone.now() - timedelta(seconds=self.db_ttl_seconds)
+            # pinned(Event embedding 저장소) 엔트리는 정리 대상 아님
+            unpinned = EmbeddingCacheEntry.objects.filter(pinned=False)
+            deleted, _ = unpinned.filter(last_accessed__lt=cutoff).delete()
+
+            pinned_cutoff = timezone.now() - timedelta(seconds=self.pinned_ttl_seconds)
+            unused_pinned, _ = EmbeddingCacheEntry.objects.filter(
+                pinned=True, last_accessed__lt=pinned_cutoff
+            ).delete()
+            deleted += unused_pinned
+
+            overflow = unpinned.count() - self.db_max_rows
+            if overflow > 0:
+                stale_ids = list(
+                    unpinned.order_by("last_accessed").values_list("id", flat=True)[
+                        :overflow
+                    ]
+                )
+                trimmed, _ = EmbeddingCacheEntry.objects.filter(
+                    id__in=stale_ids
+                ).delete()
+                deleted += trimmed
+
+            if deleted:
+                logger.info(f"🧹 임베딩 캐시 정리: {deleted}개 삭제")
+        except Exception as e:
+            self._incr("db_errors")
+            logger.warning(f"⚠️ 임베딩 캐시 정리 실패: {str(e)}")
+
+        return deleted
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+    def _incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _memory_get(self, key: tuple) -> Optional[List[float]]:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None:
+                return None
+
+            embedding, expires_at = item
+            if expires_at < time.monotonic():
+                del self._lru[key]
+                self._stats["expired"] += 1
+                return None
+
+            self._lru.move_to_end(key)
+            return embedding
+
+    def _memory_set(self, key: tuple, embedding: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._lru[key] = (embedding, time.monotonic() + self.ttl_seconds)
+            self._lru.move_to_end(key)
+
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _db_get(
+        self, model_id: str, dimension: int, text_hash: str
+    ) -> Optional[List[float]]:
+        from apps.db.models import EmbeddingCacheEntry
+
+        try:
+            entry = (
+                EmbeddingCacheEntry.objects.filter(
+                    model_id=model_id, dimension=dimension, text_hash=text_hash
+                )
+                .only("id", "embedding", "last_accessed", "pinned")
+                .first()
+            )
+            if entry is None:
+                return None
+
+            cutoff = timezone.now() - timedelta(seconds=self.db_ttl_seconds)
+            if entry.last_accessed < cutoff and not entry.pinned:
+                self._incr("expired")
+                return None
+
+            EmbeddingCacheEntry.objects.filter(pk=entry.pk).update(
+                hit_count=F("hit_count") + 1, last_accessed=timezone.now()
+            )
+            return [float(v) for v in entry.embedding]
+
+        except Exception as e:
+            self._incr("db_errors")
+            logger.warning(f"⚠️ 임베딩 캐시(DB) 조회 실패: {str(e)}")
+            return None
+
+    def _db_get_many(
+        self, model_id: str, dimension: int, text_hashes: List[str]
+    ) -> Dict[str, List[float]]:
+        from apps.db.models import EmbeddingCacheEntry
+
+        try:
+            cutoff = timezone.now() - timedelta(seconds=self.db_ttl_seconds)
+            rows = list(
+                EmbeddingCacheEntry.objects.filter(
+                    model_id=model_id, dimension=dimension, text_hash__in=text_hashes
+                )
+                .filter(Q(pinned=True) | Q(last_accessed__gte=cutoff))
+                .values_list("id", "text_hash", "embedding")
+            )
+            if not rows:
+                return {}
+
+            EmbeddingCacheEntry.objects.filter(id__in=[row[0] for row in rows]).update(
+                hit_count=F("hit_count") + 1, last_accessed=timezone.now()
+            )
+            return {
+                text_hash: [float(v) for v in embedding]
+                for _, text_hash, embedding in rows
+            }
+
+        except Exception as e:
+            self._incr("db_errors")
+            logger.warning(f"⚠️ 임베딩 캐시(DB) 일괄 조회 실패: {str(e)}")
+            return {}
+
+    def _db_set(
+        self,
+        model_id: str,
+        dimension: int,
+        text_hash: str,
+        embedding: List[float],
+        pinned: bool = False,
+    ) -> None:
+        from apps.db.models import EmbeddingCacheEntry
+
+        defaults = {"embedding": embedding, "last_accessed": timezone.now()}
+        if pinned:
+            # 고정 해제는 하지 않음 (질의 캐시 저장이 저장소 엔트리를 덮어쓰지 않도록)
+            defaults["pinned"] = True
+
+        try:
+            EmbeddingCacheEntry.objects.update_or_create(
+                model_id=model_id,
+                dimension=dimension,
+                text_hash=text_hash,
+                defaults=defaults,
+            )
+        except Exception as e:
+            self._incr("db_errors")
+            logger.warning(f"⚠️ 임베딩 캐시(DB) 저장 실패: {str(e)}")
+            return
+
+        self._maybe_prune()
+
+    def _db_set_many(
+        self,
+        model_id: str,
+        dimension: int,
+        rows: Dict[str, List[float]],
+        pinned: bool = False,
+    ) -> None:
+        from apps.db.models import EmbeddingCacheEntry
+
+        now = timezone.now()
+        update_fields = ["embedding", "last_accessed"] + (["pinned"] if pinned else [])
+        try:
+            EmbeddingCacheEntry.objects.bulk_create(
+                [
+                    EmbeddingCacheEntry(
+                        model_id=model_id,
+                        dimension=dimension,
+                        text_hash=text_hash,
+                        embedding=embedding,
+                        pinned=pinned,
+                        last_accessed=now,
+                    )
+                    for text_hash, embedding in rows.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["model_id", "dimension", "text_hash"],
+                update_fields=update_fields,
+            )
+        except Exception as e:
+            self._incr("db_errors")
+            logger.warning(f"⚠️ 임베딩 캐시(DB) 일괄 저장 실패: {str(e)}")
+            return
+
+        self._maybe_prune(len(rows))
+
+    def _maybe_prune(self, writes: int = 1) -> None:
+        with self._lock:
+            self._writes_since_prune += writes
+            should_prune = self._writes_since_prune >= self.db_prune_interval
+            if should_prune:
+                self._writes_since_prune = 0
+
+        if should_prune:
+            self.prune_db()
+
+
+# 싱글톤 인스턴스
+_embedding_cache = None
+
+
+def get_embedding_cache() -> EmbeddingCacheService:
+    """임베딩 캐시 싱글톤 인스턴스 반환"""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCacheService()
+
+    return _embedding_cache
@@ -0,0 +1,265 @@
+"""
+Event embedding 아웃박스 드레이너
+- Event 저장 트랜잭션에서 EmbeddingOutbox 행만 기록 (Bedrock 호출 없음 → 저장 즉시 반환)
+- 커밋 후 프로세스 내 백그라운드 스레드가 대기열을 일괄 처리 (또는 drain_embedding_outbox 명령)
+- SELECT ... FOR UPDATE SKIP LOCKED + 점유 시각(available_at)으로 여러 프로세스가 중복 없이 처리
+- 실패 시 지수 백오프로 재시도, 최대 횟수 초과 행은 남겨서 lag 지표에 노출
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from apps.db.models import EmbeddingOutbox, Event
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingOutboxService:
+    """EmbeddingOutbox 기록 / 일괄 처리 / 지연(lag) 조회"""
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        auto_drain: Optional[bool] = None,
+    ):
+        """
+        Args:
+            batch_size: 한 번에 점유/처리할 행 수
+            max_attempts: 최대 시도 횟수 (초과 시 재시도 중단)
+            lease_seconds: 점유 유지 시간 (드레이너 비정상 종료 시 이후 재처리)
+            auto_drain: 커밋 후 프로세스 내 백그라운드 스레드로 자동 처리
+        """
+        self.batch_size = (
+            batch_size
+            if batch_size is not None
+            else getattr(settings, "EMBEDDING_OUTBOX_BATCH_SIZE", 100)
+        )
+        self.max_attempts = (
+            max_attempts
+            if max_attempts is not None
+            else getattr(settings, "EMBEDDING_OUTBOX_MAX_ATTEMPTS", 5)
+        )
+        self.lease_seconds = (
+            lease_seconds
+            if lease_seconds is not None
+            else getattr(settings, "EMBEDDING_OUTBOX_LEASE_SECONDS", 300)
+        )
+        self.auto_drain = (
+            auto_drain
+            if auto_drain is not None
+            else getattr(settings, "EMBEDDING_OUTBOX_AUTO_DRAIN", True)
+        )
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._wake_pending = False
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def enqueue(self, event_ids: Iterable[int]) -> None:
+        """
+        embedding 생성 대기열에 등록 (호출한 트랜잭션과 함께 커밋)
+
+        이미 대기 중인 이벤트는 시도 횟수/백오프를 초기화 (재저장 시 다시 처리)
+        """
+        now = timezone.now()
+        rows = [
+            EmbeddingOutbox(event_id=event_id, available_at=now)
+            for event_id in event_ids
+        ]
+        if not rows:
+            return
+
+        EmbeddingOutbox.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["event"],
+            update_fields=["attempts", "last_error", "available_at"],
+        )
+
+        if self.auto_drain:
+            # 롤백되면 호출되지 않음, autocommit이면 즉시 호출
+            transaction.on_commit(self.wake)
+
+    # ------------------------------------------------------------------
+    # 처리
+    # ------------------------------------------------------------------
+    def drain(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        처리 가능한 대기열을 비울 때까지 일괄 처리
+
+        Args:
+            max_batches: 최대 배치 수 (None이면 대기열이 빌 때까지)
+
+        Returns:
+            {'batches', 'claimed', 'embedded', 'failed'}
+        """
+        stats = {"batches": 0, "claimed": 0, "embedded": 0, "failed": 0}
+
+        while max_batches is None or stats["batches"] < max_batches:
+            claimed = self._claim()
+            if not claimed:
+                break
+
+            embedded, failed = self._process(claimed)
+            stats["batches"] += 1
+            stats["claimed"] += len(claimed)
+            stats["embedded"] += embedded
+            stats["failed"] += failed
+
+        if stats["claimed"]:
+            logger.info(
+                f"📤 Embedding 아웃박스 처리: {stats['claimed']}개 "
+                f"(성공 {stats['embedded']}, 실패 {stats['failed']})"
+            )
+        return stats
+
+    def _claim(self) -> Dict[int, int]:
+        """
+        처리 가능한 행 점유 (available_at을 lease 이후로 미룸)
+
+        Returns:
+            {outbox_id: event_id}
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            rows = dict(
+                EmbeddingOutbox.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=now, attempts__lt=self.max_attempts)
+                .order_by("available_at", "id")
+                .values_list("id", "event_id")[: self.batch_size]
+            )
+            if rows:
+                EmbeddingOutbox.objects.filter(id__in=list(rows)).update(
+                    attempts=F("attempts") + 1,
+                    available_at=now + timedelta(seconds=self.lease_seconds),
+                )
+        return rows
+
+    def _process(self, claimed: Dict[int, int]) -> tuple:
+        from .embedding_backfill import get_embedding_backfill_service
+
+        # 이미 embedding이 있는 이벤트(backfill 등으로 처리됨)는 바로 완료
+        events = list(
+            Event.objects.filter(id__in=list(claimed.values()), embedding__isnull=True)
+            .defer("embedding")
+            .order_by("id")
+        )
+
+        try:
+            updated_ids, _ = get_embedding_backfill_service().embed_events(events)
+            error = "embedding 생성 실패"
+        except Exception as e:
+            logger.error(f"❌ Embedding 아웃박스 처리 오류: {str(e)}")
+            updated_ids, error = [], str(e)
+
+        pending_event_ids = {event.id for event in events} - set(updated_ids)
+        done_ids = [
+            outbox_id
+            for outbox_id, event_id in claimed.items()
+            if event_id not in pending_event_ids
+        ]
+        failed_ids = [
+            outbox_id
+            for outbox_id, event_id in claimed.items()
+            if event_id in pending_event_ids
+        ]
+
+        EmbeddingOutbox.objects.filter(id__in=done_ids).delete()
+
+        if failed_ids:
+            # 지수 백오프: 30초 × 2^(attempts-1), 최대 1시간
+            for row in EmbeddingOutbox.objects.filter(id__in=failed_ids).only(
+                "id", "attempts"
+            ):
+                delay = min(3600, 30 * 2 ** max(row.attempts - 1, 0))
+                EmbeddingOutbox.objects.filter(pk=row.pk).update(
+                    last_error=error[:1000],
+                    available_at=timezone.now() + timedelta(seconds=delay),
+                )
+
+        return len(done_ids), len(failed_ids)
+
+    # ------------------------------------------------------------------
+    # 백그라운드 스레드
+    # ------------------------------------------------------------------
+    def wake(self) -> None:
+        """프로세스 내 드레이너 스레드 깨우기 (실행 중이면 한 번 더 처리하도록 표시)"""
+        with self._lock:
+            self._wake_pending = True
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="embedding-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._wake_pending:
+                        self._thread = None
+                        return
+                    self._wake_pending = False
+
+                try:
+                    self.drain()
+                except Exception as e:
+                    logger.error(f"❌ Embedding 아웃박스 드레이너 오류: {str(e)}")
+        finally:
+            # 스레드 전용 DB 연결 정리
+            connections.close_all()
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def get_lag(self) -> Dict[str, Optional[float]]:
+        """
+        embedding 지연 지표
+
+        Returns:
+            {
+                'pending': 대기 중 (재시도 대기 포함),
+                'dead': 최대 시도 횟수 초과,
+                'oldest_pending_seconds': 가장 오래된 대기 행의 경과 시간 (초),
+            }
+        """
+        now = timezone.now()
+        pending = EmbeddingOutbox.objects.filter(attempts__lt=self.max_attempts)
+        oldest = pending.aggregate(oldest=Min("created_at"))["oldest"]
+
+        return {
+            "pending": pending.count(),
+            "dead": EmbeddingOutbox.objects.filter(
+                attempts__gte=self.max_attempts
+            ).count(),
+            "oldest_pending_seconds": (
+                round((now - oldest).total_seconds(), 1) if oldest else 0.0
+            ),
+        }
+
+
+# 싱글톤 인스턴스
+_embedding_outbox = None
+
+
+def get_embedding_outbox() -> EmbeddingOutboxService:
+    """Embedding 아웃박스 서비스 싱글톤 인스턴스 반환"""
+    global _embedding_outbox
+
+    if _embedding_outbox is None:
+        _embedding_outbox = EmbeddingOutboxService()
+
+    return _embedding_outbox
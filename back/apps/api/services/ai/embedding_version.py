@@ -0,0 +1,106 @@
+"""
+Embedding 버전 관리
+- 버전 문자열 = "<모델 ID>@<차원>[+t<텍스트 개정>]" (예: amazon.titan-embed-text-v2:0@1024+t2)
+  텍스트 개정 = Event embedding 입력 텍스트 규칙 (바뀌면 모델이 같아도 재임베딩 대상)
+    1 (접미사 없음): searchable_text 그대로 ('Time: …s' 포함)
+    2: 'Time: …s' 구간 제외 (같은 행동/인물 속성의 이벤트가 벡터 공유)
+- 벡터를 가진 행(Event / VideoAnalysis / PromptSession / PromptInteraction)에 생성 버전 기록
+- Video.embedding_version = 해당 비디오 검색 쿼리가 사용할 버전
+  (재임베딩이 끝난 비디오만 새 버전으로 전환, 나머지는 이전 버전으로 계속 검색)
+- 빈 문자열 = 현재 설정(AWS_BEDROCK_EMBEDDING_MODEL_ID)의 버전
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+EMBEDDING_DIMENSION = 1024
+EMBEDDING_TEXT_REVISION = 2
+
+
+def make_embedding_version(
+    model_id: Optional[str] = None,
+    dimension: int = EMBEDDING_DIMENSION,
+    text_revision: int = EMBEDDING_TEXT_REVISION,
+) -> str:
+    """모델 ID + 차원 + 텍스트 개정 → 버전 문자열 (모델 생략 시 현재 설정)"""
+    version = f"{model_id or settings.AWS_BEDROCK_EMBEDDING_MODEL_ID}@{dimension}"
+    if text_revision > 1:
+        version += f"+t{text_revision}"
+    return version
+
+
+def parse_embedding_version(version: Optional[str]) -> Tuple[str, int]:
+    """
+    버전 문자열 → (모델 ID, 차원)
+
+    빈 값이면 현재 설정, 차원이 없으면 1024
+    """
+    if not version:
+        return settings.AWS_BEDROCK_EMBEDDING_MODEL_ID, EMBEDDING_DIMENSION
+
+    model_id, _, dimension = version.rpartition("@")
+    dimension = dimension.partition("+")[0]
+    if not model_id or not dimension.isdigit():
+        return version, EMBEDDING_DIMENSION
+    return model_id, int(dimension)
+
+
+def parse_text_revision(version: Optional[str]) -> int:
+    """버전 문자열 → Event embedding 텍스트 개정 (빈 값이면 현재, 접미사 없으면 1)"""
+    if not version:
+        return EMBEDDING_TEXT_REVISION
+
+    revision = version.rpartition("@")[2].partition("+t")[2]
+    return int(revision) if revision.isdigit() else 1
+
+
+def event_embedding_text(searchable_text: str, version: Optional[str] = None) -> str:
+    """버전의 텍스트 개정 규칙으로 Event embedding 입력 텍스트 생성"""
+    from apps.db.models import Event
+
+    return Event.embedding_text_for(
+        searchable_text, include_time=parse_text_revision(version) < 2
+    )
+
+
+def get_current_embedding_version() -> str:
+    """새로 생성하는 embedding의 기본 버전 (현재 설정 모델)"""
+    return make_embedding_version()
+
+
+def get_video_embedding_versions(video_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    비디오별 활성 embedding 버전 (단일 쿼리)
+
+    Returns:
+        {video_id: 버전} - 버전 미기록 비디오는 현재 버전
+    """
+    from apps.db.models import Video
+
+    current = get_current_embedding_version()
+    video_ids = [video_id for video_id in set(video_ids) if video_id is not None]
+    if not video_ids:
+        return {}
+
+    versions = dict(
+        Video.objects.filter(pk__in=video_ids).values_list("pk", "embedding_version")
+    )
+    return {video_id: versions.get(video_id) or current for video_id in video_ids}
+
+
+def get_active_embedding_versions() -> List[str]:
+    """
+    검색 시 사용 중인 버전 목록 (전체 범위 검색용)
+
+    재임베딩 진행 중에는 이전 / 새 버전이 함께 존재
+    """
+    from apps.db.models import Video
+
+    current = get_current_embedding_version()
+    versions = {
+        version or current
+        for version in Video.objects.values_list("embedding_version", flat=True).distinct()
+    }
+    # 현재 버전을 먼저 (결과 병합 시 동률이면 현재 버전 우선)
+    return sorted(versions or {current}, key=lambda version: version != current)
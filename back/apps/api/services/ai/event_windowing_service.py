@@ -4,13 +4,56 @@
 - 이벤트 시퀀스 요약: 연속된 이벤트들을 하나의 스토리로 통합
 """
 
-from typing import List, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Optional
+from django.conf import settings
+from django.db import connection
 from django.db.models import Q
 from apps.db.models import Event
+from .answer_cache import get_video_data_signatures
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 후보 이벤트들의 앞뒤 이웃을 한 번에 조회 (비디오별 ROW_NUMBER 윈도우 함수)
+WINDOW_NEIGHBORS_SQL = """
+WITH ranked AS (
+    SELECT
+        id,
+        video_id,
+        timestamp,
+        searchable_text,
+        event_type,
+        age_group,
+        gender,
+        action,
+        emotion,
+        interaction_target,
+        ROW_NUMBER() OVER (PARTITION BY video_id ORDER BY timestamp, id) AS rn
+    FROM db_event
+    WHERE video_id = ANY(%s)
+)
+SELECT
+    center.id AS center_id,
+    neighbor.timestamp,
+    neighbor.searchable_text,
+    neighbor.event_type,
+    neighbor.age_group,
+    neighbor.gender,
+    neighbor.action,
+    neighbor.emotion,
+    neighbor.interaction_target,
+    neighbor.rn - center.rn AS position
+FROM ranked AS center
+JOIN ranked AS neighbor
+    ON neighbor.video_id = center.video_id
+   AND neighbor.rn BETWEEN center.rn - %s AND center.rn + %s
+WHERE center.id = ANY(%s)
+ORDER BY center.id, neighbor.rn
+"""
+
 
 class EventWindowingService:
     """이벤트 윈도잉 및 컨텍스트 강화 서비스"""
@@ -22,6 +65,13 @@ class EventWindowingService:
         """
         self.window_size = window_size
 
+        # 이벤트별 윈도우 텍스트 캐시: event_id -> (video_id, 비디오 데이터 시그니처, text, expires_at)
+        # 시그니처가 바뀐 비디오의 항목은 조회 시 무시 → 어느 프로세스가 이벤트를 바꿔도 반영
+        self.cache_max_size = getattr(settings, "EVENT_WINDOW_CACHE_SIZE", 10000)
+        self.cache_ttl = getattr(settings, "EVENT_WINDOW_CACHE_TTL", 600)
+        self._cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def create_windowed_text(self, event: Event) -> str:
         """
         슬라이딩 윈도우로 이벤트의 컨텍스트를 강화한 텍스트 생성
@@ -32,52 +82,201 @@ class EventWindowingService:
         Returns:
             앞뒤 이벤트를 포함한 통합 텍스트
         """
+        return self.create_windowed_texts([event]).get(
+            event.id, self._event_text(event)
+        )
+
+    def create_windowed_texts(self, events: Iterable[Event]) -> Dict[int, str]:
+        """
+        여러 이벤트의 윈도우 텍스트를 일괄 생성 (Rerank 배치용)
+
+        후보 비디오들의 데이터 시그니처를 1회 조회해 캐시 유효성을 확인하고,
+        캐시에 없는 이벤트들만 모아 윈도우 함수 쿼리 1회로 앞뒤 이웃을 조회한다.
+
+        Args:
+            events: 대상 이벤트들
+
+        Returns:
+            {event_id: 앞뒤 이벤트를 포함한 통합 텍스트}
+        """
+        events = [event for event in events if event.id is not None]
+        windowed = {}
+        misses = []
+
+        signatures = self._video_signatures(events)
+        for event in events:
+            cached = self._cache_get(event.id, signatures.get(event.video_id))
+            if cached is not None:
+                windowed[event.id] = cached
+            else:
+                misses.append(event)
+
+        if not misses:
+            return windowed
+
         try:
-            # 같은 비디오의 앞뒤 이벤트 가져오기
-            video_events = Event.objects.filter(video=event.video).order_by("timestamp")
-
-            # 현재 이벤트의 인덱스 찾기
-            event_list = list(video_events)
-            try:
-                current_index = event_list.index(event)
-            except ValueError:
-                # 현재 이벤트를 찾지 못하면 기본 텍스트 반환
-                return event.searchable_text or ""
-
-            # 윈도우 범위 계산
-            start_idx = max(0, current_index - self.window_size)
-            end_idx = min(len(event_list), current_index + self.window_size + 1)
-
-            # 윈도우 내 이벤트들 추출
-            window_events = event_list[start_idx:end_idx]
-
-            # 통합 텍스트 생성
-            context_parts = []
-
-            for i, e in enumerate(window_events):
-                # 현재 이벤트는 강조
-                if e.id == event.id:
-                    prefix = "[현재 이벤트]"
-                elif i < current_index - start_idx:
-                    prefix = "[이전]"
-                else:
-                    prefix = "[이후]"
-
-                # 이벤트 정보 추가
-                event_text = f"{prefix} {e.timestamp:.1f}초: {e.searchable_text or e.description or ''}"
-                context_parts.append(event_text)
-
-            # 전체 컨텍스트 통합
-            windowed_text = "\n".join(context_parts)
-
-            logger.debug(
-                f"✅ 윈도잉 완료: Event {event.id}, 윈도우 크기: {len(window_events)}"
+            fetched = self._fetch_windowed_texts(misses)
+        except Exception as e:
+            logger.error(f"❌ 윈도잉 실패: {str(e)}")
+            fetched = {}
+
+        for event in misses:
+            text = fetched.get(event.id)
+            if text is None:
+                # 현재 이벤트를 찾지 못하면 기본 텍스트 반환 (캐시하지 않음)
+                windowed[event.id] = self._event_text(event)
+                continue
+
+            windowed[event.id] = text
+            self._cache_set(
+                event.id, event.video_id, signatures.get(event.video_id), text
             )
-            return windowed_text
 
+        logger.debug(
+            f"✅ 윈도잉 완료: {len(events)}개 (캐시 {len(events) - len(misses)}개, 조회 {len(misses)}개)"
+        )
+        return windowed
+
+    def invalidate(self, event_ids: Optional[Iterable[int]] = None) -> None:
+        """윈도우 텍스트 캐시 무효화 (event_ids 미지정 시 전체)"""
+        with self._cache_lock:
+            if event_ids is None:
+                self._cache.clear()
+                return
+            for event_id in event_ids:
+                self._cache.pop(event_id, None)
+
+    def invalidate_video(self, video_id: int) -> None:
+        """
+        비디오 단위 캐시 즉시 제거 (메모리 정리용)
+
+        이벤트 변경은 조회 시 비디오 데이터 시그니처로 감지하므로 호출하지 않아도 됨
+        """
+        with self._cache_lock:
+            stale = [
+                event_id
+                for event_id, (cached_video_id, _, _, _) in self._cache.items()
+                if cached_video_id == video_id
+            ]
+            for event_id in stale:
+                del self._cache[event_id]
+
+    @staticmethod
+    def _video_signatures(events: List[Event]) -> Dict[int, tuple]:
+        """후보 이벤트 비디오들의 데이터 시그니처 (조회 실패 시 빈 dict → 캐시 미사용)"""
+        if not events:
+            return {}
+        try:
+            return get_video_data_signatures({event.video_id for event in events})
         except Exception as e:
-            logger.error(f"❌ 윈도잉 실패: {str(e)}")
-            return event.searchable_text or ""
+            logger.warning(f"⚠️ 비디오 데이터 시그니처 조회 실패 (윈도우 캐시 미사용): {e}")
+            return {}
+
+    @staticmethod
+    def _event_text(event: Event) -> str:
+        """이벤트 텍스트 (searchable_text가 비어 있으면 이벤트 필드로 설명 생성, 저장하지 않음)"""
+        if event.searchable_text:
+            return event.searchable_text
+
+        described = Event(
+            event_type=event.event_type,
+            timestamp=event.timestamp,
+            age_group=event.age_group,
+            gender=event.gender,
+            action=event.action,
+            emotion=event.emotion,
+            interaction_target=event.interaction_target,
+        )
+        described.generate_searchable_text()
+        return described.searchable_text or ""
+
+    def _fetch_windowed_texts(self, events: List[Event]) -> Dict[int, str]:
+        """윈도우 함수 쿼리 1회로 후보 이벤트들의 윈도우 텍스트 생성"""
+        video_ids = sorted({event.video_id for event in events})
+        event_ids = [event.id for event in events]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                WINDOW_NEIGHBORS_SQL,
+                [video_ids, self.window_size, self.window_size, event_ids],
+            )
+            rows = cursor.fetchall()
+
+        context_parts: Dict[int, List[str]] = {}
+        for (
+            center_id,
+            timestamp,
+            searchable_text,
+            event_type,
+            age_group,
+            gender,
+            action,
+            emotion,
+            interaction_target,
+            position,
+        ) in rows:
+            # 현재 이벤트는 강조
+            if position == 0:
+                prefix = "[현재 이벤트]"
+            elif position < 0:
+                prefix = "[이전]"
+            else:
+                prefix = "[이후]"
+
+            # searchable_text가 비어 있으면 이벤트 필드로 설명 생성
+            text = searchable_text or self._event_text(
+                Event(
+                    event_type=event_type,
+                    timestamp=timestamp,
+                    age_group=age_group,
+                    gender=gender,
+                    action=action,
+                    emotion=emotion,
+                    interaction_target=interaction_target,
+                )
+            )
+            context_parts.setdefault(center_id, []).append(
+                f"{prefix} {timestamp:.1f}초: {text}"
+            )
+
+        return {
+            center_id: "\n".join(parts) for center_id, parts in context_parts.items()
+        }
+
+    def _cache_get(self, event_id: int, signature: Optional[tuple]) -> Optional[str]:
+        if signature is None:
+            return None
+
+        with self._cache_lock:
+            item = self._cache.get(event_id)
+            if item is None:
+                return None
+
+            _, cached_signature, text, expires_at = item
+            if cached_signature != signature or expires_at < time.monotonic():
+                del self._cache[event_id]
+                return None
+
+            self._cache.move_to_end(event_id)
+            return text
+
+    def _cache_set(
+        self, event_id: int, video_id: int, signature: Optional[tuple], text: str
+    ) -> None:
+        if self.cache_max_size <= 0 or signature is None:
+            return
+
+        with self._cache_lock:
+            self._cache[event_id] = (
+                video_id,
+                signature,
+                text,
+                time.monotonic() + self.cache_ttl,
+            )
+            self._cache.move_to_end(event_id)
+
+            while len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
 
     def create_event_sequence_summary(
         self, events: List[Event], max_events: int = 10
@@ -7,13 +7,26 @@
 """
 
 import json
-from typing import List, Dict, Optional, Tuple
-from django.db import connection
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from django.conf import settings
+from django.db import connections
 from apps.db.models import Event
 from .search_service import RAGSearchService
 from .bedrock_service import get_bedrock_service
 from .bedrock_reranker import get_reranker_service
-from .event_windowing_service import EventWindowingService
+from .event_windowing_service import get_windowing_service
+from .vector_index import vector_search
+from .embedding_version import (
+    get_active_embedding_versions,
+    get_video_embedding_versions,
+    parse_embedding_version,
+)
+from .text2sql_executor import get_text2sql_executor
+from .lexical_search_service import get_lexical_search_service, reciprocal_rank_fusion
 
 
 class HybridSearchService:
@@ -23,7 +36,8 @@ class HybridSearchService:
         self.bedrock_service = get_bedrock_service()
         self.rag_search = RAGSearchService()
         self.reranker = get_reranker_service()  # Reranker 추가
-        self.windowing_service = EventWindowingService(window_size=2)  # Windowing 추가
+        self.windowing_service = get_windowing_service(window_size=2)  # Windowing (캐시 공유 - signal로 무효화)
+        self.lexical_search = get_lexical_search_service()  # BM25 로컬 검색
 
     def hybrid_search(
         self,
@@ -44,16 +58,80 @@ class HybridSearchService:
         Returns:
             (이벤트 리스트, 응답 텍스트)
         """
+        all_events, sql_query_results = self._retrieve_events(
+            prompt, video, use_vector_search, use_text2sql
+        )
+        events, answer_events, fallback_text = self._prepare_answer(
+            all_events, sql_query_results
+        )
+        if fallback_text is not None:
+            return events, fallback_text
+
+        response_text = self.bedrock_service.format_timeline_response(
+            prompt=prompt,
+            events=answer_events,
+            video_name=video.name if video else "알 수 없음",
+        )
+
+        return events, response_text
+
+    def hybrid_search_stream(
+        self,
+        prompt: str,
+        video=None,
+        use_vector_search: bool = True,
+        use_text2sql: bool = True,
+    ) -> Tuple[List[Event], Iterator[str]]:
+        """
+        하이브리드 검색 스트리밍 버전 - 검색은 동기로 끝내고 답변 생성만 스트리밍
+
+        Returns:
+            (이벤트 리스트, 응답 텍스트 조각 이터레이터)
+        """
+        all_events, sql_query_results = self._retrieve_events(
+            prompt, video, use_vector_search, use_text2sql
+        )
+        events, answer_events, fallback_text = self._prepare_answer(
+            all_events, sql_query_results
+        )
+        if fallback_text is not None:
+            return events, iter([fallback_text])
+
+        return events, self.bedrock_service.format_timeline_response_stream(
+            prompt=prompt,
+            events=answer_events,
+            video_name=video.name if video else "알 수 없음",
+        )
+
+    def _retrieve_events(
+        self,
+        prompt: str,
+        video,
+        use_vector_search: bool,
+        use_text2sql: bool,
+    ) -> Tuple[List[Event], List[dict]]:
+        """
+        Text2SQL + pgvector + BM25 검색, 병합/중복 제거, RRF 통합, Reranking
+
+        Returns:
+            (최종 이벤트 리스트, SQL 쿼리 원본 결과)
+        """
         all_events = []
         event_ids_seen = set()  # 중복 제거용
         sql_query_results = []  # SQL 쿼리 원본 결과 저장
 
+        # ============================================
+        # 0. 검색 단계 실행 (병렬 또는 순차)
+        # ============================================
+        use_lexical = getattr(settings, "LEXICAL_SEARCH_ENABLED", True)
+        sql_events, sql_results, vector_events, lexical_events = self._run_retrievers(
+            prompt, video, use_vector_search, use_text2sql, use_lexical
+        )
+
         # ============================================
         # 1. Text2SQL 정확한 조건 검색
         # ============================================
         if use_text2sql:
-            print(f"🔍 Text2SQL 검색 시작")
-            sql_events, sql_results = self._text2sql_search(prompt, video)
             sql_query_results = sql_results  # SQL 결과 저장
 
             for event in sql_events:
@@ -67,10 +145,6 @@ class HybridSearchService:
         # 2. pgvector 의미 기반 유사도 검색 (Recall 확대)
         # ============================================
         if use_vector_search:
-            print(f"🧠 pgvector 유사도 검색 시작 (후보군 30개)")
-            # Reranking을 위해 후보군을 더 많이 가져옴 (10 → 30)
-            vector_events = self._vector_search(prompt, video, limit=30)
-
             for event in vector_events:
                 if event.id not in event_ids_seen:
                     all_events.append(event)
@@ -78,16 +152,46 @@ class HybridSearchService:
 
             print(f"✅ pgvector 결과: {len(vector_events)}개 (중복 제외)")
 
+        # ============================================
+        # 2-1. BM25 Lexical 검색 + RRF 통합 (네트워크 호출 없음)
+        # ============================================
+        if use_lexical:
+            for event in lexical_events:
+                if event.id not in event_ids_seen:
+                    all_events.append(event)
+                    event_ids_seen.add(event.id)
+
+            print(f"✅ BM25 결과: {len(lexical_events)}개")
+
+            # 세 검색기 순위를 RRF로 통합 → Reranker 입력 순서/폴백 순서로 사용
+            events_by_id = {event.id: event for event in all_events}
+            fused = reciprocal_rank_fusion(
+                [
+                    [event.id for event in sql_events],
+                    [event.id for event in vector_events],
+                    [event.id for event in lexical_events],
+                ],
+                k=getattr(settings, "HYBRID_SEARCH_RRF_K", 60),
+            )
+            all_events = [events_by_id[event_id] for event_id, _ in fused]
+
         # ============================================
         # 3. Bedrock Reranker로 정밀도 향상 ⭐ NEW
         # ============================================
-        if len(all_events) > 5:
+        reranker_mode = getattr(settings, "HYBRID_SEARCH_RERANKER", "bedrock")
+        if len(all_events) > 5 and reranker_mode == "rrf" and use_lexical:
+            # 원격 Reranker 생략: RRF 순위 상위 5개 사용 (지연 시간 예산이 작을 때)
+            all_events = all_events[:5]
+            print(f"📊 최종 {len(all_events)}개 이벤트 선택 (✅ RRF 순위, Reranker 생략)")
+
+        elif len(all_events) > 5:
             print(f"🎯 Reranking 시작: {len(all_events)}개 → 상위 5개")
 
-            # Event Windowing으로 컨텍스트 강화 후 Reranker에 전달
+            # Event Windowing으로 컨텍스트 강화 후 Reranker에 전달 (배치 1회 조회)
+            windowed_texts = self.windowing_service.create_windowed_texts(all_events)
             rerank_docs = []
             for event in all_events:
-                context_text = self.windowing_service.create_windowed_text(event)
+                context_text = windowed_texts.get(event.id, event.searchable_text or "")
                 rerank_docs.append(
                     {
                         "id": event.id,
@@ -128,29 +232,28 @@ class HybridSearchService:
         else:
             print(f"📊 최종 {len(all_events)}개 이벤트 선택")
 
-        # ============================================
-        # 4. Bedrock RAG로 자연어 응답 생성
-        # ============================================
-        video_name = video.name if video else "알 수 없음"
+        return all_events, sql_query_results
+
+    def _prepare_answer(
+        self, all_events: List[Event], sql_query_results: List[dict]
+    ) -> Tuple[List[Event], List[Dict], Optional[str]]:
+        """
+        응답 생성 입력 구성
 
+        Returns:
+            (반환할 이벤트 리스트, 답변 생성용 데이터, 고정 응답 텍스트 또는 None)
+        """
         # Event 객체가 없어도 SQL 쿼리 결과가 있으면 사용
         if not all_events and sql_query_results:
             print(
                 f"⚠️ Event 객체는 없지만 SQL 쿼리 결과({len(sql_query_results)}개)로 답변 생성"
             )
-
-            response_text = self.bedrock_service.format_timeline_response(
-                prompt=prompt,
-                events=sql_query_results,  # SQL 쿼리 결과 직접 사용
-                video_name=video_name,
-            )
-
-            return [], response_text
+            return [], sql_query_results, None  # SQL 쿼리 결과 직접 사용
 
         # Event 객체도 없고 SQL 결과도 없으면
         if not all_events:
             print("⚠️ 결과가 없어 기본 답변 반환")
-            return [], "요청하신 조건에 해당하는 데이터를 찾을 수 없습니다."
+            return [], [], "요청하신 조건에 해당하는 데이터를 찾을 수 없습니다."
 
         # Event 객체를 딕셔너리로 변환
         events_data = []
@@ -167,11 +270,104 @@ class HybridSearchService:
                 }
             )
 
-        response_text = self.bedrock_service.format_timeline_response(
-            prompt=prompt, events=events_data, video_name=video_name
+        return all_events, events_data, None
+
+    def _run_retrievers(
+        self,
+        prompt: str,
+        video,
+        use_vector_search: bool,
+        use_text2sql: bool,
+        use_lexical: bool = False,
+    ) -> Tuple[List[Event], List[dict], List[Event], List[Event]]:
+        """
+        Text2SQL / pgvector / BM25 검색 단계 실행
+
+        두 원격 단계는 서로 독립적이므로 HYBRID_SEARCH_CONCURRENT가 켜져 있으면
+        공유 스레드풀에서 동시에 실행하고, 단계별 데드라인을 넘긴 쪽은
+        빈 결과로 처리해 다른 검색기 결과만으로 응답을 구성한다.
+        BM25는 로컬 검색이므로 원격 단계를 기다리는 동안 현재 스레드에서 실행한다.
+
+        Returns:
+            (Text2SQL 이벤트, Text2SQL 원본 결과, pgvector 이벤트, BM25 이벤트)
+        """
+        sql_events, sql_results, vector_events, lexical_events = [], [], [], []
+        concurrent = (
+            getattr(settings, "HYBRID_SEARCH_CONCURRENT", True)
+            and use_text2sql
+            and use_vector_search
         )
 
-        return all_events, response_text
+        if not concurrent:
+            if use_text2sql:
+                print(f"🔍 Text2SQL 검색 시작")
+                sql_events, sql_results = self._text2sql_search(prompt, video)
+            if use_vector_search:
+                print(f"🧠 pgvector 유사도 검색 시작 (후보군 30개)")
+                # Reranking을 위해 후보군을 더 많이 가져옴 (10 → 30)
+                vector_events = self._vector_search(prompt, video, limit=30)
+            if use_lexical:
+                lexical_events = self._lexical_search(prompt, video, limit=30)
+            return sql_events, sql_results, vector_events, lexical_events
+
+        print(f"⚡ Text2SQL + pgvector 병렬 검색 시작 (후보군 30개)")
+        executor = _get_search_executor()
+        started_at = time.monotonic()
+
+        sql_future = executor.submit(
+            _run_in_worker, self._text2sql_search, prompt, video
+        )
+        # Reranking을 위해 후보군을 더 많이 가져옴 (10 → 30)
+        vector_future = executor.submit(
+            _run_in_worker, self._vector_search, prompt, video, 30
+        )
+
+        if use_lexical:
+            lexical_events = self._lexical_search(prompt, video, limit=30)
+
+        sql_timeout = getattr(settings, "HYBRID_SEARCH_TEXT2SQL_TIMEOUT", 20.0)
+        vector_timeout = getattr(settings, "HYBRID_SEARCH_VECTOR_TIMEOUT", 8.0)
+
+        # 데드라인은 제출 시점 기준 (먼저 기다린 단계의 대기 시간 차감)
+        vector_result = self._wait_stage(
+            vector_future, "pgvector", started_at + vector_timeout
+        )
+        sql_result = self._wait_stage(
+            sql_future, "Text2SQL", started_at + sql_timeout
+        )
+
+        if vector_result is not None:
+            vector_events = vector_result
+        if sql_result is not None:
+            sql_events, sql_results = sql_result
+
+        if sql_result is None and vector_result is not None:
+            print(f"↪️ Text2SQL 데드라인 초과 → pgvector 결과로 대체")
+        elif vector_result is None and sql_result is not None:
+            print(f"↪️ pgvector 데드라인 초과 → Text2SQL 결과로 대체")
+
+        print(f"⏱️ 병렬 검색 완료: {time.monotonic() - started_at:.2f}초")
+        return sql_events, sql_results, vector_events, lexical_events
+
+    @staticmethod
+    def _wait_stage(future, stage_name: str, deadline: float):
+        """
+        단계별 데드라인까지 결과 대기
+
+        Returns:
+            단계 결과, 데드라인 초과 또는 예외 시 None
+        """
+        remaining = max(0.0, deadline - time.monotonic())
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # 실행 중인 작업은 중단할 수 없으므로 결과만 버림 (대기열에 있으면 취소)
+            future.cancel()
+            print(f"⏰ {stage_name} 검색 데드라인 초과 ({remaining:.2f}초 대기)")
+            return None
+        except Exception as e:
+            print(f"❌ {stage_name} 검색 실패: {str(e)}")
+            return None
 
     def _text2sql_search(
         self, prompt: str, video=None
@@ -199,57 +395,31 @@ class HybridSearchService:
 
             print(f"📝 생성된 SQL: {sql_query}")
 
-            # SQL 실행 (예외 처리)
+            # SQL 실행 (비용 상한 / 읽기 전용 / 타임아웃 / 행 수 제한)
             try:
-                with connection.cursor() as cursor:
-                    cursor.execute(sql_query)
-                    query_results = cursor.fetchall()
-                    column_names = (
-                        [desc[0] for desc in cursor.description]
-                        if cursor.description
-                        else []
-                    )
+                sql_result = get_text2sql_executor().execute(sql_query)
             except Exception as sql_error:
                 print(f"❌ SQL 실행 오류: {sql_error}")
                 print(f"📝 실패한 SQL: {sql_query}")
                 return [], []
 
-            if not query_results:
+            if not sql_result.rows:
                 return [], []
 
             # SQL 결과를 딕셔너리로 변환
-            sql_results_dict = []
-            for result in query_results:
-                result_dict = dict(zip(column_names, result))
-                sql_results_dict.append(result_dict)
-
-            print(f"📊 SQL 쿼리 결과: {len(sql_results_dict)}개 행")
-
-            # Event 객체 조회 시도 (id 컬럼이 있는 경우에만)
-            events = []
-            if "id" in column_names:
-                for result_dict in sql_results_dict:
-                    event_id = result_dict.get("id")
-                    if event_id:
-                        try:
-                            event = Event.objects.get(id=event_id)
-                            events.append(event)
-                        except Event.DoesNotExist:
-                            print(f"⚠️ Event ID {event_id} not found")
-            else:
-                # id가 없으면 timestamp로 시도
-                for result_dict in sql_results_dict:
-                    timestamp_value = result_dict.get("timestamp")
-                    if timestamp_value is not None:
-                        if video:
-                            event_objs = Event.objects.filter(
-                                timestamp=timestamp_value, video=video
-                            )
-                        else:
-                            event_objs = Event.objects.filter(timestamp=timestamp_value)
-
-                        if event_objs.exists():
-                            events.append(event_objs.first())
+            sql_results_dict = sql_result.as_dicts()
+
+            print(
+                f"📊 SQL 쿼리 결과: {len(sql_results_dict)}개 행"
+                f"{' (최대 행 수 초과로 잘림)' if sql_result.truncated else ''}"
+            )
+
+            # Event 객체 일괄 조회 (id 우선, 없으면 video + timestamp)
+            from apps.api.services.business import get_event_service
+
+            events = get_event_service().hydrate_events_from_rows(
+                sql_results_dict, video=video
+            )
 
             print(f"📊 Event 객체: {len(events)}개")
             return events, sql_results_dict
@@ -261,20 +431,38 @@ class HybridSearchService:
             traceback.print_exc()
             return [], []
 
-    def _extract_metadata_keywords(self, prompt: str) -> Dict[str, List[str]]:
+    def _lexical_search(self, prompt: str, video=None, limit: int = 30) -> List[Event]:
+        """BM25 로컬 검색 (비디오 범위, 네트워크 호출 없음)"""
+        if video is None:
+            return []
+
+        print(f"📚 BM25 Lexical 검색 시작 (후보군 {limit}개)")
+        return self.lexical_search.search(prompt, video, limit=limit)
+
+    def _extract_metadata_keywords(self, prompt: str) -> Dict[str, list]:
         """
         사용자 질문에서 메타데이터 키워드 추출
 
         Returns:
             {
                 'objects': ['칼', '담배', '술', ...],
-                'actions': ['걷기', '서있기', ...],
-                'persons': ['남자', '여자', ...]
+                'actions': ['walking', 'standing', ...],
+                'persons': ['male', 'female'],
+                'ages': [(20, 30)],            # [하한, 상한) - None은 무제한
+                'locations': [1],               # attr_location
+                'areas': [3],                   # attr_area_of_interest
             }
         """
-        keywords = {"objects": [], "actions": [], "persons": []}
-
-        # 객체 키워드 (objects_detected 필드에서 검색)
+        keywords = {
+            "objects": [],
+            "actions": [],
+            "persons": [],
+            "ages": [],
+            "locations": [],
+            "areas": [],
+        }
+
+        # 객체 키워드 (전용 컬럼 없음 - 로그/프롬프트 참고용)
         object_keywords = [
             "칼",
             "담배",
@@ -291,31 +479,63 @@ class HybridSearchService:
             if keyword in prompt:
                 keywords["objects"].append(keyword)
 
-        # 행동 키워드 (action_detected 필드)
-        action_keywords = [
-            "걷기",
-            "서있기",
-            "앉기",
-            "뛰기",
-            "넘어짐",
-            "쓰러짐",
-            "싸움",
-            "도난",
-            "훔침",
-        ]
-        for keyword in action_keywords:
-            if keyword in prompt:
-                keywords["actions"].append(keyword)
-
-        # 인물 키워드 (gender, age 필드)
+        # 행동 키워드 → action / attr_action_detected 값
+        action_keywords = {
+            "걷기": "walking",
+            "서있기": "standing",
+            "앉기": "sitting",
+            "뛰기": "running",
+            "넘어짐": "collapse",
+            "쓰러짐": "collapse",
+            "싸움": "fighting",
+            "도난": "theft",
+            "훔침": "theft",
+        }
+        for keyword, action in action_keywords.items():
+            if keyword in prompt and action not in keywords["actions"]:
+                keywords["actions"].append(action)
+
+        # 인물 키워드 (gender 필드)
         if "남자" in prompt or "남성" in prompt:
             keywords["persons"].append("male")
         if "여자" in prompt or "여성" in prompt:
             keywords["persons"].append("female")
 
+        # 나이 키워드 (attr_age 필드): "20대", "30세 이상", "15세 미만", "40세"
+        for match in re.finditer(r"(\d)0대", prompt):
+            decade = int(match.group(1)) * 10
+            keywords["ages"].append((decade, decade + 10))
+        for match in re.finditer(r"(\d{1,3})\s*(?:세|살)\s*(이상|초과|이하|미만)?", prompt):
+            age = int(match.group(1))
+            bound = match.group(2)
+            if bound in ("이상", "초과"):
+                keywords["ages"].append((age, None))
+            elif bound in ("이하", "미만"):
+                keywords["ages"].append((None, age + 1 if bound == "이하" else age))
+            else:
+                keywords["ages"].append((age, age + 1))
+
+        # 화면 위치 키워드 (attr_location / attr_area_of_interest 필드)
+        positions = [
+            code
+            for word, code in (("왼쪽", 1), ("가운데", 2), ("중앙", 2), ("오른쪽", 3))
+            if word in prompt
+        ]
+        if "관심 영역" in prompt or "관심영역" in prompt:
+            keywords["areas"] = positions
+        else:
+            keywords["locations"] = positions
+
         return keywords
 
-    def _vector_search(self, prompt: str, video=None, limit: int = 5) -> List[Event]:
+    def _vector_search(
+        self,
+        prompt: str,
+        video=None,
+        limit: int = 5,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> List[Event]:
         """
         pgvector로 의미 기반 유사도 검색 + Metadata Filtering
 
@@ -323,6 +543,8 @@ class HybridSearchService:
             prompt: 사용자 질문
             video: 대상 비디오 (선택)
             limit: 반환할 최대 이벤트 수
+            ef_search: HNSW 탐색 후보 수 (None이면 VECTOR_HNSW_EF_SEARCH)
+            probes: IVFFlat 탐색 리스트 수 (None이면 VECTOR_IVFFLAT_PROBES)
 
         Returns:
             유사도 + Metadata 필터링된 이벤트 리스트
@@ -331,15 +553,13 @@ class HybridSearchService:
             # 1. 메타데이터 키워드 추출
             metadata_keywords = self._extract_metadata_keywords(prompt)
 
-            # 2. 임베딩 생성
-            query_embedding = self.rag_search.create_embedding(prompt)
-            if not query_embedding:
-                print(f"⚠️ 임베딩 생성 실패")
-                return []
+            # 2. 검색할 embedding 버전 (재임베딩 중이면 비디오별로 이전/새 버전 공존)
+            if video:
+                versions = [get_video_embedding_versions([video.pk])[video.pk]]
+            else:
+                versions = get_active_embedding_versions()
 
             # 3. 기본 쿼리셋 구성
-            from django.contrib.postgres.aggregates import ArrayAgg
-            from pgvector.django import CosineDistance
             from django.db.models import Q
 
             queryset = Event.objects.filter(embedding__isnull=False)
@@ -348,35 +568,76 @@ class HybridSearchService:
             if video:
                 queryset = queryset.filter(video=video)
 
-            # 4. Metadata Filtering 적용 ⭐ NEW
-            # objects_detected JSONB 필드 활용
+            # 4. Metadata Filtering 적용 (attributes 생성 컬럼 - B-tree 인덱스)
             if metadata_keywords["objects"]:
-                print(f"🔍 객체 필터링: {metadata_keywords['objects']}")
-                object_filters = Q()
-                for obj in metadata_keywords["objects"]:
-                    # JSONB 필드에서 객체 검색
-                    object_filters |= Q(objects_detected__icontains=obj)
-                queryset = queryset.filter(object_filters)
-
-            # action_detected 필터링
+                # 객체 전용 컬럼이 없음 → 임베딩 유사도에 맡김
+                print(f"🔍 객체 키워드 (필터 없음): {metadata_keywords['objects']}")
+
+            # 행동 필터링 (action / attr_action_detected 정확 매칭)
             if metadata_keywords["actions"]:
                 print(f"🔍 행동 필터링: {metadata_keywords['actions']}")
-                action_filters = Q()
-                for action in metadata_keywords["actions"]:
-                    action_filters |= Q(action_detected__icontains=action)
-                queryset = queryset.filter(action_filters)
+                queryset = queryset.filter(
+                    Q(action__in=metadata_keywords["actions"])
+                    | Q(attr_action_detected__in=metadata_keywords["actions"])
+                    | Q(event_type__in=metadata_keywords["actions"])
+                )
 
             # gender 필터링
             if metadata_keywords["persons"]:
                 print(f"🔍 성별 필터링: {metadata_keywords['persons']}")
                 queryset = queryset.filter(gender__in=metadata_keywords["persons"])
 
-            # 5. pgvector 유사도 검색
-            similar_events = (
-                queryset.annotate(distance=CosineDistance("embedding", query_embedding))
-                .filter(distance__lt=0.3)  # 유사도 임계값 (거리가 작을수록 유사)
-                .order_by("distance")[:limit]
-            )
+            # 나이 필터링 (attr_age 범위)
+            if metadata_keywords["ages"]:
+                print(f"🔍 나이 필터링: {metadata_keywords['ages']}")
+                age_filters = Q()
+                for lower, upper in metadata_keywords["ages"]:
+                    age_filter = Q(attr_age__isnull=False)
+                    if lower is not None:
+                        age_filter &= Q(attr_age__gte=lower)
+                    if upper is not None:
+                        age_filter &= Q(attr_age__lt=upper)
+                    age_filters |= age_filter
+                queryset = queryset.filter(age_filters)
+
+            # 화면 위치 / 관심 영역 필터링
+            if metadata_keywords["locations"]:
+                print(f"🔍 위치 필터링: {metadata_keywords['locations']}")
+                queryset = queryset.filter(attr_location__in=metadata_keywords["locations"])
+            if metadata_keywords["areas"]:
+                print(f"🔍 관심 영역 필터링: {metadata_keywords['areas']}")
+                queryset = queryset.filter(
+                    attr_area_of_interest__in=metadata_keywords["areas"]
+                )
+
+            # 5. pgvector 유사도 검색 (HNSW/IVFFlat 인덱스, 호출별 탐색 파라미터)
+            #    VECTOR_QUANTIZATION=halfvec/binary면 양자화 인덱스 후보 → 원본 벡터 재채점
+            #    쿼리 벡터는 버전별 모델로 생성하고 같은 버전의 이벤트만 비교
+            similar_events = []
+            for version in versions:
+                query_embedding = self.rag_search.create_embedding(
+                    prompt, model_id=parse_embedding_version(version)[0]
+                )
+                if not query_embedding:
+                    print(f"⚠️ 임베딩 생성 실패 (version={version})")
+                    continue
+
+                similar_events.extend(
+                    vector_search(
+                        queryset.filter(embedding_version=version),
+                        query_embedding,
+                        limit,
+                        max_distance=0.3,  # 유사도 임계값 (거리가 작을수록 유사)
+                        ef_search=ef_search,
+                        probes=probes,
+                        scoped=video is not None,
+                    )
+                )
+
+            if len(versions) > 1:
+                similar_events = sorted(similar_events, key=lambda event: event.distance)[
+                    :limit
+                ]
 
             filtered_count = queryset.count()
             result_count = len(similar_events)
@@ -384,7 +645,7 @@ class HybridSearchService:
                 f"📊 Metadata 필터링: {filtered_count}개 후보 → pgvector 검색: {result_count}개"
             )
 
-            return list(similar_events)
+            return similar_events
 
         except Exception as e:
             print(f"❌ pgvector 검색 오류: {str(e)}")
@@ -394,6 +655,34 @@ class HybridSearchService:
             return []
 
 
+# 검색 단계 병렬 실행용 스레드풀 (프로세스 공유, 크기 제한)
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    """하이브리드 검색 스레드풀 싱글톤 인스턴스"""
+    global _search_executor
+
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "HYBRID_SEARCH_MAX_WORKERS", 8),
+                    thread_name_prefix="hybrid-search",
+                )
+
+    return _search_executor
+
+
+def _run_in_worker(func: Callable, *args):
+    """워커 스레드에서 실행 후 스레드 전용 DB 커넥션 반환 (replica 포함)"""
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
 # 싱글톤 인스턴스
 _hybrid_search_service = None
 
@@ -0,0 +1,284 @@
+"""
+로컬 Lexical 검색 서비스 (네트워크 호출 없음)
+- 비디오별 in-memory BM25 인덱스 (searchable_text + keywords)
+- 한국어 질의 → 영문 메타데이터 용어 확장
+- Reciprocal Rank Fusion (RRF)으로 Text2SQL / pgvector / BM25 결과 통합
+"""
+
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from apps.db.models import Event
+
+from .answer_cache import get_video_data_signatures
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣_]+")
+HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+# 한국어 질의 용어 → searchable_text/keywords의 영문 값
+# 어절 앞부분과 비교 (편집 ≠ 집, 1시간 넘어서 ≠ 넘어지다) → 다의어는 활용형까지 적어 구분
+QUERY_SYNONYMS = {
+    "남자": ["male"],
+    "남성": ["male"],
+    "여자": ["female"],
+    "여성": ["female"],
+    "도난": ["theft"],
+    "훔": ["theft", "picking"],
+    "절도": ["theft"],
+    "쓰러": ["collapse"],
+    "넘어지": ["collapse"],
+    "넘어져": ["collapse"],
+    "넘어진": ["collapse"],
+    "넘어짐": ["collapse"],
+    "점거": ["sitting"],
+    "앉": ["sitting"],
+    "걷": ["walking"],
+    "걸어": ["walking"],
+    "서있": ["standing"],
+    "물건": ["picking", "interaction"],
+    "집어": ["picking"],
+    "집는": ["picking"],
+    "집은": ["picking"],
+    "입장": ["person_enter"],
+    "들어오는": ["person_enter"],
+    "들어오다": ["person_enter"],
+    "들어온": ["person_enter"],
+    "들어와": ["person_enter"],
+    "들어옴": ["person_enter"],
+    "퇴장": ["person_exit"],
+    "나가": ["person_exit"],
+    "이상행동": ["anomaly"],
+    "이상징후": ["anomaly"],
+    "젊": ["young"],
+    "청년": ["young"],
+    "중년": ["middle"],
+    "노인": ["old"],
+    "어르신": ["old"],
+    "행복": ["happy"],
+    "웃": ["happy"],
+    "슬픔": ["sad"],
+    "슬퍼": ["sad"],
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 + 한글 토큰의 2-gram (조사가 붙은 어절 매칭용)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or "").lower()):
+        tokens.append(token)
+        if len(token) > 2 and HANGUL_PATTERN.match(token):
+            tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+    return tokens
+
+
+def expand_query(query: str) -> List[str]:
+    """
+    질의 토큰화 + 한국어 → 영문 메타데이터 용어 확장
+
+    용어는 어절(또는 띄어 쓴 두 어절을 붙인 것, 예: "이상 행동")의 앞부분과 비교
+    """
+    tokens = tokenize(query)
+    words = TOKEN_PATTERN.findall((query or "").lower())
+    candidates = words + [a + b for a, b in zip(words, words[1:])]
+    for keyword, expansions in QUERY_SYNONYMS.items():
+        if any(word.startswith(keyword) for word in candidates):
+            tokens.extend(expansions)
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]], k: int = 60
+) -> List[Tuple[Hashable, float]]:
+    """
+    Reciprocal Rank Fusion
+
+    score(d) = Σ 1 / (k + rank_i(d)), rank는 1부터
+
+    Args:
+        rankings: 각 검색기의 순위 리스트 (앞쪽이 상위)
+        k: RRF 상수 (클수록 하위 순위 영향 증가)
+
+    Returns:
+        [(항목, RRF 점수), ...] - 점수 내림차순 (동점이면 먼저 등장한 순서)
+    """
+    scores: Dict[Hashable, float] = {}
+    first_seen: Dict[Hashable, int] = {}
+
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+            first_seen.setdefault(item, len(first_seen))
+
+    return sorted(scores.items(), key=lambda pair: (-pair[1], first_seen[pair[0]]))
+
+
+class BM25Index:
+    """Okapi BM25 역색인"""
+
+    def __init__(
+        self,
+        doc_ids: List[int],
+        documents: List[List[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.doc_ids = doc_ids
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths = [len(tokens) for tokens in documents]
+        self.avg_doc_length = (
+            sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        )
+
+        # term -> [(doc_index, tf), ...]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_index, tokens in enumerate(documents):
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, []).append((doc_index, tf))
+
+        doc_count = len(documents)
+        self.idf = {
+            term: math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def search(self, query_tokens: Iterable[str], limit: int) -> List[Tuple[int, float]]:
+        """
+        Returns:
+            [(doc_id, BM25 점수), ...] - 점수 내림차순 상위 limit개
+        """
+        scores: Dict[int, float] = {}
+
+        for term in set(query_tokens):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = self.idf[term]
+            for doc_index, tf in posting:
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_lengths[doc_index] / (self.avg_doc_length or 1.0)
+                )
+                scores[doc_index] = scores.get(doc_index, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])
+        return [(self.doc_ids[doc_index], score) for doc_index, score in top]
+
+
+class LexicalSearchService:
+    """비디오별 BM25 인덱스 기반 로컬 검색 (이벤트 변경 시 자동 재생성)"""
+
+    def __init__(self, max_videos: Optional[int] = None):
+        """
+        Args:
+            max_videos: 메모리에 유지할 비디오 인덱스 최대 개수 (LRU)
+        """
+        self.max_videos = (
+            max_videos
+            if max_videos is not None
+            else getattr(settings, "LEXICAL_SEARCH_MAX_VIDEOS", 64)
+        )
+        # video_id -> (signature, BM25Index)
+        self._indexes: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, query: str, video, limit: int = 30) -> List[Event]:
+        """
+        BM25로 비디오 내 이벤트 검색
+
+        Args:
+            query: 사용자 질문
+            video: 대상 비디오 (None이면 검색하지 않음 - 전체 인덱스는 메모리 부담)
+            limit: 반환할 최대 이벤트 수
+
+        Returns:
+            BM25 점수 순 Event 리스트
+        """
+        if video is None:
+            return []
+
+        query_tokens = expand_query(query)
+        if not query_tokens:
+            return []
+
+        try:
+            index = self._get_index(video.pk)
+            ranked = index.search(query_tokens, limit)
+            if not ranked:
+                return []
+
+            events_by_id = Event.objects.select_related("video").in_bulk(
+                [doc_id for doc_id, _ in ranked]
+            )
+            return [events_by_id[doc_id] for doc_id, _ in ranked if doc_id in events_by_id]
+
+        except Exception as e:
+            logger.error(f"❌ Lexical 검색 오류: {str(e)}")
+            return []
+
+    def invalidate(self, video_id: Optional[int] = None) -> None:
+        """인덱스 무효화 (video_id 미지정 시 전체)"""
+        with self._lock:
+            if video_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(video_id, None)
+
+    def _get_index(self, video_id: int) -> BM25Index:
+        # 변경 감지용 시그니처 (data_version, count, max id) - 텍스트 수정은 data_version으로 감지
+        signature = get_video_data_signatures([video_id]).get(video_id)
+
+        with self._lock:
+            cached = self._indexes.get(video_id)
+            if cached is not None and cached[0] == signature:
+                self._indexes.move_to_end(video_id)
+                return cached[1]
+
+        index = self._build_index(video_id)
+
+        with self._lock:
+            self._indexes[video_id] = (signature, index)
+            self._indexes.move_to_end(video_id)
+            while len(self._indexes) > self.max_videos:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def _build_index(self, video_id: int) -> BM25Index:
+        doc_ids = []
+        documents = []
+
+        rows = Event.objects.filter(video_id=video_id).values_list(
+            "id", "searchable_text", "keywords"
+        )
+        for event_id, searchable_text, keywords in rows:
+            doc_ids.append(event_id)
+            documents.append(
+                tokenize(f"{searchable_text or ''} {' '.join(keywords or [])}")
+            )
+
+        logger.info(f"📚 BM25 인덱스 생성: video_id={video_id}, {len(doc_ids)}개 이벤트")
+        return BM25Index(doc_ids, documents)
+
+
+# 싱글톤 인스턴스
+_lexical_search_service = None
+
+
+def get_lexical_search_service() -> LexicalSearchService:
+    """Lexical 검색 서비스 싱글톤 인스턴스 반환"""
+    global _lexical_search_service
+
+    if _lexical_search_service is None:
+        _lexical_search_service = LexicalSearchService()
+
+    return _lexical_search_service
@@ -0,0 +1,384 @@
+"""
+Embedding 모델 교체 - 점진적 재임베딩 계획/실행
+- 대상: 활성 버전이 목표 버전과 다르거나, 목표 버전이 아닌 벡터가 남은 비디오
+- 우선순위: Hot → Warm → Cold 티어, 같은 티어는 검색 수 / hotness 높은 순
+- 비디오별 예상 비용/시간: 저장소에 없는 고유 embedding 텍스트의 토큰 수 기준
+- 실행: 새 모델 벡터를 콘텐츠 주소 저장소에 먼저 고정 저장 (검색은 계속 이전 버전)
+  → 비디오 행 잠금 후 이벤트/분석 벡터 + Video.embedding_version을 한 트랜잭션으로 전환
+- 범위 밖: PromptSession / PromptInteraction 벡터는 재임베딩하지 않음
+  (query_embedding은 답변 캐시 - 현재 버전만 조회하므로 이전 버전 행은 TTL로 자연 만료,
+   context_embedding / response_embedding은 검색에 사용하지 않음)
+"""
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, IntegerField, OuterRef, Q, When
+
+from apps.db.models import EmbeddingCacheEntry, Event, Video, VideoAnalysis
+
+from .embedding_cache import EmbeddingCacheService, get_embedding_cache
+from .embedding_version import (
+    event_embedding_text,
+    get_current_embedding_version,
+    parse_embedding_version,
+)
+
+logger = logging.getLogger(__name__)
+
+TIER_PRIORITY = Case(
+    When(data_tier="hot", then=0),
+    When(data_tier="warm", then=1),
+    default=2,
+    output_field=IntegerField(),
+)
+
+
+@dataclass
+class VideoReembedPlan:
+    """비디오 1개의 재임베딩 예상치"""
+
+    video_id: int
+    name: str
+    data_tier: str
+    search_count: int
+    current_version: str
+    events: int = 0
+    analyses: int = 0
+    unique_texts: int = 0
+    staged_texts: int = 0  # 저장소에 이미 목표 모델 벡터가 있는 텍스트 (API 호출 없음)
+    tokens: int = 0
+    cost_usd: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def pending_texts(self) -> int:
+        return self.unique_texts - self.staged_texts
+
+    def as_dict(self) -> Dict:
+        data = asdict(self)
+        data["pending_texts"] = self.pending_texts
+        return data
+
+
+class ReembedPlannerService:
+    """우선순위 기반 점진적 재임베딩 계획 / 실행"""
+
+    def __init__(
+        self,
+        price_per_1k_tokens: Optional[float] = None,
+        chars_per_token: Optional[float] = None,
+        rate: Optional[float] = None,
+    ):
+        """
+        Args:
+            price_per_1k_tokens: 목표 모델의 1,000 토큰당 가격 (USD)
+            chars_per_token: 토큰 수 추정용 평균 글자 수
+            rate: 초당 Bedrock 요청 수 (시간 추정 + 실행 속도)
+        """
+        self.price_per_1k_tokens = (
+            price_per_1k_tokens
+            if price_per_1k_tokens is not None
+            else getattr(settings, "EMBEDDING_PRICE_PER_1K_TOKENS", 0.00002)
+        )
+        self.chars_per_token = (
+            chars_per_token
+            if chars_per_token is not None
+            else getattr(settings, "EMBEDDING_CHARS_PER_TOKEN", 4.0)
+        )
+        self.rate = (
+            rate if rate is not None else getattr(settings, "EMBEDDING_BACKFILL_RATE", 50.0)
+        )
+        self._backfill = None
+
+    # ------------------------------------------------------------------
+    # 계획
+    # ------------------------------------------------------------------
+    def candidates(self, target_version: str, video_ids: Optional[List[int]] = None):
+        """재임베딩이 필요한 비디오 (우선순위 순 QuerySet)"""
+        stale_events = Event.objects.filter(
+            video=OuterRef("pk"), embedding__isnull=False
+        ).exclude(embedding_version=target_version)
+
+        queryset = Video.objects.filter(
+            ~Q(embedding_version=target_version) | Q(Exists(stale_events))
+        )
+        if video_ids:
+            queryset = queryset.filter(pk__in=video_ids)
+
+        return queryset.annotate(tier_priority=TIER_PRIORITY).order_by(
+            "tier_priority", "-search_count", "-hotness_score", "pk"
+        )
+
+    def plan(
+        self,
+        target_version: str,
+        limit: Optional[int] = None,
+        video_ids: Optional[List[int]] = None,
+    ) -> List[VideoReembedPlan]:
+        """우선순위 순 비디오별 예상 비용/시간"""
+        videos = self.candidates(target_version, video_ids)
+        if limit:
+            videos = videos[:limit]
+        return [self.estimate(video, target_version) for video in videos]
+
+    def estimate(self, video: Video, target_version: str) -> VideoReembedPlan:
+        model_id, dimension = parse_embedding_version(target_version)
+        event_texts = self._event_texts(video.pk, target_version)
+        analysis_texts = self._analysis_texts(video.pk)
+        texts = set(event_texts.values()) | set(analysis_texts.values())
+
+        staged = self._staged_hashes(texts, model_id, dimension)
+        pending = [
+            text
+            for text in texts
+            if EmbeddingCacheService.make_text_hash(text) not in staged
+        ]
+
+        plan = VideoReembedPlan(
+            video_id=video.pk,
+            name=video.name or video.filename,
+            data_tier=video.data_tier,
+            search_count=video.search_count,
+            current_version=video.embedding_version or get_current_embedding_version(),
+            events=len(event_texts),
+            analyses=len(analysis_texts),
+            unique_texts=len(texts),
+            staged_texts=len(texts) - len(pending),
+            tokens=int(sum(len(text) for text in pending) / self.chars_per_token),
+        )
+        plan.cost_usd = plan.tokens / 1000 * self.price_per_1k_tokens
+        plan.seconds = plan.pending_texts / self.rate if self.rate else 0.0
+        return plan
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """버전별 비디오 / 이벤트 수 (진행 상황 확인용)"""
+        current = get_current_embedding_version()
+        result: Dict[str, Dict[str, int]] = {}
+
+        for row in Video.objects.values("embedding_version").annotate(count=Count("id")):
+            version = row["embedding_version"] or current
+            result.setdefault(version, {"videos": 0, "events": 0})
+            result[version]["videos"] += row["count"]
+
+        for row in (
+            Event.objects.filter(embedding__isnull=False)
+            .values("embedding_version")
+            .annotate(count=Count("id"))
+        ):
+            version = row["embedding_version"] or "(unversioned)"
+            result.setdefault(version, {"videos": 0, "events": 0})
+            result[version]["events"] += row["count"]
+
+        return result
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def reembed_video(
+        self,
+        video_id: int,
+        target_version: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict:
+        """
+        비디오 1개 재임베딩 (준비 → 원자적 전환)
+
+        준비 단계에서 실패한 텍스트가 있으면 전환하지 않음 → 검색은 이전 버전 유지, 재실행 시 이어서 처리
+
+        Returns:
+            {'video_id', 'switched', 'texts', 'api_calls', 'failed', 'events', 'analyses',
+             'requeued', 'elapsed_seconds'}
+        """
+        from .embedding_backfill import EmbeddingBackfillService
+
+        if self._backfill is None:
+            # 재임베딩 전용 속도 제한 (온라인 아웃박스 처리와 별도 할당량으로 조절)
+            self._backfill = EmbeddingBackfillService(rate=self.rate)
+        backfill = self._backfill
+
+        model_id, dimension = parse_embedding_version(target_version)
+        started_at = time.monotonic()
+
+        texts = list(
+            dict.fromkeys(
+                list(self._event_texts(video_id, target_version).values())
+                + list(self._analysis_texts(video_id).values())
+            )
+        )
+        result = {
+            "video_id": video_id,
+            "switched": False,
+            "texts": len(texts),
+            "api_calls": 0,
+            "failed": 0,
+            "events": 0,
+            "analyses": 0,
+            "requeued": 0,
+            "elapsed_seconds": 0.0,
+        }
+
+        # 1. 준비: 목표 모델 벡터를 저장소에 고정 저장 (청크별 - 벡터를 메모리에 모으지 않음)
+        for offset in range(0, len(texts), backfill.chunk_size):
+            chunk = texts[offset : offset + backfill.chunk_size]
+            _, progress = backfill.embed_texts(chunk, model_id, dimension)
+            result["api_calls"] += progress.api_calls
+            result["failed"] += progress.failed
+            if on_progress:
+                on_progress(min(offset + len(chunk), len(texts)), len(texts))
+
+        if result["failed"]:
+            logger.warning(
+                f"⚠️ Video {video_id} 재임베딩 보류: 텍스트 {result['failed']}개 실패 "
+                f"(검색은 이전 버전 유지)"
+            )
+            result["elapsed_seconds"] = time.monotonic() - started_at
+            return result
+
+        # 2. 전환: 비디오 행 잠금 → 벡터 + 버전 일괄 교체 (커밋 전까지 검색은 이전 버전)
+        with transaction.atomic():
+            Video.objects.select_for_update().only("pk").get(pk=video_id)
+
+            result["events"], requeue_ids = self._switch_events(
+                video_id, target_version, model_id, dimension
+            )
+            result["analyses"] = self._switch_analyses(
+                video_id, target_version, model_id, dimension
+            )
+
+            # 준비 이후 추가된 이벤트 → 아웃박스가 새 버전으로 생성 (커밋 후)
+            if requeue_ids:
+                from .embedding_outbox import get_embedding_outbox
+
+                get_embedding_outbox().enqueue(requeue_ids)
+            result["requeued"] = len(requeue_ids)
+
+            # 검색 결과가 바뀌므로 답변 캐시도 무효화
+            Video.objects.filter(pk=video_id).update(
+                embedding_version=target_version, data_version=F("data_version") + 1
+            )
+
+        result["switched"] = True
+        result["elapsed_seconds"] = time.monotonic() - started_at
+        logger.info(
+            f"🔁 Video {video_id} embedding 전환 완료 → {target_version}: "
+            f"이벤트 {result['events']}개, 분석 {result['analyses']}개, "
+            f"API {result['api_calls']}회, 재등록 {result['requeued']}개"
+        )
+        return result
+
+    def _switch_events(
+        self, video_id: int, target_version: str, model_id: str, dimension: int
+    ) -> tuple:
+        cache = get_embedding_cache()
+        chunk_size = getattr(settings, "EMBEDDING_BACKFILL_CHUNK_SIZE", 200)
+        rows = list(self._event_texts(video_id, target_version).items())
+        switched = []
+        requeue_ids = []
+
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset : offset + chunk_size]
+            embeddings = cache.get_many(
+                list({text for _, text in chunk}), model_id, dimension
+            )
+
+            updates = []
+            for event_id, text in chunk:
+                embedding = embeddings.get(text)
+                (switched if embedding else requeue_ids).append(event_id)
+                updates.append(
+                    Event(
+                        id=event_id,
+                        embedding=embedding,
+                        embedding_version=target_version if embedding else "",
+                    )
+                )
+            Event.objects.bulk_update(updates, ["embedding", "embedding_version"])
+
+        return len(switched), requeue_ids
+
+    def _switch_analyses(
+        self, video_id: int, target_version: str, model_id: str, dimension: int
+    ) -> int:
+        rows = self._analysis_texts(video_id)
+        if not rows:
+            return 0
+
+        embeddings = get_embedding_cache().get_many(
+            list(set(rows.values())), model_id, dimension
+        )
+        updates = [
+            VideoAnalysis(
+                id=analysis_id,
+                embedding=embeddings[text],
+                embedding_version=target_version,
+            )
+            for analysis_id, text in rows.items()
+            if text in embeddings
+        ]
+        VideoAnalysis.objects.bulk_update(
+            updates, ["embedding", "embedding_version"], batch_size=500
+        )
+        return len(updates)
+
+    # ------------------------------------------------------------------
+    # 텍스트 수집
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _event_texts(video_id: int, version: str) -> Dict[int, str]:
+        """{event_id: embedding 텍스트} (목표 버전의 텍스트 개정 규칙 - 백필과 동일)"""
+        rows = (
+            Event.objects.filter(video_id=video_id)
+            .exclude(Q(searchable_text__isnull=True) | Q(searchable_text=""))
+            .order_by("id")
+            .values_list("id", "searchable_text")
+        )
+        texts = {}
+        for event_id, searchable_text in rows:
+            text = event_embedding_text(searchable_text, version)
+            if text:
+                texts[event_id] = text
+        return texts
+
+    @staticmethod
+    def _analysis_texts(video_id: int) -> Dict[int, str]:
+        """{analysis_id: searchable_text} - 기존 벡터가 있는 분석 결과만"""
+        return dict(
+            VideoAnalysis.objects.filter(video_id=video_id, embedding__isnull=False)
+            .exclude(searchable_text="")
+            .order_by("id")
+            .values_list("id", "searchable_text")
+        )
+
+    @staticmethod
+    def _staged_hashes(texts: Set[str], model_id: str, dimension: int) -> Set[str]:
+        """저장소에 이미 있는 텍스트 해시 (벡터는 읽지 않음)"""
+        hashes = [EmbeddingCacheService.make_text_hash(text) for text in texts]
+        staged = set()
+        for offset in range(0, len(hashes), 1000):
+            staged.update(
+                EmbeddingCacheEntry.objects.filter(
+                    model_id=model_id,
+                    dimension=dimension,
+                    text_hash__in=hashes[offset : offset + 1000],
+                ).values_list("text_hash", flat=True)
+            )
+        return staged
+
+
+# 싱글톤 인스턴스
+_reembed_planner = None
+
+
+def get_reembed_planner() -> ReembedPlannerService:
+    """재임베딩 계획 서비스 싱글톤 인스턴스 반환"""
+    global _reembed_planner
+
+    if _reembed_planner is None:
+        _reembed_planner = ReembedPlannerService()
+
+    return _reembed_planner
@@ -4,14 +4,206 @@ RAG 검색 서비스 - Bedrock + pgvector 통합
 
 import boto3
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.db.models import Count, F, Max
 from django.utils import timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+class EmbeddingMatrix:
+    """
+    정규화된 float32 임베딩 행렬 (행 = 분석 결과)
+
+    코사인 유사도 = 정규화 행렬 @ 정규화 쿼리 (1회 행렬-벡터 곱)
+    """
+
+    def __init__(self, ids: List[int], embeddings, dimension: int = 1024):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        matrix = (
+            np.asarray(embeddings, dtype=np.float32)
+            if len(embeddings)
+            else np.empty((0, dimension), dtype=np.float32)
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def top_k(
+        self, query: List[float], k: int, min_score: float = -1.0
+    ) -> List[Tuple[int, float]]:
+        """
+        Returns:
+            [(id, 코사인 유사도), ...] - 유사도 내림차순 상위 k개 (min_score 이상)
+        """
+        if len(self.ids) == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        scores = self.matrix @ (query / norm)
+
+        # 전체 정렬 O(n log n) 대신 argpartition O(n) + 상위 k개만 정렬
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (int(self.ids[i]), float(scores[i])) for i in top if scores[i] >= min_score
+        ]
+
+
+class EmbeddingMatrixCache:
+    """비디오 범위 + embedding 버전별 Hot 임베딩 행렬 캐시 (분석 결과 추가/삭제/재임베딩 시 재생성)"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = (
+            max_size
+            if max_size is not None
+            else getattr(settings, "RAG_MATRIX_CACHE_SIZE", 32)
+        )
+        # (video_id(None = 전체), 버전) -> (signature, EmbeddingMatrix)
+        self._matrices: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, video_id: Optional[int] = None, version: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """
+        Args:
+            video_id: 비디오 범위 (None = 전체)
+            version: embedding 버전 (기본: 현재 버전) - 쿼리 벡터와 같은 모델의 행만 포함
+        """
+        from apps.db.models import VideoAnalysis
+
+        from .embedding_version import get_current_embedding_version
+
+        version = version or get_current_embedding_version()
+        queryset = VideoAnalysis.objects.filter(
+            data_tier="hot", embedding__isnull=False, embedding_version=version
+        )
+        if video_id:
+            queryset = queryset.filter(video_id=video_id)
+
+        key = (video_id, version)
+        stats = queryset.aggregate(count=Count("id"), max_id=Max("id"))
+        signature = (stats["count"], stats["max_id"])
+
+        with self._lock:
+            cached = self._matrices.get(key)
+            if cached is not None and cached[0] == signature:
+                self._matrices.move_to_end(key)
+                return cached[1]
+
+        rows = list(queryset.order_by("id").values_list("id", "embedding"))
+        matrix = EmbeddingMatrix(
+            [row[0] for row in rows], [row[1] for row in rows]
+        )
+        logger.info(
+            f"🧮 임베딩 행렬 생성: video_id={video_id}, version={version}, {len(matrix)}행"
+        )
+
+        with self._lock:
+            self._matrices[key] = (signature, matrix)
+            self._matrices.move_to_end(key)
+            while len(self._matrices) > self.max_size:
+                self._matrices.popitem(last=False)
+
+        return matrix
+
+
+class WarmDataCache:
+    """S3 Warm 데이터 LRU 캐시 (TTL)"""
+
+    def __init__(self, max_size: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_size = (
+            max_size
+            if max_size is not None
+            else getattr(settings, "RAG_WARM_CACHE_SIZE", 1024)
+        )
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else getattr(settings, "RAG_WARM_CACHE_TTL", 600)
+        )
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_embedding_matrix_cache = None
+_warm_data_cache = None
+_s3_client = None
+_singleton_lock = threading.Lock()
+
+
+def get_embedding_matrix_cache() -> EmbeddingMatrixCache:
+    """Hot 임베딩 행렬 캐시 싱글톤 인스턴스 반환"""
+    global _embedding_matrix_cache
+
+    if _embedding_matrix_cache is None:
+        with _singleton_lock:
+            if _embedding_matrix_cache is None:
+                _embedding_matrix_cache = EmbeddingMatrixCache()
+
+    return _embedding_matrix_cache
+
+
+def get_warm_data_cache() -> WarmDataCache:
+    """Warm 데이터 캐시 싱글톤 인스턴스 반환"""
+    global _warm_data_cache
+
+    if _warm_data_cache is None:
+        with _singleton_lock:
+            if _warm_data_cache is None:
+                _warm_data_cache = WarmDataCache()
+
+    return _warm_data_cache
+
+
+def _get_s3_client():
+    # boto3 client는 스레드 안전 → 병렬 get_object에서 공유
+    global _s3_client
+
+    if _s3_client is None:
+        with _singleton_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client("s3")
+
+    return _s3_client
+
+
 class RAGSearchService:
     """RAG 기반 비디오 검색 서비스"""
 
@@ -25,8 +217,37 @@ class RAGSearchService:
         self.embedding_dimension = 1024  # v2 권장 차원 (1536 → 1024)
         self.llm_model = settings.AWS_BEDROCK_MODEL_ID
 
-    def create_embedding(self, text: str) -> List[float]:
-        """텍스트를 Bedrock Titan v2로 임베딩 벡터로 변환"""
+    def create_embedding(self, text: str, model_id: Optional[str] = None) -> List[float]:
+        """
+        텍스트를 Bedrock Titan v2로 임베딩 벡터로 변환 (임베딩 캐시 우선 조회)
+
+        Args:
+            model_id: 임베딩 모델 (기본: 현재 설정 - 재임베딩 전 비디오는 이전 모델 지정)
+        """
+        from .embedding_cache import get_embedding_cache
+
+        model_id = model_id or self.embedding_model
+        if model_id != self.embedding_model:
+            # Titan 외 모델은 요청 형식이 다르므로 Bedrock 서비스의 모델별 호출 사용
+            from .bedrock_service import get_bedrock_service
+
+            return (
+                get_bedrock_service().generate_embedding(
+                    text, model_id=model_id, input_type="search_query"
+                )
+                or []
+            )
+
+        embedding = get_embedding_cache().get_or_create(
+            text,
+            model_id,
+            self.embedding_dimension,
+            self._invoke_embedding_model,
+        )
+        return embedding or []
+
+    def _invoke_embedding_model(self, text: str) -> List[float]:
+        """Bedrock Titan v2 임베딩 API 호출"""
         try:
             response = self.bedrock.invoke_model(
                 modelId=self.embedding_model,
@@ -54,145 +275,211 @@ class RAGSearchService:
             logger.error(f"Failed to create embedding with Titan v2: {str(e)}")
             return []
 
-    def search_similar_events(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """유사한 이벤트 검색"""
-        from .models_cloud import VideoAnalysis
-        from .tier_manager import update_search_stats
+    def search_similar_events(
+        self, query: str, limit: int = 5, video_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        유사한 분석 결과 검색
+
+        Hot: float32 임베딩 행렬 1회 행렬-벡터 곱 + argpartition top-k
+        Warm: S3 데이터 병렬 로드(캐시) 후 텍스트 매칭
+        """
+        from apps.db.models import VideoAnalysis
 
-        # 1. 쿼리를 임베딩으로 변환
-        query_embedding = self.create_embedding(query)
-        if not query_embedding:
-            return []
+        from .embedding_version import (
+            get_active_embedding_versions,
+            get_video_embedding_versions,
+            parse_embedding_version,
+        )
+
+        # 1. 검색할 embedding 버전 (비디오 범위면 해당 비디오의 활성 버전,
+        #    전체 범위면 재임베딩 중 공존하는 모든 버전 - 현재 버전이 먼저)
+        if video_id:
+            versions = [get_video_embedding_versions([video_id])[video_id]]
+        else:
+            versions = get_active_embedding_versions()
+
+        # 2. Hot 데이터 검색: 버전별 모델로 쿼리 벡터 생성 → 같은 버전 행렬에서 top-k → 병합
+        min_similarity = getattr(settings, "RAG_SEARCH_MIN_SIMILARITY", 0.7)
+        query_embedding = None
+        top = []
+        for version in versions:
+            version_embedding = self.create_embedding(
+                query, model_id=parse_embedding_version(version)[0]
+            )
+            if not version_embedding:
+                logger.warning(f"⚠️ 쿼리 임베딩 생성 실패 (version={version})")
+                continue
+            query_embedding = query_embedding or version_embedding
+
+            matrix = get_embedding_matrix_cache().get(video_id, version)
+            top.extend(
+                matrix.top_k(version_embedding, limit, min_score=min_similarity)
+            )
 
-        # 2. Hot 데이터에서 먼저 검색 (pgvector 사용)
-        # TODO: pgvector 설치 후 실제 벡터 검색으로 교체
-        hot_analyses = VideoAnalysis.objects.filter(
-            storage_tier="hot", embedding_json__isnull=False
-        ).select_related("video")[
-            : limit * 2
-        ]  # 넉넉하게 가져와서 유사도로 필터링
+        if query_embedding is None:
+            return []
+        if len(versions) > 1:
+            top = sorted(top, key=lambda row: row[1], reverse=True)[:limit]
 
-        # 3. 임시로 JSON 기반 유사도 계산 (나중에 pgvector로 교체)
         results = []
-        for analysis in hot_analyses:
-            if analysis.embedding_json:
-                # 간단한 코사인 유사도 계산 (실제로는 pgvector 사용)
-                similarity = self.calculate_cosine_similarity(
-                    query_embedding, analysis.embedding_json
+        if top:
+            analyses = VideoAnalysis.objects.select_related("video").in_bulk(
+                [analysis_id for analysis_id, _ in top]
+            )
+            for analysis_id, similarity in top:
+                analysis = analyses.get(analysis_id)
+                if analysis is None:
+                    continue
+
+                results.append(
+                    {
+                        "analysis": analysis,
+                        "similarity": similarity,
+                        "video": analysis.video,
+                        "timestamp": analysis.timestamp,
+                        "description": analysis.searchable_text,
+                        "confidence": analysis.confidence,
+                    }
                 )
 
-                if similarity > 0.7:  # 유사도 임계값
-                    # 검색 통계 업데이트
-                    update_search_stats(analysis)
-
-                    results.append(
-                        {
-                            "analysis": analysis,
-                            "similarity": similarity,
-                            "video": analysis.video,
-                            "timestamp": analysis.frame_timestamp,
-                            "description": analysis.scene_description,
-                            "confidence": analysis.confidence_score,
-                        }
-                    )
-
-        # 4. 유사도 순으로 정렬
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-
-        # 5. Hot에서 결과가 부족하면 Warm 데이터도 검색
+            # 3. 검색 통계 일괄 업데이트 (행별 save 대신 UPDATE 1회)
+            VideoAnalysis.objects.filter(pk__in=[r["analysis"].pk for r in results]).update(
+                search_count=F("search_count") + 1, last_accessed=timezone.now()
+            )
+
+        # 4. Hot에서 결과가 부족하면 Warm 데이터도 검색
         if len(results) < limit:
             warm_results = self.search_warm_data(
-                query, query_embedding, limit - len(results)
+                query, query_embedding, limit - len(results), video_id=video_id
             )
             results.extend(warm_results)
 
         return results[:limit]
 
     def search_warm_data(
-        self, query: str, query_embedding: List[float], limit: int
+        self,
+        query: str,
+        query_embedding: List[float],
+        limit: int,
+        video_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Warm 데이터에서 검색 (S3에서 로드)"""
-        from .models_cloud import VideoAnalysis
-        from .tier_manager import get_tier_manager
+        """Warm 데이터에서 검색 (S3 병렬 로드 + 캐시)"""
+        from apps.db.models import VideoAnalysis
 
         # Warm 상태의 분석 데이터 조회
-        warm_analyses = VideoAnalysis.objects.filter(
-            storage_tier="warm"
-        ).select_related("video")[: limit * 3]
+        warm_analyses = VideoAnalysis.objects.filter(data_tier="warm").select_related(
+            "video"
+        )
+        if video_id:
+            warm_analyses = warm_analyses.filter(video_id=video_id)
+        warm_analyses = list(warm_analyses[: limit * 3])
+        if not warm_analyses:
+            return []
+
+        keys = {analysis.pk: self.get_warm_key(analysis) for analysis in warm_analyses}
+        warm_data_by_key = self.load_warm_data_many(list(keys.values()))
 
         results = []
-        tier_manager = get_tier_manager()
+        query_lower = query.lower()
 
         for analysis in warm_analyses:
-            try:
-                # S3에서 Warm 데이터 로드
-                if hasattr(analysis, "s3_warm_key"):
-                    warm_data = self.load_warm_data(analysis.s3_warm_key)
-
-                    # 텍스트 기반 간단 매칭 (임베딩 없음)
-                    if query.lower() in warm_data.get("scene_description", "").lower():
-                        # 자주 검색되면 Hot으로 승격
-                        analysis.update_access_stats()
-                        if analysis.hotness_score >= 30:
-                            tier_manager.promote_to_hot(analysis)
-
-                        results.append(
-                            {
-                                "analysis": analysis,
-                                "similarity": 0.5,  # 텍스트 매칭이므로 중간 점수
-                                "video": analysis.video,
-                                "timestamp": analysis.frame_timestamp,
-                                "description": warm_data.get("scene_description", ""),
-                                "confidence": warm_data.get("confidence_score", 0.0),
-                                "source": "warm",
-                            }
-                        )
-
-                        if len(results) >= limit:
-                            break
+            warm_data = warm_data_by_key.get(keys[analysis.pk]) or {}
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to load warm data for analysis {analysis.id}: {str(e)}"
-                )
+            # 텍스트 기반 간단 매칭 (임베딩 없음)
+            description = warm_data.get("scene_description") or analysis.searchable_text
+            if query_lower not in (description or "").lower():
+                continue
+
+            results.append(
+                {
+                    "analysis": analysis,
+                    "similarity": 0.5,  # 텍스트 매칭이므로 중간 점수
+                    "video": analysis.video,
+                    "timestamp": analysis.timestamp,
+                    "description": description,
+                    "confidence": warm_data.get("confidence_score", analysis.confidence),
+                    "source": "warm",
+                }
+            )
+
+            if len(results) >= limit:
+                break
+
+        if results:
+            VideoAnalysis.objects.filter(pk__in=[r["analysis"].pk for r in results]).update(
+                search_count=F("search_count") + 1, last_accessed=timezone.now()
+            )
 
         return results
 
+    @staticmethod
+    def get_warm_key(analysis) -> str:
+        """Warm 데이터 S3 키 (TierManager.move_to_warm 규칙)"""
+        return getattr(analysis, "s3_warm_key", None) or (
+            f"warm-data/analysis/{analysis.video_id}/{analysis.pk}.json"
+        )
+
     def load_warm_data(self, s3_key: str) -> Dict[str, Any]:
-        """S3에서 Warm 데이터 로드"""
-        try:
-            s3_client = boto3.client("s3")
-            response = s3_client.get_object(Bucket=settings.S3_WARM_BUCKET, Key=s3_key)
-            return json.loads(response["Body"].read())
-        except Exception as e:
-            logger.error(f"Failed to load warm data from {s3_key}: {str(e)}")
-            return {}
+        """S3에서 Warm 데이터 로드 (캐시 우선)"""
+        return self.load_warm_data_many([s3_key]).get(s3_key, {})
 
-    def calculate_cosine_similarity(
-        self, vec1: List[float], vec2: List[float]
-    ) -> float:
-        """코사인 유사도 계산 (임시, pgvector로 교체 예정)"""
-        try:
-            import numpy as np
+    def load_warm_data_many(self, s3_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 Warm 데이터를 병렬로 로드
 
-            # 벡터 정규화
-            vec1 = np.array(vec1)
-            vec2 = np.array(vec2)
+        캐시에 있는 키는 S3를 호출하지 않고, 나머지는 스레드풀에서 동시에 get_object.
+        실패한 키는 빈 딕셔너리 (캐시하지 않음 → 다음 요청에서 재시도).
+        """
+        cache = get_warm_data_cache()
+        results = {}
+        missing = []
 
-            # 코사인 유사도
-            dot_product = np.dot(vec1, vec2)
-            norm_vec1 = np.linalg.norm(vec1)
-            norm_vec2 = np.linalg.norm(vec2)
+        for key in dict.fromkeys(s3_keys):
+            cached = cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                missing.append(key)
 
-            if norm_vec1 == 0 or norm_vec2 == 0:
-                return 0.0
+        if not missing:
+            return results
 
-            return dot_product / (norm_vec1 * norm_vec2)
+        bucket = getattr(settings, "S3_WARM_BUCKET", settings.AWS_STORAGE_BUCKET_NAME)
+        s3_client = _get_s3_client()
 
-        except Exception as e:
-            logger.error(f"Failed to calculate cosine similarity: {str(e)}")
+        def fetch(key):
+            try:
+                response = s3_client.get_object(Bucket=bucket, Key=key)
+                return key, json.loads(response["Body"].read())
+            except Exception as e:
+                logger.error(f"Failed to load warm data from {key}: {str(e)}")
+                return key, None
+
+        max_workers = min(len(missing), getattr(settings, "RAG_WARM_MAX_WORKERS", 8))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for key, data in executor.map(fetch, missing):
+                if data is None:
+                    results[key] = {}
+                    continue
+                cache.set(key, data)
+                results[key] = data
+
+        return results
+
+    def calculate_cosine_similarity(
+        self, vec1: List[float], vec2: List[float]
+    ) -> float:
+        """코사인 유사도 계산 (단건 - 일괄 검색은 EmbeddingMatrix 사용)"""
+        vec1 = np.asarray(vec1, dtype=np.float32)
+        vec2 = np.asarray(vec2, dtype=np.float32)
+
+        norm_product = float(np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        if norm_product == 0.0:
             return 0.0
 
+        return float(np.dot(vec1, vec2) / norm_product)
+
     def generate_answer(self, query: str, search_results: List[Dict[str, Any]]) -> str:
         """검색 결과를 바탕으로 Bedrock으로 최종 답변 생성"""
         if not search_results:
@@ -0,0 +1,211 @@
+"""
+Text2SQL 생성 쿼리 안전 실행기
+- 단일 SELECT/WITH 문만 허용
+- EXPLAIN 예상 비용 상한 초과 시 실행 거부
+- 읽기 전용 트랜잭션 + statement_timeout (SET LOCAL → 커넥션 풀 오염 방지)
+- 서버 사이드 커서로 스트리밍, 최대 행 수 초과분은 잘라냄
+- 복제본(replica) DB alias가 설정되어 있으면 읽기를 복제본으로 전송
+"""
+
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_PREFIX = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+FORBIDDEN_KEYWORDS = re.compile(
+    r"\b(insert|update|delete|merge|drop|alter|create|truncate|grant|revoke|copy|"
+    r"vacuum|analyze|lock|call|do|set|reset|listen|notify|set_config|dblink|"
+    r"pg_sleep|pg_terminate_backend|pg_cancel_backend|pg_read_file|lo_import|lo_export)\b",
+    re.IGNORECASE,
+)
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+class Text2SQLRejected(Exception):
+    """실행 전 검증 단계에서 거부된 쿼리"""
+
+
+@dataclass
+class Text2SQLResult:
+    """가드 실행 결과"""
+
+    columns: List[str] = field(default_factory=list)
+    rows: List[tuple] = field(default_factory=list)
+    truncated: bool = False  # 최대 행 수 초과로 잘림
+    plan_cost: Optional[float] = None
+    db_alias: str = "default"
+    elapsed_ms: float = 0.0
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+class Text2SQLExecutor:
+    """LLM이 생성한 SQL을 비용/시간/행 수 제한 하에서 실행"""
+
+    def __init__(
+        self,
+        max_cost: Optional[float] = None,
+        statement_timeout_ms: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        fetch_size: Optional[int] = None,
+        db_alias: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_cost: EXPLAIN Total Cost 상한 (0이면 비용 검사 생략)
+            statement_timeout_ms: 쿼리 타임아웃 (밀리초)
+            max_rows: 반환할 최대 행 수
+            fetch_size: 서버 사이드 커서 fetchmany 크기
+            db_alias: 실행할 DB alias (None이면 TEXT2SQL_DB_ALIAS, 없으면 default)
+        """
+        self.max_cost = (
+            max_cost
+            if max_cost is not None
+            else getattr(settings, "TEXT2SQL_MAX_PLAN_COST", 100000.0)
+        )
+        self.statement_timeout_ms = (
+            statement_timeout_ms
+            if statement_timeout_ms is not None
+            else getattr(settings, "TEXT2SQL_STATEMENT_TIMEOUT_MS", 5000)
+        )
+        self.max_rows = (
+            max_rows if max_rows is not None else getattr(settings, "TEXT2SQL_MAX_ROWS", 500)
+        )
+        self.fetch_size = (
+            fetch_size
+            if fetch_size is not None
+            else getattr(settings, "TEXT2SQL_FETCH_SIZE", 100)
+        )
+        self.db_alias = db_alias or self._resolve_alias()
+
+    @staticmethod
+    def _resolve_alias() -> str:
+        alias = getattr(settings, "TEXT2SQL_DB_ALIAS", "default") or "default"
+        if alias not in connections.databases:
+            logger.warning(f"⚠️ TEXT2SQL_DB_ALIAS '{alias}' 미설정 → default 사용")
+            return "default"
+        return alias
+
+    @staticmethod
+    def validate(sql: str) -> str:
+        """
+        단일 읽기 전용 문인지 검사
+
+        Returns:
+            정리된 SQL (끝의 세미콜론 제거)
+
+        Raises:
+            Text2SQLRejected: 허용되지 않는 쿼리
+        """
+        sql = (sql or "").strip().rstrip(";").strip()
+        if not sql:
+            raise Text2SQLRejected("빈 쿼리")
+
+        if not ALLOWED_PREFIX.match(sql):
+            raise Text2SQLRejected("SELECT/WITH 문만 실행할 수 있습니다")
+
+        # 문자열 리터럴 안의 키워드/세미콜론은 검사 대상에서 제외
+        code = STRING_LITERAL.sub("''", sql)
+        if ";" in code:
+            raise Text2SQLRejected("여러 문장은 실행할 수 없습니다")
+
+        forbidden = FORBIDDEN_KEYWORDS.search(code)
+        if forbidden:
+            raise Text2SQLRejected(f"허용되지 않는 키워드: {forbidden.group(1)}")
+
+        return sql
+
+    def execute(self, sql: str) -> Text2SQLResult:
+        """
+        검증 → EXPLAIN 비용 검사 → 읽기 전용 트랜잭션에서 스트리밍 실행
+
+        Raises:
+            Text2SQLRejected: 검증/비용 상한 위반
+            django.db.Error: 실행 오류 (statement_timeout 포함)
+        """
+        sql = self.validate(sql)
+        started_at = time.perf_counter()
+        connection = connections[self.db_alias]
+        result = Text2SQLResult(db_alias=self.db_alias)
+        # 바깥 트랜잭션 안 (ATOMIC_REQUESTS, 테스트 등)에서는 이미 쿼리가 실행됐을 수 있음
+        nested = connection.in_atomic_block
+
+        with transaction.atomic(using=self.db_alias):
+            with connection.cursor() as cursor:
+                if nested:
+                    # READ ONLY는 트랜잭션 첫 쿼리 전에만 설정 가능 → 키워드 검증만 적용
+                    logger.warning("⚠️ 중첩 트랜잭션: READ ONLY 생략 (SELECT 검증만 적용)")
+                else:
+                    cursor.execute("SET TRANSACTION READ ONLY")
+                # SET은 파라미터 바인딩 불가 → int 변환으로 검증
+                cursor.execute(
+                    f"SET LOCAL statement_timeout = {int(self.statement_timeout_ms)}"
+                )
+
+                result.plan_cost = self._explain_cost(cursor, sql)
+
+            if self.max_cost and result.plan_cost is not None and result.plan_cost > self.max_cost:
+                raise Text2SQLRejected(
+                    f"예상 비용 {result.plan_cost:.0f} > 상한 {self.max_cost:.0f}"
+                )
+
+            # 서버 사이드 커서 (트랜잭션 안에서만 유효)
+            with connection.chunked_cursor() as cursor:
+                cursor.execute(sql)
+
+                while len(result.rows) <= self.max_rows:
+                    batch = cursor.fetchmany(self.fetch_size)
+                    if not batch:
+                        break
+                    result.rows.extend(batch)
+
+                if cursor.description:
+                    result.columns = [desc[0] for desc in cursor.description]
+
+        if len(result.rows) > self.max_rows:
+            result.rows = result.rows[: self.max_rows]
+            result.truncated = True
+
+        result.elapsed_ms = (time.perf_counter() - started_at) * 1000
+        logger.info(
+            f"🛡️ Text2SQL 실행: {len(result.rows)}행"
+            f"{' (잘림)' if result.truncated else ''}, "
+            f"cost={result.plan_cost}, {result.elapsed_ms:.0f}ms, db={self.db_alias}"
+        )
+        return result
+
+    @staticmethod
+    def _explain_cost(cursor, sql: str) -> Optional[float]:
+        """EXPLAIN (FORMAT JSON)의 최상위 Total Cost"""
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        plan = row[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return float(plan[0]["Plan"]["Total Cost"])
+
+
+# 싱글톤 인스턴스
+_text2sql_executor = None
+
+
+def get_text2sql_executor() -> Text2SQLExecutor:
+    """Text2SQL 실행기 싱글톤 인스턴스 반환"""
+    global _text2sql_executor
+
+    if _text2sql_executor is None:
+        _text2sql_executor = Text2SQLExecutor()
+
+    return _text2sql_executor
@@ -161,21 +161,11 @@ class TierManager:
             return False
 
     def regenerate_embedding(self, text):
-        """Bedrock으로 임베딩 재생성"""
+        """Bedrock으로 임베딩 재생성 (임베딩 캐시/저장소 우선 조회)"""
         try:
-            from django.conf import settings
+            from .bedrock_service import get_bedrock_service
 
-            bedrock = boto3.client(
-                "bedrock-runtime", region_name=settings.AWS_BEDROCK_REGION
-            )
-
-            response = bedrock.invoke_model(
-                modelId=settings.AWS_BEDROCK_EMBEDDING_MODEL_ID,
-                body=json.dumps({"inputText": text}),
-            )
-
-            result = json.loads(response["body"].read())
-            return result["embedding"]
+            return get_bedrock_service().generate_embedding(text)
 
         except Exception as e:
             logger.error(f"Failed to regenerate embedding: {str(e)}")
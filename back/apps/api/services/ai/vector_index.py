@@ -0,0 +1,229 @@
+"""
+pgvector ANN 인덱스 쿼리 파라미터
+- HNSW: hnsw.ef_search (탐색 후보 수, 클수록 recall ↑ / 속도 ↓)
+- IVFFlat: ivfflat.probes (탐색 리스트 수)
+- SET LOCAL로 현재 트랜잭션에만 적용 (커넥션 풀 오염 방지)
+- halfvec / binary 양자화 1차 검색 후 원본(float32) 벡터로 재채점
+- 필터가 있는 쿼리: pgvector 0.8+면 iterative scan (필터 후 limit개가 찰 때까지 인덱스 계속 탐색),
+  미만이면 비디오 범위 쿼리는 정확한 검색 (전역 ef_search개 후보가 필터에 걸러져 결과가 비는 것 방지)
+"""
+
+import logging
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import F, Func, Value
+from django.db.models.functions import Cast
+from pgvector.django import (
+    BitField,
+    CosineDistance,
+    HalfVectorField,
+    HammingDistance,
+    VectorField,
+)
+from pgvector.utils import Vector
+
+logger = logging.getLogger(__name__)
+
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+
+
+@lru_cache(maxsize=None)
+def pgvector_version(alias: str = "default") -> Tuple[int, ...]:
+    """설치된 pgvector 확장 버전 (DB별 1회 조회, 확장이 없으면 빈 튜플)"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cursor.fetchone()
+    if not row:
+        return ()
+    return tuple(int(part) for part in re.findall(r"\d+", row[0])[:3])
+
+
+def supports_iterative_scan(alias: str = "default") -> bool:
+    """hnsw / ivfflat.iterative_scan 지원 여부 (pgvector 0.8+)"""
+    try:
+        return pgvector_version(alias) >= ITERATIVE_SCAN_MIN_VERSION
+    except DatabaseError as e:
+        logger.warning(f"⚠️ pgvector 버전 조회 실패: {e}")
+        return False
+
+
+@contextmanager
+def vector_search_params(
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+    iterative_scan: bool = False,
+):
+    """
+    ANN 검색 파라미터를 적용한 트랜잭션 컨텍스트
+
+    블록 안에서 쿼리셋을 평가해야 설정이 적용된다.
+
+    Args:
+        ef_search: hnsw.ef_search (None이면 VECTOR_HNSW_EF_SEARCH)
+        probes: ivfflat.probes (None이면 VECTOR_IVFFLAT_PROBES)
+        exact: True면 ANN 인덱스를 끄고 정확한 검색 수행 - recall 측정 / 범위 제한 검색용
+        iterative_scan: 필터 후 결과가 부족하면 인덱스를 계속 탐색 (pgvector 0.8+에서만 적용,
+            순서가 근사이므로 결과를 거리순으로 다시 정렬해야 함)
+    """
+    if ef_search is None:
+        ef_search = getattr(settings, "VECTOR_HNSW_EF_SEARCH", 100)
+    if probes is None:
+        probes = getattr(settings, "VECTOR_IVFFLAT_PROBES", 10)
+    iterative_scan = iterative_scan and not exact and supports_iterative_scan()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if exact:
+                # ANN 인덱스는 비트맵 스캔을 지원하지 않음 → B-tree 비트맵(video_id 등)은 유지
+                cursor.execute("SET LOCAL enable_indexscan = off")
+            else:
+                # SET은 파라미터 바인딩 불가 → int 변환으로 검증
+                cursor.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+                cursor.execute(f"SET LOCAL ivfflat.probes = {int(probes)}")
+                if iterative_scan:
+                    cursor.execute("SET LOCAL hnsw.iterative_scan = relaxed_order")
+                    cursor.execute("SET LOCAL ivfflat.iterative_scan = relaxed_order")
+        yield
+
+
+# ----------------------------------------------------------------------
+# 양자화 ANN (halfvec / binary) + 원본 정밀도 재채점
+# ----------------------------------------------------------------------
+QUANTIZATION_MODES = ("none", "halfvec", "binary")
+
+# `manage.py vector_index build --type halfvec|binary`로 생성하는 식 인덱스
+# (테이블 컬럼 추가 없이 인덱스에만 양자화 사본 저장)
+QUANTIZED_INDEX_SQL = {
+    "halfvec": (
+        "db_event_embedding_halfvec_idx",
+        "hnsw ((embedding::halfvec({dimensions})) halfvec_cosine_ops)",
+    ),
+    "binary": (
+        "db_event_embedding_bit_idx",
+        "hnsw ((binary_quantize(embedding)::bit({dimensions})) bit_hamming_ops)",
+    ),
+}
+
+
+def first_pass_distance(
+    field_name: str, query_embedding, mode: str, dimensions: int = 1024
+):
+    """
+    1차(후보) 검색 거리 식 - 인덱스 식과 같은 형태여야 ANN 인덱스를 사용한다
+
+    - none: embedding <=> query (vector)
+    - halfvec: embedding::halfvec(d) <=> query::halfvec(d)
+    - binary: binary_quantize(embedding)::bit(d) <~> binary_quantize(query)::bit(d)
+    """
+    query_text = Vector._to_db(query_embedding)
+
+    if mode == "halfvec":
+        return CosineDistance(
+            Cast(field_name, HalfVectorField(dimensions=dimensions)),
+            Cast(Value(query_text), HalfVectorField(dimensions=dimensions)),
+        )
+
+    if mode == "binary":
+        return HammingDistance(
+            Cast(
+                Func(F(field_name), function="binary_quantize"),
+                BitField(length=dimensions),
+            ),
+            Cast(
+                Func(
+                    Cast(Value(query_text), VectorField(dimensions=dimensions)),
+                    function="binary_quantize",
+                ),
+                BitField(length=dimensions),
+            ),
+        )
+
+    return CosineDistance(field_name, query_embedding)
+
+
+def vector_search(
+    queryset,
+    query_embedding,
+    limit: int,
+    field_name: str = "embedding",
+    max_distance: Optional[float] = None,
+    mode: Optional[str] = None,
+    rescore_factor: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+    dimensions: int = 1024,
+    scoped: bool = False,
+) -> list:
+    """
+    코사인 거리 top-k 검색 (양자화 1차 검색 + 원본 정밀도 재채점)
+
+    Args:
+        queryset: 검색 대상 (필터 적용된 쿼리셋)
+        query_embedding: 쿼리 임베딩
+        limit: 반환할 최대 개수
+        field_name: 임베딩 필드명
+        max_distance: 최종 코사인 거리 상한 (재채점 후 적용)
+        mode: none / halfvec / binary (None이면 VECTOR_QUANTIZATION)
+        rescore_factor: 재채점 후보 배수 (None이면 VECTOR_RESCORE_FACTOR)
+        ef_search, probes, exact: vector_search_params 참고
+        scoped: 작은 범위(비디오 등)로 필터링된 쿼리 - iterative scan을 못 쓰면 정확한 검색
+
+    Returns:
+        distance(원본 정밀도 코사인 거리)가 annotate된 모델 인스턴스 리스트 (거리순)
+    """
+    if mode is None:
+        mode = getattr(settings, "VECTOR_QUANTIZATION", "none")
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"지원하지 않는 양자화 모드: {mode}")
+
+    # 필터(비디오 / 메타데이터 / 버전 / 거리 임계값)는 HNSW가 전역 ef_search개를 반환한 뒤 적용됨
+    # → 0.8+는 iterative scan, 미만은 범위 제한 쿼리만 정확한 검색 (범위 밖 쿼리는 그대로)
+    iterative_scan = not exact and supports_iterative_scan()
+    if scoped and not exact and not iterative_scan:
+        exact = True
+
+    if mode == "none" or exact:
+        results = queryset.annotate(distance=CosineDistance(field_name, query_embedding))
+        candidates = limit
+    else:
+        if rescore_factor is None:
+            rescore_factor = getattr(settings, "VECTOR_RESCORE_FACTOR", 4)
+        candidates = max(limit * int(rescore_factor), limit)
+
+        # 1차: 양자화 식 인덱스로 후보 추출 → 2차: 후보만 원본 벡터로 재채점
+        first_pass = (
+            queryset.annotate(
+                approx_distance=first_pass_distance(
+                    field_name, query_embedding, mode, dimensions
+                )
+            )
+            .order_by("approx_distance")
+            .values("pk")[:candidates]
+        )
+        results = queryset.filter(pk__in=first_pass).annotate(
+            distance=CosineDistance(field_name, query_embedding)
+        )
+
+    if max_distance is not None:
+        results = results.filter(distance__lt=max_distance)
+    results = results.order_by("distance")[:limit]
+
+    # HNSW는 ef_search개까지만 반환 → 후보 수 이상으로 보정
+    if ef_search is None:
+        ef_search = getattr(settings, "VECTOR_HNSW_EF_SEARCH", 100)
+    ef_search = max(int(ef_search), candidates)
+
+    with vector_search_params(
+        ef_search=ef_search, probes=probes, exact=exact, iterative_scan=iterative_scan
+    ):
+        events = list(results)
+
+    # relaxed_order는 인덱스 반환 순서가 근사 → 거리순 재정렬
+    return sorted(events, key=lambda event: event.distance)
@@ -0,0 +1,179 @@
+"""
+비디오 단위 Event embedding 생성 작업
+- 분석 완료(analysis_status='completed') 시 백그라운드 스레드로 실행 → 요청은 즉시 반환
+- 비디오의 모든 이벤트를 청크 단위로 처리 (backfill 엔진: 동시 호출 + bulk_update)
+- 같은 비디오의 중복 트리거는 조건부 UPDATE로 1개만 실행 (프로세스 간에도 보장)
+- 진행률은 Video.embedding_status / embedding_progress에 기록
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.db.models import Event, Video
+
+logger = logging.getLogger(__name__)
+
+
+class VideoEmbeddingJobService:
+    """비디오별 embedding 생성 작업 실행 / 중복 방지 / 진행률 기록"""
+
+    def __init__(self, stale_seconds: Optional[int] = None, max_passes: int = 3):
+        """
+        Args:
+            stale_seconds: 진행률 갱신이 이 시간 이상 없으면 중단된 작업으로 보고 재실행 허용
+            max_passes: 작업 중 새로 추가된 이벤트를 위한 최대 반복 횟수
+        """
+        self.stale_seconds = (
+            stale_seconds
+            if stale_seconds is not None
+            else getattr(settings, "VIDEO_EMBEDDING_JOB_STALE_SECONDS", 900)
+        )
+        self.max_passes = max_passes
+
+    def start(self, video_id: int) -> bool:
+        """
+        백그라운드 작업 시작 (현재 트랜잭션 커밋 후)
+
+        Returns:
+            작업을 점유했으면 True, 같은 비디오 작업이 이미 실행 중이거나 완료 후 새 이벤트가 없으면 False
+        """
+        if not self._claim(video_id):
+            logger.info(f"⏭️ Video {video_id}: embedding 작업 이미 실행 중 또는 처리할 이벤트 없음")
+            return False
+
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=self._run_in_thread,
+                args=(video_id,),
+                name=f"video-embedding-{video_id}",
+                daemon=True,
+            ).start()
+        )
+        return True
+
+    def run(self, video_id: int, claim: bool = True) -> Optional[dict]:
+        """
+        작업 실행 (동기)
+
+        Args:
+            video_id: 비디오 ID
+            claim: 실행 전 점유 여부 (start()에서 이미 점유했으면 False)
+
+        Returns:
+            {'total', 'success', 'failed', 'remaining'} 또는 None (이미 실행 중 또는 처리할 이벤트 없음)
+        """
+        from .embedding_backfill import get_embedding_backfill_service
+
+        if claim and not self._claim(video_id):
+            return None
+
+        candidates = Event.objects.filter(video_id=video_id).exclude(
+            Q(searchable_text__isnull=True) | Q(searchable_text="")
+        )
+        total = candidates.count()
+        embedded_before = total - candidates.filter(embedding__isnull=True).count()
+        result = {"total": total, "success": 0, "failed": 0, "remaining": 0}
+
+        def on_progress(progress):
+            # 청크마다 COUNT 쿼리 없이 누적 성공 수로 계산
+            done = embedded_before + result["success"] + progress.success
+            self._update(video_id, progress=self._percent(done, total))
+
+        try:
+            # 작업 중 추가된 이벤트(ID가 더 큰)까지 처리하도록 남은 게 없을 때까지 반복
+            for _ in range(self.max_passes):
+                progress = get_embedding_backfill_service().backfill(
+                    video_id=video_id, on_progress=on_progress
+                )
+                result["success"] += progress.success
+                result["failed"] += progress.failed
+
+                result["remaining"] = candidates.filter(embedding__isnull=True).count()
+                if result["remaining"] == 0 or progress.success == 0:
+                    break
+
+            self._update(
+                video_id,
+                status="completed" if result["remaining"] == 0 else "failed",
+                progress=self._percent(total - result["remaining"], total),
+            )
+            logger.info(
+                f"✅ Video {video_id} embedding 작업 완료: 이벤트 {total}개, "
+                f"성공 {result['success']}, 실패 {result['failed']}, 남음 {result['remaining']}"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Video {video_id} embedding 작업 실패: {str(e)}")
+            self._update(video_id, status="failed")
+            raise
+
+    def _run_in_thread(self, video_id: int) -> None:
+        try:
+            self.run(video_id, claim=False)
+        except Exception:
+            pass  # run()에서 로그/상태 기록
+        finally:
+            # 스레드 전용 DB 연결 정리
+            connections.close_all()
+
+    def _claim(self, video_id: int) -> bool:
+        """
+        processing 상태가 아니거나(또는 heartbeat 만료) 일 때만 processing으로 전환
+
+        completed 작업은 embedding이 없는 이벤트가 새로 생긴 경우(재분석 등)에만 다시 점유
+        """
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=self.stale_seconds)
+        pending_events = Event.objects.filter(
+            video_id=OuterRef("pk"), embedding__isnull=True
+        ).exclude(Q(searchable_text__isnull=True) | Q(searchable_text=""))
+
+        claimed = (
+            Video.objects.filter(pk=video_id)
+            .exclude(embedding_status="processing", embedding_updated_at__gte=stale_before)
+            .filter(~Q(embedding_status="completed") | Q(Exists(pending_events)))
+            .update(
+                embedding_status="processing",
+                embedding_progress=0,
+                embedding_updated_at=now,
+            )
+        )
+        return claimed == 1
+
+    @staticmethod
+    def _percent(done: int, total: int) -> int:
+        if total == 0:
+            return 100
+        return min(100, int(done * 100 / total))
+
+    @staticmethod
+    def _update(video_id: int, status: Optional[str] = None, progress: Optional[int] = None):
+        # .update()는 post_save를 발동하지 않음 → 작업 재트리거 없음
+        fields = {"embedding_updated_at": timezone.now()}
+        if status is not None:
+            fields["embedding_status"] = status
+        if progress is not None:
+            fields["embedding_progress"] = progress
+        Video.objects.filter(pk=video_id).update(**fields)
+
+
+# 싱글톤 인스턴스
+_video_embedding_job = None
+
+
+def get_video_embedding_job() -> VideoEmbeddingJobService:
+    """비디오 embedding 작업 서비스 싱글톤 인스턴스 반환"""
+    global _video_embedding_job
+
+    if _video_embedding_job is None:
+        _video_embedding_job = VideoEmbeddingJobService()
+
+    return _video_embedding_job
@@ -7,9 +7,12 @@ import json
 import base64
 import boto3
 import logging
-from typing import List, Dict, Optional
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from django.conf import settings
 from apps.db.models import Event, Video
+from .bedrock_service import iter_claude_stream_text
 import cv2
 import os
 
@@ -115,51 +118,45 @@ class BedrockVLMService:
 
         logger.info(f"🔍 프레임 추출 시작: sorted_events={len(sorted_events)}개")
 
-        # S3에서 비디오 다운로드 또는 로컬 경로 사용
-        video_path = self._get_video_path(video)
-
-        logger.info(f"📁 비디오 경로: {video_path}")
-        logger.info(
-            f"📁 파일 존재 여부: {os.path.exists(video_path) if video_path else False}"
-        )
-
-        if not video_path or not os.path.exists(video_path):
-            logger.warning(f"비디오 파일을 찾을 수 없음: {video_path}")
-            logger.warning(f"video.s3_raw_key: {getattr(video, 's3_raw_key', None)}")
-            logger.warning(f"video.filename: {getattr(video, 'filename', None)}")
-            logger.warning(f"video.video_file: {getattr(video, 'video_file', None)}")
-            return frames
-
-        # OpenCV로 비디오 열기
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-
-        for event in sorted_events:
-            # 이벤트 시점의 프레임 번호 계산
-            frame_number = int(event.timestamp * fps)
-
-            # 해당 프레임으로 이동
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = cap.read()
-
-            if ret:
-                # 프레임을 JPEG로 인코딩
-                _, buffer = cv2.imencode(".jpg", frame)
-                frame_base64 = base64.b64encode(buffer).decode("utf-8")
-
-                frames.append(
-                    {
-                        "timestamp": event.timestamp,
-                        "frame": frame_base64,
-                        "event": event,
-                        "event_type": event.event_type,
-                        "description": getattr(event, "action_detected", "알 수 없음"),
-                    }
-                )
-
-                logger.info(f"✅ 프레임 추출: {event.timestamp}초 ({event.event_type})")
-
-        cap.release()
+        # S3 스트리밍 / 다운로드 / 로컬 경로로 비디오 열기
+        with self._open_video_capture(video) as cap:
+            if cap is None:
+                logger.warning(f"video.s3_raw_key: {getattr(video, 's3_raw_key', None)}")
+                logger.warning(f"video.filename: {getattr(video, 'filename', None)}")
+                logger.warning(f"video.video_file: {getattr(video, 'video_file', None)}")
+                return frames
+
+            fps = cap.get(cv2.CAP_PROP_FPS)
+
+            # 시간 순서로 읽어 뒤로 탐색하지 않음 (스트리밍 시 Range 요청 최소화)
+            for event in sorted(sorted_events, key=lambda e: e.timestamp):
+                # 이벤트 시점의 프레임 번호 계산
+                frame_number = int(event.timestamp * fps)
+
+                # 해당 프레임으로 이동
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ret, frame = cap.read()
+
+                if ret:
+                    # 프레임을 JPEG로 인코딩
+                    _, buffer = cv2.imencode(".jpg", frame)
+                    frame_base64 = base64.b64encode(buffer).decode("utf-8")
+
+                    frames.append(
+                        {
+                            "timestamp": event.timestamp,
+                            "frame": frame_base64,
+                            "event": event,
+                            "event_type": event.event_type,
+                            "description": getattr(event, "action_detected", "알 수 없음"),
+                        }
+                    )
+
+                    logger.info(f"✅ 프레임 추출: {event.timestamp}초 ({event.event_type})")
+
+        # 결과는 중요도 순서 유지
+        order = {id(event): index for index, event in enumerate(sorted_events)}
+        frames.sort(key=lambda item: order[id(item["event"])])
         return frames
 
     def extract_frames_by_seconds(
@@ -183,67 +180,61 @@ class BedrockVLMService:
         """
         frames = []
 
-        # 비디오 경로 가져오기
-        video_path = self._get_video_path(video)
+        # S3 스트리밍 / 다운로드 / 로컬 경로로 비디오 열기
+        with self._open_video_capture(video) as cap:
+            if cap is None:
+                return frames
 
-        if not video_path or not os.path.exists(video_path):
-            print(f"⚠️ 비디오 파일을 찾을 수 없음: {video_path}")
-            return frames
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            video_duration = total_frames / fps
 
-        # OpenCV로 비디오 열기
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        video_duration = total_frames / fps
-
-        logger.info(
-            f"📹 비디오 정보: FPS={fps}, 총 프레임={total_frames}, 길이={video_duration:.2f}초"
-        )
+            logger.info(
+                f"📹 비디오 정보: FPS={fps}, 총 프레임={total_frames}, 길이={video_duration:.2f}초"
+            )
 
-        # 유효한 범위 확인
-        end_seconds = min(end_seconds, video_duration)
-        start_seconds = max(0, start_seconds)
+            # 유효한 범위 확인
+            end_seconds = min(end_seconds, video_duration)
+            start_seconds = max(0, start_seconds)
 
-        if start_seconds >= end_seconds:
-            logger.warning(
-                f"⚠️ 유효하지 않은 시간 범위: {start_seconds}~{end_seconds}초"
-            )
-            cap.release()
-            return frames
-
-        # 지정된 간격으로 프레임 추출
-        current_time = start_seconds
-        while current_time <= end_seconds:
-            frame_number = int(current_time * fps)
-
-            # 프레임 범위 확인
-            if frame_number >= total_frames:
-                break
-
-            # 해당 프레임으로 이동
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = cap.read()
-
-            if ret:
-                # 프레임을 JPEG로 인코딩
-                _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                frame_base64 = base64.b64encode(buffer).decode("utf-8")
-
-                frames.append(
-                    {
-                        "timestamp": current_time,
-                        "frame": frame_base64,
-                        "frame_number": frame_number,
-                    }
+            if start_seconds >= end_seconds:
+                logger.warning(
+                    f"⚠️ 유효하지 않은 시간 범위: {start_seconds}~{end_seconds}초"
                 )
+                return frames
 
-                logger.info(
-                    f"✅ 프레임 추출: {current_time:.1f}초 (프레임 #{frame_number})"
-                )
+            # 지정된 간격으로 프레임 추출
+            current_time = start_seconds
+            while current_time <= end_seconds:
+                frame_number = int(current_time * fps)
+
+                # 프레임 범위 확인
+                if frame_number >= total_frames:
+                    break
+
+                # 해당 프레임으로 이동
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                ret, frame = cap.read()
+
+                if ret:
+                    # 프레임을 JPEG로 인코딩
+                    _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                    frame_base64 = base64.b64encode(buffer).decode("utf-8")
 
-            current_time += interval
+                    frames.append(
+                        {
+                            "timestamp": current_time,
+                            "frame": frame_base64,
+                            "frame_number": frame_number,
+                        }
+                    )
+
+                    logger.info(
+                        f"✅ 프레임 추출: {current_time:.1f}초 (프레임 #{frame_number})"
+                    )
+
+                current_time += interval
 
-        cap.release()
         logger.info(
             f"✅ 총 {len(frames)}개 프레임 추출 완료 ({start_seconds}~{end_seconds}초)"
         )
@@ -275,6 +266,107 @@ class BedrockVLMService:
             f"🎬 시간 범위 분석 시작: {start_seconds}~{end_seconds}초 ({analysis_type})"
         )
 
+        body, frames = self._build_time_range_request(
+            video, start_seconds, end_seconds, analysis_type, interval
+        )
+        if body is None:
+            return (
+                f"{start_seconds}~{end_seconds}초 범위에서 프레임을 추출할 수 없습니다."
+            )
+
+        # Bedrock API 호출
+        try:
+            logger.info(f"🤖 Bedrock VLM 호출 중... (이미지 {min(len(frames), 10)}개)")
+
+            response = self.bedrock_runtime.invoke_model(
+                modelId=self.model_id, body=json.dumps(body)
+            )
+
+            response_body = json.loads(response["body"].read())
+            analysis_result = response_body["content"][0]["text"]
+
+            logger.info(f"✅ Bedrock VLM 분석 완료")
+            return analysis_result
+
+        except Exception as e:
+            logger.error(f"❌ VLM 분석 오류: {str(e)}")
+            import traceback
+
+            traceback.print_exc()
+
+            # 폴백: 기본 정보 반환
+            return self._generate_fallback_time_range_summary(
+                frames, start_seconds, end_seconds
+            )
+
+    def analyze_time_range_stream(
+        self,
+        video: Video,
+        start_seconds: float,
+        end_seconds: float,
+        analysis_type: str = "behavior",
+        interval: float = 2.0,
+    ) -> Iterator[str]:
+        """
+        analyze_time_range의 스트리밍 버전 (invoke_model_with_response_stream)
+
+        Yields:
+            분석 결과 텍스트 조각
+
+        Raises:
+            텍스트를 일부 보낸 뒤 Bedrock 호출이 실패하면 예외를 그대로 전파
+        """
+        logger.info(
+            f"🎬 시간 범위 스트리밍 분석 시작: {start_seconds}~{end_seconds}초 ({analysis_type})"
+        )
+
+        body, frames = self._build_time_range_request(
+            video, start_seconds, end_seconds, analysis_type, interval
+        )
+        if body is None:
+            yield f"{start_seconds}~{end_seconds}초 범위에서 프레임을 추출할 수 없습니다."
+            return
+
+        streamed_any = False
+        try:
+            logger.info(
+                f"🤖 Bedrock VLM 스트리밍 호출 중... (이미지 {min(len(frames), 10)}개)"
+            )
+
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                modelId=self.model_id, body=json.dumps(body)
+            )
+
+            for text in iter_claude_stream_text(response):
+                streamed_any = True
+                yield text
+
+            logger.info(f"✅ Bedrock VLM 스트리밍 분석 완료")
+
+        except Exception as e:
+            logger.error(f"❌ VLM 스트리밍 분석 오류: {str(e)}")
+
+            # 아직 아무것도 보내지 않았다면 폴백 요약으로 대체, 이미 보냈다면 호출자에 전파
+            if streamed_any:
+                raise
+            yield self._generate_fallback_time_range_summary(
+                frames, start_seconds, end_seconds
+            )
+
+    def _build_time_range_request(
+        self,
+        video: Video,
+        start_seconds: float,
+        end_seconds: float,
+        analysis_type: str,
+        interval: float,
+    ) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        시간 범위 프레임 추출 + Claude 3 Vision 요청 바디 구성
+
+        Returns:
+            (요청 바디 또는 None(프레임 없음), 추출된 프레임 리스트)
+        """
         # 프레임 추출
         frames = self.extract_frames_by_seconds(
             video=video,
@@ -284,9 +376,7 @@ class BedrockVLMService:
         )
 
         if not frames:
-            return (
-                f"{start_seconds}~{end_seconds}초 범위에서 프레임을 추출할 수 없습니다."
-            )
+            return None, []
 
         # 프롬프트 선택
         prompt_template = self.CONVENIENCE_STORE_PROMPTS.get(
@@ -318,37 +408,14 @@ class BedrockVLMService:
             )
             content.append({"type": "text", "text": f"[{minutes}분 {seconds}초]"})
 
-        # Bedrock API 호출
-        try:
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [{"role": "user", "content": content}],
-                "temperature": 0.5,
-            }
-
-            logger.info(f"🤖 Bedrock VLM 호출 중... (이미지 {min(len(frames), 10)}개)")
-
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id, body=json.dumps(body)
-            )
-
-            response_body = json.loads(response["body"].read())
-            analysis_result = response_body["content"][0]["text"]
-
-            logger.info(f"✅ Bedrock VLM 분석 완료")
-            return analysis_result
-
-        except Exception as e:
-            logger.error(f"❌ VLM 분석 오류: {str(e)}")
-            import traceback
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 1000,
+            "messages": [{"role": "user", "content": content}],
+            "temperature": 0.5,
+        }
 
-            traceback.print_exc()
-
-            # 폴백: 기본 정보 반환
-            return self._generate_fallback_time_range_summary(
-                frames, start_seconds, end_seconds
-            )
+        return body, frames
 
     def generate_video_summary(
         self,
@@ -676,39 +743,101 @@ class BedrockVLMService:
 
         return summary
 
-    def _get_video_path(self, video: Video) -> Optional[str]:
+    @contextmanager
+    def _open_video_capture(self, video: Video) -> Iterator[Optional[cv2.VideoCapture]]:
         """
-        비디오 파일 경로 가져오기 (S3 또는 로컬)
-        """
-        import boto3
-        import tempfile
+        OpenCV 비디오 캡처 열기 (종료 시 release, 임시 파일 삭제)
+
+        - stream 모드(기본): S3 Presigned URL을 OpenCV(FFmpeg)에 직접 전달
+          → 추출할 프레임 구간만 HTTP Range로 읽음 (전체 다운로드 / 임시 파일 없음)
+        - URL로 열 수 없거나 download 모드면 임시 파일로 다운로드
+        - S3 키가 없으면 로컬 파일
 
-        # S3 경로 확인
+        Yields:
+            열린 VideoCapture (비디오를 찾을 수 없으면 None)
+        """
         s3_key = (
             video.get_current_s3_key() if hasattr(video, "get_current_s3_key") else None
         )
+        cap = None
+        temp_path = None
 
-        if s3_key:
-            # S3에서 임시 파일로 다운로드
-            try:
-                s3_client = boto3.client("s3", region_name=settings.AWS_S3_REGION_NAME)
-                bucket = settings.AWS_STORAGE_BUCKET_NAME
+        try:
+            if s3_key and getattr(settings, "VLM_VIDEO_INPUT_MODE", "stream") == "stream":
+                cap = self._open_s3_stream(s3_key)
 
-                # 임시 파일 생성
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-                temp_path = temp_file.name
-                temp_file.close()
+            if cap is None and s3_key:
+                temp_path = self._download_to_temp(s3_key)
+                if temp_path:
+                    cap = cv2.VideoCapture(temp_path)
 
-                logger.info(
-                    f"📥 S3에서 다운로드 중: s3://{bucket}/{s3_key} → {temp_path}"
-                )
-                s3_client.download_file(bucket, s3_key, temp_path)
-                logger.info(f"✅ S3 다운로드 완료: {temp_path}")
+            if cap is None:
+                local_path = self._get_local_video_path(video)
+                if local_path:
+                    cap = cv2.VideoCapture(local_path)
 
-                return temp_path
-            except Exception as e:
-                logger.error(f"❌ S3 다운로드 실패: {e}")
+            if cap is not None and not cap.isOpened():
+                cap.release()
+                cap = None
+
+            if cap is None:
+                logger.error(f"❌ 비디오를 열 수 없음: video_id={video.video_id}")
+
+            yield cap
+
+        finally:
+            if cap is not None:
+                cap.release()
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+                logger.info(f"🗑️ 임시 파일 삭제: {temp_path}")
+
+    def _open_s3_stream(self, s3_key: str) -> Optional[cv2.VideoCapture]:
+        """S3 객체를 다운로드 없이 Presigned URL로 열기 (FFmpeg 미지원 빌드 등 실패 시 None)"""
+        try:
+            s3_client = boto3.client("s3", region_name=settings.AWS_S3_REGION_NAME)
+            url = s3_client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": s3_key},
+                ExpiresIn=getattr(settings, "VLM_VIDEO_STREAM_URL_EXPIRES", 3600),
+            )
+
+            cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+            if cap.isOpened():
+                logger.info(f"📡 S3 직접 디코딩: {s3_key}")
+                return cap
+
+            cap.release()
+            logger.warning(f"⚠️ S3 스트림을 열 수 없어 다운로드로 전환: {s3_key}")
+        except Exception as e:
+            logger.warning(f"⚠️ S3 스트림 열기 실패, 다운로드로 전환: {e}")
+        return None
+
+    def _download_to_temp(self, s3_key: str) -> Optional[str]:
+        """S3 객체를 임시 파일로 다운로드 (호출 측에서 삭제)"""
+        temp_path = None
+        try:
+            s3_client = boto3.client("s3", region_name=settings.AWS_S3_REGION_NAME)
+            bucket = settings.AWS_STORAGE_BUCKET_NAME
+
+            # 임시 파일 생성
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+            temp_path = temp_file.name
+            temp_file.close()
+
+            logger.info(f"📥 S3에서 다운로드 중: s3://{bucket}/{s3_key} → {temp_path}")
+            s3_client.download_file(bucket, s3_key, temp_path)
+            logger.info(f"✅ S3 다운로드 완료: {temp_path}")
+
+            return temp_path
+        except Exception as e:
+            logger.error(f"❌ S3 다운로드 실패: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
 
+    def _get_local_video_path(self, video: Video) -> Optional[str]:
+        """로컬 비디오 파일 경로 (MEDIA_ROOT / Django FileField)"""
         # 로컬 경로
         if hasattr(video, "filename") and video.filename:
             local_path = os.path.join(settings.MEDIA_ROOT, "videos", video.filename)
@@ -726,7 +855,6 @@ class BedrockVLMService:
             except Exception:
                 pass
 
-        logger.error(f"❌ 비디오 파일 경로를 찾을 수 없음: video_id={video.video_id}")
         return None
 
 
@@ -5,10 +5,18 @@ Business Services
 
 from .video_service import VideoService, get_video_service
 from .event_service import EventService, get_event_service
+from .processing_time_estimator import (
+    ProcessingTimeEstimate,
+    ProcessingTimeEstimator,
+    get_processing_time_estimator,
+)
 
 __all__ = [
     "VideoService",
     "get_video_service",
     "EventService",
     "get_event_service",
+    "ProcessingTimeEstimate",
+    "ProcessingTimeEstimator",
+    "get_processing_time_estimator",
 ]
@@ -72,7 +72,7 @@ class EventService:
         force: bool = False,
     ) -> Dict[str, int]:
         """
-        이벤트들의 embedding 일괄 생성
+        이벤트들의 embedding 일괄 생성 (동시 호출 + 속도 제한 + bulk_update)
 
         Args:
             video_id: 비디오 ID (선택)
@@ -82,66 +82,21 @@ class EventService:
         Returns:
             처리 결과 통계
         """
-        from apps.api.services import get_bedrock_service
-        import time
-
-        # 처리할 이벤트 쿼리
-        queryset = Event.objects.all()
-
-        if video_id:
-            queryset = queryset.filter(video_id=video_id)
-
-        if not force:
-            queryset = queryset.filter(embedding__isnull=True)
-
-        if limit:
-            queryset = queryset[:limit]
-
-        total_count = queryset.count()
-
-        if total_count == 0:
-            return {"total": 0, "success": 0, "failed": 0, "skipped": 0}
-
-        bedrock = get_bedrock_service()
-
-        success_count = 0
-        fail_count = 0
-        skip_count = 0
-
-        for event in queryset:
-            # searchable_text가 없으면 생성
-            if not event.searchable_text:
-                event.generate_searchable_text()
-                event.save(update_fields=["searchable_text", "keywords"])
-
-            # searchable_text가 여전히 비어있으면 건너뛰기
-            if not event.searchable_text or not event.searchable_text.strip():
-                skip_count += 1
-                continue
-
-            try:
-                # Embedding 생성
-                embedding = bedrock.generate_embedding(event.searchable_text)
-
-                if embedding:
-                    event.embedding = embedding
-                    event.save(update_fields=["embedding"])
-                    success_count += 1
-                else:
-                    fail_count += 1
-
-                # API Rate limit 방지
-                time.sleep(0.1)
+        from apps.api.services.ai.embedding_backfill import (
+            get_embedding_backfill_service,
+        )
 
-            except Exception as e:
-                fail_count += 1
-                logger.error(f"❌ Event {event.id} embedding 생성 실패: {str(e)}")
+        progress = get_embedding_backfill_service().backfill(
+            video_id=video_id, force=force, limit=limit
+        )
 
         return {
-            "total": total_count,
-            "success": success_count,
-            "failed": fail_count,
-            "skipped": skip_count,
+            "total": progress.total,
+            "success": progress.success,
+            "failed": progress.failed,
+            "skipped": progress.skipped,
+            "last_id": progress.last_id,
+            "elapsed_seconds": round(progress.elapsed_seconds, 2),
         }
 
     def get_event_by_id(self, event_id: int) -> Optional[Event]:
@@ -159,6 +114,89 @@ class EventService:
         except Event.DoesNotExist:
             return None
 
+    def hydrate_events_from_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        video: Optional[Video] = None,
+        match_timestamp: bool = True,
+    ) -> List[Event]:
+        """
+        Text2SQL 결과 행을 Event 객체로 일괄 변환 (행 순서 유지)
+
+        - id 컬럼이 있으면 in_bulk로 한 번에 조회
+        - id가 없으면 (video, timestamp) 쌍을 한 번에 조회 (같은 쌍은 가장 작은 id)
+        - video도 행의 video_id도 없는 행은 제외 (다른 비디오의 같은 시각 이벤트와 구분 불가)
+
+        Args:
+            rows: SQL 결과 딕셔너리 리스트
+            video: 대상 비디오 (timestamp 매칭 범위 제한)
+            match_timestamp: id가 없을 때 timestamp 매칭 사용 여부
+
+        Returns:
+            SQL 결과 순서대로 정렬된 Event 리스트 (찾지 못한 행은 제외)
+        """
+        if not rows:
+            return []
+
+        queryset = Event.objects.select_related("video")
+
+        # 1. id 기반 조회
+        if any("id" in row for row in rows):
+            event_ids = []
+            for row in rows:
+                try:
+                    if row.get("id") is not None:
+                        event_ids.append(int(row["id"]))
+                except (TypeError, ValueError):
+                    logger.warning(f"⚠️ 잘못된 Event ID: {row.get('id')}")
+
+            events_by_id = queryset.in_bulk(set(event_ids))
+            missing = set(event_ids) - set(events_by_id)
+            if missing:
+                logger.warning(f"⚠️ Event ID {sorted(missing)} not found")
+
+            return [events_by_id[event_id] for event_id in event_ids if event_id in events_by_id]
+
+        if not match_timestamp:
+            return []
+
+        # 2. (video, timestamp) 기반 조회
+        default_video_id = video.pk if video else None
+        keys = []
+        unscoped = 0
+        for row in rows:
+            timestamp_value = row.get("timestamp")
+            if timestamp_value is None:
+                continue
+            video_id = row.get("video_id") or default_video_id
+            if video_id is None:
+                unscoped += 1
+                continue
+            keys.append((video_id, timestamp_value))
+
+        if unscoped:
+            logger.warning(f"⚠️ 비디오를 알 수 없는 timestamp 행 {unscoped}개 제외")
+
+        if not keys:
+            return []
+
+        candidates = queryset.filter(
+            video_id__in={video_id for video_id, _ in keys},
+            timestamp__in={ts for _, ts in keys},
+        )
+
+        events_by_key = {}
+        for event in candidates.order_by("video_id", "timestamp", "id"):
+            events_by_key.setdefault((event.video_id, event.timestamp), event)
+
+        events = []
+        for key in keys:
+            event = events_by_key.get(key)
+            if event is not None:
+                events.append(event)
+
+        return events
+
     def create_event(self, event_data: Dict[str, Any]) -> Event:
         """
         이벤트 생성
@@ -0,0 +1,485 @@
+"""
+ProcessingTimeEstimator - 비디오 분석 처리 시간 추정
+- 완료된 AnalysisJob (실제 처리 시간 + 처리 시점 비디오 길이/해상도/FPS/크기)으로 학습
+- 인스턴스 타입별 로그-선형 회귀 (샘플 부족 시 전체 풀 모델 → 사전값)
+- 예측 구간으로 SQS 가시성 타임아웃 / Batch 타임아웃 / UI 큐 ETA 계산
+"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from apps.db.models import AnalysisJob, Video
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+POOLED = "*"  # 인스턴스 타입 구분 없이 전체 샘플로 학습한 모델
+FEATURES = ("duration", "megapixels", "fps", "size_mb")
+RIDGE_LAMBDA = 1.0  # 샘플이 적을 때 계수 폭주 방지 (절편 제외)
+MIN_LOG_SIGMA = 0.1  # 잔차가 우연히 작아도 구간을 ±10% 이상 유지
+
+# 학습 샘플이 없을 때의 사전값: 고정 오버헤드(모델 로딩/다운로드) + 영상 길이 배율
+PRIOR_BASE_SECONDS = 120.0
+PRIOR_REALTIME_FACTOR = 2.0
+PRIOR_SECONDS_PER_MB = 1.0  # 길이를 모를 때 (기존 워커 휴리스틱)
+PRIOR_DEFAULT_SECONDS = 600.0
+PRIOR_SPREAD = 3.0  # 사전값 구간: [추정/배수, 추정×배수]
+
+QUEUE_STATUSES = ("pending", "processing")
+QUEUE_WINDOW = timedelta(hours=24)  # 이보다 오래 대기 중인 비디오는 멈춘 것으로 보고 제외
+QUEUE_LOOKAHEAD = 50
+
+
+def extract_features(
+    duration: Optional[float],
+    width: Optional[int],
+    height: Optional[int],
+    fps: Optional[float],
+    file_size: Optional[int],
+) -> Dict[str, Optional[float]]:
+    """모델 입력 특성 (모르는 값은 None → 학습 샘플 중앙값으로 대체)"""
+    return {
+        "duration": duration or None,
+        "megapixels": width * height / 1e6 if width and height else None,
+        "fps": fps or None,
+        "size_mb": file_size / MB if file_size else None,
+    }
+
+
+def video_features(video: Video) -> Dict[str, Optional[float]]:
+    """Video 메타데이터 → 특성 (중복 필드는 표준 필드 우선)"""
+    return extract_features(
+        video.duration,
+        video.resolution_width or video.width,
+        video.resolution_height or video.height,
+        video.fps or video.frame_rate,
+        video.file_size,
+    )
+
+
+@dataclass
+class ProcessingTimeEstimate:
+    """처리 시간 예측 (중앙값 + 예측 구간)"""
+
+    seconds: float
+    lower_seconds: float
+    upper_seconds: float
+    confidence: float
+    instance_type: str
+    model: str  # instance | pooled | prior
+    samples: int
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        for key in ("seconds", "lower_seconds", "upper_seconds"):
+            data[key] = round(data[key])
+        return data
+
+    def to_message(self) -> Dict:
+        """SQS 메시지 형식 (camelCase)"""
+        return {
+            "seconds": round(self.seconds),
+            "lowerSeconds": round(self.lower_seconds),
+            "upperSeconds": round(self.upper_seconds),
+            "confidence": self.confidence,
+            "instanceType": self.instance_type,
+            "model": self.model,
+            "samples": self.samples,
+        }
+
+
+@dataclass
+class _FittedModel:
+    """log(처리 시간) = β · [1, log1p(특성)...] 릿지 회귀"""
+
+    coef: np.ndarray
+    fill: np.ndarray  # 결측 특성 대체값 (학습 샘플 로그값 중앙값)
+    covariance: np.ndarray  # (XᵀX + λI)⁻¹ → 예측 분산 계산
+    sigma: float  # 로그 공간 잔차 표준편차
+    samples: int
+
+    def design_row(self, features: Dict[str, Optional[float]]) -> np.ndarray:
+        values = _log_features(features)
+        values = np.where(np.isnan(values), self.fill, values)
+        return np.concatenate(([1.0], values))
+
+
+def _log_features(features: Dict[str, Optional[float]]) -> np.ndarray:
+    return np.array(
+        [
+            math.log1p(features[name]) if features.get(name) else np.nan
+            for name in FEATURES
+        ]
+    )
+
+
+def _fit(rows: List[Tuple[Dict[str, Optional[float]], float]]) -> _FittedModel:
+    raw = np.array([_log_features(features) for features, _ in rows])
+    fill = np.array(
+        [
+            np.median(column[~np.isnan(column)]) if (~np.isnan(column)).any() else 0.0
+            for column in raw.T
+        ]
+    )
+    raw = np.where(np.isnan(raw), fill, raw)
+
+    X = np.hstack([np.ones((len(rows), 1)), raw])
+    y = np.log([seconds for _, seconds in rows])
+
+    penalty = RIDGE_LAMBDA * np.eye(X.shape[1])
+    penalty[0, 0] = 0.0
+    covariance = np.linalg.pinv(X.T @ X + penalty)
+    coef = covariance @ X.T @ y
+
+    residuals = y - X @ coef
+    dof = max(len(rows) - X.shape[1], 1)
+    sigma = max(math.sqrt(float(residuals @ residuals) / dof), MIN_LOG_SIGMA)
+
+    return _FittedModel(coef, fill, covariance, sigma, len(rows))
+
+
+class ProcessingTimeEstimator:
+    """완료된 분석 작업으로 학습하는 인스턴스 타입별 처리 시간 추정기"""
+
+    def __init__(
+        self,
+        min_samples: Optional[int] = None,
+        confidence: Optional[float] = None,
+        refit_seconds: Optional[int] = None,
+    ):
+        """
+        Args:
+            min_samples: 인스턴스 타입별 모델 최소 샘플 수 (부족하면 전체 풀 모델)
+            confidence: 예측 구간 신뢰수준 (0-1)
+            refit_seconds: 모델 재학습 주기 (초)
+        """
+        self.min_samples = min_samples or getattr(
+            settings, "PROCESSING_ESTIMATOR_MIN_SAMPLES", 8
+        )
+        self.confidence = confidence or getattr(
+            settings, "PROCESSING_ESTIMATOR_CONFIDENCE", 0.9
+        )
+        self.refit_seconds = refit_seconds or getattr(
+            settings, "PROCESSING_ESTIMATOR_REFIT_SECONDS", 600
+        )
+        self.max_samples = getattr(settings, "PROCESSING_ESTIMATOR_MAX_SAMPLES", 2000)
+        self.default_instance_type = getattr(
+            settings, "PROCESSING_DEFAULT_INSTANCE_TYPE", "g5.xlarge"
+        )
+        self.queue_concurrency = max(
+            1, getattr(settings, "PROCESSING_QUEUE_CONCURRENCY", 1)
+        )
+
+        self._z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        self._models: Dict[str, _FittedModel] = {}
+        self._fitted_at: Optional[float] = None
+        self._fit_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 학습
+    # ------------------------------------------------------------------
+
+    def load_samples(self) -> Dict[str, List[Tuple[Dict, float]]]:
+        """
+        최근 성공한 AnalysisJob → 인스턴스 타입별 (특성, 처리 시간) 샘플
+
+        Returns:
+            {instance_type: [(features, seconds), ...]} (타입 미기록 작업은 "" 키)
+        """
+        jobs = (
+            AnalysisJob.objects.filter(
+                status="succeeded",
+                started_at__isnull=False,
+                completed_at__isnull=False,
+            )
+            .order_by("-completed_at")
+            .values_list(
+                "instance_type",
+                "started_at",
+                "completed_at",
+                "video_duration",
+                "video_width",
+                "video_height",
+                "video_fps",
+                "video_file_size",
+            )[: self.max_samples]
+        )
+
+        samples: Dict[str, List[Tuple[Dict, float]]] = {}
+        for instance_type, started_at, completed_at, *metadata in jobs:
+            seconds = (completed_at - started_at).total_seconds()
+            if seconds <= 0:
+                continue
+            samples.setdefault(instance_type, []).append(
+                (extract_features(*metadata), seconds)
+            )
+
+        return samples
+
+    def fit(self) -> Dict[str, int]:
+        """
+        모델 재학습 (인스턴스 타입별 + 전체 풀)
+
+        Returns:
+            {instance_type: 학습 샘플 수} (전체 풀 모델은 "*")
+        """
+        samples = self.load_samples()
+        pooled = [row for rows in samples.values() for row in rows]
+
+        models: Dict[str, _FittedModel] = {}
+        if len(pooled) >= self.min_samples:
+            models[POOLED] = _fit(pooled)
+        for instance_type, rows in samples.items():
+            if instance_type and len(rows) >= self.min_samples:
+                models[instance_type] = _fit(rows)
+
+        self._models = models
+        self._fitted_at = time.monotonic()
+
+        summary = {name: model.samples for name, model in models.items()}
+        logger.info(f"⏱️ 처리 시간 모델 학습: 샘플 {len(pooled)}개, 모델 {summary}")
+        return summary
+
+    def _get_models(self) -> Dict[str, _FittedModel]:
+        """학습된 모델 (주기가 지났으면 재학습, 다른 스레드가 학습 중이면 기존 모델 사용)"""
+        fresh = (
+            self._fitted_at is not None
+            and time.monotonic() - self._fitted_at < self.refit_seconds
+        )
+        if fresh or not self._fit_lock.acquire(blocking=False):
+            return self._models
+
+        try:
+            self.fit()
+        except Exception as e:
+            # DB 오류 시 기존 모델 유지, 다음 주기에 재시도
+            logger.warning(f"⚠️ 처리 시간 모델 학습 실패: {e}")
+            self._fitted_at = time.monotonic()
+        finally:
+            self._fit_lock.release()
+
+        return self._models
+
+    # ------------------------------------------------------------------
+    # 예측
+    # ------------------------------------------------------------------
+
+    def estimate(
+        self,
+        features: Dict[str, Optional[float]],
+        instance_type: Optional[str] = None,
+    ) -> ProcessingTimeEstimate:
+        """
+        처리 시간 예측
+
+        Args:
+            features: extract_features() 결과
+            instance_type: 처리할 인스턴스 타입 (없으면 기본 타입)
+
+        Returns:
+            ProcessingTimeEstimate (중앙값 + 신뢰수준 예측 구간)
+        """
+        instance_type = instance_type or self.default_instance_type
+        models = self._get_models()
+
+        model, name = models.get(instance_type), "instance"
+        if model is None:
+            model, name = models.get(POOLED), "pooled"
+        if model is None:
+            return self._prior(features, instance_type)
+
+        row = model.design_row(features)
+        mean = float(row @ model.coef)
+        # 예측 구간: 잔차 분산 + 계수 추정 불확실성
+        spread = self._z * model.sigma * math.sqrt(1.0 + float(row @ model.covariance @ row))
+
+        return ProcessingTimeEstimate(
+            seconds=math.exp(mean),
+            lower_seconds=math.exp(mean - spread),
+            upper_seconds=math.exp(mean + spread),
+            confidence=self.confidence,
+            instance_type=instance_type,
+            model=name,
+            samples=model.samples,
+        )
+
+    def _prior(
+        self, features: Dict[str, Optional[float]], instance_type: str
+    ) -> ProcessingTimeEstimate:
+        """학습 샘플 부족 시 길이/크기 기반 사전값"""
+        if features.get("duration"):
+            seconds = PRIOR_BASE_SECONDS + PRIOR_REALTIME_FACTOR * features["duration"]
+        elif features.get("size_mb"):
+            seconds = PRIOR_BASE_SECONDS + PRIOR_SECONDS_PER_MB * features["size_mb"]
+        else:
+            seconds = PRIOR_DEFAULT_SECONDS
+
+        return ProcessingTimeEstimate(
+            seconds=seconds,
+            lower_seconds=seconds / PRIOR_SPREAD,
+            upper_seconds=seconds * PRIOR_SPREAD,
+            confidence=self.confidence,
+            instance_type=instance_type,
+            model="prior",
+            samples=0,
+        )
+
+    def estimate_for_video(
+        self, video: Video, instance_type: Optional[str] = None
+    ) -> ProcessingTimeEstimate:
+        """비디오 메타데이터 기반 처리 시간 예측"""
+        return self.estimate(video_features(video), instance_type)
+
+    def message_payload(self, video: Video) -> Dict:
+        """
+        SQS 메시지에 실을 추정치 (Lambda / Batch / GPU 워커는 DB 없이 타임아웃 계산)
+
+        기본 인스턴스 타입 예측 + 학습된 모든 인스턴스 타입별 예측 (byInstanceType)
+        """
+        features = video_features(video)
+        instance_types = {self.default_instance_type} | {
+            name for name in self._get_models() if name != POOLED
+        }
+
+        estimates = {
+            instance_type: self.estimate(features, instance_type)
+            for instance_type in sorted(instance_types)
+        }
+
+        payload = estimates[self.default_instance_type].to_message()
+        payload["byInstanceType"] = {
+            instance_type: {
+                "seconds": round(estimate.seconds),
+                "lowerSeconds": round(estimate.lower_seconds),
+                "upperSeconds": round(estimate.upper_seconds),
+            }
+            for instance_type, estimate in estimates.items()
+        }
+        return payload
+
+    # ------------------------------------------------------------------
+    # 실측 기록
+    # ------------------------------------------------------------------
+
+    def record_job(
+        self,
+        video: Video,
+        job_id: str,
+        instance_type: str,
+        started_at,
+        completed_at,
+        succeeded: bool = True,
+        job_name: str = "",
+        job_queue: str = "",
+        job_definition: str = "",
+        error_message: str = "",
+    ) -> AnalysisJob:
+        """
+        처리 완료 작업을 AnalysisJob으로 기록 (비디오 특성 스냅샷 포함 → 다음 학습 샘플)
+
+        같은 job_id로 다시 호출하면 갱신 (재시도)
+        """
+        job = AnalysisJob.objects.filter(job_id=job_id).first() or AnalysisJob(
+            job_id=job_id, video=video
+        )
+        job.job_name = job_name or job.job_name or f"video-process-{video.video_id}"
+        job.job_queue = job_queue or job.job_queue
+        job.job_definition = job_definition or job.job_definition
+        job.instance_type = instance_type or job.instance_type
+        job.status = "succeeded" if succeeded else "failed"
+        job.started_at = started_at
+        job.completed_at = completed_at
+        job.error_message = error_message
+        job.snapshot_video_features()
+        job.save()
+
+        logger.info(
+            f"⏱️ 처리 시간 기록: video_id={video.video_id}, {job.duration:.0f}초 "
+            f"({job.instance_type or '타입 미상'}, {job.status})"
+        )
+        return job
+
+    # ------------------------------------------------------------------
+    # 큐 ETA
+    # ------------------------------------------------------------------
+
+    def queue_eta(self, video: Video) -> Optional[Dict]:
+        """
+        분석 완료까지 남은 시간 (UI 표시용)
+
+        대기 중이면 앞선 비디오들의 남은 처리 시간 / 동시 처리 수 + 자기 처리 시간,
+        처리 중이면 진행률만큼 뺀 남은 시간.
+        구간은 각 비디오 구간 끝값의 합 (오차가 같은 방향이라고 보는 보수적 합산)
+
+        Returns:
+            ETA 딕셔너리 (완료/실패한 비디오는 None)
+        """
+        if video.analysis_status not in QUEUE_STATUSES:
+            return None
+
+        own_estimate = self.estimate_for_video(video)
+        own = self._remaining(video, own_estimate)
+
+        ahead: List[Video] = []
+        if video.analysis_status == "pending":
+            ahead = list(
+                Video.objects.filter(
+                    analysis_status__in=QUEUE_STATUSES,
+                    created_at__gte=timezone.now() - QUEUE_WINDOW,
+                    created_at__lt=video.created_at,
+                ).order_by("created_at")[:QUEUE_LOOKAHEAD]
+            )
+
+        wait = np.zeros(3)
+        for other in ahead:
+            wait += self._remaining(other, self.estimate_for_video(other))
+        eta = wait / self.queue_concurrency + own
+
+        return {
+            "eta_seconds": round(eta[0]),
+            "eta_lower_seconds": round(eta[1]),
+            "eta_upper_seconds": round(eta[2]),
+            "queue_position": len(ahead),
+            "estimated_processing_seconds": round(own_estimate.seconds),
+            "confidence": own_estimate.confidence,
+            "model": own_estimate.model,
+        }
+
+    @staticmethod
+    def _remaining(video: Video, estimate: ProcessingTimeEstimate) -> np.ndarray:
+        """(중앙값, 하한, 상한) 남은 처리 시간"""
+        fraction = 1.0
+        if video.analysis_status == "processing":
+            fraction = 1.0 - min(max(video.analysis_progress or 0, 0), 100) / 100
+
+        return fraction * np.array(
+            [estimate.seconds, estimate.lower_seconds, estimate.upper_seconds]
+        )
+
+
+# 싱글톤 인스턴스
+_processing_time_estimator = None
+_estimator_lock = threading.Lock()
+
+
+def get_processing_time_estimator() -> ProcessingTimeEstimator:
+    """처리 시간 추정기 싱글톤 인스턴스 반환"""
+    global _processing_time_estimator
+
+    if _processing_time_estimator is None:
+        with _estimator_lock:
+            if _processing_time_estimator is None:
+                _processing_time_estimator = ProcessingTimeEstimator()
+
+    return _processing_time_estimator
@@ -7,13 +7,15 @@ import boto3
 import json
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 import logging
 
 logger = logging.getLogger(__name__)
 
+SQS_BATCH_LIMIT = 10  # SQS 배치 API 호출당 최대 엔트리 수
+
 
 class SQSVideoProcessingService:
     """
@@ -203,6 +205,56 @@ class SQSVideoProcessingService:
             logger.error(f"SQS 메시지 가시성 변경 실패: {e}")
             return False
 
+    def change_message_visibility_batch(
+        self, entries: List[Tuple[str, int]]
+    ) -> Dict[str, Optional[str]]:
+        """
+        여러 메시지의 가시성 타임아웃을 한 번에 변경 (ChangeMessageVisibilityBatch, 호출당 최대 10개)
+
+        Args:
+            entries: [(receipt_handle, visibility_timeout), ...]
+
+        Returns:
+            {receipt_handle: None(성공) 또는 실패 오류 코드}
+        """
+        results: Dict[str, Optional[str]] = {}
+
+        for start in range(0, len(entries), SQS_BATCH_LIMIT):
+            chunk = entries[start : start + SQS_BATCH_LIMIT]
+            by_id = {str(index): handle for index, (handle, _) in enumerate(chunk)}
+
+            try:
+                response = self.sqs_client.change_message_visibility_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {
+                            "Id": str(index),
+                            "ReceiptHandle": handle,
+                            "VisibilityTimeout": int(timeout),
+                        }
+                        for index, (handle, timeout) in enumerate(chunk)
+                    ],
+                )
+            except Exception as e:
+                logger.error(f"SQS 메시지 가시성 일괄 변경 실패: {e}")
+                for handle, _ in chunk:
+                    results[handle] = "RequestFailed"
+                continue
+
+            for entry in response.get("Successful", []):
+                results[by_id[entry["Id"]]] = None
+            for entry in response.get("Failed", []):
+                results[by_id[entry["Id"]]] = entry.get("Code", "Unknown")
+                logger.warning(
+                    f"SQS 메시지 가시성 변경 실패: {entry.get('Code')} {entry.get('Message', '')}"
+                )
+
+        logger.info(
+            f"SQS 메시지 가시성 일괄 변경: {len(entries)}개 "
+            f"({sum(1 for error in results.values() if error is None)}개 성공)"
+        )
+        return results
+
     def get_queue_attributes(self) -> Dict[str, Any]:
         """
         SQS 큐 속성 조회
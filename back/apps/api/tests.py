@@ -1,3 +1,1145 @@
-from django.test import TestCase
+import base64
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from botocore.exceptions import ClientError
+
+from apps.api.services.ai import embedding_backfill as backfill_module
+from apps.api.services.ai.bedrock_service import BedrockService
+from apps.api.services.ai.embedding_backfill import TokenBucket
+from apps.api.services.ai.embedding_outbox import EmbeddingOutboxService
+from apps.api.services.ai.lexical_search_service import expand_query
+from apps.api.services.business import get_event_service
+from apps.api.services.business import processing_time_estimator as estimator_module
+from apps.api.services.business.processing_time_estimator import (
+    MB,
+    ProcessingTimeEstimator,
+    _fit,
+    extract_features,
+)
+from apps.api.services.infrastructure.sqs_service import SQSVideoProcessingService
+from apps.db.models import EmbeddingOutbox, Event, Video
+from apps.db.signals import _DataVersionBump
+
+
+class EventHydrationQueryCountTest(TestCase):
+    """Text2SQL 결과 → Event 일괄 변환 쿼리 수 검증"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.video = Video.objects.create(
+            name="hydration.mp4",
+            filename="hydration.mp4",
+            original_filename="hydration.mp4",
+            s3_key="videos/hydration.mp4",
+            s3_raw_key="videos/hydration.mp4",
+        )
+        cls.events = [
+            Event.objects.create(
+                video=cls.video,
+                event_type="walking",
+                timestamp=float(i),
+                frame_number=i * 30,
+            )
+            for i in range(50)
+        ]
+
+    def test_id_rows_use_single_query_and_keep_order(self):
+        rows = [{"id": event.id} for event in reversed(self.events)]
+        rows.append({"id": 999999})  # 존재하지 않는 ID
+
+        with self.assertNumQueries(1):
+            events = get_event_service().hydrate_events_from_rows(rows)
+            # select_related('video') → 추가 쿼리 없음
+            names = [event.video.name for event in events]
+
+        self.assertEqual(
+            [event.id for event in events],
+            [event.id for event in reversed(self.events)],
+        )
+        self.assertEqual(len(names), 50)
+
+    def test_timestamp_rows_use_single_query(self):
+        rows = [{"timestamp": event.timestamp} for event in self.events[::-1]]
+
+        with self.assertNumQueries(1):
+            events = get_event_service().hydrate_events_from_rows(
+                rows, video=self.video
+            )
+            names = [event.video.name for event in events]
+
+        self.assertEqual(
+            [event.id for event in events],
+            [event.id for event in self.events[::-1]],
+        )
+        self.assertEqual(len(names), 50)
+
+    def test_timestamp_fallback_disabled(self):
+        rows = [{"timestamp": 1.0}]
+
+        with self.assertNumQueries(0):
+            events = get_event_service().hydrate_events_from_rows(
+                rows, match_timestamp=False
+            )
+
+        self.assertEqual(events, [])
+
+    def test_timestamp_rows_without_video_scope_are_skipped(self):
+        other = Video.objects.create(
+            name="other.mp4",
+            filename="other.mp4",
+            original_filename="other.mp4",
+            s3_key="videos/other.mp4",
+            s3_raw_key="videos/other.mp4",
+        )
+        Event.objects.create(
+            video=other, event_type="walking", timestamp=1.0, frame_number=30
+        )
+
+        rows = [{"timestamp": 1.0}, {"timestamp": 1.0, "video_id": other.pk}]
+
+        with self.assertNumQueries(1):
+            events = get_event_service().hydrate_events_from_rows(rows)
+
+        self.assertEqual([event.video_id for event in events], [other.pk])
+
+
+# 백엔드 밖 스크립트 (batch / gpu_worker / lambda)는 저장소 루트 기준으로 로드
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _load_script(relative_path, module_name):
+    """저장소 루트 기준 스크립트를 모듈로 로드 (백엔드 이미지에는 없을 수 있음)"""
+    spec = importlib.util.spec_from_file_location(module_name, REPO_ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeSQSClient:
+    """ChangeMessageVisibilityBatch 호출 기록 + 지정한 Id를 실패로 응답"""
+
+    def __init__(self, failures=None, error=None):
+        self.failures = failures or {}  # receipt_handle -> 오류 코드
+        self.error = error
+        self.calls = []
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        self.calls.append(Entries)
+        if self.error:
+            raise self.error
+        return {
+            "Successful": [
+                {"Id": entry["Id"]}
+                for entry in Entries
+                if entry["ReceiptHandle"] not in self.failures
+            ],
+            "Failed": [
+                {
+                    "Id": entry["Id"],
+                    "Code": self.failures[entry["ReceiptHandle"]],
+                    "SenderFault": True,
+                }
+                for entry in Entries
+                if entry["ReceiptHandle"] in self.failures
+            ],
+        }
+
+
+class SQSVisibilityBatchTest(SimpleTestCase):
+    """change_message_visibility_batch: 10개 단위 분할, Id → 수신 핸들 매핑, 실패 코드"""
+
+    def _service(self, client):
+        service = SQSVideoProcessingService.__new__(SQSVideoProcessingService)
+        service.sqs_client = client
+        service.queue_url = "https://sqs.example/queue"
+        return service
+
+    def test_chunks_of_ten_and_maps_ids_back_to_handles(self):
+        client = _FakeSQSClient(failures={"h3": "MessageNotInflight", "h11": "ReceiptHandleIsInvalid"})
+        entries = [(f"h{i}", 600 + i) for i in range(12)]
+
+        results = self._service(client).change_message_visibility_batch(entries)
+
+        self.assertEqual([len(call) for call in client.calls], [10, 2])
+        # Id는 호출마다 0부터 다시 시작 → 두 번째 호출의 "1"은 h11
+        self.assertEqual(client.calls[1][1]["Id"], "1")
+        self.assertEqual(client.calls[1][1]["ReceiptHandle"], "h11")
+        self.assertEqual(client.calls[0][5]["VisibilityTimeout"], 605)
+
+        self.assertEqual(results["h3"], "MessageNotInflight")
+        self.assertEqual(results["h11"], "ReceiptHandleIsInvalid")
+        self.assertEqual(
+            {handle for handle, error in results.items() if error is None},
+            {f"h{i}" for i in range(12)} - {"h3", "h11"},
+        )
+
+    def test_request_error_marks_whole_chunk_failed(self):
+        client = _FakeSQSClient(error=RuntimeError("network down"))
+
+        results = self._service(client).change_message_visibility_batch(
+            [("a", 300), ("b", 300)]
+        )
+
+        self.assertEqual(results, {"a": "RequestFailed", "b": "RequestFailed"})
+
+
+@skipUnless((REPO_ROOT / "gpu_worker").is_dir(), "gpu_worker 소스 없음")
+class VisibilityManagerTest(SimpleTestCase):
+    """가시성 관리자: 진행률 기반 연장 폭, 12시간 상한, 일괄 변경 결과 반영"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.module = _load_script("gpu_worker/visibility_manager.py", "gpu_visibility_manager")
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(
+            self.module, "time", SimpleNamespace(monotonic=lambda: self.now)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sqs = mock.Mock(spec=["change_message_visibility_batch"])
+        self.sqs.change_message_visibility_batch.side_effect = lambda entries: {
+            handle: None for handle, _ in entries
+        }
+        self.manager = self.module.VisibilityTimeoutManager(self.sqs)
+
+    def _info(self, elapsed, progress=0.0, estimated=1000, waited=0):
+        return {
+            "received_time": self.now - elapsed - waited,
+            "start_time": self.now - elapsed,
+            "started": True,
+            "progress": progress,
+            "estimated_time": estimated,
+        }
+
+    def test_next_timeout_scales_with_reported_progress(self):
+        # 600초에 50% → 남은 600초 × 1.5
+        self.assertEqual(self.manager._next_timeout(self._info(600, 0.5), self.now), 900)
+        # 900초에 75% → 남은 300초 × 1.5
+        self.assertEqual(self.manager._next_timeout(self._info(900, 0.75), self.now), 450)
+        # 거의 끝남 → 최소 연장
+        self.assertEqual(self.manager._next_timeout(self._info(990, 0.99), self.now), 120)
+        # 느린 진행 → 최대 연장
+        self.assertEqual(self.manager._next_timeout(self._info(600, 0.1), self.now), 1800)
+
+    def test_next_timeout_without_progress_uses_estimate(self):
+        # 진행률 5% 미만 → 예상 처리 시간 - 경과 시간
+        self.assertEqual(
+            self.manager._next_timeout(self._info(400, 0.01, estimated=1000), self.now), 900
+        )
+        # 예상 시간을 넘김 → 최소 연장
+        self.assertEqual(
+            self.manager._next_timeout(self._info(2000, 0.0, estimated=1000), self.now), 120
+        )
+
+    def test_next_timeout_clamped_to_sqs_12_hour_limit(self):
+        limit = self.module.SQS_MAX_VISIBILITY
+        self.assertEqual(
+            self.manager._next_timeout(self._info(limit - 100, 0.5), self.now), 100
+        )
+        self.assertEqual(self.manager._next_timeout(self._info(limit + 10, 0.5), self.now), 0)
+
+        self.manager.max_extension = limit
+        self.assertEqual(
+            self.manager._next_timeout(self._info(limit - 5000, 0.5), self.now), 5000
+        )
+        # 상한은 처리 시작이 아니라 수신 시점 기준
+        self.assertEqual(
+            self.manager._next_timeout(self._info(1000, 0.5, waited=limit - 1500), self.now), 500
+        )
+
+    def test_next_timeout_before_start_uses_full_estimate(self):
+        info = dict(self._info(0, estimated=1000, waited=3000), started=False)
+
+        self.assertEqual(self.manager._next_timeout(info, self.now), 1500)
+
+    def test_flush_sets_initial_timeouts_in_one_call(self):
+        self.manager.register_message("a", "1", estimated_processing_time=900)
+        self.manager.register_message("b", "2", estimated_processing_time=60)
+
+        self.manager._flush()
+
+        self.sqs.change_message_visibility_batch.assert_called_once()
+        entries = dict(self.sqs.change_message_visibility_batch.call_args[0][0])
+        self.assertEqual(entries, {"a": 900, "b": 120})  # 최소 연장 이상
+        status = self.manager.get_message_status("a")
+        self.assertFalse(status["initial_pending"])
+        self.assertEqual(status["deadline"], self.now + 900)
+        self.assertEqual(self.manager.get_statistics()["api_calls"], 1)
+
+        # 아직 여유가 있으면 호출하지 않음
+        self.manager._flush()
+        self.sqs.change_message_visibility_batch.assert_called_once()
+
+    def test_flush_extends_due_messages_by_progress(self):
+        self.manager.register_message("a", "1", estimated_processing_time=600)
+        self.manager.mark_started("a")
+        self.manager._flush()
+
+        self.now += 500  # 남은 가시성 100초 → 연장 대상
+        self.manager.update_progress("a", 0.5)
+        self.manager._flush()
+
+        entries = self.sqs.change_message_visibility_batch.call_args[0][0]
+        self.assertEqual(entries, [("a", 750)])  # 남은 500초 × 1.5
+        status = self.manager.get_message_status("a")
+        self.assertEqual(status["extension_count"], 1)
+        self.assertEqual(status["deadline"], self.now + 750)
+
+    def test_flush_marks_lost_message_and_stops_extending(self):
+        self.sqs.change_message_visibility_batch.side_effect = lambda entries: {
+            handle: "MessageNotInflight" for handle, _ in entries
+        }
+        self.manager.register_message("a", "1", estimated_processing_time=600)
+
+        self.manager._flush()
+        self.manager._flush()
+
+        self.sqs.change_message_visibility_batch.assert_called_once()
+        self.assertTrue(self.manager.get_message_status("a")["lost"])
+        self.assertEqual(self.manager.get_statistics()["lost_messages"], 1)
+
+    def test_flush_releases_messages_past_max_processing_time(self):
+        self.manager.register_message("a", "1", estimated_processing_time=600)
+        self.manager.mark_started("a")
+        self.now += self.manager.max_processing_time + 1
+
+        self.manager._flush()
+
+        self.sqs.change_message_visibility_batch.assert_not_called()
+        self.assertEqual(self.manager.get_active_message_count(), 0)
+
+    def test_queue_wait_past_cap_does_not_time_out(self):
+        # 앞선 GPU 작업 뒤에서 최대 처리 시간보다 오래 대기한 선행 다운로드 메시지
+        self.manager.register_message("a", "1", estimated_processing_time=600)
+        self.manager._flush()
+        for _ in range(int(self.manager.max_processing_time / 300) + 2):
+            self.now += 300
+            self.manager._flush()
+
+        self.assertEqual(self.manager.get_active_message_count(), 1)
+        # 대기 중에는 예상 처리 시간 전체로 연장
+        self.assertEqual(self.sqs.change_message_visibility_batch.call_args[0][0], [("a", 900)])
+
+        # GPU 슬롯 점유 후부터 최대 처리 시간 측정
+        self.manager.mark_started("a")
+        self.now += self.manager.max_processing_time - 60
+        self.manager._flush()
+        self.assertEqual(self.manager.get_active_message_count(), 1)
+
+        self.now += 120
+        self.manager._flush()
+        self.assertEqual(self.manager.get_active_message_count(), 0)
+
+
+def _timing_samples(rng, count, noise=0.2):
+    """처리 시간 = 120 + 2 × 길이 (로그 정규 잡음) 합성 샘플"""
+    rows = []
+    for _ in range(count):
+        duration = float(rng.uniform(30, 1800))
+        features = extract_features(duration, 1920, 1080, 30.0, int(duration * 2 * MB))
+        rows.append((features, (120 + 2 * duration) * float(np.exp(rng.normal(0, noise)))))
+    return rows
+
+
+class ProcessingTimeEstimatorTest(SimpleTestCase):
+    """처리 시간 추정: 예측 구간 적중률, 결측 특성 대체, 모델 선택 순서"""
+
+    def _estimator(self, samples):
+        estimator = ProcessingTimeEstimator(min_samples=8, confidence=0.9)
+        with mock.patch.object(estimator, "load_samples", return_value=samples):
+            estimator.fit()
+        return estimator
+
+    def test_prediction_interval_covers_held_out_samples(self):
+        rng = np.random.default_rng(0)
+        estimator = self._estimator({"g5.xlarge": _timing_samples(rng, 300)})
+
+        held_out = _timing_samples(rng, 500)
+        covered = 0
+        for features, seconds in held_out:
+            estimate = estimator.estimate(features, "g5.xlarge")
+            covered += estimate.lower_seconds <= seconds <= estimate.upper_seconds
+
+        self.assertEqual(estimate.model, "instance")
+        # 90% 구간 → 적중률이 신뢰수준 근처
+        self.assertGreater(covered / len(held_out), 0.85)
+        self.assertLess(covered / len(held_out), 0.95)
+
+    def test_missing_features_filled_with_sample_median(self):
+        rows = [
+            (extract_features(duration, None, None, fps, None), 100.0 + duration)
+            for duration, fps in [(10, None), (20, 30.0), (40, None), (80, 60.0), (160, 24.0)]
+        ]
+
+        model = _fit(rows)
+
+        # duration: 모두 있음, megapixels/size_mb: 모두 없음 → 0, fps: 있는 값(24, 30, 60)의 중앙값
+        self.assertAlmostEqual(model.fill[0], math.log1p(40))
+        self.assertEqual(model.fill[1], 0.0)
+        self.assertAlmostEqual(model.fill[2], math.log1p(30.0))
+        self.assertEqual(model.fill[3], 0.0)
+
+        row = model.design_row(extract_features(50, None, None, None, None))
+        self.assertFalse(np.isnan(row).any())
+        self.assertAlmostEqual(row[3], math.log1p(30.0))
+
+    def test_falls_back_to_pooled_then_prior(self):
+        rng = np.random.default_rng(1)
+        estimator = self._estimator(
+            {
+                "g5.xlarge": _timing_samples(rng, 10),
+                "g4dn.xlarge": _timing_samples(rng, 3),  # 타입별 모델 샘플 부족
+                "": _timing_samples(rng, 2),  # 타입 미기록 → 풀 모델에만 사용
+            }
+        )
+        features = extract_features(600, 1920, 1080, 30.0, 1200 * MB)
+
+        self.assertEqual(estimator.estimate(features, "g5.xlarge").model, "instance")
+        pooled = estimator.estimate(features, "g4dn.xlarge")
+        self.assertEqual((pooled.model, pooled.samples), ("pooled", 15))
+
+        prior = self._estimator({"g5.xlarge": _timing_samples(rng, 3)}).estimate(
+            features, "g5.xlarge"
+        )
+        self.assertEqual(prior.model, "prior")
+        self.assertEqual(prior.seconds, 120 + 2 * 600)
+        self.assertEqual(
+            (prior.lower_seconds, prior.upper_seconds), (1320 / 3, 1320 * 3)
+        )
+
+    def test_prior_without_duration_uses_file_size(self):
+        estimator = self._estimator({})
+
+        self.assertEqual(
+            estimator.estimate(extract_features(None, None, None, None, 300 * MB)).seconds,
+            120 + 300,
+        )
+        self.assertEqual(
+            estimator.estimate(extract_features(None, None, None, None, None)).seconds, 600
+        )
+
+
+class QueueEtaTest(SimpleTestCase):
+    """큐 ETA: 앞선 비디오 남은 시간 / 동시 처리 수 + 자기 처리 시간"""
+
+    def setUp(self):
+        self.estimator = ProcessingTimeEstimator(min_samples=8, confidence=0.9)
+        # 방금 학습한 것으로 표시 (DB 조회 없음), 모델이 없으므로 사전값 (120 + 2 × 길이)
+        self.estimator._fitted_at = time.monotonic()
+        self.estimator.queue_concurrency = 2
+
+    def _video(self, status, duration, progress=0):
+        return SimpleNamespace(
+            analysis_status=status,
+            analysis_progress=progress,
+            duration=duration,
+            resolution_width=None,
+            width=None,
+            resolution_height=None,
+            height=None,
+            fps=None,
+            frame_rate=None,
+            file_size=None,
+            created_at=timezone.now(),
+        )
+
+    def _queue_eta(self, video, ahead):
+        with mock.patch.object(estimator_module.Video, "objects") as objects:
+            objects.filter.return_value.order_by.return_value = ahead
+            return self.estimator.queue_eta(video)
+
+    def test_pending_video_waits_for_videos_ahead(self):
+        ahead = [
+            self._video("processing", 100, progress=50),  # 남은 320 × 0.5 = 160
+            self._video("pending", 40),  # 200
+        ]
+
+        eta = self._queue_eta(self._video("pending", 100), ahead)
+
+        self.assertEqual(eta["queue_position"], 2)
+        self.assertEqual(eta["estimated_processing_seconds"], 320)
+        self.assertEqual(eta["eta_seconds"], round((160 + 200) / 2 + 320))
+        self.assertEqual(eta["eta_lower_seconds"], round((160 + 200) / 3 / 2 + 320 / 3))
+        self.assertEqual(eta["eta_upper_seconds"], round((160 + 200) * 3 / 2 + 320 * 3))
+        self.assertEqual(eta["model"], "prior")
+
+    def test_processing_video_counts_only_its_remaining_share(self):
+        with mock.patch.object(estimator_module.Video, "objects") as objects:
+            eta = self.estimator.queue_eta(self._video("processing", 100, progress=75))
+
+        objects.filter.assert_not_called()
+        self.assertEqual(eta["queue_position"], 0)
+        self.assertEqual(eta["eta_seconds"], 80)
+
+    def test_finished_video_has_no_eta(self):
+        self.assertIsNone(self.estimator.queue_eta(self._video("completed", 100)))
+        self.assertIsNone(self.estimator.queue_eta(self._video("failed", 100)))
+
+
+ESTIMATE_MESSAGE = {
+    "seconds": 600,
+    "lowerSeconds": 400,
+    "upperSeconds": 1000,
+    "byInstanceType": {
+        "g5.xlarge": {"seconds": 600, "lowerSeconds": 400, "upperSeconds": 1000},
+        "g4dn.xlarge": {"seconds": 1200, "lowerSeconds": 800, "upperSeconds": 2000},
+    },
+}
+
+
+@skipUnless((REPO_ROOT / "lambda").is_dir(), "lambda 소스 없음")
+class LambdaJobTimeoutTest(SimpleTestCase):
+    """Lambda: 메시지 추정치 → Batch Job 타임아웃 (인스턴스 타입별 상한 중 최대)"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        environ = {
+            "BATCH_JOB_QUEUE": "test-queue",
+            "BATCH_JOB_DEFINITION": "test-definition",
+            "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "ap-northeast-2"),
+        }
+        with mock.patch.dict(os.environ, environ):
+            cls.module = _load_script("lambda/sqs_to_batch.py", "lambda_sqs_to_batch")
+
+    def test_uses_largest_upper_bound_with_margin(self):
+        expected = int(2000 * self.module.BATCH_TIMEOUT_MARGIN)
+        expected = max(self.module.BATCH_MIN_TIMEOUT, min(self.module.BATCH_MAX_TIMEOUT, expected))
+
+        self.assertEqual(self.module.job_timeout_from_estimate({"estimate": ESTIMATE_MESSAGE}), expected)
+
+    def test_clamped_to_min_and_max(self):
+        short = {"estimate": {"upperSeconds": 10}}
+        long = {"estimate": {"upperSeconds": 10 ** 7}}
+
+        self.assertEqual(self.module.job_timeout_from_estimate(short), self.module.BATCH_MIN_TIMEOUT)
+        self.assertEqual(self.module.job_timeout_from_estimate(long), self.module.BATCH_MAX_TIMEOUT)
+
+    def test_missing_estimate_uses_job_definition_default(self):
+        self.assertIsNone(self.module.job_timeout_from_estimate({}))
+        self.assertIsNone(self.module.job_timeout_from_estimate({"estimate": {"seconds": 600}}))
+        self.assertIsNone(self.module.job_timeout_from_estimate("not a dict"))
+
+
+@skipUnless((REPO_ROOT / "batch").is_dir(), "batch 소스 없음")
+class BatchTimeoutFromEstimateTest(SimpleTestCase):
+    """Batch / GPU 워커: 실행 인스턴스 타입의 예측 구간 상한 → 타임아웃"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.module = _load_script("batch/processing_estimate.py", "batch_processing_estimate")
+
+    def _expected(self, upper_seconds):
+        timeout = int(upper_seconds * self.module.TIMEOUT_MARGIN)
+        return max(self.module.MIN_TIMEOUT, min(self.module.MAX_TIMEOUT, timeout))
+
+    def test_uses_running_instance_type_prediction(self):
+        self.assertEqual(
+            self.module.timeout_from_estimate(ESTIMATE_MESSAGE, instance_type="g4dn.xlarge"),
+            self._expected(2000),
+        )
+
+    def test_unknown_instance_type_uses_default_prediction(self):
+        self.assertEqual(
+            self.module.timeout_from_estimate(ESTIMATE_MESSAGE, instance_type="p3.2xlarge"),
+            self._expected(1000),
+        )
+
+    def test_clamped_and_default_without_estimate(self):
+        self.assertEqual(
+            self.module.timeout_from_estimate({"upperSeconds": 10}, instance_type="g5.xlarge"),
+            self.module.MIN_TIMEOUT,
+        )
+        self.assertEqual(
+            self.module.timeout_from_estimate({"upperSeconds": 10 ** 7}, instance_type="g5.xlarge"),
+            self.module.MAX_TIMEOUT,
+        )
+        self.assertEqual(
+            self.module.timeout_from_estimate(None, instance_type="g5.xlarge", default=300), 300
+        )
+
+
+class _FakeClock:
+    """monotonic / sleep 대체 (sleep하면 시각만 진행)"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class TokenBucketTest(SimpleTestCase):
+    """토큰 버킷: 초당 요청 수 제한 + throttling 시 절반 감소, 성공 시 선형 증가 (AIMD)"""
+
+    def setUp(self):
+        self.clock = _FakeClock()
+        patcher = mock.patch.object(backfill_module, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_acquire_waits_for_refill_at_rate(self):
+        bucket = TokenBucket(rate=8)
+
+        for _ in range(8):  # 버킷 크기만큼은 즉시
+            self.assertEqual(bucket.acquire(), 0.0)
+        waited = bucket.acquire()
+
+        self.assertEqual(waited, 0.125)
+        self.assertEqual(self.clock.slept, 0.125)
+
+    def test_throttle_halves_rate_down_to_min(self):
+        bucket = TokenBucket(rate=16, min_rate=3, decrease_cooldown=1.0)
+
+        rates = []
+        for _ in range(4):
+            bucket.on_throttle()
+            rates.append(bucket.rate)
+            self.clock.now += 1.0
+
+        self.assertEqual(rates, [8, 4, 3, 3])
+        # 쌓여 있던 토큰도 비움 → 감소 직후 요청이 몰리지 않음
+        self.assertLessEqual(bucket._tokens, 1.0)
+
+    def test_throttles_within_cooldown_count_once(self):
+        bucket = TokenBucket(rate=16, decrease_cooldown=1.0)
+
+        bucket.on_throttle()
+        self.clock.now += 0.5
+        bucket.on_throttle()  # 같은 순간 몰린 응답들 → 한 번만 감소
+        self.assertEqual(bucket.rate, 8)
+
+        self.clock.now += 0.6
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 4)
+
+    def test_success_recovers_linearly_up_to_max(self):
+        bucket = TokenBucket(rate=10, increase_step=1.0)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 5)
+
+        for expected in (6, 7, 8, 9, 10, 10):
+            bucket.on_success()
+            self.assertEqual(bucket.rate, expected)
+
+    def test_default_increase_step_is_one_percent_of_max(self):
+        bucket = TokenBucket(rate=20)
+        bucket.on_throttle()
+
+        bucket.on_success()
+
+        self.assertAlmostEqual(bucket.rate, 10.2)
+
+
+class EmbeddingOutboxTest(TestCase):
+    """Embedding 아웃박스: 점유(lease), 실패 시 지수 백오프, 최대 시도 초과 행"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.video = Video.objects.create(
+            name="outbox.mp4",
+            filename="outbox.mp4",
+            original_filename="outbox.mp4",
+            s3_key="videos/outbox.mp4",
+            s3_raw_key="videos/outbox.mp4",
+        )
+        cls.events = [
+            Event.objects.create(
+                video=cls.video,
+                event_type="walking",
+                timestamp=float(i),
+                frame_number=i * 30,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.outbox = EmbeddingOutboxService(
+            batch_size=2, max_attempts=3, lease_seconds=300, auto_drain=False
+        )
+        self.outbox.enqueue([event.id for event in self.events])
+
+    def _embed_returns(self, updated_ids):
+        service = mock.Mock()
+        service.embed_events.return_value = (updated_ids, None)
+        return mock.patch.object(
+            backfill_module, "get_embedding_backfill_service", return_value=service
+        )
+
+    def _seconds_until(self, value):
+        return (value - timezone.now()).total_seconds()
+
+    def test_claim_leases_rows_until_lease_expires(self):
+        first = self.outbox._claim()
+        second = self.outbox._claim()
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(self.outbox._claim(), {})  # 모두 점유 중
+
+        row = EmbeddingOutbox.objects.get(pk=next(iter(first)))
+        self.assertEqual(row.attempts, 1)
+        self.assertAlmostEqual(self._seconds_until(row.available_at), 300, delta=5)
+
+        # 드레이너가 죽어 lease가 지나면 다른 드레이너가 다시 점유
+        EmbeddingOutbox.objects.filter(pk=row.pk).update(
+            available_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(self.outbox._claim(), {row.pk: row.event_id})
+        row.refresh_from_db()
+        self.assertEqual(row.attempts, 2)
+
+    def test_success_deletes_rows(self):
+        with self._embed_returns([event.id for event in self.events]):
+            stats = self.outbox.drain()
+
+        self.assertEqual(stats, {"batches": 2, "claimed": 3, "embedded": 3, "failed": 0})
+        self.assertFalse(EmbeddingOutbox.objects.exists())
+
+    def test_failure_backs_off_exponentially(self):
+        row = EmbeddingOutbox.objects.get(event=self.events[0])
+        EmbeddingOutbox.objects.exclude(pk=row.pk).delete()
+
+        for attempt, delay in ((1, 30), (2, 60)):
+            with self._embed_returns([]):
+                stats = self.outbox.drain()
+
+            self.assertEqual(stats["failed"], 1)
+            row.refresh_from_db()
+            self.assertEqual(row.attempts, attempt)
+            self.assertEqual(row.last_error, "embedding 생성 실패")
+            self.assertAlmostEqual(self._seconds_until(row.available_at), delay, delta=5)
+
+            # 백오프 중에는 점유되지 않음
+            self.assertEqual(self.outbox._claim(), {})
+            EmbeddingOutbox.objects.filter(pk=row.pk).update(
+                available_at=timezone.now() - timedelta(seconds=1)
+            )
+
+    def test_rows_past_max_attempts_are_left_as_dead(self):
+        EmbeddingOutbox.objects.filter(event=self.events[0]).update(attempts=3)
+
+        self.assertNotIn(self.events[0].id, self.outbox._claim().values())
+        lag = self.outbox.get_lag()
+        self.assertEqual((lag["pending"], lag["dead"]), (2, 1))
+
+    def test_enqueue_again_resets_attempts_and_backoff(self):
+        EmbeddingOutbox.objects.filter(event=self.events[0]).update(
+            attempts=3,
+            last_error="throttled",
+            available_at=timezone.now() + timedelta(hours=1),
+        )
+
+        self.outbox.enqueue([self.events[0].id])
+
+        row = EmbeddingOutbox.objects.get(event=self.events[0])
+        self.assertEqual((row.attempts, row.last_error), (0, ""))
+        self.assertLessEqual(row.available_at, timezone.now())
+
+    def test_enqueue_db_error_keeps_outer_transaction_usable(self):
+        def broken_insert(*args, **kwargs):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 / 0")
+
+        with transaction.atomic():
+            with mock.patch.object(
+                EmbeddingOutbox.objects, "bulk_create", side_effect=broken_insert
+            ):
+                event = Event.objects.create(
+                    video=self.video,
+                    event_type="falling",
+                    timestamp=10.0,
+                    frame_number=300,
+                    searchable_text="넘어짐",
+                )
+
+            # signal 실패가 바깥 트랜잭션을 깨뜨리지 않음
+            self.assertTrue(Event.objects.filter(pk=event.pk).exists())
+
+
+class _FakeS3Body:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self, chunk_size):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start : start + chunk_size]
+
+
+class _FakeS3Client:
+    """메모리 객체 하나를 Range GET으로 제공 (요청한 Range 기록)"""
+
+    def __init__(self, data, **head):
+        self.data = data
+        self.head = {
+            "ContentLength": len(data),
+            "ETag": f'"{hashlib.md5(data).hexdigest()}"',
+            **head,
+        }
+        self.ranges = []
+
+    def head_object(self, **kwargs):
+        return dict(self.head)
+
+    def get_object(self, Bucket, Key, Range, IfMatch):
+        start, end = (int(value) for value in Range[len("bytes=") :].split("-"))
+        self.ranges.append((start, end))
+        return {"Body": _FakeS3Body(self.data[start : end + 1])}
+
+
+@skipUnless((REPO_ROOT / "batch").is_dir(), "batch 소스 없음")
+class S3DownloaderTest(SimpleTestCase):
+    """병렬 Range GET 다운로더: 파트 분할, 이어받기, 무결성 검증"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.module = _load_script("batch/s3_downloader.py", "batch_s3_downloader")
+        cls.MB = cls.module.MB
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.local_path = os.path.join(temp_dir.name, "video.mp4")
+        # 3.5MB → 1MB 파트 4개
+        self.data = bytes(range(256)) * (7 * self.MB // 2 // 256)
+
+    def _downloader(self, client):
+        return self.module.S3Downloader(
+            s3_client=client, part_size_mb=1, max_concurrency=4, max_attempts=1, verify=True
+        )
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_plan_parts_covers_object_without_overlap(self):
+        downloader = self._downloader(None)
+        size = len(self.data)
+
+        parts = downloader._plan_parts(size)
+
+        self.assertEqual([index for index, _, _ in parts], [0, 1, 2, 3])
+        self.assertEqual(parts[0][1:], (0, self.MB - 1))
+        self.assertEqual(parts[-1][1:], (3 * self.MB, size - 1))
+        for (_, _, end), (_, start, _) in zip(parts, parts[1:]):
+            self.assertEqual(start, end + 1)
+        self.assertEqual(downloader._plan_parts(self.MB), [(0, 0, self.MB - 1)])
+        self.assertEqual(downloader._plan_parts(0), [])
+
+    def test_download_fetches_all_parts_and_verifies_etag(self):
+        client = _FakeS3Client(self.data)
+
+        result = self._downloader(client).download("bucket", "key", self.local_path)
+
+        self.assertEqual(self._read(self.local_path), self.data)
+        planned = self._downloader(None)._plan_parts(len(self.data))
+        self.assertEqual(sorted(client.ranges), [(start, end) for _, start, end in planned])
+        self.assertEqual((result.parts, result.resumed_parts), (4, 0))
+        self.assertEqual(result.transferred_bytes, len(self.data))
+        self.assertEqual((result.verified_by, result.verified), ("etag", True))
+        self.assertFalse(os.path.exists(self.local_path + ".part"))
+        self.assertFalse(os.path.exists(self.local_path + ".part.json"))
+
+    def _interrupted_download(self, etag, done):
+        """이전 시도가 done 파트까지 받고 중단된 상태 재현"""
+        partial = bytearray(len(self.data))
+        for index in done:
+            part = slice(index * self.MB, (index + 1) * self.MB)
+            partial[part] = self.data[part]
+        with open(self.local_path + ".part", "wb") as f:
+            f.write(partial)
+        with open(self.local_path + ".part.json", "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "size": len(self.data), "part_size": self.MB, "done": done}, f)
+
+    def test_resume_fetches_only_missing_parts(self):
+        client = _FakeS3Client(self.data)
+        self._interrupted_download(hashlib.md5(self.data).hexdigest(), [0, 1])
+
+        result = self._downloader(client).download("bucket", "key", self.local_path)
+
+        self.assertEqual(
+            sorted(client.ranges),
+            [(2 * self.MB, 3 * self.MB - 1), (3 * self.MB, len(self.data) - 1)],
+        )
+        self.assertEqual(result.resumed_parts, 2)
+        self.assertEqual(result.transferred_bytes, len(self.data) - 2 * self.MB)
+        self.assertEqual(self._read(self.local_path), self.data)
+
+    def test_partial_of_another_object_version_is_discarded(self):
+        client = _FakeS3Client(self.data)
+        self._interrupted_download("stale-etag", [0, 1])
+
+        result = self._downloader(client).download("bucket", "key", self.local_path)
+
+        self.assertEqual(len(client.ranges), 4)
+        self.assertEqual(result.resumed_parts, 0)
+        self.assertEqual(self._read(self.local_path), self.data)
+
+    def test_verify_prefers_full_object_checksum(self):
+        checksum = base64.b64encode(hashlib.sha256(self.data).digest()).decode()
+        client = _FakeS3Client(self.data, ChecksumSHA256=checksum)
+
+        result = self._downloader(client).download("bucket", "key", self.local_path)
+
+        self.assertEqual((result.verified_by, result.verified), ("sha256", True))
+
+    def test_checksum_mismatch_raises_and_discards_partial(self):
+        client = _FakeS3Client(self.data, ETag='"0123456789abcdef0123456789abcdef"')
+
+        with self.assertRaises(self.module.S3IntegrityError):
+            self._downloader(client).download("bucket", "key", self.local_path)
+
+        for suffix in ("", ".part", ".part.json"):
+            self.assertFalse(os.path.exists(self.local_path + suffix))
+
+    def test_multipart_etag_matched_with_common_part_size(self):
+        part_size = 8 * self.MB
+        data = bytes(range(256)) * (10 * self.MB // 256)
+        digests = b"".join(
+            hashlib.md5(data[start : start + part_size]).digest()
+            for start in range(0, len(data), part_size)
+        )
+        client = _FakeS3Client(data, ETag=f'"{hashlib.md5(digests).hexdigest()}-2"')
+
+        result = self._downloader(client).download("bucket", "key", self.local_path)
+
+        self.assertEqual((result.verified_by, result.verified), ("etag", True))
+
+    def test_unverifiable_download_reports_verified_none(self):
+        # 업로드 파트 크기를 재현할 수 없는 멀티파트 ETag / SSE-KMS ETag → 실패가 아니라 미검증
+        for head in (
+            {"ETag": '"0123456789abcdef0123456789abcdef-3"'},
+            {"ETag": '"0123456789abcdef0123456789abcdef"', "ServerSideEncryption": "aws:kms"},
+        ):
+            with self.subTest(head=head):
+                client = _FakeS3Client(self.data, **head)
+
+                result = self._downloader(client).download("bucket", "key", self.local_path)
+
+                self.assertEqual((result.verified_by, result.verified), (None, None))
+                self.assertEqual(self._read(self.local_path), self.data)
+
+
+class PromptCacheFallbackTest(SimpleTestCase):
+    """Bedrock 프롬프트 캐싱: cache_control 거부 시에만 일정 시간 비활성화"""
+
+    CLOCK = "apps.api.services.ai.bedrock_service.time.monotonic"
+
+    def setUp(self):
+        self.service = BedrockService.__new__(BedrockService)
+        self.service.model_id = "test-model"
+        self.service.prompt_cache_enabled = True
+        self.service.prompt_cache_retry_seconds = 600
+        self.service._prompt_cache_disabled_until = 0.0
+        self.service.bedrock_runtime = mock.Mock()
+
+    def _ok(self):
+        body = mock.Mock()
+        body.read.return_value = json.dumps({"content": [{"text": "ok"}]}).encode()
+        return {"body": body}
+
+    def _validation_error(self, message):
+        return ClientError(
+            {"Error": {"Code": "ValidationException", "Message": message}},
+            "InvokeModel",
+        )
+
+    def _sent_bodies(self):
+        return [
+            json.loads(call.kwargs["body"])
+            for call in self.service.bedrock_runtime.invoke_model.call_args_list
+        ]
+
+    def test_cache_control_rejection_disables_then_retries_later(self):
+        self.service.bedrock_runtime.invoke_model.side_effect = [
+            self._validation_error("extraneous key [cache_control] is not permitted"),
+            self._ok(),
+        ]
+
+        with mock.patch(self.CLOCK, return_value=1000.0):
+            self.assertEqual(self.service._invoke_claude("q", cached_prefix="schema"), "ok")
+            self.assertFalse(self.service._prompt_cache_available())
+
+        with mock.patch(self.CLOCK, return_value=1601.0):
+            self.assertTrue(self.service._prompt_cache_available())
+
+        first, retry = self._sent_bodies()
+        self.assertIn("cache_control", json.dumps(first))
+        self.assertNotIn("cache_control", json.dumps(retry))
+
+    def test_other_validation_errors_keep_cache_enabled(self):
+        self.service.bedrock_runtime.invoke_model.side_effect = self._validation_error(
+            "max_tokens: must be less than 4096"
+        )
+
+        with self.assertRaises(ClientError):
+            self.service._invoke_claude("q", cached_prefix="schema")
+
+        self.assertTrue(self.service._prompt_cache_available())
+        self.assertEqual(self.service.bedrock_runtime.invoke_model.call_count, 1)
+
+
+class QueryExpansionTest(SimpleTestCase):
+    """한국어 질의 → 영문 메타데이터 용어 확장: 어절 앞부분 일치만 확장"""
+
+    def test_expands_terms_at_word_start(self):
+        self.assertIn("collapse", expand_query("넘어진 사람"))
+        self.assertIn("theft", expand_query("물건 훔친 남자"))
+        self.assertIn("person_enter", expand_query("매장에 들어오는 사람"))
+
+    def test_ignores_substrings_inside_other_words(self):
+        self.assertNotIn("picking", expand_query("집중해서 편집"))
+        self.assertNotIn("collapse", expand_query("1시간 넘어서"))
+        self.assertNotIn("person_enter", expand_query("박스를 들어올리는 사람"))
+
+    def test_anomaly_only_for_abnormal_behavior(self):
+        self.assertEqual(
+            expand_query("30세 이상 남성"), ["30세", "이상", "남성", "male"]
+        )
+        self.assertIn("anomaly", expand_query("이상 행동"))
+        self.assertIn("anomaly", expand_query("이상행동 구간"))
+
+
+class SSEAcceptHeaderTest(SimpleTestCase):
+    """SSE 엔드포인트: Accept: text/event-stream 요청도 콘텐츠 협상 통과 (406 아님)"""
+
+    def _post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", HTTP_ACCEPT="text/event-stream"
+        )
+
+    def _body(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_prompt_stream_accepts_event_stream(self):
+        session = SimpleNamespace(session_id="session-1")
+        with mock.patch(
+            "apps.api.views.prompt._resolve_prompt_session", return_value=(session, None, None)
+        ), mock.patch(
+            "apps.api.views.processors.process_prompt_logic_stream",
+            return_value=(iter(["안녕", "하세요"]), None),
+        ), mock.patch(
+            "apps.api.views.prompt._save_prompt_interaction", return_value={"ok": True}
+        ):
+            response = self._post("/api/prompt/stream/", {"prompt": "안녕"})
+            body = self._body(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn("event: session", body)
+        self.assertIn('"text": "하세요"', body)
+        self.assertIn("event: done", body)
+
+    def test_vlm_stream_accepts_event_stream(self):
+        session = SimpleNamespace(session_id="session-2")
+        with mock.patch(
+            "apps.api.views.vlm._resolve_vlm_session", return_value=(session, None, None)
+        ), mock.patch("apps.api.views.vlm.Event"), mock.patch(
+            "apps.api.views.vlm._run_vlm_analysis", return_value=("general", iter(["장면"]))
+        ), mock.patch(
+            "apps.api.views.vlm._save_vlm_interaction", return_value={"ok": True}
+        ):
+            response = self._post("/api/vlm-chat/stream/", {"prompt": "무슨 장면?"})
+            body = self._body(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn("event: done", body)
+
+    def test_error_before_stream_rendered_as_error_event(self):
+        response = self._post("/api/prompt/stream/", {"prompt": ""})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response["Content-Type"].startswith("text/event-stream"))
+        self.assertIn("event: error", response.content.decode())
+
+    def test_json_clients_still_get_json_errors(self):
+        response = self.client.post(
+            "/api/prompt/stream/", {"prompt": ""}, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "프롬프트가 비어있습니다."})
+
+
+class VideoDataVersionBumpTest(TestCase):
+    """Event 변경 → Video.data_version은 트랜잭션당 비디오별 1회만 증가"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.videos = [
+            Video.objects.create(
+                name=f"version{i}.mp4",
+                filename=f"version{i}.mp4",
+                original_filename=f"version{i}.mp4",
+                s3_key=f"videos/version{i}.mp4",
+                s3_raw_key=f"videos/version{i}.mp4",
+            )
+            for i in range(2)
+        ]
+
+    def _create_event(self, video, index):
+        return Event.objects.create(
+            video=video, event_type="walking", timestamp=float(index), frame_number=index
+        )
+
+    def _bumps(self, callbacks):
+        return sum(isinstance(callback, _DataVersionBump) for callback in callbacks)
+
+    def _versions(self):
+        return [
+            Video.objects.get(pk=video.pk).data_version for video in self.videos
+        ]
+
+    def test_bulk_saves_bump_once_per_video_on_commit(self):
+        before = self._versions()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for index in range(20):
+                self._create_event(self.videos[index % 2], index)
+            # 커밋 전에는 db_video를 갱신하지 않음
+            self.assertEqual(self._versions(), before)
+
+        self.assertEqual(self._bumps(callbacks), 1)
+        self.assertEqual(self._versions(), [version + 1 for version in before])
+
+    def test_rolled_back_savepoint_does_not_swallow_later_bumps(self):
+        before = self._versions()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self._create_event(self.videos[0], 0)
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+            self._create_event(self.videos[1], 1)
+
+        self.assertEqual(self._bumps(callbacks), 1)
+        self.assertEqual(self._versions(), [before[0], before[1] + 1])
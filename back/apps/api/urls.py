@@ -12,6 +12,7 @@ urlpatterns = [
     path("", include(router.urls)),
     # 프롬프트 API
     path("prompt/", prompt.process_prompt, name="process_prompt"),
+    path("prompt/stream/", prompt.process_prompt_stream, name="process_prompt_stream"),
     path("prompt/history/", prompt.get_prompt_history, name="get_prompt_history"),
     path(
         "prompt/history/<str:session_id>/",
@@ -20,6 +21,11 @@ urlpatterns = [
     ),
     # VLM 채팅 API
     path("vlm-chat/", vlm.process_vlm_chat, name="process_vlm_chat"),
+    path(
+        "vlm-chat/stream/",
+        vlm.process_vlm_chat_stream,
+        name="process_vlm_chat_stream",
+    ),
     # 비디오 Summary API
     path(
         "videos/<int:video_id>/summary/",
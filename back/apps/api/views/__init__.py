@@ -18,12 +18,13 @@ from .health import health_check
 # Prompt Processing
 from .prompt import (
     process_prompt,
+    process_prompt_stream,
     get_prompt_history,
     get_session_detail,
 )
 
 # VLM Chat
-from .vlm import process_vlm_chat
+from .vlm import process_vlm_chat, process_vlm_chat_stream
 
 # S3 Upload (새로 추가)
 from .s3 import (
@@ -51,6 +52,7 @@ from .helpers import (
 # Processors
 from .processors import (
     process_prompt_logic,
+    process_prompt_logic_stream,
     classify_question_type,
     process_abnormal_behavior_query,
     process_marketing_query,
@@ -72,10 +74,12 @@ __all__ = [
     "health_check",
     # Prompt
     "process_prompt",
+    "process_prompt_stream",
     "get_prompt_history",
     "get_session_detail",
     # VLM
     "process_vlm_chat",
+    "process_vlm_chat_stream",
     # S3
     "request_upload_url",
     "confirm_upload",
@@ -92,6 +96,7 @@ __all__ = [
     "_analyze_behaviors",
     # Processors
     "process_prompt_logic",
+    "process_prompt_logic_stream",
     "classify_question_type",
     "process_abnormal_behavior_query",
     "process_marketing_query",
@@ -77,6 +77,36 @@ def health_check(request):
             health_status["checks"]["s3"] = "error"
             health_status["details"]["s3_error"] = str(e)
 
+        # 4. 임베딩 캐시 통계 (hit/miss)
+        try:
+            from apps.api.services import get_embedding_cache
+
+            health_status["details"]["embedding_cache"] = (
+                get_embedding_cache().get_stats()
+            )
+        except Exception as e:
+            health_status["details"]["embedding_cache_error"] = str(e)
+
+        # 5. Reranker 점수 캐시 통계 (hit/miss)
+        try:
+            from apps.api.services import get_reranker_service
+
+            health_status["details"]["rerank_cache"] = (
+                get_reranker_service().get_cache_stats()
+            )
+        except Exception as e:
+            health_status["details"]["rerank_cache_error"] = str(e)
+
+        # 6. Embedding 아웃박스 지연 (대기 수 / 가장 오래된 대기 시간)
+        try:
+            from apps.api.services import get_embedding_outbox
+
+            health_status["details"]["embedding_outbox"] = (
+                get_embedding_outbox().get_lag()
+            )
+        except Exception as e:
+            health_status["details"]["embedding_outbox_error"] = str(e)
+
         # 최종 상태 결정
         if health_status["checks"]["database"] != "connected":
             return JsonResponse(health_status, status=503)
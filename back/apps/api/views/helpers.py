@@ -3,10 +3,48 @@ Helper Functions
 분석 결과 생성 및 포맷팅 유틸리티
 """
 
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from apps.db.models import Video
+import json
 import re
 
 
+def _sse_event(event: str, data) -> str:
+    """Server-Sent Events 메시지 포맷 (data는 JSON 직렬화)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    text/event-stream 협상용 렌더러 (Accept: text/event-stream → 406 방지)
+
+    스트림 자체는 StreamingHttpResponse로 렌더링을 거치지 않고,
+    스트림 시작 전 오류 Response만 error 이벤트로 렌더링
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return _sse_event("error", data).encode(self.charset)
+
+
+# SSE 뷰용 렌더러 (JSON 우선, SSE 클라이언트는 text/event-stream)
+SSE_RENDERER_CLASSES = [JSONRenderer, EventStreamRenderer]
+
+
+def _sse_response(stream) -> StreamingHttpResponse:
+    """SSE 스트리밍 응답 (프록시 버퍼링 비활성화)"""
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx/ALB 버퍼링 방지
+    return response
+
+
 def _generate_timeline_response(prompt: str, events, video: Video) -> str:
     """타임라인 추출 및 응답 생성"""
     if not events:
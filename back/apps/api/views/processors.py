@@ -3,19 +3,24 @@ Prompt Processing Logic
 프롬프트 처리 및 이벤트 그룹화 로직
 """
 
-from django.db import connection
 from django.conf import settings
-from apps.db.models import Event
-from apps.api.services import get_bedrock_service, get_hybrid_search_service
+from apps.api.services import (
+    get_answer_cache,
+    get_bedrock_service,
+    get_event_service,
+    get_hybrid_search_service,
+    get_text2sql_executor,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def process_prompt_logic(prompt_text, video=None):
+def process_prompt_logic(prompt_text, video=None, use_answer_cache=True):
     """
     프롬프트 처리 로직 - AWS Bedrock 하이브리드 RAG
 
+    0. 답변 캐시: 같은 비디오/데이터 버전의 유사 질문이 있으면 이전 답변 재사용
     1. Text2SQL: 정확한 조건 검색 (timestamp, event_type 등)
     2. pgvector: 의미 기반 유사도 검색 (임베딩)
     3. 결과 병합 및 중복 제거
@@ -24,10 +29,16 @@ def process_prompt_logic(prompt_text, video=None):
     Args:
         prompt_text: 사용자 프롬프트
         video: 대상 비디오 객체 (None이면 전체 검색)
+        use_answer_cache: 답변 캐시 조회 여부
     """
     use_bedrock = getattr(settings, "USE_BEDROCK", True)
     use_hybrid_search = getattr(settings, "USE_HYBRID_SEARCH", True)
 
+    if use_answer_cache and use_bedrock:
+        cached = get_answer_cache().lookup(prompt_text, video)
+        if cached:
+            return cached["response"], _first_or_none(cached["events"])
+
     try:
         # 하이브리드 RAG: Text2SQL + pgvector
         if use_bedrock and use_hybrid_search:
@@ -68,45 +79,30 @@ def process_prompt_logic(prompt_text, video=None):
             return "SQL 쿼리를 생성하지 못했습니다.", None
 
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(sql_query)
-                query_results = cursor.fetchall()
+            sql_result = get_text2sql_executor().execute(sql_query)
         except Exception as sql_error:
             logger.error(f"❌ SQL 실행 오류: {sql_error}")
             return "SQL 실행 오류가 발생했습니다.", None
 
-        if not query_results:
+        if not sql_result.rows:
             return "요청하신 조건에 해당하는 이벤트를 찾을 수 없습니다.", None
 
-        logger.info(f"✅ 쿼리 결과: {len(query_results)}개")
+        logger.info(
+            f"✅ 쿼리 결과: {len(sql_result.rows)}개"
+            f"{' (최대 행 수 초과로 잘림)' if sql_result.truncated else ''}"
+        )
 
         # 이벤트 객체 조회
         found_events = []
         relevant_event = None
-        query_results_data = []
+        query_results_data = sql_result.as_dicts()
 
-        column_names = (
-            [desc[0] for desc in cursor.description] if cursor.description else []
+        # id 컬럼 기준 일괄 조회 (SQL 결과 순서 유지)
+        found_events = get_event_service().hydrate_events_from_rows(
+            query_results_data, video=video, match_timestamp=False
         )
-
-        for result in query_results:
-            try:
-                result_dict = dict(zip(column_names, result))
-                query_results_data.append(result_dict)
-
-                event_id = result_dict.get("id")
-                if event_id:
-                    try:
-                        event = Event.objects.get(id=event_id)
-                        found_events.append(event)
-
-                        if relevant_event is None:
-                            relevant_event = event
-                    except Event.DoesNotExist:
-                        logger.warning(f"⚠️ Event ID {event_id} not found")
-
-            except Exception as e:
-                logger.warning(f"⚠️ 이벤트 매핑 오류: {e}")
+        if found_events:
+            relevant_event = found_events[0]
 
         if not found_events and not query_results_data:
             return "요청하신 조건에 해당하는 이벤트를 찾을 수 없습니다.", None
@@ -169,6 +165,53 @@ def process_prompt_logic(prompt_text, video=None):
         return f"처리 중 오류 발생: {str(e)}", None
 
 
+def process_prompt_logic_stream(prompt_text, video=None):
+    """
+    process_prompt_logic의 스트리밍 버전
+
+    하이브리드 RAG 경로는 검색을 마친 뒤 Bedrock 답변을 토큰 단위로 스트리밍하고,
+    그 외 경로는 기존 로직의 완성된 응답을 한 번에 내보낸다.
+
+    Returns:
+        (응답 텍스트 조각 이터레이터, 대표 이벤트)
+    """
+    use_bedrock = getattr(settings, "USE_BEDROCK", True)
+    use_hybrid_search = getattr(settings, "USE_HYBRID_SEARCH", True)
+
+    if use_bedrock:
+        cached = get_answer_cache().lookup(prompt_text, video)
+        if cached:
+            return iter([cached["response"]]), _first_or_none(cached["events"])
+
+    if use_bedrock and use_hybrid_search:
+        try:
+            logger.info(f"🚀 하이브리드 RAG 검색 사용 (스트리밍)")
+            hybrid_service = get_hybrid_search_service()
+
+            found_events, response_stream = hybrid_service.hybrid_search_stream(
+                prompt=prompt_text,
+                video=video,
+                use_vector_search=True,
+                use_text2sql=True,
+            )
+
+            relevant_event = found_events[0] if found_events else None
+            return response_stream, relevant_event
+
+        except Exception as e:
+            logger.error(f"❌ 처리 중 오류: {str(e)}")
+            return iter([f"처리 중 오류 발생: {str(e)}"]), None
+
+    response_text, relevant_event = process_prompt_logic(
+        prompt_text, video, use_answer_cache=False
+    )
+    return iter([response_text]), relevant_event
+
+
+def _first_or_none(events):
+    return events[0] if events else None
+
+
 def classify_question_type(prompt_text, sql_query):
     """질문 유형 분류"""
     abnormal_keywords = [
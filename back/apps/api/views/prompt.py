@@ -3,10 +3,12 @@ Prompt Views
 프롬프트 처리 및 세션 관리 API
 """
 
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
 from apps.db.models import Video, PromptSession, PromptInteraction
+from apps.api.services import get_answer_cache
+from .helpers import SSE_RENDERER_CLASSES, _sse_event, _sse_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,56 +27,11 @@ def process_prompt(request):
 
         prompt_text = request.data.get("prompt")
         session_id = request.data.get("session_id")
-        video_id = request.data.get("video_id")
-
-        logger.info(f"💭 프롬프트: {prompt_text}")
-        logger.info(f"🆔 세션 ID: {session_id}")
-        logger.info(f"🎥 비디오 ID: {video_id}")
-
-        if not prompt_text:
-            logger.warning("❌ 프롬프트가 비어있음")
-            return Response(
-                {"error": "프롬프트가 비어있습니다."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
 
         # 1. 세션 생성 또는 조회
-        video = None
-        if session_id:
-            try:
-                history = PromptSession.objects.get(session_id=session_id)
-                video = history.related_videos
-            except PromptSession.DoesNotExist:
-                return Response(
-                    {"error": "존재하지 않는 세션입니다."},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-        else:
-            if not video_id:
-                return Response(
-                    {"error": "새 세션 생성을 위해서는 video_id가 필요합니다."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            try:
-                video = Video.objects.get(video_id=video_id)
-            except Video.DoesNotExist:
-                return Response(
-                    {"error": "존재하지 않는 비디오입니다."},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-
-            history = PromptSession.objects.create(
-                session_name="",
-                user_id=(
-                    request.user.id
-                    if hasattr(request, "user") and request.user.is_authenticated
-                    else ""
-                ),
-            )
-            if not history.related_videos:
-                history.related_videos = video
-                history.save()
+        history, video, error_response = _resolve_prompt_session(request)
+        if error_response is not None:
+            return error_response
 
         # 2. 프롬프트 처리
         try:
@@ -84,44 +41,11 @@ def process_prompt(request):
             response_text = f"죄송합니다. AI 처리 중 오류가 발생했습니다. 다시 시도해 주세요. (에러: {str(e)})"
             relevant_event = None
 
-        # 3. 세션의 main_event 설정
-        if not session_id and relevant_event and not history.main_event:
-            if video and relevant_event.video == video:
-                history.main_event = relevant_event
-                history.save()
-            else:
-                logger.warning(f"⚠️ 다른 비디오의 이벤트가 반환됨")
-                relevant_event = None
-
-        # 4. 상호작용 저장
-        interaction = PromptInteraction.objects.create(
-            session=history,
-            interaction_id=f"{history.session_id}_{history.total_interactions + 1}",
-            sequence_number=history.total_interactions + 1,
-            user_prompt=prompt_text,
-            ai_response=response_text,
+        # 3~5. 상호작용 저장 및 응답 구성
+        result = _save_prompt_interaction(
+            history, video, prompt_text, response_text, relevant_event, session_id
         )
 
-        if relevant_event:
-            interaction.related_events.add(relevant_event)
-
-        history.add_interaction(prompt_text)
-
-        # 5. 응답 반환
-        result = {
-            "session_id": history.session_id,
-            "response": response_text,
-            "timestamp": interaction.created_at.isoformat(),
-        }
-
-        if relevant_event:
-            result["event"] = {
-                "id": relevant_event.id,
-                "timestamp": relevant_event.timestamp,
-                "action_detected": relevant_event.action_detected,
-                "location": relevant_event.location,
-            }
-
         logger.info(f"✅ API 응답 성공")
         return Response(result)
 
@@ -133,6 +57,204 @@ def process_prompt(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(["POST"])
+@renderer_classes(SSE_RENDERER_CLASSES)
+def process_prompt_stream(request):
+    """
+    프롬프트 처리 SSE 스트리밍 API 뷰
+
+    이벤트 순서:
+        session → delta (응답 텍스트 조각, 반복) → done (process_prompt와 동일한 결과)
+    PromptInteraction은 스트림이 끝까지 전송된 뒤에만 저장된다.
+    응답 도중 생성이 실패하면 error 이벤트로 끝나고 저장/답변 캐시 기록을 하지 않는다.
+    """
+    logger.info(f"🔥 스트리밍 API 호출 받음: {request.method} {request.path}")
+
+    try:
+        from .processors import process_prompt_logic_stream
+
+        prompt_text = request.data.get("prompt")
+        session_id = request.data.get("session_id")
+
+        history, video, error_response = _resolve_prompt_session(request)
+        if error_response is not None:
+            return error_response
+
+    except Exception as e:
+        logger.error(f"❌ API 처리 오류: {str(e)}")
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def event_stream():
+        yield _sse_event("session", {"session_id": history.session_id})
+
+        chunks = []
+        relevant_event = None
+        try:
+            response_stream, relevant_event = process_prompt_logic_stream(
+                prompt_text, video
+            )
+            for text in response_stream:
+                chunks.append(text)
+                yield _sse_event("delta", {"text": text})
+        except Exception as e:
+            logger.warning(f"⚠️ process_prompt_logic_stream 에러: {str(e)}")
+            if chunks:
+                # 이미 일부 전송됨 → 잘린 답변을 저장하지 않고 오류로 종료
+                yield _sse_event("error", {"error": str(e)})
+                return
+            # 오류 응답은 답변 캐시에 남기지 않음 (process_prompt와 동일)
+            relevant_event = None
+            error_text = f"죄송합니다. AI 처리 중 오류가 발생했습니다. 다시 시도해 주세요. (에러: {str(e)})"
+            chunks.append(error_text)
+            yield _sse_event("delta", {"text": error_text})
+
+        # 클라이언트가 중간에 연결을 끊으면 여기까지 오지 않으므로 저장하지 않음
+        try:
+            result = _save_prompt_interaction(
+                history,
+                video,
+                prompt_text,
+                "".join(chunks).strip(),
+                relevant_event,
+                session_id,
+            )
+            logger.info(f"✅ 스트리밍 응답 완료")
+            yield _sse_event("done", result)
+        except Exception as e:
+            logger.error(f"❌ 상호작용 저장 오류: {str(e)}")
+            yield _sse_event("error", {"error": str(e)})
+
+    return _sse_response(event_stream())
+
+
+def _resolve_prompt_session(request):
+    """
+    요청의 session_id / video_id로 세션 조회 또는 생성
+
+    Returns:
+        (PromptSession, Video, 오류 Response 또는 None)
+    """
+    prompt_text = request.data.get("prompt")
+    session_id = request.data.get("session_id")
+    video_id = request.data.get("video_id")
+
+    logger.info(f"💭 프롬프트: {prompt_text}")
+    logger.info(f"🆔 세션 ID: {session_id}")
+    logger.info(f"🎥 비디오 ID: {video_id}")
+
+    if not prompt_text:
+        logger.warning("❌ 프롬프트가 비어있음")
+        return (
+            None,
+            None,
+            Response(
+                {"error": "프롬프트가 비어있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            ),
+        )
+
+    video = None
+    if session_id:
+        try:
+            history = PromptSession.objects.get(session_id=session_id)
+            video = history.related_videos
+        except PromptSession.DoesNotExist:
+            return (
+                None,
+                None,
+                Response(
+                    {"error": "존재하지 않는 세션입니다."},
+                    status=status.HTTP_404_NOT_FOUND,
+                ),
+            )
+    else:
+        if not video_id:
+            return (
+                None,
+                None,
+                Response(
+                    {"error": "새 세션 생성을 위해서는 video_id가 필요합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                ),
+            )
+
+        try:
+            video = Video.objects.get(video_id=video_id)
+        except Video.DoesNotExist:
+            return (
+                None,
+                None,
+                Response(
+                    {"error": "존재하지 않는 비디오입니다."},
+                    status=status.HTTP_404_NOT_FOUND,
+                ),
+            )
+
+        history = PromptSession.objects.create(
+            session_name="",
+            user_id=(
+                request.user.id
+                if hasattr(request, "user") and request.user.is_authenticated
+                else ""
+            ),
+        )
+        if not history.related_videos:
+            history.related_videos = video
+            history.save()
+
+    return history, video, None
+
+
+def _save_prompt_interaction(
+    history, video, prompt_text, response_text, relevant_event, session_id
+):
+    """
+    main_event 설정 + PromptInteraction 저장 후 API 응답 딕셔너리 반환
+    """
+    # 세션의 main_event 설정
+    if not session_id and relevant_event and not history.main_event:
+        if video and relevant_event.video == video:
+            history.main_event = relevant_event
+            history.save()
+        else:
+            logger.warning(f"⚠️ 다른 비디오의 이벤트가 반환됨")
+            relevant_event = None
+
+    # 상호작용 저장
+    interaction = PromptInteraction.objects.create(
+        session=history,
+        interaction_id=f"{history.session_id}_{history.total_interactions + 1}",
+        sequence_number=history.total_interactions + 1,
+        user_prompt=prompt_text,
+        ai_response=response_text,
+        related_videos=video,
+    )
+
+    if relevant_event:
+        interaction.related_events.add(relevant_event)
+        # 이후 유사 질문 재사용용 (query_embedding + 데이터 버전)
+        get_answer_cache().store(interaction, prompt_text, video, [relevant_event])
+
+    history.add_interaction(prompt_text)
+
+    # 응답 구성
+    result = {
+        "session_id": history.session_id,
+        "response": response_text,
+        "timestamp": interaction.created_at.isoformat(),
+    }
+
+    if relevant_event:
+        result["event"] = {
+            "id": relevant_event.id,
+            "timestamp": relevant_event.timestamp,
+            "action_detected": relevant_event.action_detected,
+            "location": relevant_event.location,
+        }
+
+    return result
+
+
 @api_view(["GET"])
 def get_prompt_history(request):
     """모든 프롬프트 세션 목록을 반환하는 API 뷰"""
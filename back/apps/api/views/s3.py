@@ -15,7 +15,12 @@ import logging
 import os
 import uuid
 from datetime import datetime
-from ..services import s3_service, sqs_service, get_video_service
+from ..services import (
+    s3_service,
+    sqs_service,
+    get_video_service,
+    get_processing_time_estimator,
+)
 from apps.db.models import Video
 from apps.db.serializers import VideoSerializer
 
@@ -214,16 +219,26 @@ def confirm_upload(request):
             logger.error(f"📚 Traceback: {traceback.format_exc()}")
             raise
 
+        # ⏱️ 처리 시간 예측 (Lambda Batch 타임아웃 / 워커 가시성 타임아웃 계산용)
+        additional_data = {
+            "video_name": token_payload["file_name"],
+            "file_size": token_payload["file_size"],
+            "duration": duration,
+        }
+        try:
+            additional_data["estimate"] = (
+                get_processing_time_estimator().message_payload(video)
+            )
+        except Exception as e:
+            # 예측 실패 시 소비자는 기존 고정 타임아웃 사용
+            logger.warning(f"⚠️ 처리 시간 예측 실패: video_id={video.video_id}, {e}")
+
         # 🚀 SQS 메시지 발행: 비디오 처리 요청
         sqs_result = sqs_service.send_video_processing_message(
             s3_bucket=s3_service.bucket_name,
             s3_key=s3_key,
             video_id=str(video.video_id),
-            additional_data={
-                "video_name": token_payload["file_name"],
-                "file_size": token_payload["file_size"],
-                "duration": duration,
-            },
+            additional_data=additional_data,
         )
 
         if sqs_result["success"]:
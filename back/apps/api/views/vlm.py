@@ -3,11 +3,19 @@ VLM (Vision Language Model) Views
 영상 프레임 분석 및 장면 묘사 API
 """
 
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
 from apps.db.models import Video, Event, PromptSession, PromptInteraction
 from apps.api.services import get_vlm_service, get_hybrid_search_service
+from .helpers import (
+    SSE_RENDERER_CLASSES,
+    _generate_timeline_response,
+    _analyze_location_patterns,
+    _analyze_behaviors,
+    _sse_event,
+    _sse_response,
+)
 import re
 import logging
 
@@ -26,227 +34,325 @@ def process_vlm_chat(request):
     logger.info(f"🎥 VLM 채팅 API 호출: {request.method}")
 
     try:
-        # helpers에서 import
-        from ..helpers import (
-            _generate_timeline_response,
-            _analyze_location_patterns,
-            _analyze_behaviors,
+        prompt_text = request.data.get("prompt")
+
+        # 1~2. 비디오 조회, 세션 생성 또는 조회
+        session, video, error_response = _resolve_vlm_session(request)
+        if error_response is not None:
+            return error_response
+
+        # 3. 해당 비디오의 이벤트 조회
+        events = Event.objects.filter(video=video).order_by("timestamp")
+
+        # 4~5. 프롬프트 분석
+        analysis_type, response_text = _run_vlm_analysis(
+            prompt_text, video, events, stream=False
+        )
+
+        # 6~7. 상호작용 저장 및 응답 구성
+        result = _save_vlm_interaction(
+            session, video, events, prompt_text, response_text, analysis_type
         )
 
+        logger.info(f"✅ VLM 채팅 완료: {analysis_type}")
+        return Response(result)
+
+    except Exception as e:
+        logger.error(f"❌ VLM 채팅 오류: {str(e)}")
+        import traceback
+
+        logger.error(f"🔍 오류 스택: {traceback.format_exc()}")
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@renderer_classes(SSE_RENDERER_CLASSES)
+def process_vlm_chat_stream(request):
+    """
+    VLM 채팅 SSE 스트리밍 API 뷰
+
+    이벤트 순서:
+        session → delta (응답 텍스트 조각, 반복) → done (process_vlm_chat과 동일한 결과)
+    PromptInteraction은 스트림이 끝까지 전송된 뒤에만 저장된다.
+    응답 도중 생성이 실패하면 error 이벤트로 끝나고 저장하지 않는다.
+    """
+    logger.info(f"🎥 VLM 채팅 스트리밍 API 호출: {request.method}")
+
+    try:
         prompt_text = request.data.get("prompt")
-        session_id = request.data.get("session_id")
-        video_id = request.data.get("video_id")
 
-        logger.info(f"💭 프롬프트: {prompt_text}")
-        logger.info(f"🆔 세션 ID: {session_id}")
-        logger.info(f"🎥 비디오 ID: {video_id}")
+        session, video, error_response = _resolve_vlm_session(request)
+        if error_response is not None:
+            return error_response
+
+        events = Event.objects.filter(video=video).order_by("timestamp")
+
+    except Exception as e:
+        logger.error(f"❌ VLM 채팅 오류: {str(e)}")
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def event_stream():
+        yield _sse_event("session", {"session_id": session.session_id})
+
+        chunks = []
+        analysis_type = "general"
+        try:
+            analysis_type, response_stream = _run_vlm_analysis(
+                prompt_text, video, events, stream=True
+            )
+            for text in response_stream:
+                chunks.append(text)
+                yield _sse_event("delta", {"text": text})
+        except Exception as e:
+            logger.error(f"❌ VLM 스트리밍 오류: {str(e)}")
+            yield _sse_event("error", {"error": str(e)})
+            return
+
+        # 클라이언트가 중간에 연결을 끊으면 여기까지 오지 않으므로 저장하지 않음
+        try:
+            result = _save_vlm_interaction(
+                session,
+                video,
+                events,
+                prompt_text,
+                "".join(chunks).strip(),
+                analysis_type,
+            )
+            logger.info(f"✅ VLM 채팅 스트리밍 완료: {analysis_type}")
+            yield _sse_event("done", result)
+        except Exception as e:
+            logger.error(f"❌ 상호작용 저장 오류: {str(e)}")
+            yield _sse_event("error", {"error": str(e)})
+
+    return _sse_response(event_stream())
 
-        if not prompt_text:
-            return Response(
+
+def _resolve_vlm_session(request):
+    """
+    요청 검증 후 비디오 조회 및 세션 생성/조회
+
+    Returns:
+        (PromptSession, Video, 오류 Response 또는 None)
+    """
+    prompt_text = request.data.get("prompt")
+    session_id = request.data.get("session_id")
+    video_id = request.data.get("video_id")
+
+    logger.info(f"💭 프롬프트: {prompt_text}")
+    logger.info(f"🆔 세션 ID: {session_id}")
+    logger.info(f"🎥 비디오 ID: {video_id}")
+
+    if not prompt_text:
+        return (
+            None,
+            None,
+            Response(
                 {"error": "프롬프트가 비어있습니다."},
                 status=status.HTTP_400_BAD_REQUEST,
-            )
+            ),
+        )
 
-        if not video_id:
-            return Response(
+    if not video_id:
+        return (
+            None,
+            None,
+            Response(
                 {"error": "비디오 ID가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST
-            )
+            ),
+        )
 
-        # 1. 비디오 조회
-        try:
-            video = Video.objects.get(video_id=video_id)
-        except Video.DoesNotExist:
-            return Response(
+    # 1. 비디오 조회
+    try:
+        video = Video.objects.get(video_id=video_id)
+    except Video.DoesNotExist:
+        return (
+            None,
+            None,
+            Response(
                 {"error": "존재하지 않는 비디오입니다."},
                 status=status.HTTP_404_NOT_FOUND,
-            )
+            ),
+        )
+
+    user_id = (
+        request.user.id
+        if hasattr(request, "user") and request.user.is_authenticated
+        else ""
+    )
 
-        # 2. 세션 생성 또는 조회
-        if session_id:
-            try:
-                session = PromptSession.objects.get(session_id=session_id)
-                if (
-                    session.related_videos
-                    and session.related_videos.video_id != video.video_id
-                ):
-                    session = PromptSession.objects.create(
-                        session_name="",
-                        video=video,
-                        user_id=(
-                            request.user.id
-                            if hasattr(request, "user")
-                            and request.user.is_authenticated
-                            else ""
-                        ),
-                    )
-            except PromptSession.DoesNotExist:
-                return Response(
+    # 2. 세션 생성 또는 조회
+    if session_id:
+        try:
+            session = PromptSession.objects.get(session_id=session_id)
+            if (
+                session.related_videos
+                and session.related_videos.video_id != video.video_id
+            ):
+                session = PromptSession.objects.create(
+                    session_name="", video=video, user_id=user_id
+                )
+        except PromptSession.DoesNotExist:
+            return (
+                None,
+                None,
+                Response(
                     {"error": "존재하지 않는 세션입니다."},
                     status=status.HTTP_404_NOT_FOUND,
-                )
-        else:
-            session = PromptSession.objects.create(
-                session_name="",
-                video=video,
-                user_id=(
-                    request.user.id
-                    if hasattr(request, "user") and request.user.is_authenticated
-                    else ""
                 ),
             )
+    else:
+        session = PromptSession.objects.create(
+            session_name="", video=video, user_id=user_id
+        )
 
-        # 3. 해당 비디오의 이벤트 조회
-        events = Event.objects.filter(video=video).order_by("timestamp")
+    return session, video, None
 
-        # 4. VLM 서비스
-        vlm_service = get_vlm_service()
 
-        # 5. 프롬프트 분석
-        response_text = ""
-        analysis_type = "general"
+def _run_vlm_analysis(prompt_text, video, events, stream=False):
+    """
+    프롬프트 키워드로 분석 유형을 고르고 응답 생성
 
-        # 시간 범위 추출
-        time_pattern = r"(\d+)\s*분(?:\s*(\d+)\s*초)?"
-        time_matches = re.findall(time_pattern, prompt_text)
-
-        start_seconds = None
-        end_seconds = None
-
-        if len(time_matches) >= 2:
-            start_min = int(time_matches[0][0])
-            start_sec = int(time_matches[0][1]) if time_matches[0][1] else 0
-            start_seconds = start_min * 60 + start_sec
-
-            end_min = int(time_matches[1][0])
-            end_sec = int(time_matches[1][1]) if time_matches[1][1] else 0
-            end_seconds = end_min * 60 + end_sec
-
-            logger.info(f"⏰ 시간 범위 감지: {start_seconds}초 ~ {end_seconds}초")
-
-        # 장면 묘사
-        if any(
-            keyword in prompt_text.lower()
-            for keyword in ["장면", "묘사", "무슨 일", "설명", "상황"]
-        ):
-            logger.info("📸 장면 묘사 요청")
-            analysis_type = "scene_description"
-
-            if start_seconds is not None and end_seconds is not None:
-                response_text = vlm_service.analyze_time_range(
-                    video=video,
-                    start_seconds=start_seconds,
-                    end_seconds=end_seconds,
-                    analysis_type="scene",
-                    interval=2.0,
-                )
-            else:
-                response_text = vlm_service.generate_video_summary(
-                    video=video, events=list(events), summary_type="events"
-                )
+    Args:
+        stream: True면 응답을 텍스트 조각 이터레이터로 반환
+                (Bedrock 호출 경로만 실제 스트리밍, 로컬 분석은 한 번에 반환)
 
-        # 타임라인
-        elif any(
-            keyword in prompt_text.lower()
-            for keyword in ["타임라인", "시간", "언제", "몇 분", "몇 초"]
-        ):
-            logger.info("⏰ 타임라인 추출")
-            analysis_type = "timeline"
-            response_text = _generate_timeline_response(prompt_text, events, video)
-
-        # 위치 분석
-        elif any(
-            keyword in prompt_text.lower()
-            for keyword in ["위치", "어디", "왼쪽", "중간", "오른쪽", "장소"]
-        ):
-            logger.info("📍 위치별 분석")
-            analysis_type = "location_analysis"
-
-            if start_seconds is not None and end_seconds is not None:
-                response_text = vlm_service.analyze_time_range(
-                    video=video,
-                    start_seconds=start_seconds,
-                    end_seconds=end_seconds,
-                    analysis_type="location",
-                    interval=1.5,
-                )
-            else:
-                response_text = _analyze_location_patterns(events, video)
-
-        # 행동 분석
-        elif any(
-            keyword in prompt_text.lower()
-            for keyword in ["행동", "무엇을", "어떤", "활동"]
-        ):
-            logger.info("🏃 행동 분석")
-            analysis_type = "behavior_analysis"
-
-            if start_seconds is not None and end_seconds is not None:
-                response_text = vlm_service.analyze_time_range(
-                    video=video,
-                    start_seconds=start_seconds,
-                    end_seconds=end_seconds,
-                    analysis_type="behavior",
-                    interval=1.5,
-                )
-            else:
-                response_text = _analyze_behaviors(events, video)
-
-        # 일반 질문 - 하이브리드 RAG
-        else:
-            logger.info("💬 일반 질문")
-            analysis_type = "general"
-            hybrid_search = get_hybrid_search_service()
-            response_text = hybrid_search.search_and_generate(
-                query=prompt_text, video_id=video_id
+    Returns:
+        (analysis_type, 응답 텍스트 또는 텍스트 조각 이터레이터)
+    """
+    # 4. VLM 서비스
+    vlm_service = get_vlm_service()
+
+    def time_range(analysis, interval):
+        kwargs = dict(
+            video=video,
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+            analysis_type=analysis,
+            interval=interval,
+        )
+        if stream:
+            return vlm_service.analyze_time_range_stream(**kwargs)
+        return vlm_service.analyze_time_range(**kwargs)
+
+    def complete(text):
+        return iter([text]) if stream else text
+
+    # 시간 범위 추출
+    time_pattern = r"(\d+)\s*분(?:\s*(\d+)\s*초)?"
+    time_matches = re.findall(time_pattern, prompt_text)
+
+    start_seconds = None
+    end_seconds = None
+
+    if len(time_matches) >= 2:
+        start_min = int(time_matches[0][0])
+        start_sec = int(time_matches[0][1]) if time_matches[0][1] else 0
+        start_seconds = start_min * 60 + start_sec
+
+        end_min = int(time_matches[1][0])
+        end_sec = int(time_matches[1][1]) if time_matches[1][1] else 0
+        end_seconds = end_min * 60 + end_sec
+
+        logger.info(f"⏰ 시간 범위 감지: {start_seconds}초 ~ {end_seconds}초")
+
+    has_time_range = start_seconds is not None and end_seconds is not None
+    prompt_lower = prompt_text.lower()
+
+    # 장면 묘사
+    if any(
+        keyword in prompt_lower for keyword in ["장면", "묘사", "무슨 일", "설명", "상황"]
+    ):
+        logger.info("📸 장면 묘사 요청")
+        if has_time_range:
+            return "scene_description", time_range("scene", 2.0)
+        return "scene_description", complete(
+            vlm_service.generate_video_summary(
+                video=video, events=list(events), summary_type="events"
             )
-
-        # 6. 상호작용 저장
-        interaction = PromptInteraction.objects.create(
-            session=session,
-            interaction_id=f"{session.session_id}_{session.total_interactions + 1}",
-            sequence_number=session.total_interactions + 1,
-            user_prompt=prompt_text,
-            ai_response=response_text,
-            analysis_type=analysis_type,
         )
 
-        if events.exists():
-            for event in events[:5]:
-                interaction.related_events.add(event)
-
-        if not interaction.related_videos:
-            interaction.related_videos = video
-            interaction.save()
-
-        session.add_interaction(prompt_text)
-
-        # 7. 응답 반환
-        result = {
-            "session_id": session.session_id,
-            "response": response_text,
-            "timestamp": interaction.created_at.isoformat(),
-            "analysis_type": analysis_type,
-            "event_count": events.count(),
-        }
-
-        if events.exists():
-            result["events"] = [
-                {
-                    "id": event.id,
-                    "timestamp": event.timestamp,
-                    "event_type": event.event_type,
-                    "action_detected": event.action_detected,
-                    "location": event.location,
-                }
-                for event in events[:5]
-            ]
-
-        logger.info(f"✅ VLM 채팅 완료: {analysis_type}")
-        return Response(result)
-
-    except Exception as e:
-        logger.error(f"❌ VLM 채팅 오류: {str(e)}")
-        import traceback
+    # 타임라인
+    if any(
+        keyword in prompt_lower for keyword in ["타임라인", "시간", "언제", "몇 분", "몇 초"]
+    ):
+        logger.info("⏰ 타임라인 추출")
+        return "timeline", complete(
+            _generate_timeline_response(prompt_text, events, video)
+        )
 
-        logger.error(f"🔍 오류 스택: {traceback.format_exc()}")
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    # 위치 분석
+    if any(
+        keyword in prompt_lower
+        for keyword in ["위치", "어디", "왼쪽", "중간", "오른쪽", "장소"]
+    ):
+        logger.info("📍 위치별 분석")
+        if has_time_range:
+            return "location_analysis", time_range("location", 1.5)
+        return "location_analysis", complete(_analyze_location_patterns(events, video))
+
+    # 행동 분석
+    if any(keyword in prompt_lower for keyword in ["행동", "무엇을", "어떤", "활동"]):
+        logger.info("🏃 행동 분석")
+        if has_time_range:
+            return "behavior_analysis", time_range("behavior", 1.5)
+        return "behavior_analysis", complete(_analyze_behaviors(events, video))
+
+    # 일반 질문 - 하이브리드 RAG
+    logger.info("💬 일반 질문")
+    hybrid_search = get_hybrid_search_service()
+    if stream:
+        _, response_stream = hybrid_search.hybrid_search_stream(
+            prompt=prompt_text, video=video
+        )
+        return "general", response_stream
+
+    _, response_text = hybrid_search.hybrid_search(prompt=prompt_text, video=video)
+    return "general", response_text
+
+
+def _save_vlm_interaction(
+    session, video, events, prompt_text, response_text, analysis_type
+):
+    """PromptInteraction 저장 후 API 응답 딕셔너리 반환"""
+    # 6. 상호작용 저장
+    interaction = PromptInteraction.objects.create(
+        session=session,
+        interaction_id=f"{session.session_id}_{session.total_interactions + 1}",
+        sequence_number=session.total_interactions + 1,
+        user_prompt=prompt_text,
+        ai_response=response_text,
+        analysis_type=analysis_type,
+    )
+
+    if events.exists():
+        for event in events[:5]:
+            interaction.related_events.add(event)
+
+    if not interaction.related_videos:
+        interaction.related_videos = video
+        interaction.save()
+
+    session.add_interaction(prompt_text)
+
+    # 7. 응답 반환
+    result = {
+        "session_id": session.session_id,
+        "response": response_text,
+        "timestamp": interaction.created_at.isoformat(),
+        "analysis_type": analysis_type,
+        "event_count": events.count(),
+    }
+
+    if events.exists():
+        result["events"] = [
+            {
+                "id": event.id,
+                "timestamp": event.timestamp,
+                "event_type": event.event_type,
+                "action_detected": event.action_detected,
+                "location": event.location,
+            }
+            for event in events[:5]
+        ]
+
+    return result
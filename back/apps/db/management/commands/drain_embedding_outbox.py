@@ -0,0 +1,81 @@
+"""
+Event embedding 아웃박스(EmbeddingOutbox)를 처리하는 Django management command
+
+웹 프로세스는 커밋 후 백그라운드 스레드로 자동 처리하므로(EMBEDDING_OUTBOX_AUTO_DRAIN),
+이 명령은 전용 워커 / 재시도 대기열 정리 / 지연 확인용입니다.
+
+사용법:
+    # 한 번 비우기
+    python manage.py drain_embedding_outbox
+
+    # 전용 워커로 계속 실행 (대기열이 비면 interval초 대기)
+    python manage.py drain_embedding_outbox --loop --interval 5
+
+    # 지연(lag) 지표만 출력
+    python manage.py drain_embedding_outbox --stats
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.api.services.ai.embedding_outbox import get_embedding_outbox
+
+
+class Command(BaseCommand):
+    help = "Drain the Event embedding outbox and report embedding lag"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="계속 실행")
+        parser.add_argument(
+            "--interval", type=float, default=5.0, help="대기열이 비었을 때 대기 시간 (초)"
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None, help="한 번에 처리할 최대 배치 수"
+        )
+        parser.add_argument("--stats", action="store_true", help="지연 지표만 출력")
+
+    def handle(self, *args, **options):
+        outbox = get_embedding_outbox()
+
+        if options["stats"]:
+            self._report_lag(outbox)
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🚀 Embedding 아웃박스 드레이너 시작 (batch={outbox.batch_size})"
+            )
+        )
+        self._report_lag(outbox)
+
+        try:
+            while True:
+                stats = outbox.drain(max_batches=options.get("max_batches"))
+                if stats["claimed"]:
+                    self.stdout.write(
+                        f"📤 처리: {stats['claimed']}개 (성공 {stats['embedded']}, "
+                        f"실패 {stats['failed']})"
+                    )
+                    self._report_lag(outbox)
+
+                if not options["loop"]:
+                    break
+
+                if not stats["claimed"]:
+                    close_old_connections()
+                    time.sleep(options["interval"])
+
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("\n⏸️  중단됨 (점유 행은 lease 만료 후 재처리)"))
+
+    def _report_lag(self, outbox):
+        lag = outbox.get_lag()
+        style = self.style.WARNING if lag["dead"] else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"📊 대기 {lag['pending']}개, 가장 오래된 대기 {lag['oldest_pending_seconds']}초, "
+                f"재시도 초과 {lag['dead']}개"
+            )
+        )
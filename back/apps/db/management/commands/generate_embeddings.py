@@ -5,12 +5,21 @@
     python manage.py generate_embeddings
     python manage.py generate_embeddings --video-id 103
     python manage.py generate_embeddings --limit 100
+
+    # 동시성 / 속도 (Bedrock Titan 할당량에 맞춤)
+    python manage.py generate_embeddings --workers 16 --rate 80
+
+    # 중단 후 재개 (체크포인트 파일의 마지막 처리 ID 이후부터)
+    python manage.py generate_embeddings --video-id 103 --checkpoint /tmp/backfill_103.json
+    python manage.py generate_embeddings --after-id 52000
 """
 
+import json
+import os
+
 from django.core.management.base import BaseCommand
-from apps.db.models import Event
-from apps.api.services import get_bedrock_service
-import time
+
+from apps.api.services.ai.embedding_backfill import EmbeddingBackfillService
 
 
 class Command(BaseCommand):
@@ -24,91 +33,100 @@ class Command(BaseCommand):
         parser.add_argument(
             "--force", action="store_true", help="이미 embedding이 있는 이벤트도 재생성"
         )
+        parser.add_argument("--workers", type=int, default=None, help="Bedrock 동시 호출 수")
+        parser.add_argument(
+            "--rate", type=float, default=None, help="초당 최대 Bedrock 요청 수"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=None, help="bulk_update 청크 크기"
+        )
+        parser.add_argument(
+            "--after-id", type=int, default=0, help="이 이벤트 ID 이후부터 처리 (재개)"
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default=None,
+            help="진행 상황(last_id) 저장 파일 - 존재하면 해당 위치부터 재개",
+        )
 
     def handle(self, *args, **options):
         video_id = options.get("video_id")
-        limit = options.get("limit")
         force = options.get("force")
-
-        # 처리할 이벤트 쿼리
-        queryset = Event.objects.all()
+        checkpoint = options.get("checkpoint")
+        after_id = options.get("after_id") or 0
 
         if video_id:
-            queryset = queryset.filter(video_id=video_id)
             self.stdout.write(f"🎯 Video ID {video_id}의 이벤트만 처리")
-
-        if not force:
-            queryset = queryset.filter(embedding__isnull=True)
-            self.stdout.write("📌 embedding이 없는 이벤트만 처리")
-        else:
+        if force:
             self.stdout.write("⚠️ 모든 이벤트의 embedding 재생성")
+        else:
+            self.stdout.write("📌 embedding이 없는 이벤트만 처리")
 
-        # searchable_text가 있는 것만
-        queryset = queryset.exclude(searchable_text="")
+        if checkpoint and os.path.exists(checkpoint) and not after_id:
+            with open(checkpoint) as f:
+                after_id = json.load(f).get("last_id", 0)
+            self.stdout.write(f"⏯️  체크포인트에서 재개: last_id={after_id}")
 
-        if limit:
-            queryset = queryset[:limit]
-            self.stdout.write(f"📊 최대 {limit}개 처리")
+        service = EmbeddingBackfillService(
+            workers=options.get("workers"),
+            rate=options.get("rate"),
+            chunk_size=options.get("chunk_size"),
+        )
 
-        total = queryset.count()
-        self.stdout.write(self.style.SUCCESS(f"\n🚀 총 {total}개 이벤트 처리 시작\n"))
+        def on_progress(progress):
+            percent = progress.processed * 100 // progress.total
+            self.stdout.write(
+                f"진행: {progress.processed}/{progress.total} ({percent}%) "
+                f"| {progress.events_per_second:.1f}개/s | rate={progress.rate:.1f}/s "
+                f"| throttled={progress.throttled} | last_id={progress.last_id}"
+            )
+            if checkpoint:
+                self._save_checkpoint(checkpoint, video_id, force, progress)
+
+        try:
+            result = service.backfill(
+                video_id=video_id,
+                force=force,
+                limit=options.get("limit"),
+                after_id=after_id,
+                on_progress=on_progress,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING(
+                    "\n⏸️  중단됨 - --checkpoint 또는 마지막으로 출력된 last_id를 "
+                    "--after-id로 지정하면 재개합니다."
+                )
+            )
+            return
 
-        if total == 0:
+        if result.total == 0:
             self.stdout.write(self.style.WARNING("처리할 이벤트가 없습니다."))
             return
 
-        # Bedrock 서비스 초기화
-        bedrock = get_bedrock_service()
-
-        # 진행 상황
-        success = 0
-        failed = 0
-        skipped = 0
-
-        for idx, event in enumerate(queryset, 1):
-            try:
-                # 진행률 표시
-                if idx % 10 == 0 or idx == 1:
-                    self.stdout.write(f"진행: {idx}/{total} ({idx*100//total}%)")
-
-                # searchable_text 확인
-                if not event.searchable_text:
-                    skipped += 1
-                    continue
-
-                # Embedding 생성
-                embedding = bedrock.generate_embedding(event.searchable_text)
-
-                if embedding:
-                    event.embedding = embedding
-                    event.save(update_fields=["embedding"])
-                    success += 1
-
-                    if idx % 10 == 0:
-                        self.stdout.write(
-                            self.style.SUCCESS(f"  ✅ Event {event.id} 완료")
-                        )
-                else:
-                    failed += 1
-                    self.stdout.write(self.style.ERROR(f"  ❌ Event {event.id} 실패"))
-
-                # API 호출 제한 방지 (1초에 10개)
-                if idx % 10 == 0:
-                    time.sleep(1)
-
-            except Exception as e:
-                failed += 1
-                self.stdout.write(
-                    self.style.ERROR(f"  ❌ Event {event.id} 오류: {str(e)}")
-                )
-
         # 최종 결과
         self.stdout.write("\n" + "=" * 50)
-        self.stdout.write(self.style.SUCCESS(f"✅ 성공: {success}개"))
-        if failed > 0:
-            self.stdout.write(self.style.ERROR(f"❌ 실패: {failed}개"))
-        if skipped > 0:
-            self.stdout.write(self.style.WARNING(f"⏭️  스킵: {skipped}개"))
+        self.stdout.write(self.style.SUCCESS(f"✅ 성공: {result.success}개"))
+        if result.failed > 0:
+            self.stdout.write(self.style.ERROR(f"❌ 실패: {result.failed}개"))
+        if result.skipped > 0:
+            self.stdout.write(self.style.WARNING(f"⏭️  스킵: {result.skipped}개"))
+        self.stdout.write(
+            f"⚡ {result.elapsed_seconds:.1f}초, {result.events_per_second:.1f}개/s, "
+            f"API {result.api_calls}회 (고유 텍스트 {result.unique_texts}, "
+            f"저장소 적중 {result.cache_hits}, throttled {result.throttled})"
+        )
         self.stdout.write("=" * 50 + "\n")
 
-        self.stdout.write(self.style.SUCCESS(f"\n🎉 Embedding 생성 완료!\n"))
+        self.stdout.write(self.style.SUCCESS(f"\n🎉 Embedding 생성 완료! (last_id={result.last_id})\n"))
+
+    @staticmethod
+    def _save_checkpoint(path, video_id, force, progress):
+        # 임시 파일에 쓴 뒤 교체 (중단 시 파일 손상 방지)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"video_id": video_id, "force": force, **progress.as_dict()}, f
+            )
+        os.replace(tmp_path, path)
@@ -0,0 +1,179 @@
+"""
+Embedding 모델 교체 - 재임베딩 계획(비용/시간 추정) 및 점진적 실행 Django management command
+
+검색은 비디오별 활성 버전(Video.embedding_version)을 사용하므로,
+재임베딩 중에도 전환 전 비디오는 이전 모델로 계속 검색된다.
+
+사용법:
+    # 계획만 출력 (Hot → Warm → Cold, 검색 많은 순)
+    python manage.py reembed --target-model cohere.embed-multilingual-v3
+
+    # 상위 20개 비디오만 실행
+    python manage.py reembed --target-model cohere.embed-multilingual-v3 --execute --limit-videos 20
+
+    # 가격/속도 지정
+    python manage.py reembed --target-model amazon.titan-embed-text-v2:0 --price-per-1k 0.00002 --rate 80
+
+    # 버전별 비디오 / 이벤트 수
+    python manage.py reembed --status
+
+대상은 Event / VideoAnalysis 벡터뿐이다 (PromptInteraction의 답변 캐시 벡터는 현재 버전만
+조회하므로 재임베딩하지 않고 TTL로 만료).
+
+전환이 모두 끝나면 AWS_BEDROCK_EMBEDDING_MODEL_ID를 목표 모델로 바꿔 새 데이터도 새 버전으로 생성한다.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.api.services.ai.embedding_version import make_embedding_version
+from apps.api.services.ai.reembed_planner import ReembedPlannerService
+
+
+class Command(BaseCommand):
+    help = "Plan and run an incremental, prioritized re-embed to a new embedding model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-model", type=str, help="목표 Bedrock 임베딩 모델 ID")
+        parser.add_argument(
+            "--execute", action="store_true", help="계획 출력 후 우선순위 순으로 실행"
+        )
+        parser.add_argument(
+            "--limit-videos", type=int, default=None, help="처리할 최대 비디오 수"
+        )
+        parser.add_argument(
+            "--video-id", type=int, nargs="+", default=None, help="특정 비디오만 처리"
+        )
+        parser.add_argument(
+            "--price-per-1k", type=float, default=None, help="1,000 토큰당 가격 (USD)"
+        )
+        parser.add_argument(
+            "--rate", type=float, default=None, help="초당 최대 Bedrock 요청 수"
+        )
+        parser.add_argument(
+            "--status", action="store_true", help="버전별 비디오 / 이벤트 수 출력"
+        )
+
+    def handle(self, *args, **options):
+        planner = ReembedPlannerService(
+            price_per_1k_tokens=options.get("price_per_1k"), rate=options.get("rate")
+        )
+
+        if options["status"]:
+            self._status(planner)
+            return
+
+        if not options.get("target_model"):
+            raise CommandError("--target-model 또는 --status를 지정하세요.")
+
+        target_version = make_embedding_version(options["target_model"])
+        plans = planner.plan(
+            target_version,
+            limit=options.get("limit_videos"),
+            video_ids=options.get("video_id"),
+        )
+        if not plans:
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ 모든 비디오가 이미 {target_version} 입니다.")
+            )
+            return
+
+        self._print_plan(target_version, plans)
+        if not options["execute"]:
+            self.stdout.write("\n💡 실행하려면 --execute를 추가하세요.")
+            return
+
+        self._execute(planner, target_version, plans)
+
+    def _print_plan(self, target_version, plans):
+        self.stdout.write(self.style.SUCCESS(f"\n📋 재임베딩 계획 → {target_version}\n"))
+        self.stdout.write(
+            f"{'#':>3} {'video':>6} {'tier':<5} {'search':>6} {'events':>7} "
+            f"{'texts':>7} {'staged':>7} {'tokens':>9} {'cost($)':>9} {'time':>8}  current"
+        )
+        for rank, plan in enumerate(plans, start=1):
+            self.stdout.write(
+                f"{rank:>3} {plan.video_id:>6} {plan.data_tier:<5} {plan.search_count:>6} "
+                f"{plan.events:>7} {plan.unique_texts:>7} {plan.staged_texts:>7} "
+                f"{plan.tokens:>9} {plan.cost_usd:>9.4f} {self._duration(plan.seconds):>8}  "
+                f"{plan.current_version}"
+            )
+
+        self.stdout.write("=" * 50)
+        self.stdout.write(
+            f"비디오 {len(plans)}개, 이벤트 {sum(p.events for p in plans)}개, "
+            f"API 호출 {sum(p.pending_texts for p in plans)}회 "
+            f"(저장소 적중 {sum(p.staged_texts for p in plans)})"
+        )
+        self.stdout.write(
+            f"💰 예상 비용 ${sum(p.cost_usd for p in plans):.4f} "
+            f"({sum(p.tokens for p in plans)} 토큰), "
+            f"⏱️ 예상 시간 {self._duration(sum(p.seconds for p in plans))}"
+        )
+        self.stdout.write("=" * 50)
+
+    def _execute(self, planner, target_version, plans):
+        switched = 0
+        api_calls = 0
+
+        for rank, plan in enumerate(plans, start=1):
+            self.stdout.write(
+                f"\n🔁 [{rank}/{len(plans)}] Video {plan.video_id} ({plan.name}) "
+                f"{plan.current_version} → {target_version}"
+            )
+
+            def on_progress(done, total):
+                self.stdout.write(f"   준비: {done}/{total} 텍스트")
+
+            try:
+                result = planner.reembed_video(
+                    plan.video_id, target_version, on_progress=on_progress
+                )
+            except KeyboardInterrupt:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "\n⏸️  중단됨 - 전환되지 않은 비디오는 이전 버전으로 검색됩니다. "
+                        "다시 실행하면 저장소에 준비된 벡터부터 이어서 처리합니다."
+                    )
+                )
+                return
+
+            api_calls += result["api_calls"]
+            if result["switched"]:
+                switched += 1
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"   ✅ 전환 완료: 이벤트 {result['events']}개, "
+                        f"분석 {result['analyses']}개, API {result['api_calls']}회, "
+                        f"재등록 {result['requeued']}개 ({result['elapsed_seconds']:.1f}초)"
+                    )
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"   ❌ 텍스트 {result['failed']}개 실패 → 전환 보류 (이전 버전 유지)"
+                    )
+                )
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🎉 {switched}/{len(plans)}개 비디오 전환 완료 (API {api_calls}회)"
+            )
+        )
+        self.stdout.write("=" * 50 + "\n")
+
+    def _status(self, planner):
+        self.stdout.write(self.style.SUCCESS("\n📊 Embedding 버전 현황\n"))
+        for version, counts in sorted(planner.status().items()):
+            self.stdout.write(
+                f"  {version:<50} 비디오 {counts['videos']:>6}  이벤트 {counts['events']:>9}"
+            )
+
+    @staticmethod
+    def _duration(seconds):
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds}s"
+        if seconds < 3600:
+            return f"{seconds // 60}m{seconds % 60:02d}s"
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
@@ -0,0 +1,360 @@
+"""
+Event embedding ANN 인덱스 관리 및 recall 측정 Django management command
+
+사용법:
+    # 정확한(순차) 검색 대비 ANN recall@k 측정
+    python manage.py vector_index recall
+    python manage.py vector_index recall --sample 200 --k 10 --ef-search 40 100 200
+    python manage.py vector_index recall --probes 1 10 20
+
+    # 비디오 필터 쿼리 recall (샘플마다 자기 비디오로 필터 → 필터 후 결과 부족 여부 확인)
+    python manage.py vector_index recall --per-video
+
+    # 인덱스 (재)생성 - 기본은 마이그레이션의 HNSW, IVFFlat은 선택
+    # (--drop-other는 모델에 선언되지 않은 인덱스만 삭제 - HNSW는 마이그레이션이 관리)
+    python manage.py vector_index build --type ivfflat --lists 1000
+    python manage.py vector_index build --type hnsw --m 16 --ef-construction 64
+
+    # 양자화 식 인덱스 (VECTOR_QUANTIZATION=halfvec|binary에서 사용, pgvector 0.7+)
+    python manage.py vector_index build --type halfvec
+    python manage.py vector_index build --type binary
+
+    # 모드별 메모리 / 지연 시간 / recall@k 비교 (정확한 검색 기준)
+    python manage.py vector_index benchmark --modes none halfvec binary --rescore-factor 4 10
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.api.services.ai.vector_index import (
+    QUANTIZED_INDEX_SQL,
+    pgvector_version,
+    supports_iterative_scan,
+    vector_search,
+)
+from apps.db.models import Event
+
+HNSW_INDEX_NAME = "db_event_embedding_hnsw_idx"
+IVFFLAT_INDEX_NAME = "db_event_embedding_ivfflat_idx"
+DIMENSIONS = 1024
+
+# 모드별 벡터 1개 크기 (바이트, varlena 헤더 포함) - 이론값
+# (힙에는 항상 float32 원본이 저장되고, 양자화 값은 식 인덱스에만 존재)
+VECTOR_BYTES = {
+    "none": 4 * DIMENSIONS + 8,
+    "halfvec": 2 * DIMENSIONS + 8,
+    "binary": DIMENSIONS // 8 + 8,
+}
+MODE_INDEX_NAMES = {
+    "none": HNSW_INDEX_NAME,
+    "halfvec": QUANTIZED_INDEX_SQL["halfvec"][0],
+    "binary": QUANTIZED_INDEX_SQL["binary"][0],
+}
+
+
+class Command(BaseCommand):
+    help = "Manage the Event embedding ANN index and report recall against exact search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            choices=["recall", "build", "benchmark"],
+            help="recall: recall 측정, build: 인덱스 생성, benchmark: 양자화 모드 비교",
+        )
+
+        # recall 옵션
+        parser.add_argument("--sample", type=int, default=100, help="쿼리로 사용할 샘플 이벤트 수")
+        parser.add_argument("--k", type=int, default=10, help="recall@k의 k")
+        parser.add_argument(
+            "--ef-search", type=int, nargs="+", default=None, help="측정할 hnsw.ef_search 값들"
+        )
+        parser.add_argument(
+            "--probes", type=int, nargs="+", default=None, help="측정할 ivfflat.probes 값들"
+        )
+        parser.add_argument("--video-id", type=int, help="특정 비디오 범위로 측정")
+        parser.add_argument(
+            "--per-video",
+            action="store_true",
+            help="샘플마다 자기 비디오로 필터링한 쿼리로 측정 (HybridSearchService 비디오 범위 검색과 동일)",
+        )
+
+        # benchmark 옵션
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(VECTOR_BYTES),
+            default=list(VECTOR_BYTES),
+            help="비교할 양자화 모드",
+        )
+        parser.add_argument(
+            "--rescore-factor",
+            type=int,
+            nargs="+",
+            default=[4],
+            help="재채점 후보 배수 (k * factor개 후보)",
+        )
+
+        # build 옵션
+        parser.add_argument(
+            "--type",
+            choices=["hnsw", "ivfflat", "halfvec", "binary"],
+            default="hnsw",
+            help="생성할 인덱스 종류",
+        )
+        parser.add_argument("--m", type=int, default=16, help="HNSW m")
+        parser.add_argument("--ef-construction", type=int, default=64, help="HNSW ef_construction")
+        parser.add_argument(
+            "--lists", type=int, default=None, help="IVFFlat lists (기본: 행 수 / 1000)"
+        )
+        parser.add_argument(
+            "--drop-other",
+            action="store_true",
+            help="다른 종류의 ANN 인덱스 삭제 (Event.Meta.indexes에 선언된 인덱스는 제외)",
+        )
+
+    def handle(self, *args, **options):
+        if options["action"] == "build":
+            self._build(options)
+        elif options["action"] == "benchmark":
+            self._benchmark(options)
+        else:
+            self._recall(options)
+
+    # ------------------------------------------------------------------
+    # recall 측정
+    # ------------------------------------------------------------------
+    def _sample(self, options):
+        queryset = Event.objects.filter(embedding__isnull=False)
+        if options.get("video_id"):
+            queryset = queryset.filter(video_id=options["video_id"])
+            self.stdout.write(f"🎯 Video ID {options['video_id']} 범위로 측정")
+
+        samples = list(
+            queryset.order_by("?").values_list("id", "embedding", "video_id")[
+                : options["sample"]
+            ]
+        )
+        if not samples:
+            self.stdout.write(self.style.WARNING("embedding이 있는 이벤트가 없습니다."))
+        return queryset, samples
+
+    def _recall(self, options):
+        k = options["k"]
+        queryset, samples = self._sample(options)
+        if not samples:
+            return
+
+        per_video = options.get("per_video", False)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n🚀 샘플 {len(samples)}개, recall@{k} 측정 시작"
+                f"{' (비디오 필터)' if per_video else ''}\n"
+            )
+        )
+        version = ".".join(map(str, pgvector_version())) or "-"
+        self.stdout.write(
+            f"🔧 pgvector {version}, iterative scan "
+            f"{'사용' if supports_iterative_scan() else '미지원 (비디오 필터 쿼리는 정확한 검색)'}\n"
+        )
+
+        # 1. 정확한 검색 (인덱스 비활성화) 기준값
+        exact_results, exact_latencies = self._run_queries(
+            queryset, samples, k, per_video, exact=True
+        )
+        self._report("exact", [1.0] * len(samples), exact_latencies)
+
+        # 2. ANN 검색 (파라미터별)
+        configs = []
+        for ef_search in options.get("ef_search") or []:
+            configs.append((f"hnsw.ef_search={ef_search}", {"ef_search": ef_search}))
+        for probes in options.get("probes") or []:
+            configs.append((f"ivfflat.probes={probes}", {"probes": probes}))
+        if not configs:
+            configs.append(("default", {}))
+
+        for label, params in configs:
+            ann_results, ann_latencies = self._run_queries(
+                queryset, samples, k, per_video, **params
+            )
+            recalls = []
+            short = 0
+            for exact_ids, ann_ids in zip(exact_results, ann_results):
+                if exact_ids:
+                    recalls.append(len(set(exact_ids) & set(ann_ids)) / len(exact_ids))
+                # 필터 후 결과가 정확한 검색보다 적게 나온 쿼리
+                short += len(ann_ids) < len(exact_ids)
+            self._report(label, recalls, ann_latencies, suffix=f"  결과 부족={short}/{len(samples)}")
+
+    def _run_queries(self, queryset, samples, k, per_video=False, **params):
+        results = []
+        latencies = []
+
+        for _, embedding, video_id in samples:
+            target = queryset.filter(video_id=video_id) if per_video else queryset
+            started_at = time.perf_counter()
+            events = vector_search(
+                target.only("id"), embedding, k, mode="none", scoped=per_video, **params
+            )
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            results.append([event.id for event in events])
+
+        return results, latencies
+
+    def _report(self, label, recalls, latencies, suffix=""):
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"📊 {label:<24} recall={statistics.mean(recalls):.4f}  "
+            f"p50={statistics.median(latencies):.1f}ms  p95={p95:.1f}ms{suffix}"
+        )
+
+    # ------------------------------------------------------------------
+    # 양자화 모드 벤치마크
+    # ------------------------------------------------------------------
+    def _benchmark(self, options):
+        k = options["k"]
+        queryset, samples = self._sample(options)
+        if not samples:
+            return
+
+        rows = queryset.count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n🚀 샘플 {len(samples)}개, 행 {rows}개, recall@{k} 벤치마크 시작\n"
+            )
+        )
+
+        # 실측: db_event 힙 + TOAST (float32 원본 벡터 포함, 모든 모드 공통)
+        table_bytes = self._table_size("db_event")
+        self.stdout.write(
+            f"💾 db_event 테이블 (힙 + TOAST, 실측) = {table_bytes / 1024 / 1024:.1f}MB - 모드와 무관\n"
+            f"   index = 모드별 인덱스 실측 크기 (pg_relation_size), "
+            f"vectors(이론) = 행 수 × 모드별 벡터 크기 (저장되지 않는 계산값)\n"
+        )
+
+        # 정확한 검색 기준값
+        exact_results, exact_latencies = self._run_mode(
+            queryset, samples, k, mode="none", exact=True
+        )
+        self._report("exact", [1.0] * len(samples), exact_latencies)
+
+        for mode in options["modes"]:
+            index_name = MODE_INDEX_NAMES[mode]
+            index_bytes = self._relation_size(index_name)
+            if index_bytes is None:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠️ {index_name} 없음 → 순차 스캔으로 측정 "
+                        f"(manage.py vector_index build --type {'hnsw' if mode == 'none' else mode})"
+                    )
+                )
+
+            index_mb = f"{index_bytes / 1024 / 1024:.1f}MB" if index_bytes is not None else "-"
+            memory = (
+                f"  index={index_mb}  "
+                f"vectors(이론)={VECTOR_BYTES[mode] * rows / 1024 / 1024:.1f}MB"
+            )
+
+            factors = [1] if mode == "none" else options["rescore_factor"]
+            for factor in factors:
+                ann_results, ann_latencies = self._run_mode(
+                    queryset,
+                    samples,
+                    k,
+                    mode=mode,
+                    rescore_factor=factor,
+                    ef_search=(options.get("ef_search") or [None])[0],
+                )
+                recalls = []
+                for exact_ids, ann_ids in zip(exact_results, ann_results):
+                    if exact_ids:
+                        recalls.append(len(set(exact_ids) & set(ann_ids)) / len(exact_ids))
+
+                label = mode if mode == "none" else f"{mode} x{factor}"
+                self._report(label, recalls, ann_latencies, suffix=memory)
+
+    def _run_mode(self, queryset, samples, k, **params):
+        results = []
+        latencies = []
+
+        for _, embedding, _ in samples:
+            started_at = time.perf_counter()
+            events = vector_search(queryset.only("id"), embedding, k, **params)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            results.append([event.id for event in events])
+
+        return results, latencies
+
+    @staticmethod
+    def _model_index_names():
+        return {index.name for index in Event._meta.indexes}
+
+    @staticmethod
+    def _table_size(name):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_table_size(to_regclass(%s))", [name])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    @staticmethod
+    def _relation_size(name):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_relation_size(to_regclass(%s))", [name])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    # ------------------------------------------------------------------
+    # 인덱스 생성
+    # ------------------------------------------------------------------
+    def _build(self, options):
+        index_type = options["type"]
+
+        if index_type in QUANTIZED_INDEX_SQL:
+            # 양자화 식 인덱스 - 원본 벡터 인덱스와 함께 유지 (none 모드/재채점용)
+            name, using = QUANTIZED_INDEX_SQL[index_type]
+            using = using.format(dimensions=DIMENSIONS)
+            other = None
+        elif index_type == "hnsw":
+            name, other = HNSW_INDEX_NAME, IVFFLAT_INDEX_NAME
+            using = (
+                f"hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {int(options['m'])}, ef_construction = {int(options['ef_construction'])})"
+            )
+        else:
+            name, other = IVFFLAT_INDEX_NAME, HNSW_INDEX_NAME
+            lists = options.get("lists")
+            if not lists:
+                # pgvector 권장: 100만 행 이하 rows / 1000
+                rows = Event.objects.filter(embedding__isnull=False).count()
+                lists = max(rows // 1000, 10)
+            using = f"ivfflat (embedding vector_cosine_ops) WITH (lists = {int(lists)})"
+
+        if connection.in_atomic_block:
+            raise CommandError("CONCURRENTLY 인덱스 생성은 트랜잭션 밖에서 실행해야 합니다.")
+
+        # 모델에 선언된 인덱스는 마이그레이션이 관리 → 여기서 삭제하면 스키마 불일치
+        if options["drop_other"] and other in self._model_index_names():
+            raise CommandError(
+                f"{other}는 Event.Meta.indexes에 선언된 인덱스라 삭제할 수 없습니다. "
+                f"--drop-other 없이 실행하거나, 인덱스 종류 변경은 마이그레이션으로 하세요."
+            )
+
+        self.stdout.write(f"🔨 {name} 생성 중: USING {using}")
+        started_at = time.time()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON db_event USING {using}"
+            )
+
+            if options["drop_other"] and other:
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {other}")
+                self.stdout.write(f"🗑️ {other} 삭제")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {name} 생성 완료 ({time.time() - started_at:.1f}초)")
+        )
@@ -0,0 +1,61 @@
+# Embedding cache table (query embedding L2 cache)
+
+from django.db import migrations, models
+import django.utils.timezone
+import pgvector.django.vector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0008_upgrade_embedding_to_titan_v2"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmbeddingCacheEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model_id",
+                    models.CharField(
+                        help_text="Bedrock embedding model ID", max_length=100
+                    ),
+                ),
+                ("dimension", models.IntegerField(help_text="Embedding dimension")),
+                (
+                    "text_hash",
+                    models.CharField(
+                        help_text="SHA-256 of normalized input text", max_length=64
+                    ),
+                ),
+                (
+                    "embedding",
+                    pgvector.django.vector.VectorField(dimensions=1024),
+                ),
+                ("hit_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_accessed",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "db_table": "db_embeddingcache",
+                "unique_together": {("model_id", "dimension", "text_hash")},
+                "indexes": [
+                    models.Index(
+                        fields=["last_accessed"], name="db_embeddin_last_ac_0fa458_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Composite index for per-video neighbor (windowing) lookups
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0009_embedding_cache"),
+    ]
+
+    operations = [
+        # Event (video, timestamp) 인덱스 - 윈도우 함수 PARTITION BY video ORDER BY timestamp
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["video", "timestamp"], name="db_event_video_i_0ff3fa_idx"
+            ),
+        ),
+    ]
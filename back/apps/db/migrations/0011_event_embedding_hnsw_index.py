@@ -0,0 +1,30 @@
+# HNSW ANN index on db_event.embedding (cosine distance)
+# 대용량 테이블 잠금 방지를 위해 CONCURRENTLY로 생성 (atomic = False)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+import pgvector.django.indexes
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("db", "0010_event_video_timestamp_index"),
+    ]
+
+    operations = [
+        # Event embedding HNSW 인덱스 - CosineDistance 정렬 시 순차 스캔 대신 ANN 사용
+        # IVFFlat이 필요하면: python manage.py vector_index build --type ivfflat
+        AddIndexConcurrently(
+            model_name="event",
+            index=pgvector.django.indexes.HnswIndex(
+                ef_construction=64,
+                fields=["embedding"],
+                m=16,
+                name="db_event_embedding_hnsw_idx",
+                opclasses=["vector_cosine_ops"],
+            ),
+        ),
+    ]
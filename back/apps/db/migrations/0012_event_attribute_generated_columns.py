@@ -0,0 +1,130 @@
+# Stored generated columns for frequently queried Event.attributes keys + B-tree indexes
+# STORED 컬럼 추가는 테이블 재작성(ACCESS EXCLUSIVE) → 배포 시 유지보수 시간대에 실행
+# 인덱스는 CONCURRENTLY로 생성 (atomic = False)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+
+NUMERIC_PATTERN = r"^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$"
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("db", "0011_event_embedding_hnsw_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="attr_age",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        attributes__age__regex=NUMERIC_PATTERN,
+                        then=Cast(KeyTextTransform("age", "attributes"), models.FloatField()),
+                    ),
+                    default=None,
+                    output_field=models.FloatField(),
+                ),
+                help_text="정확한 나이 (attributes->>'age')",
+                output_field=models.FloatField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="attr_location",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        attributes__location__regex=NUMERIC_PATTERN,
+                        then=Cast(
+                            Cast(KeyTextTransform("location", "attributes"), models.FloatField()),
+                            models.IntegerField(),
+                        ),
+                    ),
+                    default=None,
+                    output_field=models.IntegerField(),
+                ),
+                help_text="화면 위치 1=왼쪽, 2=가운데, 3=오른쪽 (attributes->>'location')",
+                output_field=models.IntegerField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="attr_area_of_interest",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        attributes__area_of_interest__regex=NUMERIC_PATTERN,
+                        then=Cast(
+                            Cast(KeyTextTransform("area_of_interest", "attributes"), models.FloatField()),
+                            models.IntegerField(),
+                        ),
+                    ),
+                    default=None,
+                    output_field=models.IntegerField(),
+                ),
+                help_text="관심 영역 1=왼쪽, 2=가운데, 3=오른쪽 (attributes->>'area_of_interest')",
+                output_field=models.IntegerField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="attr_obj_id",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        attributes__obj_id__regex=NUMERIC_PATTERN,
+                        then=Cast(
+                            Cast(KeyTextTransform("obj_id", "attributes"), models.FloatField()),
+                            models.IntegerField(),
+                        ),
+                    ),
+                    default=None,
+                    output_field=models.IntegerField(),
+                ),
+                help_text="객체 추적 ID (attributes->>'obj_id')",
+                output_field=models.IntegerField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="attr_action_detected",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=KeyTextTransform("action_detected", "attributes"),
+                help_text="감지된 행동 (attributes->>'action_detected')",
+                output_field=models.TextField(null=True),
+            ),
+        ),
+        # 나이/위치 질문은 대부분 비디오 범위 → (video, 컬럼) 복합 인덱스
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["video", "attr_age"], name="db_event_video_i_402a20_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["video", "attr_location"], name="db_event_video_i_d1ae68_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["video", "attr_area_of_interest"], name="db_event_video_i_8c74bb_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["video", "attr_obj_id"], name="db_event_video_i_dba301_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="event",
+            index=models.Index(fields=["attr_action_detected"], name="db_event_attr_ac_46b701_idx"),
+        ),
+    ]
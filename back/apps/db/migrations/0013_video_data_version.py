@@ -0,0 +1,21 @@
+# Per-video event data version for semantic answer cache invalidation
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0012_event_attribute_generated_columns"),
+    ]
+
+    operations = [
+        # 상수 DEFAULT 컬럼 추가 → PostgreSQL 11+에서는 테이블 재작성 없음
+        migrations.AddField(
+            model_name="video",
+            name="data_version",
+            field=models.IntegerField(
+                default=0, help_text="Bumped when this video's events change"
+            ),
+        ),
+    ]
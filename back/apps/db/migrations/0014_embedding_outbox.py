@@ -0,0 +1,69 @@
+# Event embedding outbox (replaces synchronous Bedrock call in Event pre_save)
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def enqueue_missing_embeddings(apps, schema_editor):
+    """이미 embedding 없이 저장된 이벤트를 대기열에 등록"""
+    schema_editor.execute(
+        """
+        INSERT INTO db_embeddingoutbox (event_id, attempts, last_error, available_at, created_at)
+        SELECT id, 0, '', NOW(), NOW()
+        FROM db_event
+        WHERE embedding IS NULL AND COALESCE(searchable_text, '') <> ''
+        ON CONFLICT (event_id) DO NOTHING
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0013_video_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmbeddingOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("attempts", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="처리 가능 시각 (점유/재시도 백오프)",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="embedding_outbox",
+                        to="db.event",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "db_embeddingoutbox",
+                "indexes": [
+                    models.Index(
+                        fields=["available_at"], name="db_embeddin_availab_d92ddf_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(enqueue_missing_embeddings, migrations.RunPython.noop),
+    ]
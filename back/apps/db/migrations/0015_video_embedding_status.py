@@ -0,0 +1,42 @@
+# Per-video event embedding job status / progress
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0014_embedding_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="video",
+            name="embedding_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "대기중"),
+                    ("processing", "생성중"),
+                    ("completed", "완료"),
+                    ("failed", "실패"),
+                ],
+                default="pending",
+                help_text="Event embedding job status",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="embedding_progress",
+            field=models.IntegerField(
+                default=0, help_text="Event embedding progress 0-100"
+            ),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="embedding_updated_at",
+            field=models.DateTimeField(
+                blank=True, help_text="Last embedding job heartbeat", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Content-addressed Event embedding store on top of the embedding cache table
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0015_video_embedding_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="embeddingcacheentry",
+            name="pinned",
+            field=models.BooleanField(
+                default=False,
+                help_text="Content-addressed Event embedding (never pruned)",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Embedding model version on every vector-bearing row + active version per video
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_current_version(apps, schema_editor):
+    """기존 벡터는 현재 설정 모델(1024차원)로 생성된 것으로 기록"""
+    version = f"{settings.AWS_BEDROCK_EMBEDDING_MODEL_ID}@1024"
+
+    for table, columns in (
+        ("db_event", ["embedding"]),
+        ("db_videoanalysis", ["embedding"]),
+        ("db_promptsession", ["context_embedding"]),
+        ("db_promptinteraction", ["query_embedding", "response_embedding"]),
+    ):
+        condition = " OR ".join(f"{column} IS NOT NULL" for column in columns)
+        schema_editor.execute(
+            f"UPDATE {table} SET embedding_version = %s WHERE {condition}", [version]
+        )
+
+    schema_editor.execute("UPDATE db_video SET embedding_version = %s", [version])
+
+
+def field():
+    return models.CharField(
+        blank=True, default="", help_text="Embedding model@dimension", max_length=150
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0016_embeddingcacheentry_pinned"),
+    ]
+
+    operations = [
+        migrations.AddField(model_name="event", name="embedding_version", field=field()),
+        migrations.AddField(
+            model_name="videoanalysis", name="embedding_version", field=field()
+        ),
+        migrations.AddField(
+            model_name="promptsession", name="embedding_version", field=field()
+        ),
+        migrations.AddField(
+            model_name="promptinteraction", name="embedding_version", field=field()
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="embedding_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Active embedding version (model@dimension) for this video's events",
+                max_length=150,
+            ),
+        ),
+        migrations.RunPython(set_current_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Instance type + video feature snapshot on AnalysisJob (processing-time estimator samples)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0017_embedding_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analysisjob",
+            name="instance_type",
+            field=models.CharField(
+                blank=True, help_text="EC2 instance type that ran the job", max_length=50
+            ),
+        ),
+        migrations.AddField(
+            model_name="analysisjob",
+            name="video_duration",
+            field=models.FloatField(
+                blank=True,
+                help_text="Video duration in seconds at processing time",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="analysisjob",
+            name="video_width",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="analysisjob",
+            name="video_height",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="analysisjob",
+            name="video_fps",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="analysisjob",
+            name="video_file_size",
+            field=models.BigIntegerField(
+                blank=True, help_text="File size in bytes at processing time", null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="analysisjob",
+            index=models.Index(
+                fields=["instance_type", "status"], name="db_analysis_instanc_1229db_idx"
+            ),
+        ),
+    ]
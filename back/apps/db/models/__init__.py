@@ -7,6 +7,7 @@ from .video import Video
 from .event import Event
 from .prompt import PromptSession, PromptInteraction
 from .analysis import VideoAnalysis, AnalysisJob, DepthData, DisplayData
+from .embedding import EmbeddingCacheEntry, EmbeddingOutbox
 
 __all__ = [
     "Video",
@@ -17,4 +18,6 @@ __all__ = [
     "AnalysisJob",
     "DepthData",
     "DisplayData",
+    "EmbeddingCacheEntry",
+    "EmbeddingOutbox",
 ]
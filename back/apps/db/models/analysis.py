@@ -8,7 +8,6 @@ import logging
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils import timezone
-from datetime import datetime
 from pgvector.django import VectorField
 
 logger = logging.getLogger(__name__)
@@ -45,6 +44,9 @@ class VideoAnalysis(models.Model):
 
     # 벡터 임베딩 (RAG 검색용)
     embedding = VectorField(dimensions=1024, blank=True, null=True)
+    embedding_version = models.CharField(
+        max_length=150, blank=True, default="", help_text="Embedding model@dimension"
+    )
 
     # 검색 최적화
     searchable_text = models.TextField(help_text="Searchable text representation")
@@ -72,6 +74,20 @@ class VideoAnalysis(models.Model):
             models.Index(fields=["data_tier", "search_count"]),
         ]
 
+    def save(self, *args, **kwargs):
+        # 버전 없이 벡터만 저장된 경우 (예: API 시리얼라이저) 현재 버전으로 기록 → 버전별 검색에서 누락 방지
+        if self.embedding is not None and not self.embedding_version:
+            from apps.api.services.ai.embedding_version import (
+                get_current_embedding_version,
+            )
+
+            self.embedding_version = get_current_embedding_version()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "embedding" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "embedding_version"}
+
+        super().save(*args, **kwargs)
+
     def increment_search_count(self):
         """검색 횟수 증가"""
         self.search_count += 1
@@ -125,6 +141,20 @@ class AnalysisJob(models.Model):
     log_s3_key = models.CharField(max_length=1024, blank=True, help_text="Log S3 key")
     error_message = models.TextField(blank=True)
 
+    # 실행 환경 + 처리 시점의 비디오 특성 (처리 시간 추정 모델 학습용)
+    instance_type = models.CharField(
+        max_length=50, blank=True, help_text="EC2 instance type that ran the job"
+    )
+    video_duration = models.FloatField(
+        null=True, blank=True, help_text="Video duration in seconds at processing time"
+    )
+    video_width = models.IntegerField(null=True, blank=True)
+    video_height = models.IntegerField(null=True, blank=True)
+    video_fps = models.FloatField(null=True, blank=True)
+    video_file_size = models.BigIntegerField(
+        null=True, blank=True, help_text="File size in bytes at processing time"
+    )
+
     # 시간 추적
     created_at = models.DateTimeField(auto_now_add=True)
     started_at = models.DateTimeField(null=True, blank=True)
@@ -136,6 +166,7 @@ class AnalysisJob(models.Model):
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["video", "status"]),
+            models.Index(fields=["instance_type", "status"]),
         ]
 
     @property
@@ -145,29 +176,50 @@ class AnalysisJob(models.Model):
             return (self.completed_at - self.started_at).total_seconds()
         return None
 
+    def snapshot_video_features(self):
+        """처리 시점의 비디오 길이/해상도/FPS/크기 기록 (이후 메타데이터가 바뀌어도 학습 샘플 유지)"""
+        video = self.video
+        self.video_duration = video.duration
+        self.video_width = video.resolution_width or video.width
+        self.video_height = video.resolution_height or video.height
+        self.video_fps = video.fps or video.frame_rate
+        self.video_file_size = video.file_size
+
     def update_status_from_aws(self):
-        """AWS Batch에서 최신 상태 조회 및 업데이트"""
+        """
+        AWS Batch에서 최신 상태 조회 및 업데이트
+
+        started_at / completed_at은 쓰지 않음 - 처리 시간(입력 준비 + 분석)은 작업 컨테이너가
+        batch/processing_estimate.py로 같은 job_id 행에 기록 (처리 시간 추정기 학습 샘플의 단일 기록자)
+        """
         batch_client = boto3.client("batch")
         try:
             response = batch_client.describe_jobs(jobs=[self.job_id])
             if response["jobs"]:
                 job_detail = response["jobs"][0]
                 self.status = job_detail["status"].lower()
-
-                if "startedAt" in job_detail and not self.started_at:
-                    self.started_at = datetime.fromtimestamp(
-                        job_detail["startedAt"] / 1000
-                    )
-
-                if "stoppedAt" in job_detail and not self.completed_at:
-                    self.completed_at = datetime.fromtimestamp(
-                        job_detail["stoppedAt"] / 1000
-                    )
-
-                self.save()
+                update_fields = ["status"]
+
+                instance_type = job_detail.get("container", {}).get("instanceType")
+                if instance_type and not self.instance_type:
+                    self.instance_type = instance_type
+                    update_fields.append("instance_type")
+
+                if self.status == "succeeded" and self.video_duration is None:
+                    self.snapshot_video_features()
+                    update_fields += [
+                        "video_duration",
+                        "video_width",
+                        "video_height",
+                        "video_fps",
+                        "video_file_size",
+                    ]
+
+                # 변경한 필드만 저장 (컨테이너가 기록한 처리 시간을 덮어쓰지 않음)
+                self.save(update_fields=update_fields)
         except Exception as e:
             self.error_message = str(e)
-            self.save()
+            self.save(update_fields=["error_message"])
 
     def __str__(self):
         return f"Job {self.job_name} for {self.video.name or self.video.filename} - {self.status}"
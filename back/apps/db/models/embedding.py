@@ -0,0 +1,77 @@
+"""
+Embedding 캐시 / 아웃박스 모델
+- EmbeddingCacheEntry: Bedrock 임베딩 결과를 (모델, 차원, 정규화 텍스트 해시) 단위로 영구 저장
+  (pinned 엔트리 = Event embedding 콘텐츠 주소 저장소, 일반 TTL/행 수 정리 대상 아님 - 별도 장기 TTL)
+- EmbeddingOutbox: Event 저장 트랜잭션에서 기록하는 embedding 생성 대기열
+"""
+
+import logging
+from django.db import models
+from django.utils import timezone
+from pgvector.django import VectorField
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheEntry(models.Model):
+    """임베딩 캐시 엔트리 - 동일 텍스트의 Bedrock 재호출 방지"""
+
+    # 캐시 키
+    model_id = models.CharField(max_length=100, help_text="Bedrock embedding model ID")
+    dimension = models.IntegerField(help_text="Embedding dimension")
+    text_hash = models.CharField(
+        max_length=64, help_text="SHA-256 of normalized input text"
+    )
+
+    # 캐시 값 (Titan Embed v2 - 1024D)
+    embedding = VectorField(dimensions=1024)
+
+    # 콘텐츠 주소 저장소 엔트리 (Event embedding 공유 벡터) - 일반 정리 대상 제외 (EMBEDDING_CACHE_PINNED_TTL로만 정리)
+    pinned = models.BooleanField(
+        default=False, help_text="Content-addressed Event embedding (never pruned)"
+    )
+
+    # 통계 / 만료 관리
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "db_embeddingcache"
+        unique_together = ["model_id", "dimension", "text_hash"]
+        indexes = [
+            models.Index(fields=["last_accessed"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model_id}/{self.dimension}D - {self.text_hash[:12]} ({self.hit_count} hits)"
+
+
+class EmbeddingOutbox(models.Model):
+    """
+    Event embedding 생성 대기열 (트랜잭셔널 아웃박스)
+
+    Event 저장과 같은 트랜잭션에서 행을 기록하고, 백그라운드 드레이너가
+    일괄 embedding 후 행을 삭제한다. (Event 저장 시 Bedrock 호출 없음)
+    """
+
+    event = models.OneToOneField(
+        "db.Event", on_delete=models.CASCADE, related_name="embedding_outbox"
+    )
+
+    # 재시도 관리
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    available_at = models.DateTimeField(
+        default=timezone.now, help_text="처리 가능 시각 (점유/재시도 백오프)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "db_embeddingoutbox"
+        indexes = [
+            models.Index(fields=["available_at"]),
+        ]
+
+    def __str__(self):
+        return f"Event {self.event_id} (attempts={self.attempts})"
@@ -7,12 +7,30 @@ import boto3
 import logging
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
 from django.utils import timezone
 from datetime import timedelta
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 logger = logging.getLogger(__name__)
 
+# attributes 숫자 값 검증용 (문자열/비정상 값은 NULL 처리 → INSERT 실패 방지)
+NUMERIC_PATTERN = r"^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$"
+
+
+def _attribute_number(key, output_field):
+    """attributes->>key를 숫자로 변환하는 생성 컬럼 표현식 (숫자가 아니면 NULL)"""
+    value = Cast(KeyTextTransform(key, "attributes"), models.FloatField())
+    if not isinstance(output_field, models.FloatField):
+        value = Cast(value, output_field)
+
+    return models.Case(
+        models.When(**{f"attributes__{key}__regex": NUMERIC_PATTERN}, then=value),
+        default=None,
+        output_field=output_field,
+    )
+
 
 class Event(models.Model):
     """비디오 이벤트 모델 - 객체 감지, 행동 인식 등"""
@@ -74,6 +92,38 @@ class Event(models.Model):
         default=dict, blank=True, help_text="Additional attributes"
     )
 
+    # attributes 자주 조회되는 키 - STORED 생성 컬럼 (B-tree 인덱스, Text2SQL/메타데이터 필터용)
+    attr_age = models.GeneratedField(
+        expression=_attribute_number("age", models.FloatField()),
+        output_field=models.FloatField(null=True),
+        db_persist=True,
+        help_text="정확한 나이 (attributes->>'age')",
+    )
+    attr_location = models.GeneratedField(
+        expression=_attribute_number("location", models.IntegerField()),
+        output_field=models.IntegerField(null=True),
+        db_persist=True,
+        help_text="화면 위치 1=왼쪽, 2=가운데, 3=오른쪽 (attributes->>'location')",
+    )
+    attr_area_of_interest = models.GeneratedField(
+        expression=_attribute_number("area_of_interest", models.IntegerField()),
+        output_field=models.IntegerField(null=True),
+        db_persist=True,
+        help_text="관심 영역 1=왼쪽, 2=가운데, 3=오른쪽 (attributes->>'area_of_interest')",
+    )
+    attr_obj_id = models.GeneratedField(
+        expression=_attribute_number("obj_id", models.IntegerField()),
+        output_field=models.IntegerField(null=True),
+        db_persist=True,
+        help_text="객체 추적 ID (attributes->>'obj_id')",
+    )
+    attr_action_detected = models.GeneratedField(
+        expression=KeyTextTransform("action_detected", "attributes"),
+        output_field=models.TextField(null=True),
+        db_persist=True,
+        help_text="감지된 행동 (attributes->>'action_detected')",
+    )
+
     # S3 썸네일
     s3_thumbnail_bucket = models.CharField(
         max_length=63,
@@ -87,6 +137,9 @@ class Event(models.Model):
 
     # RAG 검색을 위한 임베딩 (Titan Embed v2 - 1024D)
     embedding = VectorField(dimensions=1024, blank=True, null=True)
+    embedding_version = models.CharField(
+        max_length=150, blank=True, default="", help_text="Embedding model@dimension"
+    )
     searchable_text = models.TextField(blank=True)
     keywords = ArrayField(models.CharField(max_length=100), blank=True, default=list)
 
@@ -107,9 +160,24 @@ class Event(models.Model):
         ordering = ["video", "timestamp"]
         indexes = [
             models.Index(fields=["video", "event_type"]),
+            models.Index(fields=["video", "timestamp"]),  # 윈도잉(앞뒤 이벤트) 조회
             models.Index(fields=["timestamp"]),
             models.Index(fields=["age_group", "gender"]),
             models.Index(fields=["data_tier", "search_count"]),
+            # attributes 생성 컬럼 (나이/위치 질문이 가장 많음)
+            models.Index(fields=["video", "attr_age"]),
+            models.Index(fields=["video", "attr_location"]),
+            models.Index(fields=["video", "attr_area_of_interest"]),
+            models.Index(fields=["video", "attr_obj_id"]),
+            models.Index(fields=["attr_action_detected"]),
+            # 코사인 거리 ANN 인덱스 (IVFFlat 전환: manage.py vector_index build --type ivfflat)
+            HnswIndex(
+                name="db_event_embedding_hnsw_idx",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
         ]
 
     def increment_search_count(self):
@@ -197,6 +265,24 @@ class Event(models.Model):
         ]
         self.keywords = [k for k in self.keywords if k]
 
+    @staticmethod
+    def embedding_text_for(searchable_text: str, include_time: bool = False) -> str:
+        """
+        embedding 입력 텍스트 - searchable_text에서 'Time: ...s' 구간 제외
+
+        시각은 Text2SQL/필터로 검색하므로 벡터에 넣지 않는다. 시각을 빼면
+        같은 행동/인물 속성의 이벤트가 같은 텍스트가 되어 임베딩을 공유한다.
+        (include_time=True: 텍스트 개정 1 버전으로 생성된 벡터와 같은 규칙)
+        """
+        if include_time:
+            return (searchable_text or "").strip()
+        parts = (searchable_text or "").split(" | ")
+        return " | ".join(part for part in parts if not part.startswith("Time: ")).strip()
+
+    @property
+    def embedding_text(self) -> str:
+        return self.embedding_text_for(self.searchable_text)
+
     @property
     def thumbnail_url(self):
         """썸네일 Presigned URL"""
@@ -45,6 +45,9 @@ class PromptSession(models.Model):
     # 세션 컨텍스트 (RAG)
     context_summary = models.TextField(blank=True)
     context_embedding = VectorField(dimensions=1024, blank=True, null=True)
+    embedding_version = models.CharField(
+        max_length=150, blank=True, default="", help_text="Embedding model@dimension"
+    )
 
     # 상태 관리
     status = models.CharField(
@@ -221,6 +224,9 @@ class PromptInteraction(models.Model):
     # 임베딩 (검색 최적화)
     query_embedding = VectorField(dimensions=1024, blank=True, null=True)
     response_embedding = VectorField(dimensions=1024, blank=True, null=True)
+    embedding_version = models.CharField(
+        max_length=150, blank=True, default="", help_text="Embedding model@dimension"
+    )
 
     # 메타데이터
     processing_time = models.FloatField(
@@ -106,6 +106,37 @@ class Video(models.Model):
         help_text="Summary generation status",
     )
 
+    # 이벤트 embedding 생성 (분석 완료 후 백그라운드 작업)
+    embedding_status = models.CharField(
+        max_length=20,
+        default="pending",
+        choices=[
+            ("pending", "대기중"),
+            ("processing", "생성중"),
+            ("completed", "완료"),
+            ("failed", "실패"),
+        ],
+        help_text="Event embedding job status",
+    )
+    embedding_progress = models.IntegerField(
+        default=0, help_text="Event embedding progress 0-100"
+    )
+    embedding_updated_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last embedding job heartbeat"
+    )
+    # 검색 쿼리가 사용할 embedding 버전 (재임베딩 완료 시 비디오 단위로 전환)
+    embedding_version = models.CharField(
+        max_length=150,
+        blank=True,
+        default="",
+        help_text="Active embedding version (model@dimension) for this video's events",
+    )
+
+    # 이벤트 데이터 버전 (ORM 이벤트 변경 시 증가 - 답변 캐시 무효화)
+    data_version = models.IntegerField(
+        default=0, help_text="Bumped when this video's events change"
+    )
+
     # AWS Batch Job 추적
     job_id = models.CharField(
         max_length=100, null=True, blank=True, help_text="AWS Batch job ID"
@@ -145,6 +176,15 @@ class Video(models.Model):
             models.Index(fields=["analysis_status"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # DB에서 읽은 분석 상태 (post_save signal에서 실제 상태 전환 여부 판단용)
+        instance._loaded_analysis_status = (
+            instance.analysis_status if "analysis_status" in field_names else None
+        )
+        return instance
+
     def increment_search_count(self):
         """검색 횟수 증가 및 hotness 점수 업데이트"""
         from apps.api.services.tier_manager import TierManager
@@ -1,122 +1,144 @@
 """
 Django signals for Event and Video models
 - Video 분석 완료 시 자동 embedding 생성 (Video Analysis 데이터용)
-- Event 생성/수정 시 자동 embedding 생성 (Django ORM 사용 시)
+- Event 생성/수정 시 embedding 대기열(아웃박스) 등록 (Django ORM 사용 시)
+- Event 변경 시 비디오 데이터 버전 증가 (답변 캐시 / 윈도우 텍스트 캐시 / BM25 인덱스 무효화)
 """
 
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from apps.db.models import Event, Video
 import logging
+import threading
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# 스레드(= DB 연결)별 커밋 대기 중인 data_version 증가 {DB alias: _DataVersionBump}
+_pending_bumps = threading.local()
 
-@receiver(pre_save, sender=Event)
-def generate_event_embedding(sender, instance, **kwargs):
+# 답변 내용에 영향을 주지 않는 통계/티어링 필드 (데이터 버전 유지)
+NON_CONTENT_EVENT_FIELDS = {"search_count", "last_accessed", "data_tier"}
+
+
+@receiver(post_save, sender=Event)
+def enqueue_event_embedding(sender, instance, **kwargs):
     """
-    Event 저장 전 embedding 자동 생성 (Django ORM 사용 시만 작동)
+    Event 저장 시 embedding 생성 대기열(EmbeddingOutbox)에 등록 (Django ORM 사용 시만 작동)
 
     주의:
+    - Bedrock 호출은 커밋 후 백그라운드 드레이너가 일괄 처리 (저장은 즉시 반환)
+    - 대기열 행은 Event 저장과 같은 트랜잭션에 기록 → 롤백 시 함께 취소
     - Video Analysis는 직접 SQL INSERT를 사용하므로 이 signal이 발동하지 않습니다.
     - Video Analysis 데이터는 Video post_save signal에서 일괄 처리합니다.
-    - pre_save이므로 무한루프 위험 없음 (save() 호출 전에 embedding 세팅)
     """
-    # embedding이 이미 있으면 스킵 (중복 생성 방지)
-    if instance.embedding:
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= NON_CONTENT_EVENT_FIELDS:
         return
 
-    # searchable_text가 없으면 스킵
-    if not instance.searchable_text:
+    # embedding을 로드하지 않은 인스턴스는 판단 불가 → 스킵 (추가 쿼리 방지)
+    if "embedding" in instance.get_deferred_fields():
         return
 
-    try:
-        # Bedrock 서비스로 embedding 생성
-        from apps.api.services import get_bedrock_service
+    # embedding이 이미 있거나 searchable_text가 없으면 스킵
+    if instance.embedding is not None or not instance.searchable_text:
+        return
 
-        bedrock = get_bedrock_service()
-        embedding = bedrock.generate_embedding(instance.searchable_text)
+    try:
+        from apps.api.services.ai.embedding_outbox import get_embedding_outbox
 
-        if embedding:
-            instance.embedding = embedding
-            logger.info(f"✅ Event {instance.id} embedding 생성 완료")
-        else:
-            logger.warning(f"⚠️ Event {instance.id} embedding 생성 실패")
+        # 세이브포인트 → 대기열 INSERT가 실패해도 바깥 트랜잭션은 계속 사용 가능
+        with transaction.atomic():
+            get_embedding_outbox().enqueue([instance.pk])
 
     except Exception as e:
-        logger.error(f"❌ Event {instance.id} embedding 생성 중 오류: {str(e)}")
-        # 에러가 나도 저장은 계속 진행
-        pass
+        logger.error(f"❌ Event {instance.id} embedding 대기열 등록 실패: {str(e)}")
+        # 에러가 나도 저장은 계속 진행 (backfill 명령으로 복구 가능)
 
 
-@receiver(post_save, sender=Video)
-def generate_embeddings_on_video_completed(sender, instance, **kwargs):
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_video_data_version(sender, instance, **kwargs):
     """
-    Video 분석 완료 시 모든 이벤트의 embedding 자동 생성
+    Event 변경 시 Video.data_version 증가 → 해당 비디오의 답변·윈도우 텍스트 캐시 무효화
 
-    Video Analysis가 직접 SQL INSERT로 이벤트를 저장하면 Event signal이 발동하지 않으므로,
-    Video의 analysis_status가 'completed'로 변경될 때 일괄 처리합니다.
+    트랜잭션 안에서는 비디오별로 모아 커밋 시 1회만 증가 (이벤트마다 db_video 행을
+    UPDATE하면 같은 비디오의 이벤트 저장이 행 잠금으로 직렬화됨)
+
+    직접 SQL INSERT는 이 signal이 발동하지 않지만, 답변 캐시는
+    이벤트 수/최대 ID도 버전에 포함하므로 추가 이벤트를 감지한다.
     """
-    # analysis_status가 'completed'로 변경되었는지 확인
-    if instance.analysis_status != "completed":
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= NON_CONTENT_EVENT_FIELDS:
         return
 
-    # 이미 처리된 경우 스킵 (무한 루프 방지)
-    if hasattr(instance, "_embeddings_generated"):
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _DataVersionBump({instance.video_id})()
         return
 
-    try:
-        # 이 비디오의 embedding이 없는 이벤트 찾기
-        events_without_embedding = Event.objects.filter(
-            video=instance, embedding__isnull=True, searchable_text__isnull=False
-        ).exclude(searchable_text="")
+    pending = getattr(_pending_bumps, "by_alias", None)
+    if pending is None:
+        pending = _pending_bumps.by_alias = weakref.WeakValueDictionary()
 
-        count = events_without_embedding.count()
+    bump = pending.get(connection.alias)
+    if bump is None or bump.done:
+        bump = _DataVersionBump()
+        pending[connection.alias] = bump
+        transaction.on_commit(bump)
+    bump.video_ids.add(instance.video_id)
 
-        if count == 0:
-            logger.info(f"Video {instance.video_id}: embedding 생성할 이벤트 없음")
-            return
 
-        logger.info(
-            f"🧠 Video {instance.video_id}: {count}개 이벤트의 embedding 생성 시작..."
-        )
+class _DataVersionBump:
+    """
+    커밋 시 변경된 비디오들의 data_version을 UPDATE 1회로 증가
 
-        # Bedrock 서비스 초기화
-        from apps.api.services import get_bedrock_service
-        import time
+    강한 참조는 on_commit 콜백 목록에만 있음 → 롤백으로 콜백이 버려지면
+    대기 목록(WeakValueDictionary)에서도 사라져 다음 트랜잭션은 새로 등록
+    """
 
-        bedrock = get_bedrock_service()
+    def __init__(self, video_ids=None):
+        self.video_ids = set(video_ids or ())
+        self.done = False
 
-        success_count = 0
-        fail_count = 0
+    def __call__(self):
+        self.done = True
+        Video.objects.filter(pk__in=self.video_ids).update(
+            data_version=F("data_version") + 1
+        )
 
-        for event in events_without_embedding[:100]:  # 한 번에 최대 100개
-            try:
-                embedding = bedrock.generate_embedding(event.searchable_text)
 
-                if embedding:
-                    # 직접 UPDATE (signal 재발동 방지)
-                    Event.objects.filter(pk=event.pk).update(embedding=embedding)
-                    success_count += 1
-                else:
-                    fail_count += 1
+@receiver(post_save, sender=Video)
+def generate_embeddings_on_video_completed(sender, instance, **kwargs):
+    """
+    Video 분석 완료 시 모든 이벤트의 embedding 생성 작업 시작 (백그라운드)
 
-                # API Rate limit 방지
-                time.sleep(0.1)
+    Video Analysis가 직접 SQL INSERT로 이벤트를 저장하면 Event signal이 발동하지 않으므로,
+    Video의 analysis_status가 'completed'로 변경될 때 비디오 단위로 일괄 처리합니다.
+    - 실제 상태 전환(이전 값 != 'completed')일 때만 실행 - 완료된 비디오의 일반 save는 무시
+    - 요청 스레드에서는 작업 점유만 하고 즉시 반환 (커밋 후 스레드에서 실행)
+    - 같은 비디오 작업이 실행 중이거나, 완료 후 새 이벤트가 없으면 트리거 무시
+    - 진행률: Video.embedding_status / embedding_progress
+    """
+    # 저장된 상태를 다음 save의 이전 값으로 기록
+    previous = getattr(instance, "_loaded_analysis_status", None)
+    instance._loaded_analysis_status = instance.analysis_status
 
-            except Exception as e:
-                fail_count += 1
-                logger.error(f"Event {event.id} embedding 생성 실패: {str(e)}")
+    # analysis_status가 'completed'로 변경되었는지 확인
+    if instance.analysis_status != "completed" or previous == "completed":
+        return
 
-        logger.info(
-            f"✅ Video {instance.video_id} embedding 생성 완료: 성공 {success_count}, 실패 {fail_count}"
-        )
+    # analysis_status를 저장하지 않는 save (요약/통계 갱신 등)는 무시
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "analysis_status" not in update_fields:
+        return
 
-        # 무한 루프 방지 플래그
-        instance._embeddings_generated = True
+    try:
+        from apps.api.services.ai.video_embedding_job import get_video_embedding_job
 
-    except Exception as e:
-        logger.error(f"❌ Video {instance.video_id} embedding 일괄 생성 실패: {str(e)}")
-        import traceback
+        get_video_embedding_job().start(instance.pk)
 
-        traceback.print_exc()
+    except Exception as e:
+        logger.error(f"❌ Video {instance.video_id} embedding 작업 시작 실패: {str(e)}")
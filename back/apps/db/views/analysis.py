@@ -5,7 +5,7 @@ from django.db import transaction
 from datetime import datetime
 import logging
 
-from apps.db.models import DepthData, DisplayData, VideoAnalysis, AnalysisJob
+from apps.db.models import DepthData, DisplayData, VideoAnalysis, AnalysisJob, Video
 from ..serializers import (
     DepthDataSerializer,
     DisplayDataSerializer,
@@ -259,6 +259,47 @@ class AnalysisJobViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=False, methods=["get"], url_path="processing-estimate")
+    def processing_estimate(self, request):
+        """비디오 처리 시간 예측 (인스턴스 타입별 중앙값 + 예측 구간)"""
+        try:
+            video_id = request.query_params.get("video_id")
+            instance_type = request.query_params.get("instance_type")
+
+            if not video_id:
+                return Response(
+                    {"error": "video_id가 필요합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            from apps.api.services import get_processing_time_estimator
+
+            video = Video.objects.get(video_id=video_id)
+            estimator = get_processing_time_estimator()
+            estimate = estimator.estimate_for_video(video, instance_type)
+
+            return Response(
+                {
+                    "video_id": video.video_id,
+                    "estimate": estimate.to_dict(),
+                    "by_instance_type": estimator.message_payload(video)[
+                        "byInstanceType"
+                    ],
+                    "queue_eta": estimator.queue_eta(video),
+                }
+            )
+
+        except Video.DoesNotExist:
+            return Response(
+                {"error": "존재하지 않는 비디오입니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return Response(
+                {"error": f"처리 시간 예측 중 오류가 발생했습니다: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
     @action(detail=False, methods=["post"], url_path="submit-analysis")
     def submit_analysis(self, request):
         """새로운 분석 작업 제출"""
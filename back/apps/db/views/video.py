@@ -8,7 +8,7 @@ from django.conf import settings
 import logging
 
 from apps.db.models import Video, Event
-from apps.api.services import get_video_service
+from apps.api.services import get_video_service, get_processing_time_estimator
 from ..serializers import VideoSerializer
 
 logger = logging.getLogger(__name__)
@@ -270,6 +270,13 @@ class VideoViewSet(viewsets.ModelViewSet):
         try:
             video = self.get_object()
 
+            # 분석 완료까지 예상 남은 시간 (대기열 + 처리, 완료/실패 시 None)
+            try:
+                eta = get_processing_time_estimator().queue_eta(video)
+            except Exception as e:
+                logger.warning(f"⚠️ 분석 ETA 계산 실패: video_id={video.video_id}, {e}")
+                eta = None
+
             return Response(
                 {
                     "video_id": video.video_id,
@@ -277,6 +284,10 @@ class VideoViewSet(viewsets.ModelViewSet):
                     "status": video.analysis_status,
                     "is_completed": video.analysis_status == "completed",
                     "is_failed": video.analysis_status == "failed",
+                    # 분석 완료 후 이벤트 embedding 생성 (검색 가능 여부)
+                    "embedding_status": video.embedding_status,
+                    "embedding_progress": video.embedding_progress,
+                    "eta": eta,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -129,6 +129,13 @@ else:
 # 연결 풀링 설정 (프로덕션 환경용)
 DATABASES['default']['CONN_MAX_AGE'] = env('DB_CONN_MAX_AGE', default=600, cast=int)
 
+# 읽기 전용 복제본 (선택) - Text2SQL 생성 쿼리 실행용
+DATABASE_REPLICA_URL = env('DATABASE_REPLICA_URL', default=None)
+if DATABASE_REPLICA_URL:
+    import dj_database_url
+    DATABASES['replica'] = dj_database_url.parse(DATABASE_REPLICA_URL)
+    DATABASES['replica']['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -187,6 +194,7 @@ AWS_S3_CUSTOM_DOMAIN = env('AWS_S3_CUSTOM_DOMAIN', default=None)
 AWS_RAW_BUCKET_NAME = env('AWS_RAW_BUCKET_NAME', default='capstone-dev-raw')
 AWS_THUMBNAILS_BUCKET_NAME = env('AWS_THUMBNAILS_BUCKET_NAME', default='capstone-dev-thumbnails')
 AWS_HIGHLIGHTS_BUCKET_NAME = env('AWS_HIGHLIGHTS_BUCKET_NAME', default='capstone-dev-highlights')
+S3_WARM_BUCKET = env('S3_WARM_BUCKET', default=AWS_STORAGE_BUCKET_NAME)  # Warm 티어 분석 데이터
 
 # AWS Bedrock 설정
 AWS_BEDROCK_REGION = env('AWS_BEDROCK_REGION', default='ap-northeast-2')
@@ -195,11 +203,24 @@ AWS_BEDROCK_MODEL_ID = env('AWS_BEDROCK_MODEL_ID', default='anthropic.claude-3-5
 AWS_BEDROCK_VLM_MODEL_ID = env('AWS_BEDROCK_VLM_MODEL_ID', default='anthropic.claude-3-5-sonnet-20241022-v2:0')
 AWS_BEDROCK_EMBEDDING_MODEL_ID = env('AWS_BEDROCK_EMBEDDING_MODEL_ID', default='amazon.titan-embed-text-v2:0')
 AWS_BEDROCK_RERANK_MODEL_ID = env('AWS_BEDROCK_RERANK_MODEL_ID', default='cohere.rerank-v3-5:0')
+BEDROCK_PROMPT_CACHE_ENABLED = env('BEDROCK_PROMPT_CACHE_ENABLED', default='true').lower() == 'true'  # Text2SQL 정적 prefix 캐싱
+BEDROCK_PROMPT_CACHE_RETRY_SECONDS = int(env('BEDROCK_PROMPT_CACHE_RETRY_SECONDS', default='3600'))  # cache_control 거부 후 캐싱 재시도까지 대기 (초)
+RERANK_CACHE_ENABLED = env('RERANK_CACHE_ENABLED', default='true').lower() == 'true'  # (질의, 문서) 점수 캐시
+RERANK_CACHE_MAX_SIZE = env('RERANK_CACHE_MAX_SIZE', default=20000, cast=int)
+RERANK_CACHE_TTL = env('RERANK_CACHE_TTL', default=1800, cast=int)  # 초
 
 # AWS SQS 설정
 AWS_SQS_QUEUE_URL = env('AWS_SQS_QUEUE_URL', default='')
 AWS_SQS_REGION = env('AWS_SQS_REGION', default='ap-northeast-2')
 
+# 분석 처리 시간 추정 (완료된 AnalysisJob 기반 인스턴스 타입별 회귀)
+PROCESSING_DEFAULT_INSTANCE_TYPE = env('PROCESSING_DEFAULT_INSTANCE_TYPE', default='g5.xlarge')  # Batch 컴퓨팅 환경 기본 타입
+PROCESSING_ESTIMATOR_MIN_SAMPLES = env('PROCESSING_ESTIMATOR_MIN_SAMPLES', default=8, cast=int)  # 인스턴스 타입별 모델 최소 샘플 수 (부족하면 전체 풀 모델)
+PROCESSING_ESTIMATOR_MAX_SAMPLES = env('PROCESSING_ESTIMATOR_MAX_SAMPLES', default=2000, cast=int)  # 학습에 쓰는 최근 완료 작업 수
+PROCESSING_ESTIMATOR_CONFIDENCE = env('PROCESSING_ESTIMATOR_CONFIDENCE', default=0.9, cast=float)  # 예측 구간 신뢰수준
+PROCESSING_ESTIMATOR_REFIT_SECONDS = env('PROCESSING_ESTIMATOR_REFIT_SECONDS', default=600, cast=int)  # 모델 재학습 주기 (초)
+PROCESSING_QUEUE_CONCURRENCY = env('PROCESSING_QUEUE_CONCURRENCY', default=1, cast=int)  # 동시 처리 작업 수 (Lambda MAX_CONCURRENT_JOBS)
+
 # 파일 저장소 설정 (AWS S3 vs 로컬)
 USE_S3 = bool(AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY and AWS_STORAGE_BUCKET_NAME)
 
@@ -245,6 +266,8 @@ AWS_BEDROCK_MODEL_ID = env('AWS_BEDROCK_MODEL_ID', default='anthropic.claude-3-5
 AWS_BEDROCK_EMBEDDING_MODEL_ID = env('AWS_BEDROCK_EMBEDDING_MODEL_ID', default='amazon.titan-embed-text-v2:0')
 AWS_BEDROCK_KNOWLEDGE_BASE_ID = env('AWS_BEDROCK_KNOWLEDGE_BASE_ID', default=None)
 USE_BEDROCK = env('USE_BEDROCK', default='true').lower() == 'true'
+VLM_VIDEO_INPUT_MODE = env('VLM_VIDEO_INPUT_MODE', default='stream')  # stream: S3 Presigned URL을 OpenCV에 직접 전달 (임시 파일 없음), download: 임시 파일로 다운로드
+VLM_VIDEO_STREAM_URL_EXPIRES = env('VLM_VIDEO_STREAM_URL_EXPIRES', default=3600, cast=int)  # 초
 
 # Video Analysis FastAPI 설정 (ECS Service Discovery DNS)
 VIDEO_ANALYSIS_URL = env('VIDEO_ANALYSIS_URL', default=None)  # 예: http://video-analysis.capstone.local:7000
@@ -253,11 +276,68 @@ VIDEO_ANALYSIS_URL = env('VIDEO_ANALYSIS_URL', default=None)  # 예: http://vide
 USE_HYBRID_SEARCH = env('USE_HYBRID_SEARCH', default='true').lower() == 'true'
 VECTOR_SEARCH_SIMILARITY_THRESHOLD = env('VECTOR_SEARCH_SIMILARITY_THRESHOLD', default=0.3, cast=float)
 HYBRID_SEARCH_LIMIT = env('HYBRID_SEARCH_LIMIT', default=5, cast=int)
+HYBRID_SEARCH_CONCURRENT = env('HYBRID_SEARCH_CONCURRENT', default='true').lower() == 'true'  # Text2SQL/pgvector 병렬 실행
+HYBRID_SEARCH_MAX_WORKERS = env('HYBRID_SEARCH_MAX_WORKERS', default=8, cast=int)  # 검색 스레드풀 크기 (프로세스 공유)
+HYBRID_SEARCH_TEXT2SQL_TIMEOUT = env('HYBRID_SEARCH_TEXT2SQL_TIMEOUT', default=20.0, cast=float)  # Text2SQL 단계 데드라인 (초)
+HYBRID_SEARCH_VECTOR_TIMEOUT = env('HYBRID_SEARCH_VECTOR_TIMEOUT', default=8.0, cast=float)  # pgvector 단계 데드라인 (초)
+HYBRID_SEARCH_RERANKER = env('HYBRID_SEARCH_RERANKER', default='bedrock')  # bedrock: Cohere Rerank, rrf: RRF 순위만 사용 (원격 호출 없음)
+HYBRID_SEARCH_RRF_K = env('HYBRID_SEARCH_RRF_K', default=60, cast=int)
+TEXT2SQL_DB_ALIAS = env('TEXT2SQL_DB_ALIAS', default='replica' if DATABASE_REPLICA_URL else 'default')
+TEXT2SQL_MAX_PLAN_COST = env('TEXT2SQL_MAX_PLAN_COST', default=100000.0, cast=float)  # EXPLAIN Total Cost 상한 (0 = 검사 안 함)
+TEXT2SQL_STATEMENT_TIMEOUT_MS = env('TEXT2SQL_STATEMENT_TIMEOUT_MS', default=5000, cast=int)
+TEXT2SQL_MAX_ROWS = env('TEXT2SQL_MAX_ROWS', default=500, cast=int)  # 서버 사이드 커서 최대 행 수
+TEXT2SQL_FETCH_SIZE = env('TEXT2SQL_FETCH_SIZE', default=100, cast=int)
+ANSWER_CACHE_ENABLED = env('ANSWER_CACHE_ENABLED', default='true').lower() == 'true'  # 유사 질문 답변 재사용
+ANSWER_CACHE_SIMILARITY = env('ANSWER_CACHE_SIMILARITY', default=0.97, cast=float)  # 적중 최소 코사인 유사도
+ANSWER_CACHE_TTL = env('ANSWER_CACHE_TTL', default=86400, cast=int)  # 재사용할 이전 답변 최대 경과 시간 (초)
+RAG_SEARCH_MIN_SIMILARITY = env('RAG_SEARCH_MIN_SIMILARITY', default=0.7, cast=float)  # Hot 분석 결과 최소 코사인 유사도
+RAG_MATRIX_CACHE_SIZE = env('RAG_MATRIX_CACHE_SIZE', default=32, cast=int)  # 메모리에 유지할 비디오별 임베딩 행렬 수
+RAG_WARM_MAX_WORKERS = env('RAG_WARM_MAX_WORKERS', default=8, cast=int)  # Warm S3 병렬 로드 스레드 수
+RAG_WARM_CACHE_SIZE = env('RAG_WARM_CACHE_SIZE', default=1024, cast=int)
+RAG_WARM_CACHE_TTL = env('RAG_WARM_CACHE_TTL', default=600, cast=int)
+LEXICAL_SEARCH_ENABLED = env('LEXICAL_SEARCH_ENABLED', default='true').lower() == 'true'  # 비디오별 BM25 검색
+LEXICAL_SEARCH_MAX_VIDEOS = env('LEXICAL_SEARCH_MAX_VIDEOS', default=64, cast=int)  # 메모리에 유지할 BM25 인덱스 수
 
 # 벡터 검색 설정
 VECTOR_DIMENSION = env('VECTOR_DIMENSION', default=1024, cast=int)  # Titan Embed v2 (1024D Matryoshka)
 VECTOR_SIMILARITY_THRESHOLD = env('VECTOR_SIMILARITY_THRESHOLD', default=0.8, cast=float)
 VECTOR_SEARCH_LIMIT = env('VECTOR_SEARCH_LIMIT', default=10, cast=int)
+VECTOR_HNSW_EF_SEARCH = env('VECTOR_HNSW_EF_SEARCH', default=100, cast=int)  # HNSW 쿼리 탐색 후보 수 (≥ LIMIT)
+VECTOR_IVFFLAT_PROBES = env('VECTOR_IVFFLAT_PROBES', default=10, cast=int)  # IVFFlat 사용 시 탐색 리스트 수
+VECTOR_QUANTIZATION = env('VECTOR_QUANTIZATION', default='none')  # none | halfvec | binary (1차 ANN 검색 양자화)
+VECTOR_RESCORE_FACTOR = env('VECTOR_RESCORE_FACTOR', default=4, cast=int)  # 양자화 1차 후보 배수 (LIMIT × factor → float32 재채점)
+
+# 이벤트 윈도잉(Rerank 컨텍스트) 캐시 설정
+EVENT_WINDOW_CACHE_SIZE = env('EVENT_WINDOW_CACHE_SIZE', default=10000, cast=int)
+EVENT_WINDOW_CACHE_TTL = env('EVENT_WINDOW_CACHE_TTL', default=600, cast=int)  # 초
+
+# 임베딩 캐시 설정 (L1: 프로세스 LRU, L2: PostgreSQL db_embeddingcache)
+EMBEDDING_CACHE_ENABLED = env('EMBEDDING_CACHE_ENABLED', default='true').lower() == 'true'
+EMBEDDING_CACHE_MAX_SIZE = env('EMBEDDING_CACHE_MAX_SIZE', default=2048, cast=int)  # L1 최대 엔트리 수
+EMBEDDING_CACHE_TTL = env('EMBEDDING_CACHE_TTL', default=3600, cast=int)  # L1 TTL (초)
+EMBEDDING_CACHE_DB_ENABLED = env('EMBEDDING_CACHE_DB_ENABLED', default='true').lower() == 'true'
+EMBEDDING_CACHE_DB_TTL = env('EMBEDDING_CACHE_DB_TTL', default=30 * 24 * 3600, cast=int)  # L2 TTL (초, 마지막 접근 기준)
+EMBEDDING_CACHE_DB_MAX_ROWS = env('EMBEDDING_CACHE_DB_MAX_ROWS', default=100000, cast=int)
+EMBEDDING_CACHE_PINNED_TTL = env('EMBEDDING_CACHE_PINNED_TTL', default=180 * 24 * 3600, cast=int)  # 고정(Event 저장소) 엔트리 TTL (초, 마지막 접근 기준)
+EMBEDDING_CACHE_DB_PRUNE_INTERVAL = env('EMBEDDING_CACHE_DB_PRUNE_INTERVAL', default=500, cast=int)  # N회 저장마다 L2 정리
+
+# Embedding 일괄 생성(backfill) 설정 - RATE는 Bedrock Titan 계정 할당량(초당 요청 수) 이하로
+EMBEDDING_BACKFILL_WORKERS = env('EMBEDDING_BACKFILL_WORKERS', default=8, cast=int)  # Bedrock 동시 호출 스레드 수
+EMBEDDING_BACKFILL_RATE = env('EMBEDDING_BACKFILL_RATE', default=50.0, cast=float)  # 초당 최대 요청 수 (토큰 버킷)
+EMBEDDING_BACKFILL_CHUNK_SIZE = env('EMBEDDING_BACKFILL_CHUNK_SIZE', default=200, cast=int)  # 조회/bulk_update 청크 크기
+EMBEDDING_BACKFILL_MAX_RETRIES = env('EMBEDDING_BACKFILL_MAX_RETRIES', default=5, cast=int)  # throttling 재시도 횟수
+EMBEDDING_BACKFILL_MAX_BACKOFF = env('EMBEDDING_BACKFILL_MAX_BACKOFF', default=30.0, cast=float)  # 최대 백오프 (초)
+
+# Embedding 아웃박스 (Event 저장 시 Bedrock 호출 대신 대기열 기록 → 백그라운드 일괄 처리)
+EMBEDDING_OUTBOX_AUTO_DRAIN = env('EMBEDDING_OUTBOX_AUTO_DRAIN', default='true').lower() == 'true'  # 커밋 후 프로세스 내 스레드로 처리
+EMBEDDING_OUTBOX_BATCH_SIZE = env('EMBEDDING_OUTBOX_BATCH_SIZE', default=100, cast=int)
+EMBEDDING_OUTBOX_MAX_ATTEMPTS = env('EMBEDDING_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMBEDDING_OUTBOX_LEASE_SECONDS = env('EMBEDDING_OUTBOX_LEASE_SECONDS', default=300, cast=int)  # 점유 후 미완료 시 재처리까지 (초)
+VIDEO_EMBEDDING_JOB_STALE_SECONDS = env('VIDEO_EMBEDDING_JOB_STALE_SECONDS', default=900, cast=int)  # 비디오 embedding 작업 heartbeat 만료 (초, 이후 재실행 허용)
+
+# Embedding 모델 교체 (재임베딩 계획/실행: manage.py reembed)
+EMBEDDING_PRICE_PER_1K_TOKENS = env('EMBEDDING_PRICE_PER_1K_TOKENS', default=0.00002, cast=float)  # USD (Titan v2 기준)
+EMBEDDING_CHARS_PER_TOKEN = env('EMBEDDING_CHARS_PER_TOKEN', default=4.0, cast=float)  # 토큰 수 추정용
 
 # Django REST Framework 설정
 REST_FRAMEWORK = {
@@ -18,18 +18,48 @@ if [ -z "$VIDEO_ID" ] || [ -z "$S3_BUCKET" ] || [ -z "$S3_KEY" ]; then
     exit 1
 fi
 
-# Download video from S3
-echo "Downloading video from S3: s3://${S3_BUCKET}/${S3_KEY}"
-INPUT_VIDEO="/workspace/videos/video_${VIDEO_ID}.mp4"
-aws s3 cp "s3://${S3_BUCKET}/${S3_KEY}" "${INPUT_VIDEO}"
-
-if [ ! -f "${INPUT_VIDEO}" ]; then
-    echo "ERROR: Failed to download video from S3"
-    exit 1
+# 처리 시간 측정 시작 (입력 준비 + 분석, processing_estimate.py로 db_analysisjob에 기록)
+STARTED_AT=$(date +%s)
+
+# Prepare video input (VIDEO_INPUT_MODE, s3_stream.py)
+#   download: 전체 다운로드 후 분석 (기본)
+#   stream:   Presigned URL을 디코더에 직접 전달 (HTTP Range로 필요한 구간만 읽음, 디스크 사용 없음)
+#             URL 유효 시간 S3_STREAM_URL_EXPIRES (기본 3600초 = Batch 작업 기본 타임아웃)
+#   pipe:     이전 설정 호환용 → stream
+VIDEO_INPUT_MODE="${VIDEO_INPUT_MODE:-download}"
+S3_URI="s3://${S3_BUCKET}/${S3_KEY}"
+INPUT_VIDEO=""
+
+# 종료 시 정리 (set -e로 중간에 실패해도 실행)
+cleanup() {
+    if [ "${VIDEO_INPUT_MODE}" = "download" ] && [ -n "${INPUT_VIDEO}" ]; then
+        echo "Cleaning up temporary files..."
+        rm -f "${INPUT_VIDEO}" "${INPUT_VIDEO}.part" "${INPUT_VIDEO}.part.json"
+    fi
+}
+trap cleanup EXIT
+
+if [ "${VIDEO_INPUT_MODE}" = "pipe" ]; then
+    VIDEO_INPUT_MODE="stream"
 fi
 
-echo "Video downloaded successfully: ${INPUT_VIDEO}"
-echo "File size: $(du -h ${INPUT_VIDEO} | cut -f1)"
+if [ "${VIDEO_INPUT_MODE}" = "stream" ]; then
+    echo "Streaming video directly from S3: ${S3_URI}"
+    INPUT_VIDEO=$(python3 /workspace/s3_stream.py url "${S3_URI}")
+else
+    echo "Downloading video from S3: ${S3_URI}"
+    INPUT_VIDEO="/workspace/videos/video_${VIDEO_ID}.mp4"
+    # 병렬 Range GET + 이어받기 + ETag/체크섬 검증 (s3_downloader.py)
+    python3 /workspace/s3_downloader.py "${S3_URI}" "${INPUT_VIDEO}"
+
+    if [ ! -f "${INPUT_VIDEO}" ]; then
+        echo "ERROR: Failed to download video from S3"
+        exit 1
+    fi
+
+    echo "Video downloaded successfully: ${INPUT_VIDEO}"
+    echo "File size: $(du -h ${INPUT_VIDEO} | cut -f1)"
+fi
 
 # Create output directory
 OUTPUT_DIR="/workspace/output/video_${VIDEO_ID}"
@@ -70,9 +100,12 @@ python3 video-analysis/run.py \
     --vlm-path "${VLM_PATH:-/workspace/checkpoints/llava-fastvithd_0.5b_stage2}" \
     --device "${DEVICE:-cuda:0}" \
     --with-persons \
-    --draw
+    --draw \
+    && EXIT_CODE=0 || EXIT_CODE=$?
 
-EXIT_CODE=$?
+# 실제 처리 시간 기록 (처리 시간 추정 모델 학습 샘플, 기록 실패는 무시)
+if [ $EXIT_CODE -eq 0 ]; then JOB_RESULT="succeeded"; else JOB_RESULT="failed"; fi
+python3 /workspace/processing_estimate.py record "${VIDEO_ID_NUM}" "${STARTED_AT}" "${JOB_RESULT}" || true
 
 if [ $EXIT_CODE -eq 0 ]; then
     echo "====================================="
@@ -86,9 +119,7 @@ else
     exit $EXIT_CODE
 fi
 
-# Cleanup
-echo "Cleaning up temporary files..."
-rm -f "${INPUT_VIDEO}"
+# Cleanup: trap cleanup EXIT
 
 echo "Batch job completed successfully!"
 exit 0
@@ -11,8 +11,7 @@ import sys
 import subprocess
 from datetime import datetime
 
-import boto3
-from botocore.exceptions import ClientError
+from s3_downloader import S3DownloadError, get_s3_downloader
 
 # 로깅 설정
 logging.basicConfig(
@@ -24,18 +23,22 @@ logger = logging.getLogger(__name__)
 
 
 def download_from_s3(bucket: str, key: str, local_path: str, region: str = 'ap-northeast-2'):
-    """S3에서 파일 다운로드"""
+    """S3에서 파일 다운로드 (병렬 Range GET, 실패 시 이어받기, ETag/체크섬 검증)"""
+    downloader = get_s3_downloader(region)
     try:
         logger.info(f"📥 Downloading s3://{bucket}/{key} to {local_path}")
         
-        s3_client = boto3.client('s3', region_name=region)
-        s3_client.download_file(bucket, key, local_path)
+        result = downloader.download(bucket, key, local_path)
         
-        logger.info(f"✅ Download complete: {local_path}")
+        logger.info(
+            f"✅ Download complete: {local_path} "
+            f"({result.size_bytes / (1024 * 1024):.1f} MB, {result.throughput_mbps:.1f} MB/s)"
+        )
         return True
         
-    except ClientError as e:
+    except S3DownloadError as e:
         logger.error(f"❌ S3 download failed: {e}")
+        downloader.discard_partial(local_path)
         return False
 
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+처리 시간 추정치 소비 + 실측 기록 (Batch / EC2 GPU 워커 공용)
+
+Backend가 업로드 시 SQS 메시지에 싣는 추정치 (ProcessingTimeEstimator.message_payload):
+    "estimate": {
+        "seconds": 540, "lowerSeconds": 380, "upperSeconds": 820,
+        "confidence": 0.9, "instanceType": "g5.xlarge", "model": "instance", "samples": 23,
+        "byInstanceType": {"g5.xlarge": {"seconds": ..., "lowerSeconds": ..., "upperSeconds": ...}}
+    }
+→ 실행 중인 인스턴스 타입의 예측 구간 상한으로 가시성 타임아웃 계산
+→ 처리가 끝나면 실제 처리 시간을 db_analysisjob에 기록 (다음 학습 샘플)
+
+사용법 (CLI, entrypoint.sh):
+    python processing_estimate.py record <video_id> <시작 epoch 초> succeeded|failed
+
+환경 변수:
+    INSTANCE_TYPE                 인스턴스 타입 (없으면 EC2 메타데이터 조회)
+    PROCESSING_TIMEOUT_MARGIN     예측 구간 상한 대비 여유 배율 (기본 1.5)
+    PROCESSING_MIN_TIMEOUT        타임아웃 하한 (초, 기본 900)
+    PROCESSING_MAX_TIMEOUT        타임아웃 상한 (초, 기본 43200 = SQS 가시성 최대값)
+    POSTGRES_HOST / PORT / DB / USER / PASSWORD   기록용 DB 연결
+    AWS_BATCH_JOB_ID / AWS_BATCH_JQ_NAME          Batch가 주입하는 작업 ID / 큐 이름
+"""
+
+import os
+import sys
+import logging
+import urllib.request
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_MARGIN = float(os.environ.get('PROCESSING_TIMEOUT_MARGIN', '1.5'))
+MIN_TIMEOUT = int(os.environ.get('PROCESSING_MIN_TIMEOUT', '900'))
+MAX_TIMEOUT = int(os.environ.get('PROCESSING_MAX_TIMEOUT', '43200'))
+
+IMDS_URL = 'http://169.254.169.254/latest'
+IMDS_TIMEOUT = 1.0  # EC2가 아니면 바로 포기
+
+
+@lru_cache(maxsize=1)
+def detect_instance_type() -> str:
+    """실행 중인 인스턴스 타입 (INSTANCE_TYPE → EC2 메타데이터 IMDSv2, 확인 불가 시 '')"""
+    instance_type = os.environ.get('INSTANCE_TYPE')
+    if instance_type:
+        return instance_type
+
+    try:
+        token_request = urllib.request.Request(
+            f'{IMDS_URL}/api/token',
+            method='PUT',
+            headers={'X-aws-ec2-metadata-token-ttl-seconds': '60'},
+        )
+        with urllib.request.urlopen(token_request, timeout=IMDS_TIMEOUT) as response:
+            token = response.read().decode()
+
+        request = urllib.request.Request(
+            f'{IMDS_URL}/meta-data/instance-type',
+            headers={'X-aws-ec2-metadata-token': token},
+        )
+        with urllib.request.urlopen(request, timeout=IMDS_TIMEOUT) as response:
+            return response.read().decode().strip()
+    except Exception as e:
+        logger.debug(f"인스턴스 타입 조회 실패: {e}")
+        return ''
+
+
+def select_estimate(estimate: Optional[Dict[str, Any]], instance_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    메시지 추정치에서 인스턴스 타입에 맞는 예측 선택
+
+    Args:
+        estimate: SQS 메시지의 estimate 필드
+        instance_type: 실행 인스턴스 타입 (없으면 자동 감지, 모델이 없으면 기본 타입 예측)
+
+    Returns:
+        {'seconds', 'lowerSeconds', 'upperSeconds'} 또는 None (추정치 없음)
+    """
+    if not isinstance(estimate, dict) or not estimate.get('upperSeconds'):
+        return None
+
+    instance_type = instance_type or detect_instance_type()
+    by_type = estimate.get('byInstanceType') or {}
+    return by_type.get(instance_type) or estimate
+
+
+def timeout_from_estimate(
+    estimate: Optional[Dict[str, Any]],
+    instance_type: Optional[str] = None,
+    default: Optional[int] = None,
+) -> Optional[int]:
+    """
+    예측 구간 상한 × 여유 배율 → 타임아웃 (초, MIN_TIMEOUT ~ MAX_TIMEOUT)
+
+    Returns:
+        타임아웃 (추정치가 없으면 default)
+    """
+    selected = select_estimate(estimate, instance_type)
+    if not selected:
+        return default
+
+    timeout = int(selected['upperSeconds'] * TIMEOUT_MARGIN)
+    return max(MIN_TIMEOUT, min(MAX_TIMEOUT, timeout))
+
+
+def record_analysis_job(
+    connection,
+    video_id: int,
+    job_id: str,
+    started_at: datetime,
+    completed_at: datetime,
+    succeeded: bool,
+    instance_type: Optional[str] = None,
+    job_name: str = '',
+    job_queue: str = '',
+    job_definition: str = '',
+    error_message: str = '',
+):
+    """
+    실제 처리 시간을 db_analysisjob에 기록 (Django 없이 직접 SQL, 비디오 특성은 db_video에서 스냅샷)
+
+    같은 job_id면 갱신 (Batch 재시도)
+
+    Args:
+        connection: psycopg2 연결
+        started_at / completed_at: 처리 시작/종료 시각 (UTC aware)
+    """
+    instance_type = instance_type if instance_type is not None else detect_instance_type()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO db_analysisjob (
+                video_id, job_id, job_name, job_queue, job_definition, status,
+                analysis_types, result_s3_key, log_s3_key, error_message,
+                instance_type, video_duration, video_width, video_height, video_fps, video_file_size,
+                created_at, started_at, completed_at
+            )
+            SELECT
+                v.video_id, %(job_id)s, %(job_name)s, %(job_queue)s, %(job_definition)s, %(status)s,
+                '{}', '', '', %(error_message)s,
+                %(instance_type)s, v.duration, COALESCE(v.resolution_width, v.width),
+                COALESCE(v.resolution_height, v.height), COALESCE(v.fps, v.frame_rate), v.file_size,
+                NOW(), %(started_at)s, %(completed_at)s
+            FROM db_video v
+            WHERE v.video_id = %(video_id)s
+            ON CONFLICT (job_id) DO UPDATE SET
+                status = EXCLUDED.status,
+                error_message = EXCLUDED.error_message,
+                instance_type = EXCLUDED.instance_type,
+                video_duration = EXCLUDED.video_duration,
+                video_width = EXCLUDED.video_width,
+                video_height = EXCLUDED.video_height,
+                video_fps = EXCLUDED.video_fps,
+                video_file_size = EXCLUDED.video_file_size,
+                started_at = EXCLUDED.started_at,
+                completed_at = EXCLUDED.completed_at
+            """,
+            {
+                'video_id': video_id,
+                'job_id': job_id,
+                'job_name': job_name or f'video-process-{video_id}',
+                'job_queue': job_queue,
+                'job_definition': job_definition,
+                'status': 'succeeded' if succeeded else 'failed',
+                'error_message': error_message,
+                'instance_type': instance_type,
+                'started_at': started_at,
+                'completed_at': completed_at,
+            },
+        )
+    connection.commit()
+
+    logger.info(
+        f"처리 시간 기록: video_id={video_id}, {(completed_at - started_at).total_seconds():.0f}초 "
+        f"({instance_type or 'unknown'}, {'succeeded' if succeeded else 'failed'})"
+    )
+
+
+def record_batch_job(video_id: int, started_at: datetime, succeeded: bool, error_message: str = ''):
+    """
+    현재 Batch 작업의 처리 시간 기록 (POSTGRES_* 환경 변수로 연결)
+
+    기록 실패는 경고만 남김 (분석 결과에 영향 없음)
+    """
+    try:
+        import psycopg2
+
+        connection = psycopg2.connect(
+            host=os.environ.get('POSTGRES_HOST'),
+            port=os.environ.get('POSTGRES_PORT', '5432'),
+            dbname=os.environ.get('POSTGRES_DB'),
+            user=os.environ.get('POSTGRES_USER'),
+            password=os.environ.get('POSTGRES_PASSWORD'),
+            connect_timeout=10,
+        )
+        try:
+            record_analysis_job(
+                connection,
+                video_id,
+                job_id=os.environ.get('AWS_BATCH_JOB_ID') or f"local-{video_id}-{int(started_at.timestamp())}",
+                started_at=started_at,
+                completed_at=datetime.now(timezone.utc),
+                succeeded=succeeded,
+                job_queue=os.environ.get('AWS_BATCH_JQ_NAME', ''),
+                job_definition=os.environ.get('BATCH_JOB_DEFINITION', ''),
+                error_message=error_message,
+            )
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.warning(f"처리 시간 기록 실패: video_id={video_id}, {e}")
+
+
+def main(argv=None) -> int:
+    argv = argv if argv is not None else sys.argv[1:]
+    if len(argv) != 4 or argv[0] != 'record' or argv[3] not in ('succeeded', 'failed'):
+        print(
+            "Usage: processing_estimate.py record <video_id> <started_epoch> succeeded|failed",
+            file=sys.stderr,
+        )
+        return 2
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    started_at = datetime.fromtimestamp(int(argv[2]), tz=timezone.utc)
+    record_batch_job(int(argv[1]), started_at, argv[3] == 'succeeded')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
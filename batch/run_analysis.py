@@ -10,12 +10,18 @@ import sys
 import logging
 import subprocess
 import tempfile
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, Optional, Union
 from pathlib import Path
 
 import boto3
 from botocore.exceptions import ClientError
 
+from s3_downloader import S3DownloadError, S3Downloader
+from s3_stream import INPUT_MODES, VIDEO_INPUT_MODE, S3StreamError, open_video_stream, redact_url
+from processing_estimate import detect_instance_type, record_batch_job, timeout_from_estimate
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +30,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 수신 시 가시성 타임아웃 (메시지에 처리 시간 추정치가 있으면 파싱 후 예측 기반으로 재설정)
+DEFAULT_VISIBILITY_TIMEOUT = int(os.environ.get('SQS_VISIBILITY_TIMEOUT', '3600'))
+
 
 class VideoAnalysisProcessorError(Exception):
     """비디오 처리 중 발생하는 커스텀 예외"""
@@ -52,6 +61,9 @@ class VideoAnalysisProcessor:
         self.vlm_path = os.environ.get('VLM_PATH', '/workspace/checkpoints/llava-fastvithd_0.5b_stage2')
         self.device = os.environ.get('DEVICE', 'cuda:0')
         
+        # 비디오 입력 모드 (download: 전체 다운로드 / stream: S3에서 바로 디코딩, s3_stream.py)
+        self.video_input_mode = VIDEO_INPUT_MODE
+        
         # PostgreSQL 설정 (video-analysis run.py가 사용)
         self.postgres_host = os.environ.get('POSTGRES_HOST')
         self.postgres_port = os.environ.get('POSTGRES_PORT', '5432')
@@ -64,7 +76,9 @@ class VideoAnalysisProcessor:
         
         # AWS 클라이언트 초기화
         self.sqs_client = boto3.client('sqs', region_name=self.aws_region)
-        self.s3_client = boto3.client('s3', region_name=self.aws_region)
+        # S3 다운로드: 병렬 Range GET 전용 클라이언트 (동시성에 맞는 커넥션 풀)
+        self.downloader = S3Downloader(region=self.aws_region)
+        self.s3_client = self.downloader.s3_client
         
         # 작업 디렉토리 설정
         self.work_dir = Path('/workspace')
@@ -108,6 +122,11 @@ class VideoAnalysisProcessor:
                 f"Missing required environment variables: {', '.join(missing_vars)}"
             )
         
+        if self.video_input_mode not in INPUT_MODES:
+            raise VideoAnalysisProcessorError(
+                f"Invalid VIDEO_INPUT_MODE: {self.video_input_mode} (expected one of {', '.join(INPUT_MODES)})"
+            )
+        
         # POSTGRES_PASSWORD가 없으면 경고만 출력 (Secrets Manager가 주입할 수 있음)
         if not self.postgres_password:
             logger.warning("POSTGRES_PASSWORD not found in environment - will be injected by Secrets Manager")
@@ -121,7 +140,7 @@ class VideoAnalysisProcessor:
                 QueueUrl=self.sqs_queue_url,
                 MaxNumberOfMessages=1,
                 WaitTimeSeconds=20,  # Long polling
-                VisibilityTimeout=3600,  # 60분 (AI 분석은 오래 걸림)
+                VisibilityTimeout=DEFAULT_VISIBILITY_TIMEOUT,
                 MessageAttributeNames=['All']
             )
             
@@ -168,7 +187,8 @@ class VideoAnalysisProcessor:
                 'key': key,
                 'video_id': video_id,
                 'event_time': event_time,
-                'size': s3_info['object'].get('size', 0)
+                'size': s3_info['object'].get('size', 0),
+                'estimate': body.get('estimate')  # Backend 처리 시간 추정치 (있을 때만)
             }
             
         except (json.JSONDecodeError, KeyError) as e:
@@ -189,27 +209,62 @@ class VideoAnalysisProcessor:
             raise VideoAnalysisProcessorError(f"Video ID extraction error: {e}")
     
     def download_video_from_s3(self, bucket: str, key: str) -> Path:
-        """S3에서 비디오 다운로드"""
+        """S3에서 비디오 다운로드 (병렬 Range GET, 실패 시 이어받기, ETag/체크섬 검증)"""
+        # 로컬 파일 경로 생성
+        local_filename = Path(key).name
+        local_path = self.videos_dir / local_filename
+        
         try:
-            # 로컬 파일 경로 생성
-            local_filename = Path(key).name
-            local_path = self.videos_dir / local_filename
-            
             logger.info(f"Downloading s3://{bucket}/{key} -> {local_path}")
             
             # S3에서 다운로드
-            self.s3_client.download_file(bucket, key, str(local_path))
+            result = self.downloader.download(bucket, key, str(local_path))
             
-            file_size = local_path.stat().st_size / (1024 * 1024)  # MB
-            logger.info(f"Downloaded {file_size:.2f} MB")
+            logger.info(
+                f"Downloaded {result.size_bytes / (1024 * 1024):.2f} MB "
+                f"in {result.elapsed_seconds:.1f}s ({result.throughput_mbps:.1f} MB/s, "
+                f"parts={result.parts}, resumed={result.resumed_parts}, "
+                f"verified={result.verified_by or 'none'})"
+            )
             
             return local_path
             
-        except ClientError as e:
+        except S3DownloadError as e:
             logger.error(f"Error downloading from S3: {e}")
+            self.downloader.discard_partial(str(local_path))
             raise VideoAnalysisProcessorError(f"S3 download error: {e}")
     
-    def run_video_analysis(self, video_path: Path, video_id: int, output_dir: Path) -> bool:
+    @contextmanager
+    def open_video_input(
+        self, bucket: str, key: str, estimate: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Union[Path, str]]:
+        """
+        분석 입력 준비 (VIDEO_INPUT_MODE에 따라 로컬 파일 / Presigned URL)
+        
+        stream 모드는 전체 파일을 받기 전에 분석을 시작하고 로컬 디스크를 거의 쓰지 않음
+        (Presigned URL 유효 시간 = 처리 시간 추정 타임아웃, 추정치가 없으면 S3_STREAM_URL_EXPIRES)
+        """
+        if self.video_input_mode == 'download':
+            video_path = self.download_video_from_s3(bucket, key)
+            try:
+                yield video_path
+            finally:
+                self.cleanup(video_path)
+            return
+        
+        try:
+            with open_video_stream(
+                bucket,
+                key,
+                s3_client=self.s3_client,
+                expires_in=timeout_from_estimate(estimate),
+            ) as video_source:
+                yield video_source
+        except (S3StreamError, ClientError) as e:
+            logger.error(f"Error streaming from S3: {e}")
+            raise VideoAnalysisProcessorError(f"S3 stream error: {e}")
+    
+    def run_video_analysis(self, video_path: Union[Path, str], video_id: int, output_dir: Path) -> bool:
         """
         Video Analysis AI 분석 실행
         
@@ -247,7 +302,8 @@ class VideoAnalysisProcessor:
                 # --draw 플래그 제거: 비디오 생성하지 않음 (데이터만 처리)
             ]
             
-            logger.info(f"Executing: {' '.join(cmd)}")
+            # Presigned URL 서명은 로그에 남기지 않음
+            logger.info(f"Executing: {' '.join(redact_url(arg) for arg in cmd)}")
             
             # 환경 변수 설정 (PostgreSQL)
             env = os.environ.copy()
@@ -291,6 +347,27 @@ class VideoAnalysisProcessor:
             logger.exception("Full traceback:")
             return False
     
+    def apply_visibility_timeout(self, message: Dict[str, Any], estimate: Optional[Dict[str, Any]]):
+        """처리 시간 예측 구간 상한 기준으로 가시성 타임아웃 재설정 (추정치가 없으면 수신 시 값 유지)"""
+        receipt_handle = message.get('ReceiptHandle')
+        timeout = timeout_from_estimate(estimate)
+        if not timeout or not receipt_handle or receipt_handle == 'N/A':
+            return
+
+        try:
+            self.sqs_client.change_message_visibility(
+                QueueUrl=self.sqs_queue_url,
+                ReceiptHandle=receipt_handle,
+                VisibilityTimeout=timeout
+            )
+            logger.info(f"Visibility timeout set from estimate: {timeout}s (instance={detect_instance_type() or 'unknown'})")
+        except ClientError as e:
+            logger.warning(f"Failed to set visibility timeout from estimate: {e}")
+    
+    def record_processing_time(self, video_id: int, started_at: datetime, succeeded: bool):
+        """실제 처리 시간을 db_analysisjob에 기록 (처리 시간 추정 모델 학습 샘플, 실패해도 처리 결과에 영향 없음)"""
+        record_batch_job(video_id, started_at, succeeded)
+    
     def delete_message(self, message: Dict[str, Any]):
         """처리 완료된 메시지를 SQS에서 삭제"""
         try:
@@ -321,46 +398,46 @@ class VideoAnalysisProcessor:
     def process_message(self, message: Dict[str, Any]) -> bool:
         """
         단일 메시지 처리 파이프라인
-        1. S3 이벤트 파싱
-        2. S3에서 비디오 다운로드
-        3. Video Analysis AI 분석 실행 (PostgreSQL + pgvector에 저장)
+        1. S3 이벤트 파싱 (처리 시간 추정치가 있으면 가시성 타임아웃 재설정)
+        2. 출력 디렉토리 생성
+        3. 비디오 입력 준비 (VIDEO_INPUT_MODE: 다운로드 / S3 스트리밍) 후
+           Video Analysis AI 분석 실행 (PostgreSQL + pgvector에 저장), 임시 파일 정리,
+           실제 처리 시간을 db_analysisjob에 기록
         4. SQS 메시지 삭제
-        5. 임시 파일 정리
         """
-        video_path = None
-        
         try:
             logger.info("=" * 80)
             logger.info("Starting Video Processing Pipeline")
             logger.info("=" * 80)
             
-            # 1. S3 이벤트 파싱
+            # 1. S3 이벤트 파싱 (+ 처리 시간 추정치로 가시성 타임아웃 재설정)
             s3_event = self.parse_s3_event(message)
             video_id = s3_event['video_id']
+            self.apply_visibility_timeout(message, s3_event['estimate'])
             
-            # 2. S3에서 비디오 다운로드
-            video_path = self.download_video_from_s3(
-                s3_event['bucket'],
-                s3_event['key']
-            )
-            
-            # 3. 출력 디렉토리 생성
+            # 2. 출력 디렉토리 생성
             output_dir = self.results_dir / f"video_{video_id}"
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # 4. Video Analysis AI 분석 실행
-            success = self.run_video_analysis(video_path, video_id, output_dir)
+            # 3. 비디오 입력 준비 (다운로드 / S3 스트리밍) + Video Analysis AI 분석 실행
+            # (종료 시 다운로드 파일 정리 - 실패 시에도)
+            started_at = datetime.now(timezone.utc)
+            success = False
+            try:
+                with self.open_video_input(
+                    s3_event['bucket'], s3_event['key'], s3_event['estimate']
+                ) as video_source:
+                    success = self.run_video_analysis(video_source, video_id, output_dir)
+            finally:
+                self.record_processing_time(video_id, started_at, success)
             
             if not success:
                 logger.error("Video analysis failed")
                 return False
             
-            # 5. 성공한 메시지 삭제
+            # 4. 성공한 메시지 삭제
             self.delete_message(message)
             
-            # 6. 임시 파일 정리
-            self.cleanup(video_path)
-            
             logger.info("=" * 80)
             logger.info("Video Processing Pipeline Completed Successfully")
             logger.info("=" * 80)
@@ -375,11 +452,6 @@ class VideoAnalysisProcessor:
             logger.error(f"Unexpected error during processing: {e}")
             logger.exception("Full traceback:")
             return False
-        
-        finally:
-            # 실패 시에도 임시 파일 정리
-            if video_path and video_path.exists():
-                self.cleanup(video_path)
     
     def run(self):
         """메인 실행 루프"""
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+병렬 Range GET S3 다운로더 (Batch 컨테이너 / GPU 워커 공용)
+
+- 객체를 part_size 단위로 나눠 max_concurrency개 스레드가 동시에 Range GET
+  (단일 스트림 속도가 아니라 NIC 대역폭까지 사용)
+- <경로>.part 파일에 오프셋 단위로 기록하고 완료된 파트는 <경로>.part.json에 기록
+  → 재시도 시 ETag가 같으면 완료된 파트는 건너뛰고 이어받기
+- 모든 Range GET에 If-Match(ETag) → 다운로드 도중 객체가 바뀌면 처음부터 다시
+- 완료 후 무결성 검증: 전체 객체 체크섬(SHA256 / SHA1 / CRC32) 우선, 없으면 ETag(MD5)
+- 전송량 / 소요 시간 / 처리량(MB/s) 지표 반환
+
+사용법 (CLI):
+    python s3_downloader.py s3://bucket/videos/1/original.mp4 /workspace/videos/video_1.mp4
+
+환경 변수:
+    S3_DOWNLOAD_PART_SIZE_MB   파트 크기 (기본 16MB)
+    S3_DOWNLOAD_CONCURRENCY    동시 Range GET 수 (기본 16)
+    S3_DOWNLOAD_MAX_ATTEMPTS   전체 / 파트별 최대 시도 횟수 (기본 3)
+    S3_DOWNLOAD_VERIFY         무결성 검증 여부 (기본 true)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import zlib
+import base64
+import struct
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+PART_SIZE_MB = int(os.environ.get('S3_DOWNLOAD_PART_SIZE_MB', '16'))
+MAX_CONCURRENCY = int(os.environ.get('S3_DOWNLOAD_CONCURRENCY', '16'))
+MAX_ATTEMPTS = int(os.environ.get('S3_DOWNLOAD_MAX_ATTEMPTS', '3'))
+VERIFY = os.environ.get('S3_DOWNLOAD_VERIFY', 'true').lower() == 'true'
+
+READ_CHUNK = MB  # 응답 스트림 / 검증 시 읽기 단위
+# 멀티파트 ETag 검증 시 시도할 업로드 파트 크기 (AWS CLI / SDK / 콘솔 기본값)
+UPLOAD_PART_SIZE_CANDIDATES_MB = (8, 5, 16, 10, 15, 25, 50, 64, 100, 128)
+# 재시도해도 소용없는 오류
+NON_RETRYABLE_ERRORS = {'NoSuchKey', 'NoSuchBucket', 'AccessDenied', '403', '404'}
+
+
+class S3DownloadError(Exception):
+    """S3 다운로드 실패 (재시도 소진 / 재시도 불가 오류)"""
+
+
+class S3IntegrityError(S3DownloadError):
+    """다운로드한 파일이 ETag / 체크섬과 일치하지 않음"""
+
+
+class _ObjectChanged(Exception):
+    """다운로드 도중 객체가 교체됨 (If-Match 실패)"""
+
+
+@dataclass
+class DownloadResult:
+    """다운로드 결과 및 처리량 지표"""
+    bucket: str
+    key: str
+    local_path: str
+    size_bytes: int
+    etag: str
+    parts: int
+    resumed_parts: int  # 이전 시도에서 받아둔 파트 수
+    retried_parts: int  # 파트 단위 재시도 횟수
+    attempts: int  # 전체 시도 횟수
+    transferred_bytes: int  # 이번 호출에서 실제로 받은 바이트
+    elapsed_seconds: float
+    verified_by: Optional[str]  # 'sha256' / 'sha1' / 'crc32' / 'etag' / None(검증 불가 / 생략)
+    verified: Optional[bool] = None  # True: 검증 통과, None: 검증하지 못함 (불일치는 S3IntegrityError)
+
+    @property
+    def throughput_mbps(self) -> float:
+        """실제 전송 기준 처리량 (MB/s)"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.transferred_bytes / MB / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['throughput_mbps'] = round(self.throughput_mbps, 2)
+        return data
+
+
+class _Progress:
+    """한 번의 download() 호출 동안 누적되는 지표 (파트 스레드에서 갱신)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.transferred_bytes = 0
+        self.retried_parts = 0
+
+    def add_bytes(self, count: int):
+        with self._lock:
+            self.transferred_bytes += count
+
+    def add_retry(self):
+        with self._lock:
+            self.retried_parts += 1
+
+
+class S3Downloader:
+    """
+    병렬 Range GET 다운로더
+    스레드 안전 - 여러 스레드가 서로 다른 파일을 동시에 받아도 됨
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        region: Optional[str] = None,
+        part_size_mb: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        verify: Optional[bool] = None,
+    ):
+        """
+        Args:
+            s3_client: boto3 S3 클라이언트 (없으면 동시성에 맞는 커넥션 풀로 생성)
+            region: AWS 리전 (클라이언트 생성 시)
+            part_size_mb: Range GET 파트 크기 (기본: S3_DOWNLOAD_PART_SIZE_MB)
+            max_concurrency: 동시 Range GET 수 (기본: S3_DOWNLOAD_CONCURRENCY)
+            max_attempts: 전체 / 파트별 최대 시도 횟수 (기본: S3_DOWNLOAD_MAX_ATTEMPTS)
+            verify: 무결성 검증 여부 (기본: S3_DOWNLOAD_VERIFY)
+        """
+        self.part_size = max(1, part_size_mb or PART_SIZE_MB) * MB
+        self.max_concurrency = max(1, max_concurrency or MAX_CONCURRENCY)
+        self.max_attempts = max(1, max_attempts or MAX_ATTEMPTS)
+        self.verify = VERIFY if verify is None else verify
+
+        if s3_client is None:
+            # 기본 커넥션 풀(10)보다 동시성이 크면 연결을 재사용하지 못하므로 풀 크기를 맞춤
+            s3_client = boto3.client(
+                's3',
+                region_name=region,
+                config=Config(
+                    max_pool_connections=self.max_concurrency + 2,
+                    retries={'max_attempts': 5, 'mode': 'adaptive'},
+                ),
+            )
+        self.s3_client = s3_client
+
+    def download(self, bucket: str, key: str, local_path: str) -> DownloadResult:
+        """
+        S3 객체를 local_path로 다운로드 (같은 경로로 다시 호출하면 이어받기)
+
+        Returns:
+            DownloadResult (처리량 지표 포함)
+
+        Raises:
+            S3DownloadError: 재시도 소진 / 재시도 불가 오류
+            S3IntegrityError: 검증 실패 (부분 파일은 삭제됨)
+        """
+        local_path = str(local_path)
+        progress = _Progress()
+        started = time.monotonic()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = self._download_once(bucket, key, local_path, progress)
+                result.attempts = attempt
+                result.transferred_bytes = progress.transferred_bytes
+                result.retried_parts = progress.retried_parts
+                result.elapsed_seconds = time.monotonic() - started
+
+                logger.info(
+                    f"✅ S3 다운로드 완료: s3://{bucket}/{key} "
+                    f"{result.size_bytes / MB:.1f}MB, {result.elapsed_seconds:.1f}초, "
+                    f"{result.throughput_mbps:.1f}MB/s "
+                    f"(파트 {result.parts}, 이어받기 {result.resumed_parts}, "
+                    f"재시도 {result.retried_parts}, 검증 {result.verified_by or '미검증'})"
+                )
+                return result
+
+            except S3IntegrityError as e:
+                # 부분 파일이 이미 폐기됐으므로 다음 시도는 처음부터
+                last_error = e
+                logger.error(f"❌ 무결성 검증 실패 ({attempt}/{self.max_attempts}): {e}")
+
+            except _ObjectChanged:
+                last_error = S3DownloadError(f"다운로드 중 객체 변경: s3://{bucket}/{key}")
+                logger.warning(f"⚠️ 다운로드 중 객체가 바뀜 → 처음부터 다시: s3://{bucket}/{key}")
+                self.discard_partial(local_path)
+
+            except (ClientError, BotoCoreError, OSError) as e:
+                if _error_code(e) in NON_RETRYABLE_ERRORS:
+                    raise S3DownloadError(f"S3 다운로드 불가: s3://{bucket}/{key}: {e}") from e
+
+                last_error = e
+                logger.warning(
+                    f"⚠️ S3 다운로드 중단 ({attempt}/{self.max_attempts}), 완료된 파트부터 이어받기: {e}"
+                )
+
+            if attempt < self.max_attempts:
+                time.sleep(min(2 ** attempt, 30))
+
+        if isinstance(last_error, S3IntegrityError):
+            raise last_error
+        raise S3DownloadError(
+            f"S3 다운로드 실패 ({self.max_attempts}회 시도): s3://{bucket}/{key}: {last_error}"
+        ) from last_error
+
+    def discard_partial(self, local_path: str):
+        """이어받기용 부분 파일 / 진행 기록 삭제 (최종 실패 후 정리용)"""
+        for path in (_part_path(local_path), _state_path(local_path)):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logger.warning(f"부분 파일 삭제 실패: {path}, {e}")
+
+    def _download_once(self, bucket: str, key: str, local_path: str, progress: _Progress) -> DownloadResult:
+        """한 번의 시도: 남은 파트만 병렬로 받고 검증 후 최종 경로로 이동"""
+        head = self.s3_client.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED')
+        size = int(head['ContentLength'])
+        etag = head['ETag'].strip('"')
+
+        part_path = _part_path(local_path)
+        state_path = _state_path(local_path)
+        parts = self._plan_parts(size)
+
+        done = self._load_state(state_path, part_path, etag, size)
+        if not done:
+            # 새로 시작: 전체 크기로 미리 할당해 두고 각 스레드가 자기 오프셋에 기록
+            with open(part_path, 'wb') as f:
+                f.truncate(size)
+
+        pending = [part for part in parts if part[0] not in done]
+        resumed = len(parts) - len(pending)
+        if resumed:
+            logger.info(f"⏩ 이어받기: {resumed}/{len(parts)} 파트 완료 상태에서 재개 ({key})")
+
+        if pending:
+            self._fetch_parts(bucket, key, etag, size, part_path, state_path, pending, done, progress)
+
+        verified_by = None
+        if self.verify:
+            verified_by = self._verify(part_path, head, size)
+            if verified_by is None:
+                logger.warning(f"⚠️ 무결성 검증하지 못함 (verified=None): s3://{bucket}/{key}")
+
+        os.replace(part_path, local_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        return DownloadResult(
+            bucket=bucket,
+            key=key,
+            local_path=local_path,
+            size_bytes=size,
+            etag=etag,
+            parts=len(parts),
+            resumed_parts=resumed,
+            retried_parts=0,
+            attempts=1,
+            transferred_bytes=0,
+            elapsed_seconds=0.0,
+            verified_by=verified_by,
+            verified=True if verified_by else None,
+        )
+
+    def _plan_parts(self, size: int) -> List[Tuple[int, int, int]]:
+        """[(파트 번호, 시작 바이트, 끝 바이트(포함))]"""
+        return [
+            (index, start, min(start + self.part_size, size) - 1)
+            for index, start in enumerate(range(0, size, self.part_size))
+        ]
+
+    def _fetch_parts(
+        self,
+        bucket: str,
+        key: str,
+        etag: str,
+        size: int,
+        part_path: str,
+        state_path: str,
+        pending: List[Tuple[int, int, int]],
+        done: Set[int],
+        progress: _Progress,
+    ):
+        """남은 파트를 병렬로 받고, 파트가 끝날 때마다 진행 기록 갱신"""
+        workers = min(self.max_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='s3-range') as pool:
+            futures = {
+                pool.submit(self._fetch_part, bucket, key, etag, part_path, part, progress): part
+                for part in pending
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    done.add(futures[future][0])
+                    # 진행 기록은 메인 스레드에서만 씀
+                    self._save_state(state_path, etag, size, done)
+            except BaseException:
+                # 아직 시작하지 않은 파트는 취소 (받은 파트는 기록에 남아 다음 시도에서 재사용)
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _fetch_part(
+        self,
+        bucket: str,
+        key: str,
+        etag: str,
+        part_path: str,
+        part: Tuple[int, int, int],
+        progress: _Progress,
+    ):
+        """파트 하나를 Range GET으로 받아 자기 오프셋에 기록 (스트림 중단 시 파트 단위 재시도)"""
+        index, start, end = part
+        expected = end - start + 1
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self.s3_client.get_object(
+                    Bucket=bucket,
+                    Key=key,
+                    Range=f'bytes={start}-{end}',
+                    IfMatch=f'"{etag}"',
+                )
+
+                written = 0
+                with open(part_path, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response['Body'].iter_chunks(READ_CHUNK):
+                        f.write(chunk)
+                        written += len(chunk)
+                        progress.add_bytes(len(chunk))
+
+                if written != expected:
+                    raise IOError(f"파트 {index} 길이 불일치: {written}/{expected} bytes")
+                return
+
+            except ClientError as e:
+                code = _error_code(e)
+                if code in ('PreconditionFailed', '412'):
+                    raise _ObjectChanged() from e
+                if code in NON_RETRYABLE_ERRORS or attempt >= self.max_attempts:
+                    raise
+
+            except (BotoCoreError, OSError):
+                if attempt >= self.max_attempts:
+                    raise
+
+            progress.add_retry()
+            logger.debug(f"파트 {index} 재시도 ({attempt}/{self.max_attempts})")
+            time.sleep(min(0.5 * 2 ** attempt, 10))
+
+    def _load_state(self, state_path: str, part_path: str, etag: str, size: int) -> Set[int]:
+        """
+        이어받기 가능한 완료 파트 번호
+
+        같은 객체(ETag / 크기)이고 같은 파트 크기로 받던 기록만 인정, 아니면 부분 파일 폐기
+        """
+        if not os.path.exists(state_path) or not os.path.exists(part_path):
+            return set()
+
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+
+        if (
+            state.get('etag') != etag
+            or state.get('size') != size
+            or state.get('part_size') != self.part_size
+            or os.path.getsize(part_path) != size
+        ):
+            logger.info(f"이전 부분 파일이 현재 객체와 달라 폐기: {part_path}")
+            return set()
+
+        return set(state.get('done', []))
+
+    def _save_state(self, state_path: str, etag: str, size: int, done: Set[int]):
+        """진행 기록 저장 (임시 파일에 쓰고 교체 → 중단돼도 기록이 깨지지 않음)"""
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'etag': etag, 'size': size, 'part_size': self.part_size, 'done': sorted(done)},
+                f,
+            )
+        os.replace(temp_path, state_path)
+
+    def _verify(self, part_path: str, head: Dict[str, Any], size: int) -> Optional[str]:
+        """
+        다운로드 파일 무결성 검증
+
+        Returns:
+            검증에 사용한 방식 (검증 수단이 없으면 None)
+
+        Raises:
+            S3IntegrityError: 불일치 (부분 파일 / 진행 기록 삭제)
+        """
+        local_path = part_path[:-len('.part')]
+
+        if os.path.getsize(part_path) != size:
+            self.discard_partial(local_path)
+            raise S3IntegrityError(f"크기 불일치: {os.path.getsize(part_path)}/{size} bytes")
+
+        # 1. 전체 객체 체크섬 (업로드 시 지정한 경우, 멀티파트 복합 체크섬 "-N"은 제외)
+        for algorithm in ('SHA256', 'SHA1', 'CRC32'):
+            expected = head.get(f'Checksum{algorithm}')
+            if not expected or '-' in expected:
+                continue
+
+            actual = _file_checksum(part_path, algorithm)
+            if actual != expected:
+                self.discard_partial(local_path)
+                raise S3IntegrityError(f"{algorithm} 불일치: {actual} != {expected}")
+            return algorithm.lower()
+
+        # 2. ETag (SSE-KMS 객체의 ETag는 MD5가 아님)
+        etag = head['ETag'].strip('"')
+        if head.get('ServerSideEncryption', '').startswith('aws:kms'):
+            return None
+
+        if '-' not in etag:
+            actual = _file_md5(part_path)
+            if actual != etag:
+                self.discard_partial(local_path)
+                raise S3IntegrityError(f"ETag(MD5) 불일치: {actual} != {etag}")
+            return 'etag'
+
+        # 멀티파트 ETag = md5(파트 MD5들)-N → 업로드 파트 크기를 알 수 없으므로 흔한 값으로 대조
+        digest, _, count = etag.partition('-')
+        candidates = _upload_part_size_candidates(size, int(count))
+        if candidates and digest in _multipart_etags(part_path, candidates).values():
+            return 'etag'
+
+        # 후보 파트 크기가 모두 안 맞으면 업로더의 파트 크기가 다른 것일 수 있어 실패로 보지 않음
+        # (대신 검증되지 않았음을 결과에 남김: verified=None)
+        logger.warning(
+            f"⚠️ 멀티파트 ETag를 후보 파트 크기 {[c // MB for c in candidates]}MB로 재현하지 못함 "
+            f"(업로드 파트 크기 불명) - 검증되지 않은 파일: {etag}"
+        )
+        return None
+
+
+def _part_path(local_path: str) -> str:
+    return f"{local_path}.part"
+
+
+def _state_path(local_path: str) -> str:
+    return f"{local_path}.part.json"
+
+
+def _error_code(error: Exception) -> str:
+    if isinstance(error, ClientError):
+        return str(error.response.get('Error', {}).get('Code', ''))
+    return ''
+
+
+def _iter_file(path: str):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _file_md5(path: str) -> str:
+    md5 = hashlib.md5()
+    for chunk in _iter_file(path):
+        md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _file_checksum(path: str, algorithm: str) -> str:
+    """S3 체크섬 형식 (base64)"""
+    if algorithm == 'CRC32':
+        crc = 0
+        for chunk in _iter_file(path):
+            crc = zlib.crc32(chunk, crc)
+        return base64.b64encode(struct.pack('>I', crc & 0xFFFFFFFF)).decode()
+
+    hasher = hashlib.new(algorithm.lower())
+    for chunk in _iter_file(path):
+        hasher.update(chunk)
+    return base64.b64encode(hasher.digest()).decode()
+
+
+def _upload_part_size_candidates(size: int, count: int) -> List[int]:
+    """파트 수가 ETag의 N과 맞는 업로드 파트 크기 후보 (MB 단위, 바이트로 반환)"""
+    candidates = [mb * MB for mb in UPLOAD_PART_SIZE_CANDIDATES_MB]
+    # 파트 수로부터 역산한 크기 (MB 단위 올림)
+    candidates.append(math.ceil(size / count / MB) * MB)
+    return [
+        part_size for part_size in dict.fromkeys(candidates)
+        if part_size > 0 and math.ceil(size / part_size) == count
+    ]
+
+
+def _multipart_etags(path: str, part_sizes: List[int]) -> Dict[int, str]:
+    """
+    후보 파트 크기별 멀티파트 ETag 다이제스트 (파일은 한 번만 읽음)
+
+    후보는 모두 MB 배수이므로 READ_CHUNK(1MB) 경계에서 파트가 나뉨
+    """
+    hashers = {part_size: hashlib.md5() for part_size in part_sizes}
+    digests: Dict[int, List[bytes]] = {part_size: [] for part_size in part_sizes}
+    offset = 0
+
+    for chunk in _iter_file(path):
+        offset += len(chunk)
+        for part_size, hasher in hashers.items():
+            hasher.update(chunk)
+            if offset % part_size == 0:
+                digests[part_size].append(hasher.digest())
+                hashers[part_size] = hashlib.md5()
+
+    result = {}
+    for part_size, hasher in hashers.items():
+        if offset % part_size:
+            digests[part_size].append(hasher.digest())
+        result[part_size] = hashlib.md5(b''.join(digests[part_size])).hexdigest()
+    return result
+
+
+_downloader: Optional[S3Downloader] = None
+_downloader_lock = threading.Lock()
+
+
+def get_s3_downloader(region: Optional[str] = None) -> S3Downloader:
+    """프로세스 공용 다운로더 (환경 변수 설정 사용)"""
+    global _downloader
+    with _downloader_lock:
+        if _downloader is None:
+            _downloader = S3Downloader(region=region)
+        return _downloader
+
+
+def main():
+    """CLI: python s3_downloader.py s3://bucket/key <로컬 경로>"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    if len(sys.argv) != 3 or not sys.argv[1].startswith('s3://'):
+        print("Usage: s3_downloader.py s3://<bucket>/<key> <local_path>", file=sys.stderr)
+        sys.exit(2)
+
+    bucket, _, key = sys.argv[1][len('s3://'):].partition('/')
+    try:
+        result = get_s3_downloader(os.environ.get('AWS_DEFAULT_REGION')).download(
+            bucket, key, sys.argv[2]
+        )
+    except S3DownloadError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+
+    print(json.dumps(result.to_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+S3 스트리밍 비디오 입력 (전체 파일을 디스크에 받지 않고 바로 디코딩)
+
+입력 모드 (VIDEO_INPUT_MODE):
+- download: s3_downloader로 전체 다운로드 후 로컬 경로 전달 (기본, 기존 방식)
+- stream: Presigned URL을 디코더(OpenCV / FFmpeg)에 직접 전달
+  FFmpeg가 HTTP Range 요청으로 필요한 구간만 읽음 → 탐색 / 재읽기 가능, 로컬 디스크 사용 0
+  (video-analysis/run.py는 하이라이트 추출 시 --input을 다시 열므로 재읽기가 필요)
+- pipe: 이전 설정 호환용 → stream으로 처리
+
+Presigned URL은 run.py 명령행으로 전달되어 프로세스 목록에 보이므로 유효 시간을
+처리 시간 추정치(예측 상한 × 여유 배율)로 제한하고, 로그에는 서명을 뺀 URL만 남김
+
+사용법 (CLI, entrypoint.sh):
+    python s3_stream.py url s3://bucket/key              # Presigned URL 출력
+
+환경 변수:
+    VIDEO_INPUT_MODE            download / stream (기본 download)
+    S3_STREAM_URL_EXPIRES       추정치가 없을 때 Presigned URL 유효 시간 (초, 기본 3600 = Batch 작업 기본 타임아웃)
+"""
+
+import os
+import sys
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+VIDEO_INPUT_MODE = os.environ.get('VIDEO_INPUT_MODE', 'download').lower()
+if VIDEO_INPUT_MODE == 'pipe':
+    VIDEO_INPUT_MODE = 'stream'
+URL_EXPIRES = int(os.environ.get('S3_STREAM_URL_EXPIRES', '3600'))
+
+INPUT_MODES = ('download', 'stream')
+
+
+class S3StreamError(Exception):
+    """스트리밍 입력 실패"""
+
+
+def generate_stream_url(bucket: str, key: str, s3_client=None, region: Optional[str] = None,
+                        expires_in: Optional[int] = None) -> str:
+    """디코더가 직접 읽을 Presigned GET URL (FFmpeg는 HTTP Range로 탐색)"""
+    s3_client = s3_client or boto3.client('s3', region_name=region)
+    return s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=expires_in or URL_EXPIRES,
+    )
+
+
+@contextmanager
+def open_video_stream(
+    bucket: str,
+    key: str,
+    s3_client=None,
+    region: Optional[str] = None,
+    expires_in: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    디코더에 넘길 스트리밍 입력(Presigned URL) 준비
+    (download 모드는 호출 측에서 s3_downloader로 처리)
+
+    Args:
+        bucket: S3 버킷
+        key: S3 키
+        s3_client: boto3 S3 클라이언트 (없으면 생성)
+        region: AWS 리전
+        expires_in: URL 유효 시간 (초, 처리 시간 추정 타임아웃 - 없으면 S3_STREAM_URL_EXPIRES)
+    """
+    logger.info(f"📡 S3 직접 디코딩 (Presigned URL, {expires_in or URL_EXPIRES}초): s3://{bucket}/{key}")
+    yield generate_stream_url(bucket, key, s3_client, region, expires_in)
+
+
+def redact_url(value: str) -> str:
+    """로그용: Presigned URL의 서명 쿼리 제거 (다른 값은 그대로)"""
+    if value.startswith(('http://', 'https://')):
+        return value.split('?', 1)[0] + '?<presigned>'
+    return value
+
+
+def _parse_s3_uri(uri: str):
+    if not uri.startswith('s3://'):
+        raise ValueError(f"S3 URI 형식이 아닙니다: {uri}")
+    bucket, _, key = uri[len('s3://'):].partition('/')
+    return bucket, key
+
+
+def main():
+    """CLI: url"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]  # stdout은 URL 출력용
+    )
+
+    if len(sys.argv) != 3 or sys.argv[1] != 'url':
+        print("Usage: s3_stream.py url s3://<bucket>/<key>", file=sys.stderr)
+        sys.exit(2)
+
+    bucket, key = _parse_s3_uri(sys.argv[2])
+    region = os.environ.get('AWS_DEFAULT_REGION')
+
+    try:
+        print(generate_stream_url(bucket, key, region=region))
+    except (ClientError, BotoCoreError, S3StreamError) as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 ﻿// Client-side API service (Server Actions 제거하여 403 에러 방지)
 import type { ChatSession } from '@/app/types/session';
+import type { AnalysisEta } from '@/app/types/video';
 
 // API Base URL 설정 - 클라이언트에서 상대 경로 사용
 const getApiBaseUrl = () => {
@@ -879,6 +880,7 @@ export async function getAnalysisProgress(videoId: string): Promise<{
   status: string;
   is_completed: boolean;
   is_failed: boolean;
+  eta?: AnalysisEta | null;
 }> {
   const API_URL = process.env.NEXT_PUBLIC_API_URL;
   if (API_URL === undefined || API_URL === null) {
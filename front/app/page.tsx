@@ -38,7 +38,7 @@ import { saveVideoFile } from '@/app/actions/video/video-service';
 import { getUploadedVideos } from '@/app/actions/video/video-service-client';
 import { uploadVideoToS3 } from '@/app/actions/video/s3-upload-service';
 import type { ChatSession } from '@/app/types/session';
-import type { UploadedVideo } from '@/app/types/video';
+import type { AnalysisEta, UploadedVideo } from '@/app/types/video';
 import EventTimeline from '@/components/video/EventTimeline';
 import VideoPlayer from '@/components/video/VideoPlayer';
 import UploadSection from '@/components/upload/UploadSection';
@@ -113,10 +113,12 @@ export default function CCTVAnalysis() {
   // 분석 상태와 진행도를 관리하는 새로운 state 추가:
   const [isAnalyzing, setIsAnalyzing] = useState(false);
   const [analysisProgress, setAnalysisProgress] = useState(0);
+  const [analysisEta, setAnalysisEta] = useState<AnalysisEta | null>(null);
 
   const { startProgressPolling, stopProgressPolling } = useAnalysisProgress({
     analysisProgress,
     setAnalysisProgress,
+    setAnalysisEta,
     setIsAnalyzing,
     setMessages,
     setVideo,
@@ -982,6 +984,7 @@ export default function CCTVAnalysis() {
                     uploadProgress={uploadProgress}
                     uploadStage={uploadStage}
                     analysisProgress={analysisProgress}
+                    analysisEta={analysisEta}
                     videoLoading={videoLoading}
                     videoError={videoError}
                     isMobile={isMobile}
@@ -13,6 +13,17 @@ export type UploadedVideo = {
   summary?: string; // AI 영상 분석 요약 (이모지, 특수기호 포함 가능)
 };
 
+// 분석 완료까지 예상 남은 시간 (대기열 + 처리, 처리 시간 추정 모델 예측 구간)
+export type AnalysisEta = {
+  eta_seconds: number;
+  eta_lower_seconds: number;
+  eta_upper_seconds: number;
+  queue_position: number; // 앞에서 대기/처리 중인 비디오 수
+  estimated_processing_seconds: number;
+  confidence: number;
+  model: 'instance' | 'pooled' | 'prior';
+};
+
 export type VideoListResponse = {
   success: boolean;
   data: UploadedVideo[];
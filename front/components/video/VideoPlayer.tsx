@@ -11,6 +11,7 @@ import {
   Info,
   AlertTriangle,
 } from 'lucide-react';
+import type { AnalysisEta } from '@/app/types/video';
 
 interface VideoPlayerProps {
   videoSrc: string | null;
@@ -24,6 +25,7 @@ interface VideoPlayerProps {
   uploadProgress: number;
   uploadStage: string;
   analysisProgress: number;
+  analysisEta?: AnalysisEta | null;
   videoLoading: boolean;
   videoError: string | null;
   isMobile: boolean;
@@ -38,6 +40,15 @@ interface VideoPlayerProps {
   formatTime: (seconds: number) => string;
 }
 
+// 예상 남은 시간 표시 (분 단위 올림)
+const formatEta = (seconds: number) => {
+  if (seconds < 60) return '1분 미만';
+  const minutes = Math.ceil(seconds / 60);
+  if (minutes < 60) return `${minutes}분`;
+  const hours = Math.floor(minutes / 60);
+  return minutes % 60 ? `${hours}시간 ${minutes % 60}분` : `${hours}시간`;
+};
+
 const VideoPlayer = forwardRef<HTMLVideoElement, VideoPlayerProps>(
   (
     {
@@ -52,6 +63,7 @@ const VideoPlayer = forwardRef<HTMLVideoElement, VideoPlayerProps>(
       uploadProgress,
       uploadStage,
       analysisProgress,
+      analysisEta,
       videoLoading,
       videoError,
       isMobile,
@@ -203,6 +215,18 @@ const VideoPlayer = forwardRef<HTMLVideoElement, VideoPlayerProps>(
                       ? 'AI가 이벤트를 감지하고 분류하고 있습니다.'
                       : 'AI가 분석 결과를 정리하고 있습니다.'}
                   </p>
+                  {analysisEta && analysisProgress < 100 && (
+                    <p className="text-[#00e6b4] text-xs md:text-sm text-center px-4 mb-4">
+                      {analysisEta.queue_position > 0 &&
+                        `앞선 분석 ${analysisEta.queue_position}건 대기 중 · `}
+                      예상 남은 시간 약 {formatEta(analysisEta.eta_seconds)}
+                      <span className="text-gray-400">
+                        {' '}
+                        ({formatEta(analysisEta.eta_lower_seconds)} ~{' '}
+                        {formatEta(analysisEta.eta_upper_seconds)})
+                      </span>
+                    </p>
+                  )}
                   <button
                     onClick={onCancelProcess}
                     className="bg-[#00e6b4] hover:bg-[#00c49c] text-[#1a1f2c] px-4 py-2 rounded-md transition-colors duration-200 text-sm font-medium border border-[#00e6b4] hover:border-[#00c49c]"
@@ -4,11 +4,12 @@ import {
   getAnalysisResult,
 } from '@/app/actions/ai/ai-service';
 import { getUploadedVideos } from '@/app/actions/video/video-service-client';
-import type { UploadedVideo } from '@/app/types/video';
+import type { AnalysisEta, UploadedVideo } from '@/app/types/video';
 
 interface UseAnalysisProgressProps {
   analysisProgress: number;
   setAnalysisProgress: (progress: number) => void;
+  setAnalysisEta?: (eta: AnalysisEta | null) => void;
   setIsAnalyzing: (analyzing: boolean) => void;
   setMessages: React.Dispatch<
     React.SetStateAction<
@@ -28,6 +29,7 @@ interface UseAnalysisProgressProps {
 export const useAnalysisProgress = ({
   analysisProgress,
   setAnalysisProgress,
+  setAnalysisEta,
   setIsAnalyzing,
   setMessages,
   setVideo,
@@ -37,6 +39,7 @@ export const useAnalysisProgress = ({
   const progressIntervalRef = useRef<NodeJS.Timeout | null>(null);
 
   const stopProgressPolling = () => {
+    setAnalysisEta?.(null);
     if (progressIntervalRef.current) {
       clearInterval(progressIntervalRef.current);
       progressIntervalRef.current = null;
@@ -82,6 +85,9 @@ export const useAnalysisProgress = ({
         progressRetryCount = 0;
         initialCheckCount++;
 
+        // 예상 남은 시간 (분석 시작 전에도 대기열 ETA 표시)
+        setAnalysisEta?.(progressData.eta ?? null);
+
         console.log('📊 [Progress Polling] DB 진행률 업데이트:', {
           videoId: currentVideoId,
           progress: progressData.progress,
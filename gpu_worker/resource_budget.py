@@ -0,0 +1,165 @@
+"""
+동시 처리 슬롯 자원 예산 관리 모듈
+여러 메시지를 동시에 처리할 때 디스크 / 메모리 사용량이 호스트 한도를 넘지 않도록 예약
+"""
+
+import os
+import shutil
+import threading
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class BudgetExceeded(Exception):
+    """요청한 자원이 전체 예산보다 커서 예약할 수 없음"""
+
+
+class ResourceBudget:
+    """
+    디스크 / 메모리 예산 관리자
+    슬롯(메시지)마다 필요한 양을 예약하고, 여유가 생길 때까지 대기
+    """
+
+    def __init__(
+        self,
+        disk_budget_bytes: int,
+        memory_budget_bytes: int,
+    ):
+        """
+        Args:
+            disk_budget_bytes: 임시 디렉토리에서 동시에 사용할 수 있는 최대 디스크 (바이트)
+            memory_budget_bytes: 동시에 사용할 수 있는 최대 메모리 (바이트)
+        """
+        self.disk_budget = int(disk_budget_bytes)
+        self.memory_budget = int(memory_budget_bytes)
+
+        self._disk_used = 0
+        self._memory_used = 0
+        self._reservations: Dict[str, tuple] = {}  # slot_id -> (disk, memory)
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_host(
+        cls,
+        temp_dir: str,
+        disk_budget_mb: Optional[int] = None,
+        memory_budget_mb: Optional[int] = None,
+        disk_ratio: float = 0.8,
+        memory_ratio: float = 0.75,
+    ) -> 'ResourceBudget':
+        """
+        호스트 자원 기준 예산 생성 (명시값이 없으면 여유 디스크 / 물리 메모리의 일정 비율)
+
+        Args:
+            temp_dir: 다운로드 임시 디렉토리 (여유 공간 측정 위치)
+            disk_budget_mb: 디스크 예산 (MB, 선택)
+            memory_budget_mb: 메모리 예산 (MB, 선택)
+        """
+        if disk_budget_mb:
+            disk_budget = disk_budget_mb * MB
+        else:
+            disk_budget = int(shutil.disk_usage(temp_dir).free * disk_ratio)
+
+        if memory_budget_mb:
+            memory_budget = memory_budget_mb * MB
+        else:
+            memory_budget = int(get_physical_memory() * memory_ratio)
+
+        logger.info(f"자원 예산: 디스크 {disk_budget // MB}MB, 메모리 {memory_budget // MB}MB")
+        return cls(disk_budget, memory_budget)
+
+    def acquire(
+        self,
+        slot_id: str,
+        disk_bytes: int,
+        memory_bytes: int,
+        timeout: Optional[float] = None,
+        should_stop=None,
+    ) -> bool:
+        """
+        자원 예약 (여유가 생길 때까지 대기)
+
+        Args:
+            slot_id: 슬롯 식별자 (release 시 사용)
+            disk_bytes: 필요한 디스크 (바이트)
+            memory_bytes: 필요한 메모리 (바이트)
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+            should_stop: 대기 중단 여부를 반환하는 함수 (종료 시그널 등)
+
+        Returns:
+            예약 성공 여부 (타임아웃 / 중단 시 False)
+
+        Raises:
+            BudgetExceeded: 전체 예산보다 큰 요청 (대기해도 예약 불가)
+        """
+        if disk_bytes > self.disk_budget or memory_bytes > self.memory_budget:
+            raise BudgetExceeded(
+                f"요청 자원이 전체 예산 초과: 디스크 {disk_bytes // MB}/{self.disk_budget // MB}MB, "
+                f"메모리 {memory_bytes // MB}/{self.memory_budget // MB}MB"
+            )
+
+        with self._condition:
+            waited = 0.0
+            while not self._fits(disk_bytes, memory_bytes):
+                if should_stop and should_stop():
+                    return False
+                if timeout is not None and waited >= timeout:
+                    return False
+                # 주기적으로 깨어나 중단 여부 확인
+                self._condition.wait(1.0)
+                waited += 1.0
+
+            self._disk_used += disk_bytes
+            self._memory_used += memory_bytes
+            self._reservations[slot_id] = (disk_bytes, memory_bytes)
+
+        logger.debug(
+            f"자원 예약: slot={slot_id}, 디스크 {disk_bytes // MB}MB, 메모리 {memory_bytes // MB}MB"
+        )
+        return True
+
+    def release(self, slot_id: str):
+        """예약 해제 (예약하지 않은 슬롯이면 무시)"""
+        with self._condition:
+            reservation = self._reservations.pop(slot_id, None)
+            if reservation is None:
+                return
+
+            self._disk_used -= reservation[0]
+            self._memory_used -= reservation[1]
+            self._condition.notify_all()
+
+    def max_slots(self, slot_disk_bytes: int, slot_memory_bytes: int) -> int:
+        """슬롯당 기본 자원 기준으로 동시에 실행 가능한 최대 슬롯 수"""
+        by_disk = self.disk_budget // max(slot_disk_bytes, 1)
+        by_memory = self.memory_budget // max(slot_memory_bytes, 1)
+        return max(1, int(min(by_disk, by_memory)))
+
+    def get_statistics(self) -> Dict:
+        """현재 예약 현황"""
+        with self._condition:
+            return {
+                'slots': len(self._reservations),
+                'disk_used_mb': self._disk_used // MB,
+                'disk_budget_mb': self.disk_budget // MB,
+                'memory_used_mb': self._memory_used // MB,
+                'memory_budget_mb': self.memory_budget // MB,
+            }
+
+    def _fits(self, disk_bytes: int, memory_bytes: int) -> bool:
+        return (
+            self._disk_used + disk_bytes <= self.disk_budget
+            and self._memory_used + memory_bytes <= self.memory_budget
+        )
+
+
+def get_physical_memory() -> int:
+    """물리 메모리 크기 (바이트, 확인 불가 시 4GB)"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 4096 * MB
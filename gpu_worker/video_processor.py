@@ -2,20 +2,26 @@
 EC2 GPU Video Processing Worker
 SQS Long Polling을 통한 비디오 처리 워커
 가시성 타임아웃 자동 관리 포함
+슬롯(메시지)별 디스크/메모리 예산 내에서 여러 메시지 동시 처리
+GPU 슬롯을 기다리는 동안 다음 메시지를 미리 수신/다운로드 (prefetch)
+처리 시간은 완료 작업으로 학습한 인스턴스 타입별 추정기로 예측하고, 실측값을 다시 기록
 """
 
 import os
 import sys
 import json
+import hashlib
 import time
 import logging
 import signal
+import threading
 import boto3
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from visibility_manager import VisibilityTimeoutManager
+from resource_budget import MB, ResourceBudget
 from error_handler import retry_manager, error_tracker, retry_on_error, safe_execute
 
 
@@ -25,6 +31,8 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 DJANGO_ROOT = PROJECT_ROOT / 'back'
 
 sys.path.insert(0, str(DJANGO_ROOT))
+# 공용 S3 다운로더 / 처리 시간 추정치 (batch/s3_downloader.py, batch/processing_estimate.py)
+sys.path.insert(0, str(PROJECT_ROOT / 'batch'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 try:
@@ -33,13 +41,19 @@ try:
     
     from apps.api.services.sqs_service import sqs_service
     from apps.api.services.s3_service import s3_service
+    from apps.api.services.business.processing_time_estimator import get_processing_time_estimator
     from apps.db.models import Video
+    from django.db import connections
+    from django.conf import settings
     
     print("Django 모듈 로드 완료")
 except Exception as e:
     print(f"Django 모듈 로드 실패: {e}")
     sys.exit(1)
 
+from s3_downloader import get_s3_downloader
+from processing_estimate import detect_instance_type, select_estimate
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -51,6 +65,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger('GPUWorker')
 
+# 동시 처리 설정 (환경 변수)
+WORKER_CONCURRENCY = int(os.environ.get('GPU_WORKER_CONCURRENCY', '1'))  # 동시에 처리할 최대 메시지 수
+SLOT_DISK_MB = int(os.environ.get('GPU_WORKER_SLOT_DISK_MB', '4096'))  # 슬롯당 기본 디스크 예약
+SLOT_MEMORY_MB = int(os.environ.get('GPU_WORKER_SLOT_MEMORY_MB', '2048'))  # 슬롯당 메모리 예약
+DISK_BUDGET_MB = int(os.environ.get('GPU_WORKER_DISK_BUDGET_MB', '0')) or None  # 기본: 여유 디스크의 80%
+MEMORY_BUDGET_MB = int(os.environ.get('GPU_WORKER_MEMORY_BUDGET_MB', '0')) or None  # 기본: 물리 메모리의 75%
+PREFETCH_DEPTH = int(os.environ.get('GPU_WORKER_PREFETCH_DEPTH', '1'))  # GPU 슬롯 외에 미리 받아둘 메시지 수
+DRAIN_TIMEOUT = int(os.environ.get('GPU_WORKER_DRAIN_TIMEOUT', '900'))  # 종료 시 처리 중 메시지 대기 (초)
+DISK_HEADROOM = 1.2  # 다운로드 파일 크기 대비 디스크 여유 (결과/임시 파일)
+PARTIAL_MAX_AGE_HOURS = int(os.environ.get('GPU_WORKER_PARTIAL_MAX_AGE_HOURS', '24'))  # 이어받기용 부분 파일 보존 시간
+
 
 class GPUVideoWorker:
     """
@@ -58,25 +83,89 @@ class GPUVideoWorker:
     가시성 타임아웃 자동 관리 포함
     """
     
-    def __init__(self):
+    def __init__(self, concurrency: Optional[int] = None, prefetch_depth: Optional[int] = None):
+        """
+        Args:
+            concurrency: 동시에 처리(GPU 추론)할 최대 메시지 수 (기본: GPU_WORKER_CONCURRENCY)
+            prefetch_depth: 처리 슬롯 외에 미리 다운로드해 둘 메시지 수 (기본: GPU_WORKER_PREFETCH_DEPTH)
+        """
         self.running = False
         self.processed_count = 0
         self.error_count = 0
+        self._stats_lock = threading.Lock()
         
         # 가시성 타임아웃 매니저 초기화
         self.visibility_manager = VisibilityTimeoutManager(sqs_service)
         
+        # 슬롯 자원 예산 (동시 처리 수는 예산으로 수용 가능한 슬롯 수 이하)
+        temp_dir = SCRIPT_DIR / 'temp'
+        temp_dir.mkdir(exist_ok=True)
+        self._remove_stale_partials(temp_dir)
+        self.resource_budget = ResourceBudget.from_host(
+            str(temp_dir), DISK_BUDGET_MB, MEMORY_BUDGET_MB
+        )
+        self.concurrency = max(1, concurrency or WORKER_CONCURRENCY)
+        max_slots = self.resource_budget.max_slots(SLOT_DISK_MB * MB, SLOT_MEMORY_MB * MB)
+        if self.concurrency > max_slots:
+            logger.warning(f"동시 처리 수 {self.concurrency} → {max_slots} (자원 예산 한도)")
+            self.concurrency = max_slots
+        
+        # 선행 다운로드 깊이 (디스크 예산으로 수용 가능한 메시지 수 이하)
+        disk_slots = self.resource_budget.disk_budget // (SLOT_DISK_MB * MB)
+        requested_depth = PREFETCH_DEPTH if prefetch_depth is None else prefetch_depth
+        self.prefetch_depth = max(0, min(requested_depth, disk_slots - self.concurrency))
+        if self.prefetch_depth < requested_depth:
+            logger.warning(f"선행 다운로드 깊이 {requested_depth} → {self.prefetch_depth} (디스크 예산 한도)")
+        
+        # 보유 메시지 (receipt_handle -> 메시지 스레드) = 처리 중 + 선행 다운로드
+        self._in_flight: Dict[str, threading.Thread] = {}
+        self._slots_condition = threading.Condition()
+        self._compute_slots = threading.BoundedSemaphore(self.concurrency)
+        self._computing: set = set()  # GPU 슬롯을 점유한 receipt_handle
+        self._prefetched: set = set()  # 다운로드 완료 후 GPU 슬롯 대기 중
+        self._downloading: set = set()  # 다운로드 중인 로컬 경로 (같은 키 동시 처리 시 경로 분리)
+        self._downloading_lock = threading.Lock()
+        self._force_stop = False
+        
+        # 처리 시간 추정 / 실측 기록 기준 인스턴스 타입
+        self.instance_type = detect_instance_type()
+        
         # 시그널 핸들러 등록 (Graceful Shutdown)
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
         logger.info("GPU Video Worker 초기화 완료")
     
+    @staticmethod
+    def _remove_stale_partials(temp_dir: Path):
+        """오래된 이어받기용 부분 파일 정리 (다른 워커가 처리를 마친 메시지의 잔여물)"""
+        cutoff = time.time() - PARTIAL_MAX_AGE_HOURS * 3600
+        for path in list(temp_dir.glob('*.part')) + list(temp_dir.glob('*.part.json')):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.info(f"오래된 부분 파일 삭제: {path.name}")
+            except OSError as e:
+                logger.warning(f"부분 파일 삭제 실패: {path}, {e}")
+    
     def _signal_handler(self, signum, frame):
-        """시그널 핸들러 - Graceful Shutdown"""
-        logger.info(f"시그널 {signum} 수신 - 워커 종료 중...")
+        """시그널 핸들러 - Graceful Shutdown (두 번째 시그널은 대기 없이 종료)"""
+        if not self.running:
+            logger.warning(f"시그널 {signum} 재수신 - 처리 중 메시지 대기 중단")
+            self._force_stop = True
+            return
+        
+        logger.info(f"시그널 {signum} 수신 - 새 메시지 수신 중단, "
+                    f"처리 중 {self._in_flight_count()}개 완료 후 종료")
         self.running = False
-        self._print_final_statistics()
+    
+    def _record_result(self, success: bool):
+        """처리 결과 카운트 (슬롯 스레드들이 동시에 호출)"""
+        with self._stats_lock:
+            if success:
+                self.processed_count += 1
+            else:
+                self.error_count += 1
     
     def _print_final_statistics(self):
         """최종 통계 및 오류 요약 출력"""
@@ -85,7 +174,7 @@ class GPUVideoWorker:
         logger.info("=" * 60)
         
         # 기본 통계
-        logger.info(f" 처리 통계:")
+        logger.info(f" 처리 통계 (동시 처리 {self.concurrency}개):")
         logger.info(f"    성공: {self.processed_count}건")
         logger.info(f"    실패: {self.error_count}건")
         
@@ -109,15 +198,24 @@ class GPUVideoWorker:
             logger.info(f"   가시성 타임아웃 통계:")
             logger.info(f"   관리 메시지: {visibility_stats.get('managed_messages', 0)}건")
             logger.info(f"   연장 횟수: {visibility_stats.get('extensions', 0)}회")
+            logger.info(f"   SQS 호출: {visibility_stats.get('api_calls', 0)}회 "
+                        f"(실패 {visibility_stats.get('failed_changes', 0)}, "
+                        f"소유권 상실 {visibility_stats.get('lost_messages', 0)})")
+        
+        # 자원 예산
+        budget_stats = self.resource_budget.get_statistics()
+        logger.info(f"   자원 예산: 디스크 {budget_stats['disk_budget_mb']}MB, "
+                    f"메모리 {budget_stats['memory_budget_mb']}MB")
         
         logger.info("=" * 60)
     
     def start_worker_loop(self):
         """
         메인 워커 루프 시작
-        Long Polling으로 SQS 메시지를 지속적으로 수신하고 처리
+        Long Polling으로 SQS 메시지를 지속적으로 수신하고, 빈 슬롯 수만큼 동시에 처리
         """
-        logger.info("GPU Video Worker 시작...")
+        logger.info(f"GPU Video Worker 시작... (동시 처리 {self.concurrency}개, "
+                    f"선행 다운로드 {self.prefetch_depth}개)")
         logger.info(f"현재 상태: 처리완료={self.processed_count}, 오류={self.error_count}")
         
         # 가시성 타임아웃 모니터링 시작
@@ -130,10 +228,15 @@ class GPUVideoWorker:
         try:
             while self.running:
                 try:
-                    # SQS Long Polling으로 메시지 수신 (20초 대기)
-                    logger.debug("SQS 메시지 수신 중... (Long Polling 20초)")
+                    # 빈 슬롯(처리 + 선행 다운로드)이 생길 때까지 대기 (모두 사용 중이면 폴링하지 않음)
+                    free_slots = self._wait_for_free_slot()
+                    if free_slots == 0:
+                        continue
+                    
+                    # SQS Long Polling으로 빈 슬롯 수만큼 메시지 수신 (20초 대기)
+                    logger.debug(f"SQS 메시지 수신 중... (빈 슬롯 {free_slots}개, Long Polling 20초)")
                     messages = sqs_service.receive_messages(
-                        max_messages=1,
+                        max_messages=min(free_slots, 10),
                         wait_time_seconds=20,
                         visibility_timeout=300  # 5분 기본 가시성 타임아웃
                     )
@@ -142,16 +245,18 @@ class GPUVideoWorker:
                         consecutive_empty_polls = 0
                         for message in messages:
                             if not self.running:
-                                break
-                            self._process_message_with_visibility_management(message)
+                                # 종료 중 수신된 메시지는 바로 다른 워커에 넘김
+                                self._release_message(message.get('ReceiptHandle'))
+                                continue
+                            self._start_slot(message)
                     else:
                         consecutive_empty_polls += 1
                         logger.debug(f"수신된 메시지 없음 ({consecutive_empty_polls}/3)")
                         
-                        # 연속으로 빈 메시지가 여러 번 나오면 잠시 대기
-                        if consecutive_empty_polls >= max_empty_polls:
+                        # 처리 중인 메시지도 없이 연속으로 비면 잠시 대기
+                        if consecutive_empty_polls >= max_empty_polls and self._in_flight_count() == 0:
                             logger.info("잠시 대기 중... (30초)")
-                            time.sleep(30)
+                            self._sleep_while_running(30)
                             consecutive_empty_polls = 0
                 
                 except KeyboardInterrupt:
@@ -159,10 +264,15 @@ class GPUVideoWorker:
                     break
                 except Exception as e:
                     logger.error(f"워커 루프 오류: {e}")
-                    self.error_count += 1
-                    time.sleep(10)  # 오류 시 10초 대기
+                    self._record_result(False)
+                    self._sleep_while_running(10)  # 오류 시 10초 대기
         
         finally:
+            self.running = False
+            
+            # 처리 중인 메시지 완료 대기 (Graceful Drain)
+            self._drain_in_flight()
+            
             # 가시성 타임아웃 모니터링 중지
             self.visibility_manager.stop_monitoring()
             
@@ -170,6 +280,98 @@ class GPUVideoWorker:
             self._print_final_statistics()
             logger.info("🏁 GPU Video Worker 완전 종료")
 
+    def _in_flight_count(self) -> int:
+        with self._slots_condition:
+            return len(self._in_flight)
+    
+    def _wait_for_free_slot(self) -> int:
+        """
+        빈 슬롯이 생길 때까지 대기
+        
+        Returns:
+            빈 슬롯 수 (종료 시그널로 대기를 멈추면 0)
+        """
+        capacity = self.concurrency + self.prefetch_depth
+        with self._slots_condition:
+            while self.running and len(self._in_flight) >= capacity:
+                self._slots_condition.wait(1.0)
+            return capacity - len(self._in_flight) if self.running else 0
+    
+    def _start_slot(self, message: Dict[str, Any]):
+        """메시지 1개를 슬롯 스레드에서 처리 시작"""
+        receipt_handle = message.get('ReceiptHandle')
+        
+        # 데몬 스레드: 종료 대기 시간 초과 시 프로세스 종료를 막지 않음 (메시지는 가시성 복구)
+        thread = threading.Thread(
+            target=self._run_slot,
+            args=(message,),
+            name=f"gpu-slot-{receipt_handle[:8]}",
+            daemon=True
+        )
+        with self._slots_condition:
+            self._in_flight[receipt_handle] = thread
+        thread.start()
+    
+    def _run_slot(self, message: Dict[str, Any]):
+        """메시지 스레드 본문 - 처리 후 자원 예약 / GPU 슬롯 / 보유 슬롯 반환"""
+        receipt_handle = message.get('ReceiptHandle')
+        try:
+            self._process_message_with_visibility_management(message)
+        finally:
+            self._release_compute_slot(receipt_handle)
+            self.resource_budget.release(f"{receipt_handle}:disk")
+            # 스레드 전용 DB 연결 정리
+            connections.close_all()
+            with self._slots_condition:
+                self._in_flight.pop(receipt_handle, None)
+                self._slots_condition.notify_all()
+    
+    def _drain_in_flight(self):
+        """
+        처리 중인 메시지가 모두 끝날 때까지 대기 (최대 DRAIN_TIMEOUT초)
+        시간 초과 / 강제 종료 시 남은 메시지는 가시성을 즉시 복구해 다른 워커가 재처리
+        """
+        in_flight = self._in_flight_count()
+        if in_flight == 0:
+            return
+        
+        logger.info(f"처리 중인 메시지 {in_flight}개 완료 대기 (최대 {DRAIN_TIMEOUT}초)")
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        
+        with self._slots_condition:
+            while self._in_flight and not self._force_stop and time.monotonic() < deadline:
+                self._slots_condition.wait(1.0)
+            remaining = list(self._in_flight)
+        
+        # 연장이 다시 걸리지 않도록 먼저 해제한 뒤 한 번에 가시성 복구
+        for receipt_handle in remaining:
+            logger.warning(f"종료 대기 초과 - 메시지 반환: handle={receipt_handle[:10]}...")
+            self.visibility_manager.unregister_message(receipt_handle, 'interrupted')
+        if remaining:
+            safe_execute(
+                sqs_service.change_message_visibility_batch,
+                [(receipt_handle, 0) for receipt_handle in remaining],
+                context=f"가시성 일괄 복구 {len(remaining)}개"
+            )
+        
+        if not remaining:
+            logger.info("처리 중인 메시지 모두 완료")
+    
+    def _release_message(self, receipt_handle: str):
+        """메시지 가시성 즉시 복구 (다른 워커가 바로 재처리)"""
+        safe_execute(
+            sqs_service.change_message_visibility,
+            receipt_handle,
+            0,
+            context=f"가시성 복구 handle={receipt_handle[:10]}..."
+        )
+    
+    def _sleep_while_running(self, seconds: float):
+        """종료 시그널을 받으면 즉시 깨어나는 대기"""
+        deadline = time.monotonic() + seconds
+        while self.running and time.monotonic() < deadline:
+            time.sleep(min(1.0, deadline - time.monotonic()))
+
     def _process_message_with_visibility_management(self, message: Dict[str, Any]):
         """
         SQS 메시지 처리 (가시성 타임아웃 자동 관리 + 오류 처리)
@@ -189,7 +391,7 @@ class GPUVideoWorker:
                 logger.error(f"메시지 파싱 실패: {payload}")
                 # 파싱 실패 시 메시지 삭제 (잘못된 형식)
                 sqs_service.delete_message(receipt_handle)
-                self.error_count += 1
+                self._record_result(False)
                 return
             
             video_id = payload.get('video', {}).get('id')
@@ -209,45 +411,79 @@ class GPUVideoWorker:
                 )
                 # 필수 정보 누락 시 메시지 삭제 (재처리 불가)
                 sqs_service.delete_message(receipt_handle)
-                self.error_count += 1
+                self._record_result(False)
                 return
             
-            # 파일 크기 기반으로 예상 처리 시간 계산
-            estimated_time = self._estimate_processing_time_safe(s3_key)
+            # 처리 시간 예측 (학습된 추정기 → 메시지 추정치 → 파일 크기 순)
+            file_size = self._get_file_size_safe(s3_key)
+            estimated_time = self._estimate_processing_time_safe(
+                s3_key, file_size, video_id, payload.get('estimate')
+            )
             
-            # 가시성 타임아웃 관리 시작
+            # 가시성 타임아웃 관리 시작 (자원 대기 중에도 연장)
             self.visibility_manager.register_message(
                 receipt_handle, 
                 video_id, 
                 estimated_time
             )
             
+            # 다운로드 디스크 예약 (다른 메시지가 공간을 반환할 때까지 대기)
+            if not self._reserve_disk(receipt_handle, video_id, file_size):
+                logger.info(f"종료 중 - 처리 전 메시지 반환: video_id={video_id}")
+                self.visibility_manager.unregister_message(receipt_handle, 'interrupted')
+                self._release_message(receipt_handle)
+                return
+            
+            # 선행 다운로드 (GPU 슬롯을 기다리는 동안 S3 전송)
+            local_video_path, download_seconds = self._prefetch_video(video_id, s3_bucket, s3_key)
+            
+            # GPU 슬롯 + 메모리 대기 (종료 시 선행 다운로드한 메시지는 바로 반환)
+            if not self._acquire_compute_slot(receipt_handle, video_id):
+                logger.info(f"종료 중 - 선행 다운로드 메시지 반환: video_id={video_id}")
+                if local_video_path:
+                    self._cleanup_temp_files(local_video_path)
+                self.visibility_manager.unregister_message(receipt_handle, 'interrupted')
+                self._release_message(receipt_handle)
+                return
+            
+            # 최대 처리 시간은 여기부터 (앞선 작업 뒤에서 기다린 시간 제외)
+            self.visibility_manager.mark_started(receipt_handle)
+            
             # 비디오 처리 실행 (재시도 로직 포함)
-            processing_result = self._process_video_with_retry(video_id, s3_bucket, s3_key)
+            processing_result = self._process_video_with_retry(
+                video_id, s3_bucket, s3_key, local_video_path, receipt_handle, download_seconds
+            )
             
             if processing_result['success']:
-                # 처리 완료 - 메시지 삭제
-                success, _ = safe_execute(
+                # 처리 완료 - 등록 해제 후 메시지 삭제
+                self.visibility_manager.unregister_message(receipt_handle, 'completed')
+                success, deleted = safe_execute(
                     sqs_service.delete_message,
                     receipt_handle,
                     context=f"메시지 삭제 video_id={video_id}"
                 )
                 
-                self.visibility_manager.unregister_message(receipt_handle, 'completed')
-                if success:
-                    self.processed_count += 1
+                # 삭제 실패 시 메시지가 다시 보여 재처리되므로 오류로 집계
+                deleted = success and deleted is True
+                self._record_result(deleted)
+                if deleted:
                     logger.info(f"비디오 처리 완료: video_id={video_id}")
                 else:
-                    logger.warning(f"⚠️ 처리는 성공했지만 메시지 삭제 실패: video_id={video_id}")
+                    logger.warning(f"⚠️ 처리는 성공했지만 메시지 삭제 실패 (재처리 예상): video_id={video_id}")
                     
             else:
                 # 처리 실패 - 메시지 가시성 복구 (다른 워커가 재처리 가능)
+                # 연장이 다시 걸리지 않도록 먼저 등록 해제
+                self.visibility_manager.unregister_message(receipt_handle, 'failed')
                 error_type = processing_result.get('error_type', 'unknown')
                 
                 if error_type == 'permanent':
-                    # 영구적 오류 - 메시지 삭제
+                    # 영구적 오류 - 메시지 삭제 (다시 받을 일이 없으므로 부분 파일도 정리)
                     logger.error(f"영구적 오류로 메시지 삭제: video_id={video_id}")
                     sqs_service.delete_message(receipt_handle)
+                    get_s3_downloader(settings.AWS_S3_REGION_NAME).discard_partial(
+                        str(self._local_video_path(video_id, s3_bucket, s3_key))
+                    )
                 else:
                     # 일시적 오류 - 가시성 복구하여 재처리 가능하게 함
                     logger.warning(f"일시적 오류로 재처리 대기: video_id={video_id}")
@@ -258,8 +494,7 @@ class GPUVideoWorker:
                         context=f"가시성 복구 video_id={video_id}"
                     )
                 
-                self.visibility_manager.unregister_message(receipt_handle, 'failed')
-                self.error_count += 1
+                self._record_result(False)
                 
         except Exception as e:
             # 예상치 못한 오류
@@ -270,35 +505,154 @@ class GPUVideoWorker:
                 function_name="_process_message_with_visibility_management"
             )
             
-            # 가시성 복구
+            # 가시성 복구 (연장이 다시 걸리지 않도록 먼저 등록 해제)
             try:
-                sqs_service.change_message_visibility(receipt_handle, 0)
                 self.visibility_manager.unregister_message(receipt_handle, 'error')
+                sqs_service.change_message_visibility(receipt_handle, 0)
             except:
                 pass  # 복구 시도도 실패하면 그냥 넘어감
                 
-            self.error_count += 1
+            self._record_result(False)
+    
+    def _get_file_size_safe(self, s3_key: str) -> Optional[int]:
+        """S3 객체 크기 조회 (실패 시 None)"""
+        success, file_info = safe_execute(
+            s3_service.get_file_info,
+            s3_key,
+            context=f"파일 정보 조회 {s3_key}"
+        )
+        if success and file_info:
+            return file_info.get('ContentLength') or None
+        return None
     
-    def _estimate_processing_time_safe(self, s3_key: str) -> int:
+    def _reserve_disk(self, slot_id: str, video_id: str, file_size: Optional[int]) -> bool:
         """
-        S3 키를 기반으로 예상 처리 시간 계산 (오류 처리 포함)
+        다운로드 디스크 예약
+        
+        파일 크기 기반 (기본 슬롯 크기 이상), 전체 예산보다 큰 파일은 예산 전체를 예약해 단독 실행
+        
+        Returns:
+            예약 성공 여부 (종료 시그널로 대기 중단 시 False)
+        """
+        disk_bytes = max(SLOT_DISK_MB * MB, int((file_size or 0) * DISK_HEADROOM))
+        disk_bytes = min(disk_bytes, self.resource_budget.disk_budget)
+        
+        reserved = self.resource_budget.acquire(
+            f"{slot_id}:disk",
+            disk_bytes,
+            0,
+            should_stop=lambda: not self.running
+        )
+        if reserved:
+            logger.info(f"디스크 예약: video_id={video_id}, {disk_bytes // MB}MB")
+        return reserved
+    
+    def _prefetch_video(self, video_id: str, s3_bucket: str, s3_key: str) -> Tuple[Optional[str], float]:
+        """
+        GPU 슬롯 대기 전 비디오 다운로드
+        
+        Returns:
+            (로컬 경로 (실패 시 None - 처리 단계에서 재시도 포함 다운로드), 다운로드 시간 (초))
+        """
+        started_at = time.monotonic()
+        try:
+            local_video_path = self._download_video_safe(video_id, s3_bucket, s3_key)
+        except Exception as e:
+            logger.warning(f"선행 다운로드 실패 (처리 단계에서 재시도): video_id={video_id}, {e}")
+            return None, 0.0
+        
+        download_seconds = time.monotonic() - started_at
+        logger.info(f"선행 다운로드 완료: video_id={video_id} ({download_seconds:.1f}초)")
+        return local_video_path, download_seconds
+    
+    def _acquire_compute_slot(self, receipt_handle: str, video_id: str) -> bool:
+        """
+        GPU 처리 슬롯 + 메모리 예약 (대기 중인 메시지는 prefetched 상태)
+        
+        Returns:
+            점유 성공 여부 (종료 시그널로 대기 중단 시 False)
+        """
+        with self._slots_condition:
+            self._prefetched.add(receipt_handle)
+        
+        try:
+            while not self._compute_slots.acquire(timeout=1.0):
+                if not self.running:
+                    return False
+            
+            if not self.running:
+                self._compute_slots.release()
+                return False
+            
+            with self._slots_condition:
+                self._computing.add(receipt_handle)
+        finally:
+            with self._slots_condition:
+                self._prefetched.discard(receipt_handle)
+        
+        memory_bytes = min(SLOT_MEMORY_MB * MB, self.resource_budget.memory_budget)
+        if not self.resource_budget.acquire(
+            f"{receipt_handle}:memory",
+            0,
+            memory_bytes,
+            should_stop=lambda: not self.running
+        ):
+            return False
+        
+        logger.info(f"GPU 슬롯 점유: video_id={video_id}, 메모리 {memory_bytes // MB}MB")
+        return True
+    
+    def _release_compute_slot(self, receipt_handle: str):
+        """GPU 처리 슬롯 + 메모리 반환 (점유하지 않았으면 무시)"""
+        self.resource_budget.release(f"{receipt_handle}:memory")
+        with self._slots_condition:
+            if receipt_handle not in self._computing:
+                return
+            self._computing.discard(receipt_handle)
+        self._compute_slots.release()
+    
+    def _estimate_processing_time_safe(
+        self,
+        s3_key: str,
+        file_size: Optional[int] = None,
+        video_id: Optional[str] = None,
+        estimate: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        예상 처리 시간 계산 (오류 처리 포함)
+        완료 작업으로 학습한 이 인스턴스 타입의 예측 구간 상한을 우선 사용
         
         Args:
             s3_key: S3 객체 키
+            file_size: 이미 조회한 파일 크기 (없으면 S3에서 조회)
+            video_id: 비디오 ID (추정기 입력: 길이/해상도/FPS/크기)
+            estimate: SQS 메시지에 실린 업로드 시점 추정치 (DB 조회 실패 시 사용)
             
         Returns:
             예상 처리 시간 (초)
         """
+        if video_id:
+            try:
+                video = Video.objects.get(video_id=video_id)
+                prediction = get_processing_time_estimator().estimate_for_video(video, self.instance_type)
+                logger.debug(
+                    f"처리 시간 예측: {prediction.seconds:.0f}초 "
+                    f"({prediction.confidence:.0%} 구간 {prediction.lower_seconds:.0f}~{prediction.upper_seconds:.0f}초, "
+                    f"{prediction.model} 모델 샘플 {prediction.samples}개)"
+                )
+                return int(prediction.upper_seconds)
+            except Exception as e:
+                logger.warning(f"처리 시간 추정기 사용 실패, 메시지 추정치 사용: {e}")
+        
+        selected = select_estimate(estimate, self.instance_type)
+        if selected:
+            return int(selected['upperSeconds'])
+        
         try:
-            # S3에서 파일 크기 정보 조회
-            success, file_info = safe_execute(
-                s3_service.get_file_info,
-                s3_key,
-                context=f"파일 정보 조회 {s3_key}"
-            )
+            if file_size is None:
+                file_size = self._get_file_size_safe(s3_key)
             
-            if success and file_info:
-                file_size = file_info.get('ContentLength', 0)
+            if file_size:
                 # 파일 크기 기반 예상 시간 (MB당 1초 + 기본 120초)
                 size_mb = file_size / (1024 * 1024)
                 estimated_time = max(120, int(size_mb * 1.0 + 120))
@@ -315,7 +669,15 @@ class GPUVideoWorker:
         else:
             return 300  # 기본: 5분
     
-    def _process_video_with_retry(self, video_id: str, s3_bucket: str, s3_key: str) -> Dict[str, Any]:
+    def _process_video_with_retry(
+        self,
+        video_id: str,
+        s3_bucket: str,
+        s3_key: str,
+        local_video_path: Optional[str] = None,
+        receipt_handle: Optional[str] = None,
+        download_seconds: float = 0.0
+    ) -> Dict[str, Any]:
         """
         비디오 처리 실행 (재시도 로직 포함)
         
@@ -323,6 +685,9 @@ class GPUVideoWorker:
             video_id: 비디오 ID
             s3_bucket: S3 버킷명  
             s3_key: S3 객체 키
+            local_video_path: 선행 다운로드된 로컬 경로 (없으면 처리 중 다운로드)
+            receipt_handle: 진행률을 보고할 SQS 메시지 수신 핸들 (가시성 연장 폭 계산)
+            download_seconds: 선행 다운로드에 걸린 시간 (처리 시간 기록에 포함)
             
         Returns:
             처리 결과 딕셔너리
@@ -336,6 +701,9 @@ class GPUVideoWorker:
                 video_id,
                 s3_bucket,
                 s3_key,
+                local_video_path,
+                receipt_handle,
+                download_seconds,
                 context=context
             )
             return result
@@ -350,10 +718,11 @@ class GPUVideoWorker:
                 'error_type': error_type.value
             }
     
-    @retry_on_error(max_retries=2, context="S3 파일 다운로드")
     def _download_video_from_s3(self, s3_bucket: str, s3_key: str, local_path: str) -> bool:
         """
-        S3에서 비디오 파일 다운로드 (재시도 기능 포함)
+        S3에서 비디오 파일 다운로드
+        병렬 Range GET으로 받고, 재시도는 다운로더가 같은 경로의 부분 파일에서 이어받음
+        (바깥 재시도 데코레이터를 두지 않음 - 재시도가 중첩되지 않도록)
         
         Args:
             s3_bucket: S3 버킷명
@@ -365,15 +734,14 @@ class GPUVideoWorker:
         """
         logger.info(f"S3 다운로드: s3://{s3_bucket}/{s3_key} → {local_path}")
         
-        # S3 다운로드 실행
-        s3_service.download_file(s3_bucket, s3_key, local_path)
-        
-        # 파일 존재 확인
-        if not os.path.exists(local_path):
-            raise FileNotFoundError(f"다운로드된 파일을 찾을 수 없습니다: {local_path}")
+        # S3 다운로드 실행 (ETag/체크섬 검증 포함)
+        result = get_s3_downloader(settings.AWS_S3_REGION_NAME).download(s3_bucket, s3_key, local_path)
         
-        file_size = os.path.getsize(local_path)
-        logger.info(f"다운로드 완료: {file_size:,} bytes")
+        logger.info(
+            f"다운로드 완료: {result.size_bytes:,} bytes, {result.elapsed_seconds:.1f}초, "
+            f"{result.throughput_mbps:.1f}MB/s (이어받기 {result.resumed_parts}/{result.parts} 파트, "
+            f"검증 {result.verified_by or '미검증'})"
+        )
         return True
     
     @retry_on_error(max_retries=2, context="분석 결과 업로드")  
@@ -445,26 +813,29 @@ class GPUVideoWorker:
             processing_result = self._process_video(video_id, s3_bucket, s3_key)
             
             if processing_result['success']:
-                # 처리 완료 - 메시지 삭제
-                sqs_service.delete_message(receipt_handle)
-                self.processed_count += 1
-                logger.info(f"비디오 처리 완료: video_id={video_id}")
+                # 처리 완료 - 메시지 삭제 (삭제 실패는 재처리되므로 오류로 집계)
+                deleted = sqs_service.delete_message(receipt_handle)
+                self._record_result(deleted)
+                if deleted:
+                    logger.info(f"비디오 처리 완료: video_id={video_id}")
+                else:
+                    logger.warning(f"⚠️ 처리는 성공했지만 메시지 삭제 실패 (재처리 예상): video_id={video_id}")
             else:
                 # 처리 실패 - 메시지 가시성 복구 (다른 워커가 재처리 가능)
                 sqs_service.change_message_visibility(receipt_handle, 0)
-                self.error_count += 1
+                self._record_result(False)
                 logger.error(f"비디오 처리 실패: video_id={video_id}, error={processing_result['error']}")
         
         except json.JSONDecodeError as e:
             logger.error(f"메시지 파싱 실패: {e}")
             # 잘못된 형식의 메시지는 삭제
             sqs_service.delete_message(receipt_handle)
-            self.error_count += 1
+            self._record_result(False)
         
         except Exception as e:
             logger.error(f"메시지 처리 오류: {e}")
             traceback.print_exc()
-            self.error_count += 1
+            self._record_result(False)
             
             # 처리 실패 시 메시지 가시성 복구
             try:
@@ -472,35 +843,58 @@ class GPUVideoWorker:
             except:
                 pass
     
-    def _process_video(self, video_id: str, s3_bucket: str, s3_key: str) -> Dict[str, Any]:
+    def _process_video(
+        self,
+        video_id: str,
+        s3_bucket: str,
+        s3_key: str,
+        local_video_path: Optional[str] = None,
+        receipt_handle: Optional[str] = None,
+        download_seconds: float = 0.0
+    ) -> Dict[str, Any]:
         """
         비디오 GPU 처리 파이프라인 (오류 처리 강화)
+        단계가 끝날 때마다 가시성 관리자에 진행률 보고
         
-        1. S3에서 비디오 다운로드
+        1. S3에서 비디오 다운로드 (선행 다운로드된 파일이 있으면 생략)
         2. GPU 추론 실행  
         3. 결과 저장
         4. Django API 상태 업데이트
-        """
-        local_video_path = None
+        끝나면 실제 처리 시간을 AnalysisJob으로 기록 (처리 시간 추정기 학습 샘플)
         
+        처리 시간 = 다운로드 + 추론/저장 (Batch의 입력 준비 + 분석과 같은 기준, GPU 슬롯 대기 제외)
+        → 선행 다운로드 파일을 쓰면 그 다운로드 시간만큼 시작 시각을 앞당김
+        """
+        started_at = datetime.now(timezone.utc)
+        if local_video_path and os.path.exists(local_video_path):
+            started_at -= timedelta(seconds=download_seconds)
+        succeeded = False
+        error_message = ''
         try:
             # Step 1: S3에서 비디오 다운로드 (재시도 포함)
-            logger.info(f" S3 비디오 다운로드 시작: {s3_key}")
-            local_video_path = self._download_video_safe(video_id, s3_bucket, s3_key)
+            if local_video_path and os.path.exists(local_video_path):
+                logger.info(f" 선행 다운로드 파일 사용: {local_video_path}")
+            else:
+                logger.info(f" S3 비디오 다운로드 시작: {s3_key}")
+                local_video_path = self._download_video_safe(video_id, s3_bucket, s3_key)
+            self._report_progress(receipt_handle, 0.2, 'downloaded')
             
             # Step 2: GPU 추론 실행 (재시도 포함)
             logger.info(f" GPU 추론 시작: {local_video_path}")
             inference_result = self._run_gpu_inference_safe(video_id, local_video_path)
+            self._report_progress(receipt_handle, 0.85, 'inferred')
             
             # Step 3: 결과 저장 (재시도 포함)
             logger.info(f" 처리 결과 저장 중...")
             storage_result = self._save_processing_result_safe(video_id, inference_result)
+            self._report_progress(receipt_handle, 0.95, 'saved')
             
             # Step 4: Django DB 상태 업데이트 (재시도 포함)
             logger.info(f" DB 상태 업데이트 중...")
             self._update_video_status_safe(video_id, 'completed', inference_result)
             
             logger.info(f" 비디오 처리 완료: video_id={video_id}")
+            succeeded = True
             
             return {
                 'success': True,
@@ -510,6 +904,7 @@ class GPUVideoWorker:
         
         except Exception as e:
             logger.error(f" 비디오 처리 오류: video_id={video_id}, error={type(e).__name__}: {str(e)}")
+            error_message = str(e)
             
             # 실패 상태로 DB 업데이트 시도
             success, _ = safe_execute(
@@ -537,23 +932,71 @@ class GPUVideoWorker:
                     local_video_path,
                     context=f"임시 파일 정리 video_id={video_id}"
                 )
+            
+            # 실제 처리 시간 기록 (실패해도 처리 결과에 영향 없음)
+            safe_execute(
+                self._record_processing_time,
+                video_id,
+                started_at,
+                succeeded,
+                error_message,
+                context=f"처리 시간 기록 video_id={video_id}"
+            )
+    
+    def _record_processing_time(self, video_id: str, started_at: datetime, succeeded: bool, error_message: str = ''):
+        """처리 완료 작업을 AnalysisJob으로 기록 (비디오 특성 스냅샷 포함)"""
+        video = Video.objects.get(video_id=video_id)
+        get_processing_time_estimator().record_job(
+            video,
+            job_id=f"gpu-worker-{video_id}-{int(started_at.timestamp())}",
+            instance_type=self.instance_type,
+            started_at=started_at,
+            completed_at=datetime.now(timezone.utc),
+            succeeded=succeeded,
+            job_queue='gpu-worker',
+            error_message=error_message
+        )
+    
+    def _report_progress(self, receipt_handle: Optional[str], progress: float, stage: str):
+        """처리 진행률 보고 (가시성 연장 폭이 남은 처리 시간에 맞춰짐)"""
+        if receipt_handle:
+            self.visibility_manager.update_progress(receipt_handle, progress, stage)
     
     def _download_video_safe(self, video_id: str, s3_bucket: str, s3_key: str) -> str:
-        """S3에서 비디오 다운로드 (오류 처리 강화)"""
-        # 임시 디렉토리 생성
-        temp_dir = SCRIPT_DIR / 'temp'
-        temp_dir.mkdir(exist_ok=True)
+        """
+        S3에서 비디오 다운로드 (오류 처리 강화)
         
-        # 로컬 파일 경로 생성
-        file_extension = Path(s3_key).suffix or '.mp4'
-        local_filename = f"video_{video_id}_{int(time.time())}{file_extension}"
-        local_video_path = temp_dir / local_filename
+        경로는 비디오 + 객체 키로 고정 → 실패 후 처리 재시도 / 메시지 재수신 시 부분 파일에서 이어받음
+        (객체가 바뀌었으면 다운로더가 ETag 불일치로 처음부터 받음)
+        """
+        local_video_path = self._local_video_path(video_id, s3_bucket, s3_key)
+        
+        # 같은 키를 다른 슬롯이 받는 중이면 (중복 메시지) 부분 파일이 겹치지 않도록 별도 경로
+        with self._downloading_lock:
+            if str(local_video_path) in self._downloading:
+                local_video_path = local_video_path.with_name(
+                    f"{local_video_path.stem}_{threading.get_ident()}{local_video_path.suffix}"
+                )
+            self._downloading.add(str(local_video_path))
         
-        # 재시도 로직으로 다운로드 실행
-        self._download_video_from_s3(s3_bucket, s3_key, str(local_video_path))
+        try:
+            self._download_video_from_s3(s3_bucket, s3_key, str(local_video_path))
+        finally:
+            with self._downloading_lock:
+                self._downloading.discard(str(local_video_path))
         
         return str(local_video_path)
     
+    @staticmethod
+    def _local_video_path(video_id: str, s3_bucket: str, s3_key: str) -> Path:
+        """비디오 + 객체 키별 고정 로컬 경로"""
+        temp_dir = SCRIPT_DIR / 'temp'
+        temp_dir.mkdir(exist_ok=True)
+        
+        file_extension = Path(s3_key).suffix or '.mp4'
+        key_digest = hashlib.sha1(f"{s3_bucket}/{s3_key}".encode()).hexdigest()[:16]
+        return temp_dir / f"video_{video_id}_{key_digest}{file_extension}"
+    
     def _run_gpu_inference_safe(self, video_id: str, local_video_path: str) -> Dict[str, Any]:
         """GPU 추론 실행 (오류 처리 강화)"""
         context = f"GPU 추론 video_id={video_id}"
@@ -606,36 +1049,6 @@ class GPUVideoWorker:
             logger.error(f" {context} 실패: {type(e).__name__}: {str(e)}")
             raise
     
-    def _download_video_from_s3(self, s3_bucket: str, s3_key: str) -> str:
-        """S3에서 비디오 다운로드"""
-        # 임시 디렉토리 생성
-        temp_dir = SCRIPT_DIR / 'temp'
-        temp_dir.mkdir(exist_ok=True)
-        
-        # 로컬 파일 경로
-        file_name = Path(s3_key).name
-        local_path = temp_dir / f"{int(time.time())}_{file_name}"
-        
-        # S3에서 다운로드 (s3_service 사용)
-        try:
-            # Pre-signed URL 생성 후 다운로드 방식 사용
-            download_url = s3_service.generate_download_url(s3_key)
-            
-            import requests
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
-            
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            logger.info(f"비디오 다운로드 완료: {local_path}")
-            return str(local_path)
-            
-        except Exception as e:
-            logger.error(f"S3 다운로드 실패: {e}")
-            raise
-    
     def _run_gpu_inference(self, video_path: str) -> Dict[str, Any]:
         """
         GPU 추론 실행 (Mock Implementation)
@@ -1,44 +1,75 @@
 """
 SQS 메시지 가시성 타임아웃 관리 모듈
 메시지 처리 중 가시성 타임아웃을 동적으로 관리
+- 여러 처리 슬롯이 동시에 등록 / 해제 / 진행률 보고 (스레드 안전)
+- 연장이 필요한 메시지를 모아 ChangeMessageVisibilityBatch로 처리 (호출당 최대 10개)
+- 연장 폭은 보고된 진행률로 추정한 남은 처리 시간에 비례 (고정 300초가 아님)
+- 처리 시간(최대 처리 시간 / 진행률 추정)은 mark_started() 이후부터 측정
+  (디스크 / GPU 슬롯 대기 시간 제외, 12시간 상한만 수신 시점 기준)
 """
 
+import math
 import time
 import threading
 import logging
-from typing import Dict, Optional, Callable
-from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+SQS_BATCH_LIMIT = 10  # ChangeMessageVisibilityBatch 호출당 최대 엔트리 수
+SQS_MAX_VISIBILITY = 43200  # 수신 시점부터 최대 12시간
+# 이 오류면 더 이상 이 워커가 가진 메시지가 아님 (삭제됨 / 다른 워커에 재전달됨)
+LOST_MESSAGE_ERRORS = {
+    'ReceiptHandleIsInvalid',
+    'MessageNotInflight',
+    'AWS.SimpleQueueService.MessageNotInflight',
+}
+
 
 class VisibilityTimeoutManager:
     """
     SQS 메시지 가시성 타임아웃 관리자
     메시지 처리 중 자동으로 가시성 연장
     """
-    
+
     def __init__(self, sqs_service):
         """
         Args:
-            sqs_service: SQS 서비스 인스턴스
+            sqs_service: SQS 서비스 인스턴스 (change_message_visibility_batch가 없으면 개별 호출)
         """
         self.sqs_service = sqs_service
         self.active_messages: Dict[str, Dict] = {}  # receipt_handle -> message_info
+        self._lock = threading.Lock()  # active_messages / 통계 보호
+        self._flush_lock = threading.Lock()  # 연장 API 호출 중 해제된 메시지에 결과가 적용되지 않도록
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()  # 새 메시지 등록 시 모니터 스레드 즉시 깨움
         self._monitor_thread: Optional[threading.Thread] = None
-        
+
         # 설정값
-        self.default_timeout = 300  # 5분 기본 가시성 타임아웃
-        self.extension_interval = 240  # 4분마다 연장 체크
+        self.default_timeout = 300  # 5분 기본 가시성 타임아웃 (수신 시 설정값)
+        self.check_interval = 30  # 30초마다 연장 필요 여부 확인
+        self.min_extension = 120  # 최소 연장 시간 (거의 끝난 메시지)
+        self.max_extension = 1800  # 최대 연장 시간 (워커가 죽으면 이 시간 안에 재전달)
+        self.safety_factor = 1.5  # 남은 처리 시간 추정치 대비 여유
+        self.renew_ratio = 0.3  # 남은 가시성이 마지막 설정값의 30% 이하면 연장
+        self.batch_delay = 0.5  # 동시에 등록된 메시지를 모아 한 번에 호출하기 위한 대기 (초)
         self.max_processing_time = 5400  # 최대 처리 시간 1시간 30분
-        
+
+        # 통계
+        self._stats = {
+            'managed_messages': 0,
+            'extensions': 0,
+            'api_calls': 0,
+            'failed_changes': 0,
+            'lost_messages': 0,
+        }
+
     def start_monitoring(self):
         """가시성 타임아웃 모니터링 시작"""
         if self._monitor_thread and self._monitor_thread.is_alive():
             logger.warning("가시성 타임아웃 모니터링이 이미 실행 중입니다")
             return
-            
+
         self._stop_event.clear()
         self._monitor_thread = threading.Thread(
             target=self._monitor_visibility_timeouts,
@@ -46,152 +77,293 @@ class VisibilityTimeoutManager:
         )
         self._monitor_thread.start()
         logger.info("가시성 타임아웃 모니터링 시작")
-    
+
     def stop_monitoring(self):
         """가시성 타임아웃 모니터링 중지"""
         self._stop_event.set()
+        self._wake_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5)
         logger.info("가시성 타임아웃 모니터링 중지")
-    
+
     def register_message(
-        self, 
-        receipt_handle: str, 
+        self,
+        receipt_handle: str,
         video_id: str,
         estimated_processing_time: int = None
     ):
         """
         메시지 처리 시작 등록
-        
+        초기 가시성 타임아웃은 모니터 스레드가 다른 메시지와 모아서 설정
+        (수신 시 가시성 타임아웃이 남아 있는 동안 처리됨)
+
         Args:
             receipt_handle: SQS 메시지 수신 핸들
             video_id: 처리할 비디오 ID
             estimated_processing_time: 예상 처리 시간 (초)
         """
+        now = time.monotonic()
         processing_time = estimated_processing_time or self.default_timeout
-        
+
         message_info = {
             'video_id': video_id,
-            'start_time': datetime.now(timezone.utc),
-            'last_extended': datetime.now(timezone.utc),
-            'visibility_timeout': processing_time,
+            'received_time': now,  # SQS 12시간 상한 기준
+            'start_time': now,  # 처리 시작 시각 (mark_started()에서 다시 설정)
+            'started': False,
+            'last_extended': now,
+            'deadline': now + self.default_timeout,  # 현재 가시성이 끝나는 시점 (수신 시 설정값 기준)
+            'visibility_timeout': self.default_timeout,
+            'estimated_time': processing_time,
+            'progress': 0.0,
+            'stage': None,
             'extension_count': 0,
+            'initial_pending': True,
+            'lost': False,
             'status': 'processing'
         }
-        
-        self.active_messages[receipt_handle] = message_info
-        
-        # 초기 가시성 타임아웃 설정
-        success = self.sqs_service.change_message_visibility(
-            receipt_handle, 
-            processing_time
-        )
-        
-        if success:
-            logger.info(f"메시지 처리 등록: video_id={video_id}, timeout={processing_time}초")
-        else:
-            logger.error(f"초기 가시성 타임아웃 설정 실패: video_id={video_id}")
-    
+
+        with self._lock:
+            self.active_messages[receipt_handle] = message_info
+            self._stats['managed_messages'] += 1
+
+        self._wake_event.set()
+        logger.info(f"메시지 처리 등록: video_id={video_id}, 예상 처리 시간={processing_time}초")
+
+    def mark_started(self, receipt_handle: str):
+        """
+        실제 처리 시작 (GPU 슬롯 점유 직후 호출)
+
+        자원 대기 중에는 남은 처리 시간을 예상 처리 시간 전체로 보고 최대 처리 시간도 적용하지 않음
+        → 앞선 작업 뒤에서 기다린 시간 때문에 처리 중인 메시지를 timeout으로 해제하지 않도록
+        """
+        with self._lock:
+            message_info = self.active_messages.get(receipt_handle)
+            if message_info is None:
+                return
+            message_info['start_time'] = time.monotonic()
+            message_info['started'] = True
+
+    def update_progress(self, receipt_handle: str, progress: float, stage: Optional[str] = None):
+        """
+        처리 진행률 보고 (다음 연장 폭 계산에 사용)
+
+        Args:
+            receipt_handle: SQS 메시지 수신 핸들
+            progress: 0.0 ~ 1.0
+            stage: 현재 단계 이름 (로그용)
+        """
+        with self._lock:
+            message_info = self.active_messages.get(receipt_handle)
+            if message_info is None:
+                return
+            # 재시도로 단계가 되돌아가도 진행률은 줄이지 않음 (추정이 과도하게 늘어나는 것 방지)
+            message_info['progress'] = max(message_info['progress'], min(max(progress, 0.0), 1.0))
+            if stage:
+                message_info['stage'] = stage
+
     def extend_visibility(self, receipt_handle: str, additional_time: int = 300):
         """
-        특정 메시지의 가시성 타임아웃 연장
-        
+        특정 메시지의 가시성 타임아웃 즉시 연장
+
         Args:
             receipt_handle: SQS 메시지 수신 핸들
             additional_time: 추가 연장 시간 (초)
         """
-        if receipt_handle not in self.active_messages:
+        with self._lock:
+            registered = receipt_handle in self.active_messages
+        if not registered:
             logger.warning(f"등록되지 않은 메시지: {receipt_handle[:20]}...")
             return False
-        
-        message_info = self.active_messages[receipt_handle]
-        
-        # 가시성 타임아웃 연장
-        success = self.sqs_service.change_message_visibility(receipt_handle, additional_time)
-        
-        if success:
-            message_info['last_extended'] = datetime.now(timezone.utc)
-            message_info['extension_count'] += 1
-            message_info['visibility_timeout'] = additional_time
-            
-            logger.info(f"가시성 타임아웃 연장: video_id={message_info['video_id']}, "
-                       f"추가시간={additional_time}초, 연장횟수={message_info['extension_count']}")
-            return True
-        else:
-            logger.error(f"가시성 타임아웃 연장 실패: video_id={message_info['video_id']}")
-            return False
-    
+
+        with self._flush_lock:
+            results = self._apply_changes([(receipt_handle, int(additional_time))])
+        return results.get(receipt_handle) is None
+
     def unregister_message(self, receipt_handle: str, status: str = 'completed'):
         """
         메시지 처리 완료 또는 실패 등록 해제
-        
+        반환 후에는 이 메시지의 가시성을 다시 바꾸지 않음 (가시성 복구 전에 호출)
+
         Args:
-            receipt_handle: SQS 메시지 수신 핸들  
+            receipt_handle: SQS 메시지 수신 핸들
             status: 완료 상태 ('completed', 'failed', 'timeout')
         """
-        if receipt_handle not in self.active_messages:
+        with self._flush_lock:
+            with self._lock:
+                message_info = self.active_messages.pop(receipt_handle, None)
+        if message_info is None:
             logger.warning(f"등록되지 않은 메시지 해제 시도: {receipt_handle[:20]}...")
             return
-        
-        message_info = self.active_messages[receipt_handle]
-        processing_time = (datetime.now(timezone.utc) - message_info['start_time']).total_seconds()
-        
+
+        processing_time = time.monotonic() - message_info['start_time']
+
         logger.info(f"메시지 처리 완료: video_id={message_info['video_id']}, "
                    f"상태={status}, 처리시간={processing_time:.1f}초, "
                    f"연장횟수={message_info['extension_count']}")
-        
-        del self.active_messages[receipt_handle]
-    
+
     def get_active_message_count(self) -> int:
         """현재 처리 중인 메시지 수 반환"""
-        return len(self.active_messages)
-    
+        with self._lock:
+            return len(self.active_messages)
+
     def get_message_status(self, receipt_handle: str) -> Optional[Dict]:
-        """특정 메시지의 상태 정보 반환"""
-        return self.active_messages.get(receipt_handle)
-    
+        """특정 메시지의 상태 정보 반환 (복사본)"""
+        with self._lock:
+            message_info = self.active_messages.get(receipt_handle)
+            return dict(message_info) if message_info else None
+
+    def get_statistics(self) -> Dict:
+        """가시성 관리 통계"""
+        with self._lock:
+            return dict(self._stats, active_messages=len(self.active_messages))
+
+    def _next_timeout(self, message_info: Dict, now: float) -> int:
+        """
+        다음 가시성 타임아웃 (남은 처리 시간 추정 × 여유)
+
+        진행률 보고가 있으면 지금까지의 속도로 남은 시간을 추정하고, 없으면 예상 처리 시간 기준
+        (처리 시작 전이면 예상 처리 시간 전체)
+        """
+        elapsed = now - message_info['start_time'] if message_info['started'] else 0.0
+        progress = message_info['progress']
+
+        if progress >= 0.05 and elapsed > 0:
+            remaining = elapsed * (1.0 - progress) / progress
+        else:
+            remaining = message_info['estimated_time'] - elapsed
+
+        timeout = max(self.min_extension, int(max(remaining, 0) * self.safety_factor))
+        timeout = min(timeout, self.max_extension)
+        # 수신 후 12시간을 넘길 수 없음
+        return max(0, min(timeout, int(SQS_MAX_VISIBILITY - (now - message_info['received_time']))))
+
+    def _is_due(self, message_info: Dict, now: float) -> bool:
+        """연장 필요 여부 (다음 확인 전에 만료될 수 있거나 마지막 설정값의 일정 비율 이하로 남음)"""
+        if message_info['lost']:
+            return False
+        if message_info['initial_pending']:
+            return True
+
+        remaining = message_info['deadline'] - now
+        threshold = max(2 * self.check_interval, self.renew_ratio * message_info['visibility_timeout'])
+        return remaining <= threshold
+
+    def _flush(self):
+        """연장이 필요한 메시지를 모아 일괄 변경하고, 최대 처리 시간을 넘긴 메시지는 해제"""
+        with self._flush_lock:
+            now = time.monotonic()
+            entries: List[Tuple[str, int]] = []
+            timed_out: List[Tuple[str, str]] = []
+
+            with self._lock:
+                for receipt_handle, message_info in self.active_messages.items():
+                    if (
+                        message_info['started']
+                        and now - message_info['start_time'] > self.max_processing_time
+                    ):
+                        timed_out.append((receipt_handle, message_info['video_id']))
+                    elif self._is_due(message_info, now):
+                        if message_info['initial_pending']:
+                            timeout = max(message_info['estimated_time'], self.min_extension)
+                            timeout = min(timeout, SQS_MAX_VISIBILITY)
+                        else:
+                            timeout = self._next_timeout(message_info, now)
+                        entries.append((receipt_handle, timeout))
+
+            if entries:
+                self._apply_changes(entries)
+
+        # 타임아웃된 메시지들 정리 (더 이상 연장하지 않음)
+        for receipt_handle, video_id in timed_out:
+            logger.error(f"메시지 처리 타임아웃: video_id={video_id}")
+            self.unregister_message(receipt_handle, 'timeout')
+
+    def _apply_changes(self, entries: List[Tuple[str, int]]) -> Dict[str, Optional[str]]:
+        """가시성 변경 호출 후 결과를 메시지 정보에 반영 (_flush_lock 보유 상태에서 호출)"""
+        sent_at = time.monotonic()
+        results = self._change_visibility(entries)
+
+        with self._lock:
+            for receipt_handle, timeout in entries:
+                message_info = self.active_messages.get(receipt_handle)
+                if message_info is None:
+                    continue
+
+                error = results.get(receipt_handle, 'Unknown')
+                if error is None:
+                    initial = message_info['initial_pending']
+                    message_info.update(
+                        deadline=sent_at + timeout,
+                        last_extended=sent_at,
+                        visibility_timeout=timeout,
+                        initial_pending=False,
+                    )
+                    if not initial:
+                        message_info['extension_count'] += 1
+                        self._stats['extensions'] += 1
+                    logger.info(
+                        f"가시성 타임아웃 {'설정' if initial else '연장'}: "
+                        f"video_id={message_info['video_id']}, {timeout}초, "
+                        f"진행률={message_info['progress']:.0%}"
+                        f"{' (' + message_info['stage'] + ')' if message_info['stage'] else ''}, "
+                        f"연장횟수={message_info['extension_count']}"
+                    )
+                elif error in LOST_MESSAGE_ERRORS:
+                    message_info['lost'] = True
+                    self._stats['lost_messages'] += 1
+                    logger.error(
+                        f"메시지 소유권 상실 ({error}) - 다른 워커에 재전달됐을 수 있음: "
+                        f"video_id={message_info['video_id']}"
+                    )
+                else:
+                    # 다음 확인 주기에 다시 시도
+                    self._stats['failed_changes'] += 1
+                    logger.error(f"가시성 타임아웃 변경 실패 ({error}): video_id={message_info['video_id']}")
+
+        return results
+
+    def _change_visibility(self, entries: List[Tuple[str, int]]) -> Dict[str, Optional[str]]:
+        """
+        SQS 가시성 변경 (배치 API 우선)
+
+        Returns:
+            {receipt_handle: None(성공) 또는 오류 코드}
+        """
+        if hasattr(self.sqs_service, 'change_message_visibility_batch'):
+            api_calls = math.ceil(len(entries) / SQS_BATCH_LIMIT)
+            try:
+                results = self.sqs_service.change_message_visibility_batch(entries)
+            except Exception as e:
+                logger.error(f"가시성 타임아웃 일괄 변경 오류: {e}")
+                results = {receipt_handle: 'RequestFailed' for receipt_handle, _ in entries}
+        else:
+            api_calls = len(entries)
+            results = {}
+            for receipt_handle, timeout in entries:
+                success = self.sqs_service.change_message_visibility(receipt_handle, timeout)
+                results[receipt_handle] = None if success else 'RequestFailed'
+
+        with self._lock:
+            self._stats['api_calls'] += api_calls
+        return results
+
     def _monitor_visibility_timeouts(self):
         """백그라운드에서 가시성 타임아웃 모니터링"""
         logger.info("가시성 타임아웃 모니터링 스레드 시작")
-        
+
         while not self._stop_event.is_set():
+            woken = self._wake_event.wait(self.check_interval)
+            if self._stop_event.is_set():
+                break
+
+            if woken:
+                self._wake_event.clear()
+                # 동시에 수신된 메시지들의 등록을 잠시 기다렸다가 한 번에 설정
+                self._stop_event.wait(self.batch_delay)
+
             try:
-                current_time = datetime.now(timezone.utc)
-                messages_to_extend = []
-                messages_to_timeout = []
-                
-                # 활성 메시지들 체크
-                for receipt_handle, message_info in self.active_messages.items():
-                    elapsed_since_extension = (current_time - message_info['last_extended']).total_seconds()
-                    total_elapsed = (current_time - message_info['start_time']).total_seconds()
-                    
-                    # 최대 처리 시간 초과 체크
-                    if total_elapsed > self.max_processing_time:
-                        messages_to_timeout.append(receipt_handle)
-                        continue
-                    
-                    # 연장이 필요한 메시지 체크
-                    if elapsed_since_extension >= self.extension_interval:
-                        messages_to_extend.append(receipt_handle)
-                
-                # 가시성 타임아웃 연장
-                for receipt_handle in messages_to_extend:
-                    self.extend_visibility(receipt_handle, self.default_timeout)
-                
-                # 타임아웃된 메시지들 정리
-                for receipt_handle in messages_to_timeout:
-                    message_info = self.active_messages[receipt_handle]
-                    logger.error(f"메시지 처리 타임아웃: video_id={message_info['video_id']}")
-                    self.unregister_message(receipt_handle, 'timeout')
-                
-                # 상태 로깅 (5분마다)
-                if len(self.active_messages) > 0:
-                    logger.info(f"현재 처리 중인 메시지: {len(self.active_messages)}개")
-                
+                self._flush()
             except Exception as e:
                 logger.error(f"가시성 타임아웃 모니터링 오류: {e}")
-            
-            # 60초마다 체크
-            self._stop_event.wait(60)
-        
-        logger.info("가시성 타임아웃 모니터링 스레드 종료")
\ No newline at end of file
+
+        logger.info("가시성 타임아웃 모니터링 스레드 종료")
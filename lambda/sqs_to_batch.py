@@ -3,6 +3,7 @@ Lambda Function: SQS to AWS Batch Trigger (Safe Version)
 안전장치:
 1. Lambda Concurrency = 1 (동시 실행 방지)
 2. 실행 중인 Job 체크 (중복 제출 방지)
+3. Job 타임아웃 = Backend 처리 시간 예측 구간 상한 × 여유 배율 (추정치 없으면 Job Definition 기본값)
 """
 
 import json
@@ -24,6 +25,11 @@ JOB_QUEUE = os.environ['BATCH_JOB_QUEUE']
 JOB_DEFINITION = os.environ['BATCH_JOB_DEFINITION']
 MAX_CONCURRENT_JOBS = int(os.environ.get('MAX_CONCURRENT_JOBS', '1'))
 
+# Job 타임아웃 (Backend가 메시지에 싣는 처리 시간 추정치 기반)
+BATCH_TIMEOUT_MARGIN = float(os.environ.get('BATCH_TIMEOUT_MARGIN', '1.5'))
+BATCH_MIN_TIMEOUT = int(os.environ.get('BATCH_MIN_TIMEOUT', '900'))
+BATCH_MAX_TIMEOUT = int(os.environ.get('BATCH_MAX_TIMEOUT', '14400'))
+
 # PostgreSQL 환경 변수 (Job Definition에 있는 값을 Lambda에서도 가져옴)
 POSTGRES_HOST = os.environ.get('POSTGRES_HOST', '')
 POSTGRES_DB = os.environ.get('POSTGRES_DB', '')
@@ -103,6 +109,29 @@ def parse_s3_event(body):
         return None, None
 
 
+def job_timeout_from_estimate(body):
+    """
+    메시지의 처리 시간 추정치 → Batch Job 타임아웃 (attemptDurationSeconds)
+    Job이 컴퓨팅 환경의 어느 인스턴스 타입에 배치될지 모르므로 타입별 예측 구간 상한 중 최대값 사용
+    
+    Args:
+        body: SQS 메시지 body (dict)
+    
+    Returns:
+        int: 타임아웃 (초) 또는 None (추정치 없음 → Job Definition 기본값)
+    """
+    estimate = body.get('estimate') if isinstance(body, dict) else None
+    if not isinstance(estimate, dict) or not estimate.get('upperSeconds'):
+        return None
+    
+    upper_seconds = [estimate['upperSeconds']] + [
+        prediction.get('upperSeconds', 0)
+        for prediction in (estimate.get('byInstanceType') or {}).values()
+    ]
+    timeout = int(max(upper_seconds) * BATCH_TIMEOUT_MARGIN)
+    return max(BATCH_MIN_TIMEOUT, min(BATCH_MAX_TIMEOUT, timeout))
+
+
 def lambda_handler(event, context):
     """
     Lambda 핸들러 - SQS 메시지를 받아서 AWS Batch Job 제출
@@ -154,10 +183,12 @@ def lambda_handler(event, context):
                 # 1. SQS 메시지의 video.id 필드 (주 방법)
                 # 2. MessageAttributes의 video_id (백업)
                 video_id = None
+                job_timeout = None
                 
                 # 1. 메시지 body에서 video.id 찾기
                 try:
                     body_dict = json.loads(body) if isinstance(body, str) else body
+                    job_timeout = job_timeout_from_estimate(body_dict)
                     if 'video' in body_dict and 'id' in body_dict['video']:
                         video_id = str(body_dict['video']['id'])
                         logger.info(f"Extracted video_id from message body: {video_id}")
@@ -252,12 +283,19 @@ def lambda_handler(event, context):
                 except Exception as check_error:
                     logger.warning(f"⚠️ Failed to check for duplicate jobs: {check_error}. Proceeding with job submission anyway.")
                 
+                # 처리 시간 추정치가 있으면 Job 타임아웃 조정 (없으면 Job Definition의 3600초)
+                timeout_args = {}
+                if job_timeout:
+                    timeout_args['timeout'] = {'attemptDurationSeconds': job_timeout}
+                    logger.info(f"⏱️ Job timeout from processing estimate: {job_timeout}s")
+                
                 # containerOverrides.environment 사용하지 않음
                 # Job Definition의 환경변수를 그대로 사용하고, 동적 값만 command로 전달
                 response = batch_client.submit_job(
                     jobName=job_name,
                     jobQueue=JOB_QUEUE,
                     jobDefinition=JOB_DEFINITION,
+                    **timeout_args,
                     containerOverrides={
                         'environment': [
                             # Lambda에서 전달하는 동적 값만 추가